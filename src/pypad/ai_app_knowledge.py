@@ -112,6 +112,14 @@ Settings keys (frequently useful):
 - ai_app_knowledge_override   (user knowledge field; appended separately from built-in knowledge)
 - ai_private_mode
 - ai_verbose_logging
+- ai_response_cache_enabled   (identical AI requests reuse a cached reply; chat Retry bypasses it)
+- ai_context_budget_tokens   (token budget for prompt context; low-priority blocks are trimmed or dropped first)
+- ai_batch_max_concurrency   (parallel requests for Batch AI Refactor; results still apply in order)
+- ai_requests_per_minute   (per-provider request spacing; 0 = no limit, 429/503 responses back off automatically)
+- ai_provider   ("gemini" or "local"; local is an offline simulator for load/latency testing, never sends data)
+- ai_local_response_chars / ai_local_chunk_chars / ai_local_chunk_delay_ms / ai_local_first_token_ms   (local simulator stream shape)
+- ai_local_error_percent / ai_local_rate_limit_percent / ai_local_seed   (local simulator fault injection, reproducible per seed)
+- ai_local_canned_response   (fixed local simulator reply; blank = seeded filler text)
 - ai_preview_redacted_prompt
 - ai_send_redact_emails
 - ai_send_redact_paths
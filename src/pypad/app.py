@@ -4,7 +4,7 @@ from typing import Optional
 from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 
-from .logging_utils import configure_app_logging, get_logger
+from .logging_utils import configure_app_logging, flush_app_logging, get_logger
 from .ui.main_window import Notepad
 
 LOGGER = get_logger(__name__)
@@ -27,6 +27,7 @@ def main(existing_app: Optional[QApplication] = None) -> Notepad:
         save_crash = getattr(window, "save_crash_traceback", None)
         if callable(save_crash):
             save_crash(error_text)
+        flush_app_logging()
         sys.__excepthook__(exc_type, exc_value, exc_tb)
 
     sys.excepthook = _global_exception_hook
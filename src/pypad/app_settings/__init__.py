@@ -4,14 +4,20 @@ from .coercion import coerce_bool, migrate_settings, normalize_ui_visibility_set
 from .defaults import build_default_settings
 from .scintilla_profile import ScintillaProfile
 from .paths import (
+    get_ai_metrics_dir_path,
+    get_ai_response_cache_dir_path,
     get_autosave_dir_path,
+    get_chat_history_dir_path,
     get_crash_logs_file_path,
     get_debug_logs_file_path,
+    get_index_cache_dir_path,
     get_legacy_settings_file_path,
     get_password_file_path,
+    get_plugin_discovery_cache_path,
     get_plugins_dir_path,
     get_reminders_file_path,
     get_settings_file_path,
+    get_startup_history_path,
     get_translation_cache_path,
 )
 
@@ -21,13 +27,19 @@ __all__ = [
     "coerce_bool",
     "migrate_settings",
     "normalize_ui_visibility_settings",
+    "get_ai_metrics_dir_path",
+    "get_ai_response_cache_dir_path",
     "get_autosave_dir_path",
+    "get_chat_history_dir_path",
     "get_crash_logs_file_path",
     "get_debug_logs_file_path",
+    "get_index_cache_dir_path",
     "get_legacy_settings_file_path",
     "get_password_file_path",
+    "get_plugin_discovery_cache_path",
     "get_plugins_dir_path",
     "get_reminders_file_path",
     "get_settings_file_path",
+    "get_startup_history_path",
     "get_translation_cache_path",
 ]
@@ -263,6 +263,21 @@ def migrate_settings(settings: dict) -> dict:
         0,
         15000,
     )
+    current["plugin_event_coalesce_ms"] = _coerce_int_clamped(current.get("plugin_event_coalesce_ms", 150), 150, 0, 2000)
+    current["plugin_event_budget_ms"] = _coerce_int_clamped(current.get("plugin_event_budget_ms", 16), 16, 1, 1000)
+    current["plugin_event_slow_strikes"] = _coerce_int_clamped(current.get("plugin_event_slow_strikes", 3), 3, 1, 50)
+    current["plugin_process_runtime_default"] = coerce_bool(current.get("plugin_process_runtime_default", False), False)
+    current["plugin_process_cpu_limit_ms"] = _coerce_int_clamped(
+        current.get("plugin_process_cpu_limit_ms", 2000), 2000, 50, 60000
+    )
+    current["plugin_discovery_verify_minutes"] = _coerce_int_clamped(
+        current.get("plugin_discovery_verify_minutes", 60), 60, 0, 1440
+    )
+    if not isinstance(current.get("last_session_view_states"), dict):
+        current["last_session_view_states"] = {}
+    current["session_background_load_ms"] = _coerce_int_clamped(
+        current.get("session_background_load_ms", 150), 150, 0, 10000
+    )
 
     current["ai_send_redact_emails"] = coerce_bool(current.get("ai_send_redact_emails", False), False)
     current["ai_send_redact_paths"] = coerce_bool(current.get("ai_send_redact_paths", False), False)
@@ -104,6 +104,8 @@ def build_default_settings(*, default_style: str, font_family: str, font_size: i
         "last_session_active_file": "",
         "last_session_workspace_root": "",
         "last_session_file_path": "",
+        "last_session_view_states": {},
+        "session_background_load_ms": 150,
         "large_file_threshold_kb": 2048,
         "large_file_fast_open_enabled": True,
         "large_file_fast_open_kb": 8192,
@@ -131,6 +133,12 @@ def build_default_settings(*, default_style: str, font_family: str, font_size: i
         "plugin_startup_safe_mode": False,
         "defer_plugin_load_on_startup": True,
         "plugin_startup_defer_ms": 1200,
+        "plugin_event_coalesce_ms": 150,
+        "plugin_event_budget_ms": 16,
+        "plugin_event_slow_strikes": 3,
+        "plugin_process_runtime_default": False,
+        "plugin_process_cpu_limit_ms": 2000,
+        "plugin_discovery_verify_minutes": 60,
         "keyboard_only_mode": False,
         "backup_scheduler_enabled": False,
         "backup_interval_min": 15,
@@ -165,6 +173,10 @@ def build_default_settings(*, default_style: str, font_family: str, font_size: i
         "ai_last_prompt_app_name": "Pypad",
         "ai_rewrite_require_approval": True,
         "ai_verbose_logging": False,
+        "ai_response_cache_enabled": True,
+        "ai_response_cache_ttl_hours": 24,
+        "ai_response_cache_max_mb": 32,
+        "ai_context_budget_tokens": 16000,
         "lsp_definition_enabled": True,
         "lsp_definition_initialize_timeout_sec": 5.0,
         "lsp_definition_request_timeout_sec": 3.0,
@@ -177,6 +189,17 @@ def build_default_settings(*, default_style: str, font_family: str, font_size: i
         "ai_enable_regression_guard_prompts": True,
         "ai_template_nearby_lines_radius": 20,
         "ai_batch_refactor_max_selected_files": 20,
+        "ai_batch_max_concurrency": 3,
+        "ai_requests_per_minute": 0,
+        "ai_provider": "gemini",
+        "ai_local_canned_response": "",
+        "ai_local_response_chars": 2000,
+        "ai_local_chunk_chars": 24,
+        "ai_local_chunk_delay_ms": 30,
+        "ai_local_first_token_ms": 300,
+        "ai_local_error_percent": 0,
+        "ai_local_rate_limit_percent": 0,
+        "ai_local_seed": 0,
         "ai_session_default_include_current_file_auto": False,
         "ai_session_default_include_workspace_snippets_auto": False,
         "ai_session_default_strict_citations_only": False,
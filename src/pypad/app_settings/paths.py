@@ -38,9 +38,33 @@ def get_plugins_dir_path() -> Path:
     return _app_roaming_dir() / "plugins"
 
 
+def get_plugin_discovery_cache_path() -> Path:
+    return _app_roaming_dir() / "plugin_discovery_cache.json"
+
+
+def get_startup_history_path() -> Path:
+    return _app_roaming_dir() / "startup_history.json"
+
+
 def get_debug_logs_file_path() -> Path:
     return _app_roaming_dir() / "debug_logs.log"
 
 
 def get_crash_logs_file_path() -> Path:
     return _app_roaming_dir() / "crash_tracebacks.log"
+
+
+def get_index_cache_dir_path() -> Path:
+    return _app_roaming_dir() / "index"
+
+
+def get_ai_metrics_dir_path() -> Path:
+    return _app_roaming_dir() / "ai_metrics"
+
+
+def get_ai_response_cache_dir_path() -> Path:
+    return _app_roaming_dir() / "ai_response_cache"
+
+
+def get_chat_history_dir_path() -> Path:
+    return _app_roaming_dir() / "chat_history"
@@ -1,9 +1,17 @@
 """Runtime translation helpers."""
 
-from .translator import AppTranslator, get_language_display_options, language_code_for
+from .translator import (
+    AppTranslator,
+    TranslationCatalog,
+    compile_catalog,
+    get_language_display_options,
+    language_code_for,
+)
 
 __all__ = [
     "AppTranslator",
+    "TranslationCatalog",
+    "compile_catalog",
     "get_language_display_options",
     "language_code_for",
 ]
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
 import json
+import mmap
+import os
 import queue
+import struct
 import threading
+import time
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Protocol
 
+# Strings per remote request, and a soft cap on their combined length.
+MAX_BATCH_SIZE = 64
+MAX_BATCH_CHARS = 4000
+# How long the worker waits for more strings before sending a batch.
+BATCH_WINDOW_SEC = 0.05
+# Translated strings are written to the cache file at most this often.
+CACHE_SAVE_DELAY_SEC = 2.0
+TRANSLATION_BACKEND_ENV = "PYPAD_TRANSLATION_BACKEND"
+_MO_MAGIC = 0x950412DE
 
 _LANGUAGE_OPTIONS: list[tuple[str, str]] = [
     ("English", "en"),
@@ -39,49 +52,259 @@ def language_code_for(label: str) -> str:
     return "en"
 
 
+class TranslationBackend(Protocol):
+    def translate_batch(self, texts: list[str], target_lang: str) -> list[str]: ...
+
+
+class GoogleTranslateBackend:
+    """googletrans, sending a batch as one newline-joined request.
+
+    googletrans translates a list one string per HTTP request, so single-line strings
+    are joined with newlines (which the service keeps) and the reply is split again.
+    Strings with their own newlines, and batches whose reply does not split back into
+    the same number of segments, fall back to one request per string.
+    """
+
+    def __init__(self, client=None) -> None:
+        self._client = client
+
+    def _translate_one(self, text: str, target_lang: str) -> str:
+        if self._client is None:
+            from googletrans import Translator  # type: ignore
+
+            self._client = Translator()
+        result = self._client.translate(text, dest=target_lang)
+        return str(getattr(result, "text", "") or "")
+
+    def translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
+        results = list(texts)
+        joinable: list[int] = []
+        single: list[int] = []
+        for index, text in enumerate(texts):
+            if text.strip():
+                (single if "\n" in text else joinable).append(index)
+        if len(joinable) == 1:
+            single.append(joinable.pop())
+        if joinable:
+            joined = self._translate_one("\n".join(texts[index] for index in joinable), target_lang)
+            segments = joined.split("\n")
+            if len(segments) == len(joinable):
+                for index, segment in zip(joinable, segments):
+                    results[index] = segment.strip() or texts[index]
+            else:
+                single.extend(joinable)
+        for index in sorted(single):
+            results[index] = self._translate_one(texts[index], target_lang) or texts[index]
+        return results
+
+
+class PseudoTranslationBackend:
+    """Offline stand-in that tags each string with the target language."""
+
+    def translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
+        return [f"[{target_lang}] {text}" for text in texts]
+
+
+def make_translation_backend(name: str | None = None) -> TranslationBackend:
+    choice = str(name if name is not None else os.environ.get(TRANSLATION_BACKEND_ENV, "")).strip().lower()
+    if choice in {"pseudo", "local", "offline"}:
+        return PseudoTranslationBackend()
+    return GoogleTranslateBackend()
+
+
+class TranslationCatalog:
+    """Read-only lookup into a compiled gettext ``.mo`` catalog.
+
+    The file is memory-mapped and searched in its sorted message table, so a
+    catalog costs no Python objects beyond the strings actually looked up.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if struct.unpack_from("<I", self._data, 0)[0] == _MO_MAGIC:
+                self._order = "<"
+            elif struct.unpack_from(">I", self._data, 0)[0] == _MO_MAGIC:
+                self._order = ">"
+            else:
+                raise ValueError(f"not a .mo catalog: {self.path}")
+            self._count, self._originals, self._translations = struct.unpack_from(
+                self._order + "3I", self._data, 8
+            )
+        except Exception:
+            self._data.close()
+            raise
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _string(self, table: int, index: int) -> bytes:
+        length, offset = struct.unpack_from(self._order + "2I", self._data, table + index * 8)
+        return self._data[offset : offset + length]
+
+    def get(self, text: str) -> str | None:
+        key = text.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            original = self._string(self._originals, middle)
+            if original < key:
+                low = middle + 1
+            elif original > key:
+                high = middle
+            else:
+                translated = self._string(self._translations, middle)
+                return translated.decode("utf-8", errors="replace") if translated else None
+        return None
+
+    def close(self) -> None:
+        self._data.close()
+
+
+def compile_catalog(mapping: dict[str, str], path: Path) -> int:
+    """Write ``mapping`` as a UTF-8 ``.mo`` catalog; returns the number of messages."""
+    entries = sorted(
+        (src.encode("utf-8"), dst.encode("utf-8")) for src, dst in mapping.items() if src and dst and src != dst
+    )
+    entries.insert(0, (b"", b"Content-Type: text/plain; charset=UTF-8\n"))
+    count = len(entries)
+    originals_at = 28
+    translations_at = originals_at + count * 8
+    data_at = translations_at + count * 8
+    tables = bytearray()
+    blob = bytearray()
+    for column in (0, 1):
+        for entry in entries:
+            value = entry[column]
+            tables += struct.pack("<2I", len(value), data_at + len(blob))
+            blob += value + b"\0"
+    header = struct.pack("<7I", _MO_MAGIC, 0, count, originals_at, translations_at, 0, data_at)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + bytes(tables) + bytes(blob))
+    return count - 1
+
+
 class AppTranslator:
-    def __init__(self, cache_path: Path) -> None:
+    """UI string translator backed by bundled catalogs, a JSON cache and a batched worker.
+
+    Lookups never block: misses are queued, deduplicated against in-flight
+    requests and sent to the backend in batches, and the cache file is
+    rewritten at most once per ``save_delay_sec``.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path,
+        *,
+        catalog_dir: Path | None = None,
+        backend: TranslationBackend | None = None,
+        save_delay_sec: float = CACHE_SAVE_DELAY_SEC,
+    ) -> None:
         self._cache_path = Path(cache_path)
+        self._catalog_dir = Path(catalog_dir) if catalog_dir else None
+        self._catalogs: dict[str, TranslationCatalog | None] = {}
         self._cache: dict[str, dict[str, str]] = {}
         self._loaded = False
-        self._translator = None
+        self._backend = backend
         self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
         self._pending: set[tuple[str, str]] = set()
         self._queue: queue.Queue[tuple[str, str]] = queue.Queue()
         self._worker_started = False
+        self._generation = 0
+        self._save_delay_sec = max(0.0, float(save_delay_sec))
+        self._save_timer: threading.Timer | None = None
+        self._cache_dirty = False
 
     def clear_cache(self) -> None:
         with self._lock:
             self._cache = {}
             self._loaded = True
             self._pending.clear()
+            self._generation += 1
+            self._cache_dirty = False
+            timer, self._save_timer = self._save_timer, None
             while True:
                 try:
                     self._queue.get_nowait()
+                    self._queue.task_done()
                 except queue.Empty:
                     break
+        if timer is not None:
+            timer.cancel()
         try:
             self._cache_path.unlink(missing_ok=True)
         except OSError:
             pass
 
     def translate(self, text: str, target_lang: str) -> str:
-        if not text:
-            return text
+        return self.translate_many([text], target_lang)[0]
+
+    def translate_many(self, values: Iterable[str], target_lang: str) -> list[str]:
+        texts = list(values)
         target = (target_lang or "").strip().lower()
         if not target or target in {"en", "english"}:
-            return text
+            return texts
         self._load_cache()
+        catalog = self._catalog_for(target)
+        results: list[str] = []
+        misses: list[tuple[str, str]] = []
         with self._lock:
             bucket = self._cache.setdefault(target, {})
-            cached = bucket.get(text)
-        if cached:
-            return cached
-        self._enqueue_translation(text, target)
-        return text
+            for text in texts:
+                if not text:
+                    results.append(text)
+                    continue
+                translated = catalog.get(text) if catalog is not None else None
+                if not translated:
+                    translated = bucket.get(text)
+                if translated:
+                    results.append(translated)
+                    continue
+                results.append(text)
+                key = (target, text)
+                if key not in self._pending:
+                    self._pending.add(key)
+                    misses.append(key)
+        if misses:
+            self._start_worker()
+            for key in misses:
+                self._queue.put(key)
+        return results
 
-    def translate_many(self, values: Iterable[str], target_lang: str) -> list[str]:
-        return [self.translate(value, target_lang) for value in values]
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """Write the cache now if it has unsaved translations."""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty, self._cache_dirty = self._cache_dirty, False
+            payload = {lang: dict(mapping) for lang, mapping in self._cache.items() if mapping}
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        if dirty:
+            self._write_cache(payload)
+
+    def _catalog_for(self, target_lang: str) -> TranslationCatalog | None:
+        if self._catalog_dir is None:
+            return None
+        with self._lock:
+            if target_lang in self._catalogs:
+                return self._catalogs[target_lang]
+        catalog = None
+        path = self._catalog_dir / f"{target_lang}.mo"
+        if path.is_file():
+            try:
+                catalog = TranslationCatalog(path)
+            except Exception:
+                catalog = None
+        with self._lock:
+            return self._catalogs.setdefault(target_lang, catalog)
 
     def _load_cache(self) -> None:
         with self._lock:
@@ -100,21 +323,34 @@ class AppTranslator:
                                 str(src): str(dst) for src, dst in mapping.items() if isinstance(src, str)
                             }
                     with self._lock:
+                        for lang, mapping in normalized.items():
+                            # Keep anything translated while the file was being read.
+                            mapping.update(self._cache.get(lang, {}))
                         self._cache = normalized
-        except Exception:
-            with self._lock:
-                self._cache = {}
-
-    def _save_cache(self) -> None:
-        try:
-            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with self._lock:
-                payload = dict(self._cache)
-            with open(self._cache_path, "w", encoding="utf-8") as handle:
-                json.dump(payload, handle, indent=2, ensure_ascii=False)
         except Exception:
             pass
 
+    def _schedule_save(self) -> None:
+        with self._lock:
+            self._cache_dirty = True
+            if self._save_timer is not None:
+                return
+            timer = threading.Timer(self._save_delay_sec, self.flush)
+            timer.daemon = True
+            self._save_timer = timer
+        timer.start()
+
+    def _write_cache(self, payload: dict[str, dict[str, str]]) -> None:
+        with self._save_lock:
+            try:
+                self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self._cache_path.with_name(self._cache_path.name + ".tmp")
+                with open(temp_path, "w", encoding="utf-8") as handle:
+                    json.dump(payload, handle, ensure_ascii=False)
+                os.replace(temp_path, self._cache_path)
+            except Exception:
+                pass
+
     def _start_worker(self) -> None:
         with self._lock:
             if self._worker_started:
@@ -123,39 +359,50 @@ class AppTranslator:
         thread = threading.Thread(target=self._worker_loop, name="app-translator-worker", daemon=True)
         thread.start()
 
-    def _enqueue_translation(self, text: str, target_lang: str) -> None:
-        key = (target_lang, text)
-        with self._lock:
-            if key in self._pending:
-                return
-            self._pending.add(key)
-        self._start_worker()
-        self._queue.put(key)
+    def _next_batch(self) -> list[tuple[str, str]]:
+        batch = [self._queue.get()]
+        # Let a burst of lookups (a whole menu being retranslated) land in one request.
+        time.sleep(BATCH_WINDOW_SEC)
+        chars = len(batch[0][1])
+        while len(batch) < MAX_BATCH_SIZE and chars < MAX_BATCH_CHARS:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            chars += len(item[1])
+        return batch
 
     def _worker_loop(self) -> None:
         while True:
-            target_lang, text = self._queue.get()
-            try:
-                translated = self._translate_remote(text, target_lang)
-                if translated and translated != text:
-                    with self._lock:
-                        bucket = self._cache.setdefault(target_lang, {})
-                        bucket[text] = translated
-                    self._save_cache()
-            except Exception:
-                pass
-            finally:
+            batch = self._next_batch()
+            with self._lock:
+                generation = self._generation
+            by_lang: dict[str, list[str]] = {}
+            for target_lang, text in batch:
+                by_lang.setdefault(target_lang, []).append(text)
+            changed = False
+            for target_lang, texts in by_lang.items():
+                try:
+                    translated = self._translate_batch(texts, target_lang)
+                except Exception:
+                    translated = []
                 with self._lock:
-                    self._pending.discard((target_lang, text))
+                    if generation != self._generation:
+                        continue
+                    bucket = self._cache.setdefault(target_lang, {})
+                    for text, value in zip(texts, translated):
+                        if value and value != text:
+                            bucket[text] = value
+                            changed = True
+                    for text in texts:
+                        self._pending.discard((target_lang, text))
+            for _ in batch:
                 self._queue.task_done()
+            if changed:
+                self._schedule_save()
 
-    def _translate_remote(self, text: str, target_lang: str) -> str:
-        try:
-            if self._translator is None:
-                from googletrans import Translator  # type: ignore
-
-                self._translator = Translator()
-            result = self._translator.translate(text, dest=target_lang)
-            return str(getattr(result, "text", "")) or text
-        except Exception:
-            return text
+    def _translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
+        if self._backend is None:
+            self._backend = make_translation_backend()
+        return self._backend.translate_batch(texts, target_lang)
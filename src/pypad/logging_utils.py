@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
 import threading
-from datetime import datetime
+import time
 from collections import deque
+from pathlib import Path
 
 LOG_LEVEL_OPTIONS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
 DEFAULT_LOG_LEVEL = "INFO"
@@ -12,6 +17,17 @@ _CONSOLE_BUFFER_MAX = 12000
 _console_lines: deque[str] = deque(maxlen=_CONSOLE_BUFFER_MAX)
 _console_lock = threading.Lock()
 _console_capture_installed = False
+# Lines kept for the Debug Logs view.
+DEBUG_LOG_LIMIT = 5000
+LOG_FILE_MAX_BYTES = 2 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+LOG_FILE_BATCH_SEC = 0.25
+# (epoch second, "HH:MM:SS", "M/D/YYYY") of the last formatted timestamp.
+_timestamp_cache: tuple[int, str, str] = (-1, "", "")
+_log_file_writer: "LogFileWriter | None" = None
+_log_file_writer_lock = threading.Lock()
+_console_listener: logging.handlers.QueueListener | None = None
+_console_handler: logging.Handler | None = None
 
 
 class _NullStream:
@@ -51,7 +67,7 @@ class _ConsoleCaptureTee:
     def __init__(self, stream, *, label: str) -> None:
         self._stream = stream
         self._label = label
-        self._partial = ""
+        self._partial: list[str] = []
         self._pypad_console_capture_wrapper = True
 
     def write(self, data) -> int:
@@ -64,16 +80,21 @@ class _ConsoleCaptureTee:
                 stream.write(text)
             except Exception:
                 pass
-        self._partial += text
-        while True:
-            nl_idx = self._partial.find("\n")
-            if nl_idx < 0:
-                break
-            line = self._partial[:nl_idx]
-            self._partial = self._partial[nl_idx + 1 :]
+        size = len(text)
+        if "\n" not in text:
+            self._partial.append(text)
+            return size
+        if self._partial:
+            self._partial.append(text)
+            text = "".join(self._partial)
+            self._partial.clear()
+        *lines, rest = text.split("\n")
+        if rest:
+            self._partial.append(rest)
+        for line in lines:
             if line.strip():
                 _append_console_line(f"[{self._label}] {line.rstrip(chr(13))}")
-        return len(text)
+        return size
 
     def flush(self) -> None:
         try:
@@ -81,9 +102,10 @@ class _ConsoleCaptureTee:
             if stream is not None:
                 stream.flush()
         finally:
-            if self._partial.strip():
-                _append_console_line(f"[{self._label}] {self._partial.rstrip(chr(13))}")
-            self._partial = ""
+            partial = "".join(self._partial)
+            self._partial.clear()
+            if partial.strip():
+                _append_console_line(f"[{self._label}] {partial.rstrip(chr(13))}")
 
     def __getattr__(self, name: str):
         stream = self._stream
@@ -103,11 +125,152 @@ class _CapturingStreamHandler(logging.StreamHandler):
         super().emit(record)
 
 
+def format_log_timestamp(created: float | None = None) -> str:
+    """``HH:MM:SS.mmm M/D/YYYY`` in local time; the per-second part is formatted once."""
+    global _timestamp_cache
+    if created is None:
+        created = time.time()
+    second = int(created)
+    cached = _timestamp_cache
+    if cached[0] != second:
+        local = time.localtime(second)
+        cached = (
+            second,
+            f"{local.tm_hour:02d}:{local.tm_min:02d}:{local.tm_sec:02d}",
+            f"{local.tm_mon}/{local.tm_mday}/{local.tm_year}",
+        )
+        _timestamp_cache = cached
+    millis = min(999, int((created - second) * 1000))
+    return f"{cached[1]}.{millis:03d} {cached[2]}"
+
+
+def format_log_line(level_title: str, message: str, created: float | None = None) -> str:
+    return f"[{level_title}] [{format_log_timestamp(created)}] {message}"
+
+
+class LogFileWriter:
+    """Appends lines to log files on a background thread, in batches, rotating by size.
+
+    ``write`` only enqueues, so callers on the UI thread never touch the disk.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = LOG_FILE_MAX_BYTES,
+        backup_count: int = LOG_FILE_BACKUP_COUNT,
+        batch_sec: float = LOG_FILE_BATCH_SEC,
+    ) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.backup_count = max(0, int(backup_count))
+        self.batch_sec = max(0.0, float(batch_sec))
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def write(self, path: Path | str, line: str) -> None:
+        self._queue.put((str(path), line))
+        if self._thread is None:
+            self._start()
+
+    def write_lines(self, path: Path | str, lines: list[str]) -> None:
+        for line in lines:
+            self._queue.put((str(path), line))
+        if self._thread is None:
+            self._start()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Block until everything queued so far is on disk; False on timeout."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="pypad-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            pending: dict[str, list[str]] = {}
+            waiters: list[threading.Event] = []
+            stop = False
+            item = self._queue.get()
+            deadline = time.monotonic() + self.batch_sec
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                path, line = item
+                pending.setdefault(path, []).append(line)
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            for path, lines in pending.items():
+                self._write_batch(Path(path), lines)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write_batch(self, path: Path, lines: list[str]) -> None:
+        text = "".join(f"{line.rstrip(chr(10))}\n" for line in lines)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._rotate_if_needed(path, len(text.encode("utf-8", errors="replace")))
+            with open(path, "a", encoding="utf-8", errors="replace") as handle:
+                handle.write(text)
+        except Exception:
+            pass
+
+    def _rotate_if_needed(self, path: Path, incoming: int) -> None:
+        if self.max_bytes <= 0:
+            return
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        if self.backup_count <= 0:
+            path.unlink(missing_ok=True)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{index}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{index + 1}"))
+        os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def get_log_file_writer() -> LogFileWriter:
+    """Process-wide writer, flushed at interpreter exit."""
+    global _log_file_writer
+    with _log_file_writer_lock:
+        if _log_file_writer is None:
+            _log_file_writer = LogFileWriter()
+            atexit.register(_log_file_writer.close)
+        return _log_file_writer
+
+
 class _PypadLogFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
-        timestamp = datetime.fromtimestamp(record.created)
-        time_text = timestamp.strftime("%H:%M:%S.%f")[:-3]
-        date_text = f"{timestamp.month}/{timestamp.day}/{timestamp.year}"
         level_text = str(record.levelname or "INFO").capitalize()
         message = record.getMessage()
         name = str(record.name or "").strip()
@@ -117,7 +280,7 @@ class _PypadLogFormatter(logging.Formatter):
             exc_text = self.formatException(record.exc_info)
             if exc_text:
                 message = f"{message}\n{exc_text}"
-        return f"[{level_text}] [{time_text} {date_text}] {message}"
+        return format_log_line(level_text, message, record.created)
 
 
 def normalize_log_level_name(value: object, default: str = DEFAULT_LOG_LEVEL) -> str:
@@ -139,16 +302,62 @@ def configure_app_logging(level: object = DEFAULT_LOG_LEVEL) -> str:
             handler = existing
             break
     if handler is None:
+        global _console_listener, _console_handler
         base_stream = sys.__stdout__ or sys.stdout or sys.__stderr__ or sys.stderr or _NullStream()
-        handler = _CapturingStreamHandler(base_stream)
+        console = _CapturingStreamHandler(base_stream)
+        console.setFormatter(_PypadLogFormatter())
+        # Records are formatted and written to the console by a listener thread.
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler = logging.handlers.QueueHandler(records)
         handler._pypad_console_handler = True  # type: ignore[attr-defined]
-        handler.setFormatter(_PypadLogFormatter())
+        _console_handler = console
+        _console_listener = logging.handlers.QueueListener(records, console)
+        _console_listener.start()
+        atexit.register(shutdown_app_logging)
         root_logger.addHandler(handler)
     root_logger.setLevel(get_level_number(level_name))
     logging.captureWarnings(True)
     return level_name
 
 
+def flush_app_logging() -> None:
+    """Write out queued console records and log-file lines now, e.g. from a crash hook.
+
+    Pending records are handled on the calling thread, so this works even when the
+    listener thread is stuck or about to be killed.
+    """
+    listener = _console_listener
+    if listener is not None:
+        while True:
+            try:
+                record = listener.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is listener._sentinel:
+                listener.queue.put_nowait(record)  # a concurrent stop() still needs it
+                break
+            listener.handle(record)
+    if _log_file_writer is not None:
+        _log_file_writer.flush()
+
+
+def shutdown_app_logging() -> None:
+    """Stop the console listener once and log synchronously from then on; runs at quit."""
+    global _console_listener
+    listener, _console_listener = _console_listener, None
+    if listener is not None:
+        listener.stop()
+        root_logger = logging.getLogger()
+        for existing in list(root_logger.handlers):
+            if getattr(existing, "_pypad_console_handler", False):
+                root_logger.removeHandler(existing)
+        if _console_handler is not None:
+            _console_handler._pypad_console_handler = True  # type: ignore[attr-defined]
+            root_logger.addHandler(_console_handler)
+    if _log_file_writer is not None:
+        _log_file_writer.close()
+
+
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
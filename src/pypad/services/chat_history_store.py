@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from pathlib import Path
+
+from pypad.logging_utils import get_logger
+
+_LOGGER = get_logger(__name__)
+
+STORE_FORMAT_VERSION = 1
+MAX_STORED_SESSIONS = 200
+MAX_SESSION_MESSAGES = 200
+# Compact a session log once it holds this many more records than live messages.
+COMPACT_SLACK_RECORDS = 256
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]")
+
+Message = tuple[str, str]
+
+
+def _to_messages(rows: object, *, cap: int) -> list[Message]:
+    out: list[Message] = []
+    if not isinstance(rows, list):
+        return out
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        role = str(row.get("role", "")).strip().lower()
+        if role in {"user", "assistant"}:
+            out.append((role, str(row.get("text", ""))))
+    return out[-cap:]
+
+
+def _appended_tail(known: list[Message], new: list[Message], cap: int) -> list[Message] | None:
+    """Return the messages appended to ``known`` to produce ``new`` (both capped to
+    ``cap``), or None when ``new`` is not an append-only continuation."""
+    for added in range(0, len(new) + 1):
+        head = new[: len(new) - added]
+        if len(head) > len(known):
+            continue
+        if len(head) < len(known) and len(new) < cap:
+            return None
+        if not head and known:
+            # Nothing kept from ``known``: a replacement, not an append.
+            return None
+        if known[len(known) - len(head):] == head:
+            return new[len(new) - added:]
+    return None
+
+
+class ChatHistoryStore:
+    """On-disk AI chat history: a small session index plus one message log per session.
+
+    ``index.json`` holds session metadata and the active session id, never message
+    bodies. Each session's messages live in ``<id>.jsonl`` as append-only records
+    (``add`` a message, ``extend`` the last one, ``reset`` to a full list) that are
+    replayed when the session is opened, so streaming a reply only appends to the tail
+    of the active session's log.
+    """
+
+    def __init__(self, root: Path, *, max_messages: int = MAX_SESSION_MESSAGES) -> None:
+        self.root = Path(root)
+        self.max_messages = max(1, int(max_messages))
+        self._lock = threading.Lock()
+        self._synced: dict[str, list[Message]] = {}
+        self._records: dict[str, int] = {}
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def session_path(self, session_id: str) -> Path:
+        return self.root / f"{_UNSAFE_NAME_RE.sub('_', str(session_id))}.jsonl"
+
+    def has_index(self) -> bool:
+        return self.index_path.exists()
+
+    def load_index(self) -> tuple[list[dict[str, object]], str]:
+        """Return ``(sessions, active_session_id)``; sessions carry no ``messages``."""
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return [], ""
+        except Exception:
+            _LOGGER.exception("Failed to read chat history index %s", self.index_path)
+            return [], ""
+        if not isinstance(payload, dict):
+            return [], ""
+        rows = payload.get("sessions", [])
+        sessions = [dict(row) for row in rows if isinstance(row, dict)] if isinstance(rows, list) else []
+        for session in sessions:
+            session.pop("messages", None)
+        return sessions, str(payload.get("active_session_id", "") or "")
+
+    def save_index(self, sessions: list[dict[str, object]], active_session_id: str) -> None:
+        rows: list[dict[str, object]] = []
+        for session in sessions[-MAX_STORED_SESSIONS:]:
+            row = {key: value for key, value in session.items() if key != "messages"}
+            messages = session.get("messages")
+            if isinstance(messages, list):
+                row["message_count"] = len(messages)
+            rows.append(row)
+        payload = {
+            "version": STORE_FORMAT_VERSION,
+            "active_session_id": str(active_session_id or ""),
+            "sessions": rows,
+        }
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.index_path)
+            self._prune_locked({str(row.get("id", "")) for row in rows})
+
+    def load_messages(self, session_id: str) -> list[dict[str, str]]:
+        sid = str(session_id)
+        with self._lock:
+            messages = self._synced.get(sid)
+            if messages is None:
+                messages = self._replay_locked(sid)
+        return [{"role": role, "text": text} for role, text in messages]
+
+    def sync_messages(self, session_id: str, rows: list[dict[str, str]]) -> None:
+        """Make the stored log for ``session_id`` match ``rows``, writing only the delta."""
+        sid = str(session_id)
+        if not sid:
+            return
+        new = _to_messages(rows, cap=self.max_messages)
+        with self._lock:
+            known = self._synced.get(sid)
+            if known is None:
+                known = self._replay_locked(sid)
+            if new == known:
+                return
+            records: list[dict[str, object]] = []
+            tail = _appended_tail(known, new, self.max_messages)
+            if tail is not None:
+                records = [{"op": "add", "role": role, "text": text} for role, text in tail]
+            elif (
+                len(new) == len(known)
+                and new[:-1] == known[:-1]
+                and new[-1][0] == known[-1][0]
+                and new[-1][1].startswith(known[-1][1])
+            ):
+                records = [{"op": "extend", "text": new[-1][1][len(known[-1][1]):]}]
+            self._synced[sid] = new
+            if not records or self._records.get(sid, 0) + len(records) > len(new) + COMPACT_SLACK_RECORDS:
+                self._rewrite_locked(sid, new)
+            else:
+                self._append_locked(sid, records)
+
+    def delete_session(self, session_id: str) -> None:
+        sid = str(session_id)
+        with self._lock:
+            self._synced.pop(sid, None)
+            self._records.pop(sid, None)
+            try:
+                self.session_path(sid).unlink()
+            except FileNotFoundError:
+                pass
+            except Exception:
+                _LOGGER.exception("Failed to delete chat history for session=%s", sid)
+
+    def _replay_locked(self, sid: str) -> list[Message]:
+        messages: list[Message] = []
+        records = 0
+        try:
+            with self.session_path(sid).open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn write at the tail after a crash
+                    if not isinstance(record, dict):
+                        continue
+                    records += 1
+                    op = record.get("op")
+                    if op == "add":
+                        role = str(record.get("role", "")).strip().lower()
+                        if role in {"user", "assistant"}:
+                            messages.append((role, str(record.get("text", ""))))
+                    elif op == "extend" and messages:
+                        role, text = messages[-1]
+                        messages[-1] = (role, text + str(record.get("text", "")))
+                    elif op == "reset":
+                        messages = _to_messages(record.get("messages", []), cap=self.max_messages)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            _LOGGER.exception("Failed to read chat history for session=%s", sid)
+        messages = messages[-self.max_messages:]
+        self._synced[sid] = messages
+        self._records[sid] = records
+        return messages
+
+    def _append_locked(self, sid: str, records: list[dict[str, object]]) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.session_path(sid).open("a", encoding="utf-8") as handle:
+                for record in records:
+                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._records[sid] = self._records.get(sid, 0) + len(records)
+        except Exception:
+            _LOGGER.exception("Failed to append chat history for session=%s", sid)
+
+    def _rewrite_locked(self, sid: str, messages: list[Message]) -> None:
+        record = {"op": "reset", "messages": [{"role": role, "text": text} for role, text in messages]}
+        path = self.session_path(sid)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".jsonl.tmp")
+            tmp.write_text(json.dumps(record, ensure_ascii=False) + "\n", encoding="utf-8")
+            tmp.replace(path)
+            self._records[sid] = 1
+        except Exception:
+            _LOGGER.exception("Failed to rewrite chat history for session=%s", sid)
+
+    def _prune_locked(self, keep_ids: set[str]) -> None:
+        keep = {self.session_path(sid).name for sid in keep_ids if sid}
+        try:
+            paths = list(self.root.glob("*.jsonl"))
+        except Exception:
+            return
+        for path in paths:
+            if path.name in keep:
+                continue
+            try:
+                path.unlink()
+            except Exception:
+                _LOGGER.debug("Failed to prune chat history file %s", path)
+        for sid in [sid for sid in self._synced if self.session_path(sid).name not in keep]:
+            self._synced.pop(sid, None)
+            self._records.pop(sid, None)
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+
+INDEX_FORMAT_VERSION = 1
+MAX_INDEXED_FILE_BYTES = 1_000_000
+
+_LANGUAGE_BY_SUFFIX = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".json": "json",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".mdown": "markdown",
+}
+
+_PYTHON_PATTERNS = [
+    (re.compile(r"^\s*(?:async\s+)?def\s+([A-Za-z_][A-Za-z0-9_]*)\b"), "function"),
+    (re.compile(r"^\s*class\s+([A-Za-z_][A-Za-z0-9_]*)\b"), "class"),
+    (re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(?::[^=]+)?=(?!=)"), "variable"),
+]
+_SCRIPT_PATTERNS = [
+    (re.compile(r"^\s*(?:export\s+(?:default\s+)?)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][A-Za-z0-9_$]*)\b"), "function"),
+    (re.compile(r"^\s*(?:export\s+(?:default\s+)?)?class\s+([A-Za-z_$][A-Za-z0-9_$]*)\b"), "class"),
+    (re.compile(r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][A-Za-z0-9_$]*)\b"), "variable"),
+    (re.compile(r"^\s*(?:export\s+)?(?:interface|type|enum)\s+([A-Za-z_$][A-Za-z0-9_$]*)\b"), "type"),
+]
+_PLAIN_PATTERNS = [
+    (re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=(?!=)"), "variable"),
+]
+_JSON_KEY_PATTERN = re.compile(r'^\s*"([^"\\]+)"\s*:')
+_MARKDOWN_HEADING_PATTERN = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+
+
+@dataclass(frozen=True)
+class DefinitionEntry:
+    name: str
+    path: str
+    line: int  # 0-based
+    kind: str
+    language: str
+
+
+def language_for_path(path: str) -> str:
+    return _LANGUAGE_BY_SUFFIX.get(Path(path).suffix.lower(), "plain")
+
+
+def extract_definitions(language: str, text: str) -> list[tuple[str, int, str]]:
+    """Return ``(name, line, kind)`` rows for the definitions found in ``text``."""
+    lang = str(language or "plain").lower().strip()
+    rows: list[tuple[str, int, str]] = []
+    if lang == "python":
+        patterns = _PYTHON_PATTERNS
+    elif lang in {"javascript", "typescript"}:
+        patterns = _SCRIPT_PATTERNS
+    elif lang == "json":
+        for idx, ln in enumerate(text.splitlines()):
+            m = _JSON_KEY_PATTERN.match(ln)
+            if m:
+                rows.append((m.group(1), idx, "key"))
+        return rows
+    elif lang == "markdown":
+        for idx, ln in enumerate(text.splitlines()):
+            m = _MARKDOWN_HEADING_PATTERN.match(ln)
+            if m:
+                rows.append((m.group(1).strip(), idx, "heading"))
+        return rows
+    else:
+        patterns = _PLAIN_PATTERNS
+    for idx, ln in enumerate(text.splitlines()):
+        for pattern, kind in patterns:
+            m = pattern.match(ln)
+            if m:
+                rows.append((m.group(1), idx, kind))
+                break
+    return rows
+
+
+def _proximity_key(candidate: str, current_file: str) -> tuple[int, int, int]:
+    if not current_file:
+        return (1, 0, len(candidate))
+    cand = os.path.normcase(os.path.abspath(candidate))
+    cur = os.path.normcase(os.path.abspath(current_file))
+    if cand == cur:
+        return (0, 0, 0)
+    cand_parts = Path(cand).parent.parts
+    cur_parts = Path(cur).parent.parts
+    shared = 0
+    for a, b in zip(cand_parts, cur_parts):
+        if a != b:
+            break
+        shared += 1
+    # Directory hops between the two files; siblings are 0, cousins 2, ...
+    distance = (len(cand_parts) - shared) + (len(cur_parts) - shared)
+    return (1, distance, len(cand))
+
+
+class DefinitionIndex:
+    """ctags-like identifier -> (file, line, kind) index persisted per workspace root.
+
+    Files are fingerprinted by ``(size, mtime_ns)`` so a refresh only reparses files
+    that actually changed on disk.
+    """
+
+    def __init__(self, cache_path: Path, root: str = "") -> None:
+        self.cache_path = cache_path
+        self.root = str(root or "")
+        self._lock = threading.Lock()
+        self._files: dict[str, dict[str, object]] = {}
+        self._symbols: dict[str, list[DefinitionEntry]] = {}
+        self._dirty = False
+        # Set once a full refresh has completed (now or in the loaded cache); until then
+        # lookups cover only part of the workspace.
+        self.built = False
+
+    @classmethod
+    def for_workspace(cls, cache_dir: Path, root: str) -> "DefinitionIndex":
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode("utf-8")).hexdigest()[:16]
+        return cls(cache_dir / f"definitions_{key}.json", root=root)
+
+    @property
+    def file_count(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    @property
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._files
+
+    def load(self) -> None:
+        if not self.cache_path.exists():
+            return
+        try:
+            payload = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(payload, dict) or int(payload.get("version", 0) or 0) != INDEX_FORMAT_VERSION:
+            return
+        files = payload.get("files", {})
+        if not isinstance(files, dict):
+            return
+        with self._lock:
+            self._files = {}
+            self._symbols = {}
+            for path, row in files.items():
+                if not isinstance(row, dict):
+                    continue
+                entries = row.get("entries", [])
+                if not isinstance(entries, list):
+                    continue
+                cleaned: list[list[object]] = []
+                for item in entries:
+                    if isinstance(item, list) and len(item) == 3:
+                        cleaned.append([str(item[0]), int(item[1]), str(item[2])])
+                self._store_locked(
+                    str(path),
+                    size=int(row.get("size", -1)),
+                    mtime_ns=int(row.get("mtime_ns", -1)),
+                    language=str(row.get("language", "plain")),
+                    rows=cleaned,
+                )
+            self._dirty = False
+            self.built = bool(payload.get("built", False))
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "version": INDEX_FORMAT_VERSION,
+                "root": self.root,
+                "built": self.built,
+                "files": dict(self._files),
+            }
+            self._dirty = False
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.cache_path)
+
+    def _drop_locked(self, path: str) -> None:
+        row = self._files.pop(path, None)
+        if row is None:
+            return
+        for name, _line, _kind in row.get("entries", []):  # type: ignore[union-attr]
+            bucket = self._symbols.get(name)
+            if not bucket:
+                continue
+            bucket[:] = [entry for entry in bucket if entry.path != path]
+            if not bucket:
+                self._symbols.pop(name, None)
+
+    def _store_locked(self, path: str, *, size: int, mtime_ns: int, language: str, rows: list) -> None:
+        self._drop_locked(path)
+        self._files[path] = {"size": size, "mtime_ns": mtime_ns, "language": language, "entries": rows}
+        for name, line, kind in rows:
+            self._symbols.setdefault(name, []).append(
+                DefinitionEntry(name=name, path=path, line=int(line), kind=kind, language=language)
+            )
+        self._dirty = True
+
+    def update_file(self, path: str) -> bool:
+        """Reindex ``path`` if its fingerprint changed. Returns True when reparsed."""
+        path = str(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.remove_file(path)
+            return False
+        with self._lock:
+            row = self._files.get(path)
+            if row is not None and row.get("size") == st.st_size and row.get("mtime_ns") == st.st_mtime_ns:
+                return False
+        language = language_for_path(path)
+        rows: list[tuple[str, int, str]] = []
+        if st.st_size <= MAX_INDEXED_FILE_BYTES:
+            try:
+                text = Path(path).read_text(encoding="utf-8", errors="replace")
+            except Exception:
+                text = ""
+            rows = extract_definitions(language, text)
+        with self._lock:
+            self._store_locked(
+                path,
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                language=language,
+                rows=[list(r) for r in rows],
+            )
+        return True
+
+    def update_text(self, path: str, text: str) -> None:
+        """Reindex ``path`` from an in-memory copy, e.g. right after a save."""
+        path = str(path)
+        try:
+            st = os.stat(path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size, mtime_ns = -1, -1
+        language = language_for_path(path)
+        rows = extract_definitions(language, text) if len(text) <= MAX_INDEXED_FILE_BYTES else []
+        with self._lock:
+            self._store_locked(path, size=size, mtime_ns=mtime_ns, language=language, rows=[list(r) for r in rows])
+
+    def remove_file(self, path: str) -> None:
+        with self._lock:
+            if path in self._files:
+                self._drop_locked(path)
+                self._dirty = True
+
+    def refresh(self, paths: list[str]) -> int:
+        """Bring the index in line with ``paths``; returns the number of reparsed files."""
+        wanted = {str(p) for p in paths}
+        with self._lock:
+            stale = [p for p in self._files if p not in wanted]
+            for path in stale:
+                self._drop_locked(path)
+            if stale:
+                self._dirty = True
+        changed = 0
+        for path in paths:
+            if self.update_file(str(path)):
+                changed += 1
+        with self._lock:
+            self._dirty = self._dirty or not self.built
+            self.built = True
+        return changed
+
+    def lookup(self, name: str, *, current_file: str = "", language: str = "") -> list[DefinitionEntry]:
+        """Return definitions of ``name`` ranked by language match and proximity to ``current_file``."""
+        with self._lock:
+            candidates = list(self._symbols.get(str(name), []))
+        if not candidates:
+            return []
+        lang = str(language or "").lower()
+        # The editor reports ``.ts`` buffers as javascript, so treat the two as one family.
+        family = {"javascript", "typescript"} if lang in {"javascript", "typescript"} else {lang}
+        kind_rank = {"class": 0, "function": 0, "type": 0, "variable": 1}
+        candidates.sort(
+            key=lambda e: (
+                0 if e.language in family else 1,
+                _proximity_key(e.path, current_file),
+                kind_rank.get(e.kind, 2),
+                e.line,
+            )
+        )
+        return candidates
+
+
+def find_definition_in_files(name: str, paths: list[str], *, skip: set[str] | None = None) -> tuple[str, int] | None:
+    """First definition of ``name`` in ``paths`` read straight from disk; for use off the UI thread.
+
+    Serves lookups until the index has been built once. ``skip`` holds resolved paths
+    whose text was already searched in memory.
+    """
+    skip = skip or set()
+    for path in paths:
+        path = str(path)
+        if skip and str(Path(path).resolve()) in skip:
+            continue
+        try:
+            if os.stat(path).st_size > MAX_INDEXED_FILE_BYTES:
+                continue
+            text = Path(path).read_text(encoding="utf-8", errors="replace")
+        except Exception:
+            continue
+        for found, line, _kind in extract_definitions(language_for_path(path), text):
+            if found == name:
+                return path, line
+    return None
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+# ``path:line`` or ``path:line:column``, as printed by compilers and grep -n.
+_POSITION_SUFFIX = re.compile(r"^(?P<path>.+?):(?P<line>\d+)(?::(?P<column>\d+))?:?$")
+
+
+@dataclass(frozen=True)
+class OpenTarget:
+    """A file to open; ``line``/``column`` are 1-based, 0 when not given."""
+
+    path: str
+    line: int = 0
+    column: int = 0
+
+    def to_payload(self) -> dict[str, Any]:
+        return {"path": self.path, "line": self.line, "column": self.column}
+
+    @classmethod
+    def from_payload(cls, payload: Any, cwd: str = "") -> "OpenTarget | None":
+        if not isinstance(payload, dict) or not payload.get("path"):
+            return None
+        try:
+            line = max(0, int(payload.get("line", 0) or 0))
+            column = max(0, int(payload.get("column", 0) or 0))
+        except (TypeError, ValueError):
+            line = column = 0
+        return cls(resolve_path(str(payload["path"]), cwd), line, column)
+
+
+def resolve_path(arg: str, cwd: str = "") -> str:
+    """Absolute form of ``arg``, relative to ``cwd`` (default: this process's cwd)."""
+    candidate = Path(arg).expanduser()
+    if not candidate.is_absolute():
+        candidate = Path(cwd or Path.cwd()) / candidate
+    try:
+        return str(candidate.resolve())
+    except Exception:
+        return str(candidate)
+
+
+def parse_open_target(arg: str, cwd: str = "") -> OpenTarget | None:
+    """Resolve one command-line argument; None for options and paths that do not exist.
+
+    An existing path always wins, so files whose names end in ``:<digits>`` still open.
+    """
+    if not arg:
+        return None
+    path = resolve_path(arg, cwd)
+    if Path(path).exists():
+        return OpenTarget(path)
+    if arg.startswith("-"):
+        return None
+    match = _POSITION_SUFFIX.match(arg)
+    if match is None:
+        return None
+    path = resolve_path(match.group("path"), cwd)
+    if not Path(path).is_file():
+        return None
+    return OpenTarget(path, int(match.group("line")), int(match.group("column") or 0))
+
+
+def collect_open_targets(args: Iterable[str], cwd: str = "") -> tuple[list[OpenTarget], list[str]]:
+    """Split arguments into file targets and folders, dropping duplicates and unknowns."""
+    seen: set[str] = set()
+    files: list[OpenTarget] = []
+    folders: list[str] = []
+    for arg in args:
+        target = parse_open_target(arg, cwd)
+        if target is None or target.path in seen:
+            continue
+        seen.add(target.path)
+        if Path(target.path).is_dir():
+            folders.append(target.path)
+        else:
+            files.append(target)
+    return files, folders
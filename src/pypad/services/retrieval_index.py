@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+
+WINDOW_LINES = 12
+WINDOW_STRIDE = 6
+MAX_INDEXED_FILE_BYTES = 1_000_000
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+INDEXABLE_SUFFIXES = frozenset(
+    {
+        ".py",
+        ".md",
+        ".markdown",
+        ".mdown",
+        ".txt",
+        ".json",
+        ".yaml",
+        ".yml",
+        ".toml",
+        ".ini",
+        ".js",
+        ".ts",
+        ".html",
+        ".css",
+        ".xml",
+        ".csv",
+        ".log",
+    }
+)
+
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_STOPWORDS = frozenset(
+    {
+        "the", "and", "for", "are", "but", "not", "you", "all", "any", "can", "was", "our",
+        "this", "that", "with", "from", "have", "has", "had", "what", "when", "where", "which",
+        "who", "why", "how", "does", "did", "into", "its", "it's", "than", "then", "them",
+        "they", "there", "these", "those", "your", "about", "would", "should", "could",
+    }
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased search terms; identifiers also contribute their snake/camel-case parts."""
+    out: list[str] = []
+    for word in _WORD_RE.findall(text or ""):
+        lowered = word.lower()
+        if len(lowered) >= 2 and lowered not in _STOPWORDS:
+            out.append(lowered)
+        parts = [p for chunk in word.split("_") for p in _CAMEL_RE.findall(chunk)]
+        if len(parts) > 1:
+            out.extend(p.lower() for p in parts if len(p) >= 3 and p.lower() not in _STOPWORDS)
+    return out
+
+
+def line_windows(line_count: int, *, size: int = WINDOW_LINES, stride: int = WINDOW_STRIDE) -> list[tuple[int, int]]:
+    """0-based ``[start, end)`` line ranges of overlapping windows covering ``line_count`` lines."""
+    if line_count <= 0:
+        return []
+    windows: list[tuple[int, int]] = []
+    start = 0
+    while True:
+        end = min(line_count, start + size)
+        windows.append((start, end))
+        if end >= line_count:
+            return windows
+        start += stride
+
+
+@dataclass(frozen=True)
+class RetrievalHit:
+    path: str
+    start_line: int  # 0-based, inclusive
+    end_line: int  # 0-based, exclusive
+    score: float
+
+
+class RetrievalIndex:
+    """BM25 inverted index over overlapping line windows of workspace files.
+
+    Each file is tokenized once when its ``(size, mtime_ns)`` fingerprint changes;
+    refreshes only reparse changed files, so a query is a postings walk over the
+    query terms rather than a scan of the workspace.
+    """
+
+    def __init__(self, root: str = "") -> None:
+        self.root = str(root or "")
+        self._lock = threading.Lock()
+        # path -> (size, mtime_ns, window ids, terms) so a file can be dropped without a vocabulary scan.
+        self._files: dict[str, tuple[int, int, list[int], frozenset[str]]] = {}
+        self._windows: dict[int, tuple[str, int, int, int]] = {}  # id -> (path, start, end, length)
+        self._postings: dict[str, dict[int, int]] = {}
+        self._total_length = 0
+        self._next_id = 0
+        # Set once a full refresh has completed; until then results cover only part of the workspace.
+        self.built = False
+
+    @property
+    def file_count(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    @property
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._files
+
+    def _drop_locked(self, path: str) -> None:
+        row = self._files.pop(path, None)
+        if row is None:
+            return
+        for wid in row[2]:
+            _path, _start, _end, length = self._windows.pop(wid)
+            self._total_length -= length
+        for term in row[3]:
+            bucket = self._postings.get(term)
+            if bucket is None:
+                continue
+            for wid in row[2]:
+                bucket.pop(wid, None)
+            if not bucket:
+                del self._postings[term]
+
+    def _store_locked(self, path: str, *, size: int, mtime_ns: int, text: str) -> None:
+        self._drop_locked(path)
+        lines = text.splitlines()
+        line_tokens = [tokenize(line) for line in lines]
+        ids: list[int] = []
+        terms: set[str] = set()
+        for start, end in line_windows(len(lines)):
+            counts: Counter[str] = Counter()
+            for tokens in line_tokens[start:end]:
+                counts.update(tokens)
+            if not counts:
+                continue
+            wid = self._next_id
+            self._next_id += 1
+            length = sum(counts.values())
+            self._windows[wid] = (path, start, end, length)
+            self._total_length += length
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[wid] = tf
+            terms.update(counts)
+            ids.append(wid)
+        self._files[path] = (size, mtime_ns, ids, frozenset(terms))
+
+    def update_file(self, path: str) -> bool:
+        """Reindex ``path`` if its fingerprint changed. Returns True when reparsed."""
+        path = str(path)
+        if Path(path).suffix.lower() not in INDEXABLE_SUFFIXES:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.remove_file(path)
+            return False
+        with self._lock:
+            row = self._files.get(path)
+            if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                return False
+        text = ""
+        if st.st_size <= MAX_INDEXED_FILE_BYTES:
+            try:
+                text = Path(path).read_text(encoding="utf-8", errors="replace")
+            except Exception:
+                text = ""
+            if "\x00" in text:
+                text = ""
+        with self._lock:
+            self._store_locked(path, size=st.st_size, mtime_ns=st.st_mtime_ns, text=text)
+        return True
+
+    def update_text(self, path: str, text: str) -> None:
+        """Reindex ``path`` from an in-memory copy, e.g. right after a save."""
+        path = str(path)
+        if Path(path).suffix.lower() not in INDEXABLE_SUFFIXES:
+            return
+        try:
+            st = os.stat(path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size, mtime_ns = -1, -1
+        if len(text) > MAX_INDEXED_FILE_BYTES:
+            text = ""
+        with self._lock:
+            self._store_locked(path, size=size, mtime_ns=mtime_ns, text=text)
+
+    def remove_file(self, path: str) -> None:
+        with self._lock:
+            self._drop_locked(str(path))
+
+    def refresh(self, paths: list[str]) -> int:
+        """Bring the index in line with ``paths``; returns the number of reparsed files."""
+        wanted = {str(p) for p in paths}
+        with self._lock:
+            for path in [p for p in self._files if p not in wanted]:
+                self._drop_locked(path)
+        changed = 0
+        for path in paths:
+            if self.update_file(str(path)):
+                changed += 1
+        self.built = True
+        return changed
+
+    def search(self, query: str, *, limit: int = 40) -> list[RetrievalHit]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            count = len(self._windows)
+            if not count:
+                return []
+            avg_length = self._total_length / count
+            scores: dict[int, float] = {}
+            for term in terms:
+                bucket = self._postings.get(term)
+                if not bucket:
+                    continue
+                idf = math.log(1.0 + (count - len(bucket) + 0.5) / (len(bucket) + 0.5))
+                for wid, tf in bucket.items():
+                    length = self._windows[wid][3]
+                    norm = tf * (BM25_K1 + 1.0) / (tf + BM25_K1 * (1.0 - BM25_B + BM25_B * length / avg_length))
+                    scores[wid] = scores.get(wid, 0.0) + idf * norm
+            ranked = sorted(scores.items(), key=lambda row: (-row[1], row[0]))[: max(0, int(limit))]
+            return [
+                RetrievalHit(path=self._windows[wid][0], start_line=self._windows[wid][1], end_line=self._windows[wid][2], score=score)
+                for wid, score in ranked
+            ]
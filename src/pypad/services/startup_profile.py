@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import builtins
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+PROFILE_FORMAT_VERSION = 1
+DEFAULT_HISTORY_SIZE = 30
+# A stage regressed when it is this much slower than its median over earlier launches...
+REGRESSION_RATIO = 1.25
+# ...and at least this many milliseconds slower, so jitter in tiny stages is ignored.
+REGRESSION_MIN_MS = 20.0
+# Median needs a few launches before it means anything.
+MIN_BASELINE_RUNS = 3
+MAX_RECORDED_IMPORTS = 40
+
+
+class ImportTimer:
+    """Times first imports by wrapping ``builtins.__import__``.
+
+    Each module is recorded once, when an import statement first loads it; its time
+    includes the modules it imports in turn (like the cumulative column of
+    ``python -X importtime``). Already-loaded modules cost one dict lookup.
+    """
+
+    def __init__(self) -> None:
+        self.modules: dict[str, float] = {}
+        self._original: Any = None
+        self._wrapper: Any = None
+        self._active = False
+
+    def install(self) -> None:
+        if self._active:
+            return
+        self._original = builtins.__import__
+        self._active = True
+        original = self._original
+        modules = self.modules
+        loaded = sys.modules
+
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in loaded or not self._active:
+                return original(name, globals, locals, fromlist, level)
+            started = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                modules.setdefault(name, (time.perf_counter() - started) * 1000.0)
+
+        builtins.__import__ = _timed_import
+        self._wrapper = _timed_import
+
+    def uninstall(self) -> None:
+        self._active = False
+        # Someone may have wrapped us since; then leave theirs in place (we are inert now).
+        if builtins.__import__ is self._wrapper:
+            builtins.__import__ = self._original
+
+    def slowest(self, limit: int = MAX_RECORDED_IMPORTS) -> dict[str, float]:
+        rows = sorted(self.modules.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return {name: round(ms, 1) for name, ms in rows}
+
+
+class StartupRecorder:
+    """Collects one launch's startup profile, from process start to plugins loaded."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.marks: list[tuple[str, float]] = []
+        self.imports = ImportTimer()
+
+    def mark(self, name: str) -> float:
+        elapsed_ms = (time.perf_counter() - self.started) * 1000.0
+        self.marks.append((name, elapsed_ms))
+        return elapsed_ms
+
+    def build_profile(
+        self,
+        *,
+        stages: list[tuple[str, float]],
+        counts: dict[str, int],
+        plugins: dict[str, float],
+    ) -> dict[str, Any]:
+        self.imports.uninstall()
+        return {
+            "version": PROFILE_FORMAT_VERSION,
+            "started_at": self.started_at,
+            "process_marks": [[name, round(ms, 1)] for name, ms in self.marks],
+            "stages": [[name, round(float(ms), 1)] for name, ms in stages],
+            "imports": self.imports.slowest(),
+            "counts": dict(counts),
+            "plugins": {pid: round(ms, 1) for pid, ms in plugins.items()},
+        }
+
+
+_ACTIVE_RECORDER: StartupRecorder | None = None
+
+
+def begin_startup_recording() -> StartupRecorder:
+    """Start recording this launch; call as early as possible (before app imports)."""
+    global _ACTIVE_RECORDER
+    if _ACTIVE_RECORDER is None:
+        _ACTIVE_RECORDER = StartupRecorder()
+        _ACTIVE_RECORDER.imports.install()
+    return _ACTIVE_RECORDER
+
+
+def active_startup_recorder() -> StartupRecorder | None:
+    return _ACTIVE_RECORDER
+
+
+def stage_durations(profile: dict[str, Any]) -> dict[str, float]:
+    """Time spent in each stage: its offset minus the previous stage's offset."""
+    out: dict[str, float] = {}
+    previous = 0.0
+    for row in profile.get("stages", []):
+        try:
+            name, offset = str(row[0]), float(row[1])
+        except (TypeError, ValueError, IndexError):
+            continue
+        out[name] = max(0.0, offset - previous)
+        previous = offset
+    if out:
+        out["total"] = previous
+    return out
+
+
+class StartupHistory:
+    """Rolling list of startup profiles, newest last, persisted as one JSON file."""
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_HISTORY_SIZE) -> None:
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+
+    def load(self) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return []
+        if not isinstance(payload, dict) or int(payload.get("version", 0) or 0) != PROFILE_FORMAT_VERSION:
+            return []
+        runs = payload.get("runs", [])
+        return [run for run in runs if isinstance(run, dict)] if isinstance(runs, list) else []
+
+    def append(self, profile: dict[str, Any]) -> list[dict[str, Any]]:
+        runs = (self.load() + [profile])[-self.max_entries :]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"version": PROFILE_FORMAT_VERSION, "runs": runs}, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
+        return runs
+
+
+def find_regressions(
+    current: dict[str, Any],
+    baseline: list[dict[str, Any]],
+    *,
+    ratio: float = REGRESSION_RATIO,
+    min_ms: float = REGRESSION_MIN_MS,
+) -> list[tuple[str, float, float]]:
+    """``(stage, current_ms, median_ms)`` for stages clearly slower than their median."""
+    if len(baseline) < MIN_BASELINE_RUNS:
+        return []
+    history = [stage_durations(run) for run in baseline]
+    out: list[tuple[str, float, float]] = []
+    for name, ms in stage_durations(current).items():
+        samples = [durations[name] for durations in history if name in durations]
+        if len(samples) < MIN_BASELINE_RUNS:
+            continue
+        median = statistics.median(samples)
+        if ms - median >= min_ms and ms > median * ratio:
+            out.append((name, ms, median))
+    return out
+
+
+def build_startup_report(runs: list[dict[str, Any]]) -> str:
+    """Compare the newest launch in ``runs`` with the median of the ones before it."""
+    if not runs:
+        return "No startup profiles recorded yet."
+    current, baseline = runs[-1], runs[:-1]
+    durations = stage_durations(current)
+    history = [stage_durations(run) for run in baseline]
+    flagged = {name for name, _ms, _median in find_regressions(current, baseline)}
+    started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(float(current.get("started_at", 0) or 0)))
+    lines = [f"Startup profile of {started}, compared with the median of {len(baseline)} earlier launch(es)", ""]
+    lines.append(f"{'stage':<28}{'now ms':>10}{'median ms':>12}{'change':>10}")
+    for name, ms in durations.items():
+        samples = [d[name] for d in history if name in d]
+        if samples:
+            median = statistics.median(samples)
+            change = f"{ms - median:+.0f}"
+            median_text = f"{median:.0f}"
+        else:
+            change = median_text = "-"
+        marker = "  REGRESSED" if name in flagged else ""
+        lines.append(f"{name:<28}{ms:>10.0f}{median_text:>12}{change:>10}{marker}")
+    if len(baseline) < MIN_BASELINE_RUNS:
+        lines.append("")
+        lines.append(f"Regressions are flagged once {MIN_BASELINE_RUNS} earlier launches are recorded.")
+    marks = current.get("process_marks", [])
+    if marks:
+        lines.append("")
+        lines.append("Process: " + ", ".join(f"{name}={float(ms):.0f}ms" for name, ms in marks))
+    counts = current.get("counts", {})
+    if counts:
+        lines.append("Counts: " + ", ".join(f"{key}={value}" for key, value in counts.items()))
+    plugins = current.get("plugins", {})
+    if plugins:
+        lines.append("")
+        lines.append("Plugin load (ms): " + ", ".join(f"{pid}={ms:.0f}" for pid, ms in plugins.items()))
+    imports = current.get("imports", {})
+    if imports:
+        lines.append("")
+        lines.append("Slowest imports (ms, including nested imports):")
+        for name, ms in list(imports.items())[:15]:
+            lines.append(f"  {float(ms):>8.1f}  {name}")
+    return "\n".join(lines)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QDialogButtonBox,
+    QLabel,
+    QProgressBar,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from pypad.ui.ai.ai_job_scheduler import (
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RETRYING,
+    JOB_RUNNING,
+    AIJob,
+)
+
+_STATUS_LABELS = {
+    JOB_QUEUED: "Queued",
+    JOB_RUNNING: "Running",
+    JOB_RETRYING: "Retrying",
+    JOB_DONE: "Ready",
+    JOB_FAILED: "Failed",
+    JOB_CANCELLED: "Cancelled",
+}
+
+
+class AIBatchJobsDialog(QDialog):
+    """Non-modal progress panel for one batch of concurrent AI jobs."""
+
+    def __init__(self, parent, title: str, labels: list[str], *, on_cancel: Callable[[int], None]) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(820, 420)
+        self.setModal(False)
+        self._on_cancel = on_cancel
+        self._finished: set[int] = set()
+        root = QVBoxLayout(self)
+        self.summary = QLabel(self)
+        root.addWidget(self.summary)
+        self.progress = QProgressBar(self)
+        self.progress.setRange(0, max(1, len(labels)))
+        self.progress.setValue(0)
+        root.addWidget(self.progress)
+        self.table = QTableWidget(len(labels), 4, self)
+        self.table.setHorizontalHeaderLabels(["File", "Status", "Attempts", "Detail"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for row, label in enumerate(labels):
+            item = QTableWidgetItem(Path(label).name or label)
+            item.setToolTip(label)
+            self.table.setItem(row, 0, item)
+            for col, text in ((1, _STATUS_LABELS[JOB_QUEUED]), (2, "0"), (3, "")):
+                self.table.setItem(row, col, QTableWidgetItem(text))
+        root.addWidget(self.table, 1)
+        buttons = QDialogButtonBox(self)
+        self.cancel_selected_btn = buttons.addButton("Cancel Selected", QDialogButtonBox.ActionRole)
+        self.cancel_all_btn = buttons.addButton("Cancel All", QDialogButtonBox.ActionRole)
+        close_btn = buttons.addButton(QDialogButtonBox.Close)
+        root.addWidget(buttons)
+        self.cancel_selected_btn.clicked.connect(self._cancel_selected)
+        self.cancel_all_btn.clicked.connect(self._cancel_all)
+        close_btn.clicked.connect(self.close)
+        self._refresh_summary()
+
+    def update_job(self, job: AIJob) -> None:
+        row = job.job_id
+        if not (0 <= row < self.table.rowCount()):
+            return
+        status = _STATUS_LABELS.get(job.status, job.status)
+        detail = ""
+        if job.status == JOB_RETRYING:
+            status = f"Retrying in {job.retry_in:.0f}s"
+            detail = job.error
+        elif job.status == JOB_FAILED:
+            detail = job.error
+        self.table.item(row, 1).setText(status)
+        self.table.item(row, 2).setText(str(job.attempts))
+        self.table.item(row, 3).setText(detail)
+        self.table.item(row, 3).setToolTip(detail)
+        if job.finished:
+            self._finished.add(row)
+        self._refresh_summary()
+
+    def set_detail(self, job_id: int, status: str, detail: str = "") -> None:
+        if not (0 <= job_id < self.table.rowCount()):
+            return
+        self.table.item(job_id, 1).setText(status)
+        self.table.item(job_id, 3).setText(detail)
+
+    def _refresh_summary(self) -> None:
+        total = self.table.rowCount()
+        done = len(self._finished)
+        self.progress.setValue(done)
+        self.summary.setText(f"{done} of {total} file(s) finished.")
+        all_done = done >= total
+        self.cancel_selected_btn.setEnabled(not all_done)
+        self.cancel_all_btn.setEnabled(not all_done)
+
+    def _cancel_selected(self) -> None:
+        for index in self.table.selectionModel().selectedRows():
+            if index.row() not in self._finished:
+                self._on_cancel(index.row())
+
+    def _cancel_all(self) -> None:
+        for row in range(self.table.rowCount()):
+            if row not in self._finished:
+                self._on_cancel(row)
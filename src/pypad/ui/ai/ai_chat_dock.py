@@ -5,15 +5,14 @@ import difflib
 import hashlib
 import json
 import re
-import socket
 from datetime import datetime
 from html import escape as html_escape
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 from urllib.parse import parse_qs, unquote, urlparse
 
-from PySide6.QtCore import QByteArray, QRect, QSize, Qt, QTimer, QUrl, Signal
-from PySide6.QtGui import QDesktopServices, QTextDocument
+from PySide6.QtCore import QByteArray, QEvent, QRect, QSize, Qt, QTimer, QUrl, Signal
+from PySide6.QtGui import QDesktopServices, QGuiApplication, QTextCursor, QTextDocument, QTextDocumentFragment
 from PySide6.QtGui import QColor, QIcon, QPainter, QPixmap, QResizeEvent
 from PySide6.QtSvg import QSvgRenderer
 from PySide6.QtWidgets import (
@@ -46,7 +45,10 @@ from PySide6.QtWidgets import (
 )
 from pypad.ui.theme.asset_paths import resolve_asset_path
 from pypad.ui.ai.ai_collaboration import build_workspace_citation_snippets, paragraph_bounds
+from pypad.ui.ai.ai_context_assembler import ContextSource
 from pypad.ui.ai.ai_edit_preview_dialog import AIEditPreviewDialog
+from pypad.app_settings import get_chat_history_dir_path
+from pypad.services.chat_history_store import ChatHistoryStore
 from pypad.services.workspace_search_helpers import collect_workspace_files, search_files_for_query
 from pypad.ui.main_window.notepadpp_pref_runtime import is_clickable_scheme_allowed
 from pypad.ui.theme.theme_tokens import build_ai_chat_qss, build_tokens_from_settings
@@ -169,6 +171,9 @@ class _Bubble(QFrame):
         re.IGNORECASE,
     )
     _PYPAD_LINK_RE = re.compile(r"(?<![\w(/\"'])(pypad://[^\s<>'\")]+)", re.IGNORECASE)
+    _CMD_BEGIN_RE = re.compile(r"\[PYPAD_CMD_[A-Z_]+_BEGIN\]", re.IGNORECASE)
+    _CMD_END_RE = re.compile(r"\[PYPAD_CMD_[A-Z_]+_END\]", re.IGNORECASE)
+    _STREAM_FENCE_RE = re.compile(r"^\s{0,3}```")
 
     def __init__(
         self,
@@ -184,6 +189,7 @@ class _Bubble(QFrame):
         self._copy_icon_data_uri = copy_icon_data_uri
         self._on_pypad_link = on_pypad_link
         self._code_blocks: list[str] = []
+        self._reset_stream_state()
         self._view = QTextBrowser(self)
         self._view.setFrameStyle(QFrame.NoFrame)
         self._view.setReadOnly(True)
@@ -197,6 +203,7 @@ class _Bubble(QFrame):
         lay = QVBoxLayout(self)
         lay.setContentsMargins(10, 8, 10, 8)
         lay.addWidget(self._view)
+        self._cached_label: QLabel | None = None
         if role == "user":
             self.setObjectName("userBubble")
         else:
@@ -205,8 +212,13 @@ class _Bubble(QFrame):
         self._sync_height()
 
     def append_text(self, text: str) -> None:
+        if not text:
+            return
         self._raw_text += text
-        self._render_markdown()
+        if self._role == "assistant":
+            self._render_stream_update()
+        else:
+            self._render_markdown()
         self._sync_height()
 
     def set_text(self, text: str) -> None:
@@ -217,14 +229,90 @@ class _Bubble(QFrame):
     def text(self) -> str:
         return self._HIDDEN_COMMAND_RE.sub("", self._raw_text).strip()
 
+    def set_cached(self, cached: bool) -> None:
+        if self._cached_label is None:
+            if not cached:
+                return
+            self._cached_label = QLabel("Cached", self)
+            self._cached_label.setObjectName("aiChatCachedBadge")
+            self._cached_label.setToolTip("Served from the local AI response cache. Use Retry to ask the model again.")
+            self.layout().addWidget(self._cached_label, 0, Qt.AlignmentFlag.AlignRight)
+        self._cached_label.setVisible(bool(cached))
+
+    def _reset_stream_state(self) -> None:
+        # Raw offsets: blocks before _stream_committed are final in the document,
+        # complete lines before _stream_scanned have been fed through the block parser.
+        self._stream_committed = 0
+        self._stream_scanned = 0
+        self._stream_in_fence = False
+        self._stream_open_commands = 0
+        self._stream_doc_end = 0
+        self._stream_code_count = 0
+
     def _render_markdown(self) -> None:
+        self._reset_stream_state()
+        self._code_blocks = []
         if self._role != "assistant":
             self._view.setMarkdown(self._raw_text)
             return
+        self._view.setHtml(self._fragment_html(self._raw_text))
 
-        self._code_blocks = []
+    def _render_stream_update(self) -> None:
+        """Commit newly completed blocks and re-render only the trailing open block."""
+        raw = self._raw_text
+        pos = self._stream_scanned
+        boundary = self._stream_committed
+        while True:
+            nl = raw.find("\n", pos)
+            if nl < 0:
+                break
+            line = raw[pos:nl]
+            opened = len(self._CMD_BEGIN_RE.findall(line)) - len(self._CMD_END_RE.findall(line))
+            self._stream_open_commands = max(0, self._stream_open_commands + opened)
+            if self._STREAM_FENCE_RE.match(line):
+                self._stream_in_fence = not self._stream_in_fence
+            elif not line.strip() and not self._stream_in_fence and self._stream_open_commands == 0:
+                boundary = nl + 1
+            pos = nl + 1
+        self._stream_scanned = pos
+
+        cursor = QTextCursor(self._view.document())
+        cursor.beginEditBlock()
+        cursor.setPosition(self._stream_doc_end)
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        del self._code_blocks[self._stream_code_count :]
+        if boundary > self._stream_committed:
+            self._insert_stream_fragment(cursor, raw[self._stream_committed : boundary])
+            self._stream_committed = boundary
+            self._stream_doc_end = cursor.position()
+            self._stream_code_count = len(self._code_blocks)
+        self._insert_stream_fragment(cursor, self._visible_stream_tail(raw[self._stream_committed :]))
+        cursor.endEditBlock()
+
+    def _insert_stream_fragment(self, cursor: QTextCursor, text: str) -> None:
+        if not self._HIDDEN_COMMAND_RE.sub("", text).strip():
+            return
+        if cursor.position() > 0:
+            cursor.insertBlock()
+        cursor.insertFragment(QTextDocumentFragment.fromHtml(self._fragment_html(text)))
+
+    def _visible_stream_tail(self, tail: str) -> str:
+        tail = self._HIDDEN_COMMAND_RE.sub("", tail)
+        # Hide an unterminated command (or a half-streamed marker) until its END arrives.
+        match = self._CMD_BEGIN_RE.search(tail)
+        if match:
+            tail = tail[: match.start()]
+        bracket = tail.rfind("[")
+        if bracket >= 0:
+            rest = tail[bracket:].upper()
+            if "]" not in rest and ("[PYPAD_CMD_".startswith(rest) or rest.startswith("[PYPAD_CMD_")):
+                tail = tail[:bracket]
+        return tail
+
+    def _fragment_html(self, text: str) -> str:
         pypad_links: list[str] = []
-        card_idx = 0
+        card_idx = len(self._code_blocks)
 
         def _replace_fenced(match: re.Match[str]) -> str:
             nonlocal card_idx
@@ -255,7 +343,7 @@ class _Bubble(QFrame):
                 "</div>"
             )
 
-        clean_text = self._HIDDEN_COMMAND_RE.sub("", self._raw_text)
+        clean_text = self._HIDDEN_COMMAND_RE.sub("", text)
         clean_text = self._normalize_broken_pypad_buttons(clean_text)
         processed = re.sub(r"```([^\n`]*)\n(.*?)```", _replace_fenced, clean_text, flags=re.DOTALL)
 
@@ -282,7 +370,7 @@ class _Bubble(QFrame):
         html = doc.toHtml()
         for idx, href in enumerate(pypad_links):
             html = html.replace(f"[[PYPAD_LINK_{idx}]]", self._pypad_link_html(href))
-        self._view.setHtml(html)
+        return html
 
     @classmethod
     def _normalize_broken_pypad_buttons(cls, text: str) -> str:
@@ -448,6 +536,7 @@ class AIChatDock(QDockWidget):
         self._pending_prompt_edit_row: QWidget | None = None
         self._chat_sessions: list[dict[str, object]] = []
         self._active_chat_id: str = ""
+        self._chat_store = ChatHistoryStore(get_chat_history_dir_path())
         self._start_menu_filter_text: str = ""
         self._start_menu_rebuild_active = False
         self._pending_insert_offer: str | None = None
@@ -465,6 +554,10 @@ class AIChatDock(QDockWidget):
         self._typing_step = 0
         self._typing_active = False
         self._received_stream_content = False
+        self._stream_pending_chunks: list[str] = []
+        self._stream_flush_timer = QTimer(self)
+        self._stream_flush_timer.setSingleShot(True)
+        self._stream_flush_timer.timeout.connect(self._flush_stream_chunks)
         self._title_bar = _DockTitleBar(self)
         self.setTitleBarWidget(self._title_bar)
 
@@ -513,6 +606,7 @@ class AIChatDock(QDockWidget):
         self.input.setObjectName("aiChatInput")
         self.input.setPlaceholderText("Ask AI...")
         self.input.setFixedHeight(90)
+        self.input.installEventFilter(self)
         root.addWidget(self.input)
         self.attachments_bar = QWidget(host)
         self.attachments_bar.setObjectName("aiChatAttachmentsBar")
@@ -551,6 +645,14 @@ class AIChatDock(QDockWidget):
         self._load_history()
         self._refresh_attachment_chips()
 
+    def eventFilter(self, watched, event) -> bool:  # type: ignore[override]
+        if watched is getattr(self, "input", None) and event.type() == QEvent.Type.FocusIn:
+            # Build the SDK client and open its connection while the user is still typing.
+            prewarm = getattr(self.ai_controller, "prewarm_client", None)
+            if callable(prewarm):
+                prewarm()
+        return super().eventFilter(watched, event)
+
     def _log_ai_chat(self, message: str) -> None:
         window = getattr(self.ai_controller, "window", None)
         if window is None:
@@ -947,7 +1049,7 @@ class AIChatDock(QDockWidget):
                 continue
             sid = str(item.get("id", "") or "").strip() or self._new_chat_id()
             title = str(item.get("title", "") or "New Chat").strip() or "New Chat"
-            messages_raw = item.get("messages", [])
+            messages_raw = item.get("messages")
             messages: list[dict[str, str]] = []
             if isinstance(messages_raw, list):
                 for row in messages_raw[-200:]:
@@ -957,7 +1059,7 @@ class AIChatDock(QDockWidget):
                     text = str(row.get("text", ""))
                     if role in {"user", "assistant"}:
                         messages.append({"role": role, "text": text})
-            sessions.append(
+            session: dict[str, object] = (
                 {
                     "id": sid,
                     "title": title,
@@ -968,13 +1070,29 @@ class AIChatDock(QDockWidget):
                     "project": bool(item.get("project", False)),
                     "created_at": str(item.get("created_at", "") or datetime.now().isoformat(timespec="seconds")),
                     "updated_at": str(item.get("updated_at", "") or datetime.now().isoformat(timespec="seconds")),
-                    "messages": messages,
                     "context_attachments": self._sanitize_context_attachments(item.get("context_attachments", [])),
                     "memory_policy": self._sanitize_memory_policy(item.get("memory_policy", {})),
                 }
             )
+            # Sessions read from the history index leave "messages" unset until opened.
+            if isinstance(messages_raw, list):
+                session["messages"] = messages
+                session["message_count"] = len(messages)
+            else:
+                try:
+                    session["message_count"] = max(0, int(item.get("message_count", 0)))
+                except (TypeError, ValueError):
+                    session["message_count"] = 0
+            sessions.append(session)
         return sessions
 
+    def _session_messages(self, session: dict[str, object]) -> list[dict[str, str]]:
+        messages = session.get("messages")
+        if not isinstance(messages, list):
+            messages = self._chat_store.load_messages(str(session.get("id", "")))
+            session["messages"] = messages
+        return messages
+
     def _clear_messages_ui(self) -> None:
         while self.messages_layout.count() > 1:
             item = self.messages_layout.takeAt(0)
@@ -1029,9 +1147,9 @@ class AIChatDock(QDockWidget):
         if target is None:
             return
         self._active_chat_id = str(target.get("id", ""))
-        messages = target.get("messages", [])
-        self._history = list(messages if isinstance(messages, list) else [])
+        self._history = list(self._session_messages(target))
         self._pending_prompt_edit_row = None
+        self._discard_stream_chunks()
         self._active_reply_bubble = None
         self._active_reply_index = None
         self._pending_insert_offer = None
@@ -1098,6 +1216,7 @@ class AIChatDock(QDockWidget):
             return
         current_id = str(session.get("id", ""))
         self._chat_sessions = [s for s in self._chat_sessions if str(s.get("id", "")) != current_id]
+        self._chat_store.delete_session(current_id)
         if self._chat_sessions:
             self._set_active_chat(str(self._chat_sessions[0].get("id", "")), persist=True)
         else:
@@ -1110,7 +1229,7 @@ class AIChatDock(QDockWidget):
     def _chat_transcript_text(self, session: dict[str, object]) -> str:
         title = str(session.get("title", "") or "New Chat")
         lines = [f"# {title}", ""]
-        for item in session.get("messages", []) if isinstance(session.get("messages", []), list) else []:
+        for item in self._session_messages(session):
             if not isinstance(item, dict):
                 continue
             role = str(item.get("role", "")).strip().lower()
@@ -1156,7 +1275,7 @@ class AIChatDock(QDockWidget):
             QMessageBox.information(self, "Extract Tasks", "Set a workspace folder first.")
             return
         title = str(session.get("title", "") or "Chat Tasks")
-        messages = session.get("messages", [])
+        messages = self._session_messages(session)
         assistant_text = ""
         if isinstance(messages, list):
             for item in reversed(messages):
@@ -1212,7 +1331,7 @@ class AIChatDock(QDockWidget):
         for session in self._chat_sessions:
             title = str(session.get("title", "") or "New Chat")
             haystack_parts = [title.lower()]
-            messages = session.get("messages", [])
+            messages = self._session_messages(session)
             if isinstance(messages, list):
                 for item in messages[-50:]:
                     if isinstance(item, dict):
@@ -1251,7 +1370,7 @@ class AIChatDock(QDockWidget):
         title = str(session.get("title", "") or "New Chat").lower()
         if q in title:
             return True
-        messages = session.get("messages", [])
+        messages = self._session_messages(session)
         if isinstance(messages, list):
             for item in messages[-50:]:
                 if isinstance(item, dict) and q in str(item.get("text", "")).lower():
@@ -1371,6 +1490,7 @@ class AIChatDock(QDockWidget):
     def clear_chat(self) -> None:
         _LOGGER.debug("AI chat clear_chat active_chat_id=%s history_items=%d", self._active_chat_id, len(self._history))
         self._pending_prompt_edit_row = None
+        self._discard_stream_chunks()
         self._active_reply_bubble = None
         self._active_reply_index = None
         self._pending_insert_offer = None
@@ -1405,8 +1525,7 @@ class AIChatDock(QDockWidget):
             return
         self._ensure_active_session(create_if_missing=True)
         self._maybe_name_current_chat_from_first_prompt(prompt)
-        context_prefix = self._build_session_context_prefix(prompt)
-        effective_prompt = ("\n\n".join([p for p in [context_prefix, prompt] if str(p).strip()])).strip()
+        context_sources = self._build_session_context_sources(prompt)
         self.input.clear()
         self._external_on_done = None
         self._add_bubble(prompt, "user", persist=True)
@@ -1423,16 +1542,18 @@ class AIChatDock(QDockWidget):
         self._active_response_correlation_id = cid
         _LOGGER.debug("AI chat response cycle start cid=%s source=_send_prompt", cid)
         self.ai_controller.ask_ai_chat(
-            effective_prompt,
+            prompt,
             on_chunk=self._on_stream_chunk,
             on_done=self._on_stream_done,
             on_error=self._on_stream_error,
             on_cancel=self._on_stream_cancel,
             debug_correlation_id=cid,
+            on_cached=self._on_stream_cached,
+            context_sources=context_sources,
         )
-        _LOGGER.debug("AI chat _send_prompt dispatched effective_chars=%d", len(effective_prompt))
+        _LOGGER.debug("AI chat _send_prompt dispatched chars=%d context_sources=%d", len(prompt), len(context_sources))
 
-    def send_prompt(self, *, prompt: str, visible_prompt: str | None = None, on_done=None) -> None:
+    def send_prompt(self, *, prompt: str, visible_prompt: str | None = None, on_done=None, bypass_cache: bool = False) -> None:
         prompt = (prompt or "").strip()
         if not prompt:
             return
@@ -1454,8 +1575,7 @@ class AIChatDock(QDockWidget):
             return
         self._ensure_active_session(create_if_missing=True)
         self._maybe_name_current_chat_from_first_prompt(visible_prompt if visible_prompt is not None else prompt)
-        context_prefix = self._build_session_context_prefix(prompt)
-        effective_prompt = ("\n\n".join([p for p in [context_prefix, prompt] if str(p).strip()])).strip()
+        context_sources = self._build_session_context_sources(prompt)
         if visible_prompt is None:
             visible_prompt = prompt
         self.input.clear()
@@ -1475,14 +1595,17 @@ class AIChatDock(QDockWidget):
         self._active_response_correlation_id = cid
         _LOGGER.debug("AI chat response cycle start cid=%s source=send_prompt external_on_done=%s", cid, bool(on_done))
         self.ai_controller.ask_ai_chat(
-            effective_prompt,
+            prompt,
             on_chunk=self._on_stream_chunk,
             on_done=self._on_stream_done,
             on_error=self._on_stream_error,
             on_cancel=self._on_stream_cancel,
             debug_correlation_id=cid,
+            use_cache=not bypass_cache,
+            on_cached=self._on_stream_cached,
+            context_sources=context_sources,
         )
-        _LOGGER.debug("AI chat send_prompt dispatched effective_chars=%d", len(effective_prompt))
+        _LOGGER.debug("AI chat send_prompt dispatched chars=%d context_sources=%d", len(prompt), len(context_sources))
 
     def _maybe_name_current_chat_from_first_prompt(self, prompt: str) -> None:
         # Title is now owned by the AI hidden title-command flow.
@@ -1509,7 +1632,7 @@ class AIChatDock(QDockWidget):
             return
         if bool(session.get("title_fallback_attempted", False)):
             return
-        messages = session.get("messages", [])
+        messages = self._session_messages(session)
         if not isinstance(messages, list):
             return
         assistant_count = sum(
@@ -1832,18 +1955,22 @@ class AIChatDock(QDockWidget):
         session["updated_at"] = datetime.now().isoformat(timespec="seconds")
         self._persist_history(save=True)
 
-    def _build_session_context_prefix(self, prompt: str) -> str:
+    def _build_session_context_sources(self, prompt: str) -> list[ContextSource]:
+        """Session context for the controller's assembler; it budgets, dedups and orders them."""
         session = self._current_session()
         if session is None:
-            return ""
+            return []
         policy = self._sanitize_memory_policy(session.get("memory_policy", {}))
-        parts: list[str] = []
+        sources: list[ContextSource] = []
+        rules: list[str] = []
         if bool(policy.get("strict_citations_only", False)):
-            parts.append(
+            rules.append(
                 "Use citations for factual/code claims when possible. If evidence is insufficient, say what is missing."
             )
         if not bool(policy.get("allow_hidden_apply_commands", True)):
-            parts.append("Do not emit hidden apply commands for insert/file/patch actions in this chat session.")
+            rules.append("Do not emit hidden apply commands for insert/file/patch actions in this chat session.")
+        if rules:
+            sources.append(ContextSource("session_policy", "\n\n".join(rules), priority=95, stable=True))
         attachments = session.get("context_attachments", [])
         if isinstance(attachments, list) and attachments:
             rendered: list[str] = []
@@ -1859,41 +1986,70 @@ class AIChatDock(QDockWidget):
                 header = f"[{kind}] {title}" + (f" ({source_path})" if source_path else "")
                 rendered.append(f"{header}\n{content[:4000]}")
             if rendered:
-                parts.append("[CHAT_CONTEXT_ATTACHMENTS]\n" + "\n\n".join(rendered) + "\n[/CHAT_CONTEXT_ATTACHMENTS]")
+                sources.append(
+                    ContextSource(
+                        "attachments",
+                        "\n\n".join(rendered),
+                        priority=80,
+                        stable=True,
+                        truncatable=True,
+                        header="[CHAT_CONTEXT_ATTACHMENTS]",
+                        footer="[/CHAT_CONTEXT_ATTACHMENTS]",
+                    )
+                )
         window = getattr(self.ai_controller, "window", None)
         if bool(policy.get("include_current_file_auto", False)) and window is not None and hasattr(window, "active_tab"):
             tab = window.active_tab()
             if tab is not None:
                 file_name = str(getattr(tab, "current_file", "") or "Untitled")
                 file_text = str(tab.text_edit.get_text() or "")
-                parts.append(
-                    "[AUTO_CURRENT_FILE]\n"
-                    f"file={file_name}\n"
-                    f"{file_text[:12000]}\n"
-                    "[/AUTO_CURRENT_FILE]"
+                sources.append(
+                    ContextSource(
+                        "current_file",
+                        file_text[:12000],
+                        priority=60,
+                        truncatable=True,
+                        header=f"[AUTO_CURRENT_FILE]\nfile={file_name}",
+                        footer="[/AUTO_CURRENT_FILE]",
+                    )
                 )
         if bool(policy.get("include_workspace_snippets_auto", False)) and window is not None:
             workspace_root = str(getattr(window, "settings", {}).get("workspace_root", "") or "").strip()
             if workspace_root:
                 try:
-                    files = collect_workspace_files(workspace_root, max_files=800)
                     max_files = int(getattr(window, "settings", {}).get("ai_workspace_qa_max_files", 6) or 6)
                     max_lines = int(getattr(window, "settings", {}).get("ai_workspace_qa_max_lines_per_file", 30) or 30)
-                    snippets = build_workspace_citation_snippets(prompt, files, max_files=max_files, max_lines_per_file=max_lines, max_total_chars=12000)
+                    features = getattr(window, "advanced_features", None)
+                    if features is not None:
+                        snippets = features.workspace_citation_snippets(
+                            prompt, max_files=max_files, max_lines_per_file=max_lines, max_total_chars=12000
+                        )
+                    else:
+                        files = collect_workspace_files(workspace_root, max_files=800)
+                        snippets = build_workspace_citation_snippets(prompt, files, max_files=max_files, max_lines_per_file=max_lines, max_total_chars=12000)
                     if snippets:
                         sections = [f"FILE: {s.path}\n{s.excerpt}" for s in snippets]
-                        parts.append("[AUTO_WORKSPACE_SNIPPETS]\n" + "\n\n".join(sections) + "\n[/AUTO_WORKSPACE_SNIPPETS]")
+                        sources.append(
+                            ContextSource(
+                                "workspace_snippets",
+                                "\n\n".join(sections),
+                                priority=50,
+                                truncatable=True,
+                                header="[AUTO_WORKSPACE_SNIPPETS]",
+                                footer="[/AUTO_WORKSPACE_SNIPPETS]",
+                            )
+                        )
                 except Exception:
                     pass
-        out = ("\n\n".join(p for p in parts if str(p).strip())).strip()
-        if out:
+        if sources:
             self._log_ai_chat(
-                "context prefix built "
-                f"chars={len(out)} attachments={len(session.get('context_attachments', [])) if isinstance(session.get('context_attachments', []), list) else 0} "
+                "context sources built "
+                f"names={','.join(source.name for source in sources)} "
+                f"tokens={sum(source.cost for source in sources)} "
                 f"strict_citations={bool(policy.get('strict_citations_only', False))} "
                 f"allow_hidden_apply={bool(policy.get('allow_hidden_apply_commands', True))}"
             )
-        return out
+        return sources
 
         def _on_error(_message: str) -> None:
             return
@@ -1906,14 +2062,12 @@ class AIChatDock(QDockWidget):
             on_cancel=lambda _partial: None,
         )
 
-    @staticmethod
-    def _has_internet_connection(timeout_sec: float = 0.8) -> bool:
-        try:
-            sock = socket.create_connection(("1.1.1.1", 53), timeout=timeout_sec)
-            sock.close()
-            return True
-        except OSError:
-            return False
+    def _has_internet_connection(self) -> bool:
+        return self.ai_controller.has_internet_connection()
+
+    def _on_stream_cached(self) -> None:
+        if self._active_reply_bubble is not None:
+            self._active_reply_bubble.set_cached(True)
 
     def _on_stream_chunk(self, text: str) -> None:
         cid = self._active_response_correlation_id or "none"
@@ -1927,14 +2081,38 @@ class AIChatDock(QDockWidget):
             self._stop_typing_animation(clear=True)
             if self._active_reply_bubble is not None:
                 self._active_reply_bubble.set_text("")
+        # Chunks often arrive faster than the screen refreshes; render them once per frame.
+        self._stream_pending_chunks.append(text)
+        if not self._stream_flush_timer.isActive():
+            self._stream_flush_timer.start(self._stream_frame_interval_ms())
+
+    def _stream_frame_interval_ms(self) -> int:
+        screen = self.screen() or QGuiApplication.primaryScreen()
+        rate = float(screen.refreshRate()) if screen is not None else 60.0
+        return max(8, int(1000.0 / max(1.0, rate)))
+
+    def _discard_stream_chunks(self) -> None:
+        self._stream_flush_timer.stop()
+        self._stream_pending_chunks.clear()
+
+    def _flush_stream_chunks(self) -> None:
+        self._stream_flush_timer.stop()
+        if not self._stream_pending_chunks:
+            return
+        text = "".join(self._stream_pending_chunks)
+        self._stream_pending_chunks.clear()
+        if self._active_reply_bubble is None:
+            return
         self._active_reply_bubble.append_text(text)
         if self._active_reply_index is not None and 0 <= self._active_reply_index < len(self._history):
             self._history[self._active_reply_index]["text"] += text
-            self._persist_history(save=False)
+            # Only the reply's tail is appended to the session log; the index waits for the turn to end.
+            self._chat_store.sync_messages(self._active_chat_id, self._history[-200:])
         self._scroll_to_bottom()
 
     def _on_stream_done(self, full_text: str) -> None:
         cid = self._active_response_correlation_id or "none"
+        self._flush_stream_chunks()
         self.send_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self._stop_typing_animation(clear=not self._received_stream_content)
@@ -2046,6 +2224,7 @@ class AIChatDock(QDockWidget):
 
     def _on_stream_error(self, message: str) -> None:
         cid = self._active_response_correlation_id or "none"
+        self._discard_stream_chunks()
         _LOGGER.debug("AI chat on_stream_error cid=%s message_len=%d", cid, len(message or ""))
         self.send_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -2068,6 +2247,7 @@ class AIChatDock(QDockWidget):
 
     def _on_stream_cancel(self, _partial: str) -> None:
         cid = self._active_response_correlation_id or "none"
+        self._flush_stream_chunks()
         _LOGGER.debug("AI chat on_stream_cancel cid=%s", cid)
         self.send_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -2209,7 +2389,8 @@ class AIChatDock(QDockWidget):
         prompt = self._previous_user_prompt_for_row(row)
         if not prompt:
             return
-        self.send_prompt(prompt=prompt, visible_prompt=prompt)
+        # Retry always asks the model again instead of replaying a cached reply.
+        self.send_prompt(prompt=prompt, visible_prompt=prompt, bypass_cache=True)
 
     def _find_bubble_row(self, bubble: _Bubble) -> QWidget | None:
         parent = bubble.parentWidget()
@@ -2281,6 +2462,7 @@ class AIChatDock(QDockWidget):
         self._history[prompt_index]["text"] = edited_prompt
         del self._history[prompt_index + 1 :]
         self._remove_rows_from_history_index(prompt_index + 1)
+        self._discard_stream_chunks()
         self._active_reply_bubble = None
         self._active_reply_index = None
         self._pending_prompt_edit_row = None
@@ -3272,8 +3454,25 @@ class AIChatDock(QDockWidget):
 
     def _load_history(self) -> None:
         settings = getattr(self.ai_controller.window, "settings", {})
-        self._chat_sessions = self._sanitize_chat_sessions(settings.get("ai_chat_sessions", []))
+        if self._chat_store.has_index():
+            sessions, requested = self._chat_store.load_index()
+            self._chat_sessions = self._sanitize_chat_sessions(sessions)
+        else:
+            self._chat_sessions = self._migrate_settings_chat_history(settings)
+            requested = str(settings.get("ai_chat_active_session_id", "") or "")
         if not self._chat_sessions:
+            self._chat_sessions = [self._default_chat_session()]
+        if requested and any(str(s.get("id", "")) == requested for s in self._chat_sessions):
+            self._active_chat_id = requested
+        else:
+            self._active_chat_id = str(self._chat_sessions[0].get("id", ""))
+        self._set_active_chat(self._active_chat_id, persist=False)
+        self._persist_history(save=True)
+
+    def _migrate_settings_chat_history(self, settings: dict) -> list[dict[str, object]]:
+        """One-time move of chat sessions kept in settings.json into the history store."""
+        sessions = self._sanitize_chat_sessions(settings.get("ai_chat_sessions", []))
+        if not sessions:
             legacy = settings.get("ai_chat_history", [])
             if isinstance(legacy, list) and legacy:
                 boot = self._default_chat_session(title="Previous Chat")
@@ -3286,35 +3485,41 @@ class AIChatDock(QDockWidget):
                     if role in {"user", "assistant"}:
                         boot_msgs.append({"role": role, "text": text})
                 boot["messages"] = boot_msgs
-                self._chat_sessions = [boot]
-        if not self._chat_sessions:
-            self._chat_sessions = [self._default_chat_session()]
-        requested = str(settings.get("ai_chat_active_session_id", "") or "")
-        if requested and any(str(s.get("id", "")) == requested for s in self._chat_sessions):
-            self._active_chat_id = requested
-        else:
-            self._active_chat_id = str(self._chat_sessions[0].get("id", ""))
-        self._set_active_chat(self._active_chat_id, persist=False)
-        self._persist_history(save=False)
+                sessions = [boot]
+        for session in sessions:
+            self._chat_store.sync_messages(str(session.get("id", "")), self._session_messages(session))
+        had_legacy = bool(settings.pop("ai_chat_sessions", None)) or bool(settings.get("ai_chat_history"))
+        settings.pop("ai_chat_active_session_id", None)
+        settings["ai_chat_history"] = []
+        if sessions:
+            self._chat_store.save_index(sessions, str(sessions[0].get("id", "")))
+        window = self.ai_controller.window
+        if had_legacy and hasattr(window, "save_settings_to_disk"):
+            window.save_settings_to_disk()
+        return sessions
 
     def _persist_history(self, *, save: bool) -> None:
-        window = self.ai_controller.window
+        """Write the active session's messages to the history store.
+
+        Only the delta is appended to the session log, so this is cheap enough to call
+        while streaming; ``save`` also rewrites the session index.
+        """
         session = self._current_session()
         if session is not None:
             session["messages"] = list(self._history[-200:])
             session["updated_at"] = datetime.now().isoformat(timespec="seconds")
-        self._chat_sessions = self._sanitize_chat_sessions(self._chat_sessions)
         if not self._chat_sessions:
             self._chat_sessions = [self._default_chat_session()]
             self._active_chat_id = str(self._chat_sessions[0].get("id", ""))
-        window.settings["ai_chat_sessions"] = list(self._chat_sessions[-200:])
-        window.settings["ai_chat_active_session_id"] = str(self._active_chat_id or "")
-        # Backward-compatible mirror for older code paths.
-        window.settings["ai_chat_history"] = list(self._history[-200:])
-        self._history = list(window.settings["ai_chat_history"])
+        if session is not None:
+            self._chat_store.sync_messages(str(session.get("id", "")), session["messages"])
+        if save:
+            self._chat_sessions = self._sanitize_chat_sessions(self._chat_sessions)
+            try:
+                self._chat_store.save_index(self._chat_sessions, self._active_chat_id)
+            except Exception:
+                _LOGGER.exception("Failed to save AI chat history index")
         self._refresh_chat_session_header()
-        if save and hasattr(window, "save_settings_to_disk"):
-            window.save_settings_to_disk()
 
     def _is_chat_near_bottom(self, *, threshold_px: int = 48) -> bool:
         bar = self.scroll.verticalScrollBar()
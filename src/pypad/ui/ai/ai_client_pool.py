@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from collections.abc import Callable
+
+from pypad.logging_utils import get_logger
+
+_LOGGER = get_logger(__name__)
+
+ONLINE_STATUS_TTL_SEC = 30.0
+OFFLINE_STATUS_TTL_SEC = 3.0
+PREWARM_INTERVAL_SEC = 60.0
+
+FLAVOR_GENAI = "genai"
+FLAVOR_LEGACY = "legacy"
+
+
+def probe_internet_connection(timeout_sec: float = 0.8) -> bool:
+    try:
+        sock = socket.create_connection(("1.1.1.1", 53), timeout=timeout_sec)
+        sock.close()
+        return True
+    except OSError:
+        return False
+
+
+class AIClientPool:
+    """Reusable Gemini SDK clients keyed by ``(api_key, model, flavor)``.
+
+    A pooled ``genai.Client`` keeps its HTTP connection pool alive between requests, so
+    only the first request to a key pays client construction and TLS setup. The
+    connectivity probe result is cached for a short TTL, and :meth:`prewarm` builds the
+    client and opens its connection on a background thread before the first prompt.
+    """
+
+    def __init__(
+        self,
+        *,
+        probe: Callable[[], bool] = probe_internet_connection,
+        online_ttl: float = ONLINE_STATUS_TTL_SEC,
+        offline_ttl: float = OFFLINE_STATUS_TTL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._probe = probe
+        self._online_ttl = float(online_ttl)
+        self._offline_ttl = float(offline_ttl)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (factory, client); the factory is kept so a re-imported SDK is not mixed
+        # with clients built by the previous one.
+        self._clients: dict[tuple[str, str, str], tuple[object, object]] = {}
+        self._legacy_configured: tuple[object, str] | None = None
+        self._online: bool | None = None
+        self._online_checked_at = 0.0
+        self._warmed_at: dict[tuple[str, str], float] = {}
+        self._prewarm_in_flight = False
+
+    def is_online(self, *, force: bool = False) -> bool:
+        now = self._clock()
+        with self._lock:
+            cached = self._online
+            if cached is not None and not force:
+                ttl = self._online_ttl if cached else self._offline_ttl
+                if now - self._online_checked_at < ttl:
+                    return cached
+        online = bool(self._probe())
+        with self._lock:
+            self._online = online
+            self._online_checked_at = self._clock()
+        return online
+
+    def mark_online(self) -> None:
+        """Record a successful request; it proves connectivity as well as a probe does."""
+        with self._lock:
+            self._online = True
+            self._online_checked_at = self._clock()
+
+    def invalidate_connectivity(self) -> None:
+        with self._lock:
+            self._online = None
+
+    def genai_client(self, api_key: str, model: str):
+        from google import genai  # type: ignore
+
+        key = (api_key, model, FLAVOR_GENAI)
+        factory = genai.Client
+        with self._lock:
+            cached = self._clients.get(key)
+            if cached is not None and cached[0] is factory:
+                return cached[1]
+        client = factory(api_key=api_key)
+        with self._lock:
+            self._clients[key] = (factory, client)
+        return client
+
+    def legacy_model(self, api_key: str, model: str):
+        import google.generativeai as legacy_genai  # type: ignore
+
+        key = (api_key, model, FLAVOR_LEGACY)
+        factory = legacy_genai.GenerativeModel
+        with self._lock:
+            # ``configure`` is process-global in the legacy SDK; only redo it on a key change.
+            if self._legacy_configured != (legacy_genai, api_key):
+                legacy_genai.configure(api_key=api_key)
+                self._legacy_configured = (legacy_genai, api_key)
+            cached = self._clients.get(key)
+            if cached is not None and cached[0] is factory:
+                return cached[1]
+        legacy_model = factory(model_name=model)
+        with self._lock:
+            self._clients[key] = (factory, legacy_model)
+        return legacy_model
+
+    def discard(self, api_key: str, model: str, flavor: str) -> None:
+        """Drop a client whose request failed so the next request starts from a fresh one."""
+        with self._lock:
+            self._clients.pop((api_key, model, flavor), None)
+            self._warmed_at.pop((api_key, model), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._warmed_at.clear()
+            self._legacy_configured = None
+
+    def prewarm(self, api_key: str, model: str) -> bool:
+        """Build the client and open its connection in the background.
+
+        Returns False when there is nothing to do (no key, recently warmed, or a warm-up
+        already running).
+        """
+        api_key = str(api_key or "").strip()
+        model = str(model or "").strip()
+        if not api_key or not model:
+            return False
+        now = self._clock()
+        with self._lock:
+            warmed = self._warmed_at.get((api_key, model))
+            if self._prewarm_in_flight or (warmed is not None and now - warmed < PREWARM_INTERVAL_SEC):
+                return False
+            self._prewarm_in_flight = True
+            self._warmed_at[(api_key, model)] = now
+
+        def _worker() -> None:
+            warmed_ok = False
+            try:
+                if self.is_online():
+                    client = self.genai_client(api_key, model)
+                    # A cheap metadata call opens the TLS connection the first prompt will reuse.
+                    client.models.get(model=model)
+                    self.mark_online()
+                    warmed_ok = True
+                    _LOGGER.debug("AI client pool prewarmed model=%s", model)
+            except Exception:
+                _LOGGER.debug("AI client pool prewarm failed model=%s", model, exc_info=True)
+            finally:
+                with self._lock:
+                    self._prewarm_in_flight = False
+                    if not warmed_ok:
+                        self._warmed_at.pop((api_key, model), None)
+
+        threading.Thread(target=_worker, name="pypad-ai-prewarm", daemon=True).start()
+        return True
+
+
+_SHARED_POOL: AIClientPool | None = None
+_SHARED_POOL_LOCK = threading.Lock()
+
+
+def shared_client_pool() -> AIClientPool:
+    global _SHARED_POOL
+    with _SHARED_POOL_LOCK:
+        if _SHARED_POOL is None:
+            _SHARED_POOL = AIClientPool()
+        return _SHARED_POOL
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 import re
 
+from pypad.services.retrieval_index import INDEXABLE_SUFFIXES, RetrievalIndex
+
 
 @dataclass(frozen=True)
 class CitationSnippet:
@@ -14,6 +16,7 @@ class CitationSnippet:
 
 WORD_RE = re.compile(r"[A-Za-z0-9_]{3,}")
 FENCE_RE = re.compile(r"^\s*```[\w-]*\s*|\s*```\s*$", re.MULTILINE)
+MAX_WINDOWS_PER_CITATION = 4
 
 
 def strip_model_fences(text: str) -> str:
@@ -80,25 +83,7 @@ def build_workspace_citation_snippets(
         path = Path(raw_path)
         if not path.exists() or not path.is_file():
             continue
-        if path.suffix.lower() not in {
-            ".py",
-            ".md",
-            ".markdown",
-            ".mdown",
-            ".txt",
-            ".json",
-            ".yaml",
-            ".yml",
-            ".toml",
-            ".ini",
-            ".js",
-            ".ts",
-            ".html",
-            ".css",
-            ".xml",
-            ".csv",
-            ".log",
-        }:
+        if path.suffix.lower() not in INDEXABLE_SUFFIXES:
             continue
         if path.stat().st_size > 1_000_000:
             continue
@@ -130,6 +115,54 @@ def build_workspace_citation_snippets(
     return out
 
 
+def build_indexed_citation_snippets(
+    index: RetrievalIndex,
+    question: str,
+    *,
+    max_files: int = 10,
+    max_lines_per_file: int = 60,
+    max_total_chars: int = 24000,
+) -> list[CitationSnippet]:
+    """Citation snippets from the best BM25 windows of ``index``.
+
+    Only the files that make the cut are read, and only for their excerpt lines.
+    """
+    hits = index.search(question, limit=max(1, max_files) * 32)
+    by_path: dict[str, list[tuple[int, int]]] = {}
+    file_scores: dict[str, float] = {}
+    for hit in hits:
+        windows = by_path.get(hit.path)
+        if windows is None:
+            if len(by_path) >= max_files:
+                continue
+            windows = by_path[hit.path] = []
+            # Hits arrive best first, so a file ranks by its best window, not its size.
+            file_scores[hit.path] = hit.score
+        if len(windows) < MAX_WINDOWS_PER_CITATION:
+            windows.append((hit.start_line, hit.end_line))
+    out: list[CitationSnippet] = []
+    used_chars = 0
+    for path in sorted(by_path, key=lambda p: (-file_scores[p], p.lower())):
+        lines = _safe_read_text(Path(path)).splitlines()
+        picked: set[int] = set()
+        for start, end in by_path[path]:
+            for idx in range(start, min(end, len(lines))):
+                if len(picked) >= max_lines_per_file:
+                    break
+                if lines[idx].strip():
+                    picked.add(idx)
+        if not picked:
+            continue
+        excerpt = "\n".join(f"{idx + 1:04d}: {lines[idx].rstrip()}" for idx in sorted(picked))
+        snip = CitationSnippet(path=path, excerpt=excerpt, score=max(1, round(file_scores[path] * 100)))
+        blob = f"FILE: {snip.path}\n{snip.excerpt}\n"
+        if used_chars + len(blob) > max_total_chars and out:
+            break
+        out.append(snip)
+        used_chars += len(blob)
+    return out
+
+
 def build_project_qa_prompt(question: str, snippets: list[CitationSnippet]) -> str:
     sections: list[str] = []
     for snip in snippets:
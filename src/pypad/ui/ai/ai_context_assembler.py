@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+
+DEFAULT_CONTEXT_BUDGET_TOKENS = 16000
+# Paragraphs shorter than this are too generic ("}", "---") to treat as duplicates.
+MIN_DEDUP_CHARS = 48
+# Do not bother truncating a source into less room than this.
+MIN_TRUNCATED_TOKENS = 64
+TRUNCATION_MARKER = "[... truncated to fit the context budget]"
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|[0-9]+|[ \t]+|\n+|[^\x00-\x7f]|(.)\1*", re.DOTALL)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count of ``text`` without a model-specific vocabulary.
+
+    Short words are one token and long ones split every ~5 letters, digits group in
+    threes, punctuation runs compress, and non-ASCII characters count one each.
+    """
+    if not text:
+        return 0
+    total = 0
+    for match in _PIECE_RE.finditer(text):
+        piece = match.group(0)
+        first = piece[0]
+        if first.isascii() and first.isalpha():
+            total += 1 if len(piece) <= 6 else (len(piece) + 4) // 5
+        elif first.isdigit() and first.isascii():
+            total += (len(piece) + 2) // 3
+        elif first in " \t":
+            # A single space is absorbed by the following word.
+            total += 0 if len(piece) == 1 else (len(piece) + 3) // 4
+        elif first == "\n":
+            total += 1
+        elif not first.isascii():
+            total += 1
+        else:
+            total += (len(piece) + 3) // 4
+    return max(1, total)
+
+
+@dataclass(frozen=True)
+class ContextSource:
+    """One block of prompt context.
+
+    ``stable`` sources form the prompt prefix and are emitted first, in declaration
+    order, so the prefix stays byte-identical between turns. Under budget pressure
+    sources are kept by ``priority``; ``required`` ones are always kept and
+    ``truncatable`` ones may be cut at a line boundary instead of dropped.
+    """
+
+    name: str
+    body: str
+    priority: int = 50
+    stable: bool = False
+    required: bool = False
+    truncatable: bool = False
+    header: str = ""
+    footer: str = ""
+
+    def render(self) -> str:
+        return "\n".join(part for part in (self.header, self.body, self.footer) if part)
+
+    @property
+    def cost(self) -> int:
+        return estimate_tokens(self.render())
+
+
+@dataclass
+class AssembledContext:
+    text: str
+    tokens: int
+    prefix_tokens: int
+    included: list[str] = field(default_factory=list)
+    truncated: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    deduped_blocks: int = 0
+
+
+def _dedup_key(block: str) -> str:
+    return " ".join(block.split())
+
+
+def _without_seen_blocks(body: str, seen: set[str]) -> tuple[str, int]:
+    kept: list[str] = []
+    removed = 0
+    local: set[str] = set()
+    for block in body.split("\n\n"):
+        key = _dedup_key(block)
+        if len(key) >= MIN_DEDUP_CHARS and (key in seen or key in local):
+            removed += 1
+            continue
+        local.add(key)
+        kept.append(block)
+    return "\n\n".join(kept).strip("\n"), removed
+
+
+def _truncate_to(source: ContextSource, budget: int) -> ContextSource | None:
+    frame = estimate_tokens("\n".join(part for part in (source.header, TRUNCATION_MARKER, source.footer) if part))
+    room = budget - frame
+    if room < MIN_TRUNCATED_TOKENS:
+        return None
+    lines: list[str] = []
+    used = 0
+    for line in source.body.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > room:
+            break
+        lines.append(line)
+        used += cost
+    if not lines:
+        return None
+    return replace(source, body="\n".join(lines) + "\n" + TRUNCATION_MARKER)
+
+
+def assemble_context(
+    sources: list[ContextSource],
+    *,
+    budget_tokens: int = DEFAULT_CONTEXT_BUDGET_TOKENS,
+    separator: str = "\n\n",
+) -> AssembledContext:
+    """Select, deduplicate and order ``sources`` into one prompt within ``budget_tokens``.
+
+    Selection claims the stable prefix first, then required sources, then the rest by
+    priority. A paragraph already emitted by a selected source is removed from later
+    ones; required sources are never edited and their cost is reserved up front.
+    """
+    selection_order = sorted(
+        ((idx, source) for idx, source in enumerate(sources) if source.body.strip()),
+        key=lambda row: (not row[1].stable, not row[1].required, -row[1].priority, row[0]),
+    )
+    separator_cost = estimate_tokens(separator)
+    reserved = sum(source.cost + separator_cost for _idx, source in selection_order if source.required)
+    seen: set[str] = set()
+    chosen: list[tuple[int, ContextSource]] = []
+    result = AssembledContext(text="", tokens=0, prefix_tokens=0)
+    used = 0
+    for position, source in selection_order:
+        if source.required:
+            candidate, removed = source, 0
+            reserved -= source.cost + separator_cost
+        else:
+            body, removed = _without_seen_blocks(source.body, seen)
+            if not body.strip():
+                result.deduped_blocks += removed
+                result.dropped.append(source.name)
+                continue
+            candidate = replace(source, body=body) if removed else source
+            remaining = budget_tokens - used - reserved - separator_cost
+            if candidate.cost > remaining:
+                trimmed = _truncate_to(candidate, remaining) if candidate.truncatable else None
+                if trimmed is None:
+                    result.dropped.append(source.name)
+                    continue
+                candidate = trimmed
+                result.truncated.append(source.name)
+        result.deduped_blocks += removed
+        used += candidate.cost + separator_cost
+        chosen.append((position, candidate))
+        for block in candidate.body.split("\n\n"):
+            key = _dedup_key(block)
+            if len(key) >= MIN_DEDUP_CHARS:
+                seen.add(key)
+    ordered = [source for _position, source in sorted(chosen, key=lambda row: (not row[1].stable, row[0]))]
+    rendered = [source.render() for source in ordered]
+    result.text = separator.join(rendered)
+    result.tokens = estimate_tokens(result.text)
+    prefix = separator.join(text for source, text in zip(ordered, rendered) if source.stable)
+    result.prefix_tokens = estimate_tokens(prefix) if prefix else 0
+    result.included = [source.name for source in ordered]
+    return result
@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 import re
 import sys
-import socket
+import time
 from collections.abc import Callable, Iterator
 from datetime import datetime
 from pathlib import Path
@@ -23,7 +23,19 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
+from pypad.ui.ai.ai_context_assembler import (
+    DEFAULT_CONTEXT_BUDGET_TOKENS,
+    ContextSource,
+    assemble_context,
+    estimate_tokens,
+)
+from pypad.ui.ai.ai_client_pool import FLAVOR_GENAI, FLAVOR_LEGACY, AIClientPool, shared_client_pool
+from pypad.ui.ai.ai_job_scheduler import JOB_CANCELLED, JOB_DONE, AIJob, AIJobScheduler, ProviderRateLimiter
+from pypad.ui.ai.ai_metrics_ledger import STATUS_CANCELLED, STATUS_ERROR, STATUS_OK, AIMetricsLedger
 from pypad.ui.ai.ai_edit_preview_dialog import AIEditPreviewDialog, AIRewritePromptDialog
+from pypad.ui.ai.ai_providers import LOCAL_MODEL_NAME, PROVIDER_GEMINI, PROVIDER_LOCAL, AIProvider, LocalAIProvider
+from pypad.ui.ai.ai_response_cache import AIResponseCache, response_cache_key
+from pypad.app_settings import get_ai_metrics_dir_path, get_ai_response_cache_dir_path
 from pypad.ai_app_knowledge import DEFAULT_AI_APP_KNOWLEDGE
 from pypad.logging_utils import get_logger
 from pypad.ui.theme.asset_paths import resolve_asset_path
@@ -75,15 +87,15 @@ class _AIWorker(QObject):
     finished = Signal(str)
     failed = Signal(str)
 
-    def __init__(self, prompt: str, api_key: str, model: str) -> None:
+    def __init__(self, prompt: str, provider: AIProvider, model: str) -> None:
         super().__init__()
         self.prompt = prompt
-        self.api_key = api_key
+        self.provider = provider
         self.model = model
 
     def run(self) -> None:
         try:
-            result = _generate_sync(self.prompt, self.api_key, self.model)
+            result = self.provider.generate(self.prompt, self.model)
         except Exception as exc:  # noqa: BLE001
             self.failed.emit(str(exc))
             return
@@ -96,10 +108,10 @@ class _AIStreamWorker(QObject):
     cancelled = Signal(str)
     failed = Signal(str)
 
-    def __init__(self, prompt: str, api_key: str, model: str) -> None:
+    def __init__(self, prompt: str, provider: AIProvider, model: str) -> None:
         super().__init__()
         self.prompt = prompt
-        self.api_key = api_key
+        self.provider = provider
         self.model = model
         self._cancel_requested = False
 
@@ -111,7 +123,7 @@ class _AIStreamWorker(QObject):
         _LOGGER.debug("AI stream worker run start model=%s prompt_chars=%d", self.model, len(self.prompt))
         try:
             parts: list[str] = []
-            for piece in _generate_stream(self.prompt, self.api_key, self.model):
+            for piece in self.provider.stream(self.prompt, self.model):
                 if self._cancel_requested:
                     _LOGGER.debug("AI stream worker run cancelled-before-emit chunks=%d chars=%d", len(parts), len("".join(parts)))
                     self.cancelled.emit("".join(parts).strip())
@@ -133,43 +145,49 @@ class _AIStreamWorker(QObject):
             self.failed.emit(str(exc))
 
 
-def _generate_sync(prompt: str, api_key: str, model: str) -> str:
+def _generate_sync(prompt: str, api_key: str, model: str, *, pool: AIClientPool | None = None) -> str:
     if not api_key:
         raise RuntimeError(MISSING_API_KEY_MESSAGE)
     if not model.strip():
         raise RuntimeError("AI model is not configured. Set it in Settings > AI & Updates.")
+    pool = pool or shared_client_pool()
+    model = model.strip()
+    last_error: Exception | None = None
 
     # Preferred SDK path (`google-genai`).
     try:
-        from google import genai  # type: ignore
-
-        client = genai.Client(api_key=api_key)
+        client = pool.genai_client(api_key, model)
         response = client.models.generate_content(
-            model=model.strip(),
+            model=model,
             contents=prompt,
         )
         text = getattr(response, "text", None)
         if text:
+            pool.mark_online()
             return str(text)
-    except Exception:
+    except ImportError:
         pass
+    except Exception as exc:
+        last_error = exc
+        pool.discard(api_key, model, FLAVOR_GENAI)
 
     # Compatibility fallback (`google-generativeai`).
     try:
-        import google.generativeai as legacy_genai  # type: ignore
-
-        legacy_genai.configure(api_key=api_key)
-        legacy_model = legacy_genai.GenerativeModel(model_name=model.strip())
+        legacy_model = pool.legacy_model(api_key, model)
         response = legacy_model.generate_content(prompt)
         text = getattr(response, "text", None)
         if text:
+            pool.mark_online()
             return str(text)
-    except Exception:
+    except ImportError:
         pass
+    except Exception as exc:
+        last_error = exc
+        pool.discard(api_key, model, FLAVOR_LEGACY)
 
     raise RuntimeError(
         "AI request failed. Check your connection and try again. It is possible that the rate limit has been exceeded or the model is unavailable. Please try again later."
-    )
+    ) from last_error
 
 
 def _split_for_live_ui(text: str) -> Iterator[str]:
@@ -191,16 +209,15 @@ def _split_for_live_ui(text: str) -> Iterator[str]:
         yield " ".join(chunk)
 
 
-def _generate_stream(prompt: str, api_key: str, model: str) -> Iterator[str]:
+def _generate_stream(prompt: str, api_key: str, model: str, *, pool: AIClientPool | None = None) -> Iterator[str]:
     if not api_key:
         raise RuntimeError(MISSING_API_KEY_MESSAGE)
     if not model.strip():
         raise RuntimeError("AI model is not configured. Set it in Settings > AI & Updates.")
+    pool = pool or shared_client_pool()
 
     try:
-        from google import genai  # type: ignore
-
-        client = genai.Client(api_key=api_key)
+        client = pool.genai_client(api_key, model.strip())
         stream = client.models.generate_content_stream(
             model=model.strip(),
             contents=prompt,
@@ -209,18 +226,38 @@ def _generate_stream(prompt: str, api_key: str, model: str) -> Iterator[str]:
         for chunk in stream:
             text = str(getattr(chunk, "text", "") or "")
             if text:
+                if not yielded:
+                    pool.mark_online()
                 yielded = True
                 yield text
         if yielded:
             return
-    except Exception:
+    except ImportError:
         pass
+    except Exception:
+        pool.discard(api_key, model.strip(), FLAVOR_GENAI)
 
-    text = _generate_sync(prompt, api_key, model)
+    text = _generate_sync(prompt, api_key, model, pool=pool)
     for piece in _split_for_live_ui(text):
         yield piece
 
 
+class GeminiProvider(AIProvider):
+    """Google Gemini through the pooled ``google-genai`` / ``google-generativeai`` SDKs."""
+
+    name = PROVIDER_GEMINI
+
+    def __init__(self, api_key: str, *, pool: AIClientPool | None = None) -> None:
+        self.api_key = api_key
+        self.pool = pool
+
+    def generate(self, prompt: str, model: str) -> str:
+        return _generate_sync(prompt, self.api_key, model, pool=self.pool)
+
+    def stream(self, prompt: str, model: str) -> Iterator[str]:
+        return _generate_stream(prompt, self.api_key, model, pool=self.pool)
+
+
 class AIResultDialog(QDialog):
     def __init__(self, parent, title: str, text: str) -> None:
         super().__init__(parent)
@@ -308,6 +345,10 @@ class AIController:
         self._active_stream_thread: QThread | None = None
         self._app_metadata_block = self._build_app_metadata_block()
         self._ai_request_counter = 0
+        self._client_pool = shared_client_pool()
+        self._response_cache: AIResponseCache | None = None
+        self._rate_limiter = ProviderRateLimiter()
+        self.metrics_ledger = AIMetricsLedger(get_ai_metrics_dir_path())
 
     def _log_ai(self, message: str) -> None:
         if not bool(self.window.settings.get("ai_verbose_logging", False)):
@@ -405,8 +446,20 @@ class AIController:
         return str(os.getenv("GEMINI_API_KEY", "")).strip()
 
     def _model(self) -> str:
+        if self._provider_name() == PROVIDER_LOCAL:
+            return LOCAL_MODEL_NAME
         return str(self.window.settings.get("ai_model", "gemini-3-flash-preview") or "gemini-3-flash-preview")
 
+    def _provider_name(self) -> str:
+        name = str(self.window.settings.get("ai_provider", PROVIDER_GEMINI) or PROVIDER_GEMINI).strip().lower()
+        return name if name in {PROVIDER_GEMINI, PROVIDER_LOCAL} else PROVIDER_GEMINI
+
+    def _provider(self) -> AIProvider:
+        """Backend for the next request; rebuilt per request so setting changes apply immediately."""
+        if self._provider_name() == PROVIDER_LOCAL:
+            return LocalAIProvider.from_settings(self.window.settings)
+        return GeminiProvider(self._api_key(), pool=self._client_pool)
+
     def _ai_private_mode_enabled(self) -> bool:
         return bool(self.window.settings.get("ai_private_mode", False))
 
@@ -422,7 +475,7 @@ class AIController:
 
     @staticmethod
     def _estimate_tokens(text: str) -> int:
-        return max(1, int(len(text) / 4)) if text else 0
+        return estimate_tokens(text)
 
     def _record_ai_metrics(self, *, action: str, prompt: str, response: str, model: str) -> None:
         tokens = self._estimate_tokens(prompt) + self._estimate_tokens(response)
@@ -449,11 +502,55 @@ class AIController:
                 "response_preview": response[:200],
             }
         )
+        # Persisted with the next regular settings save; timings go to the metrics ledger.
         self.window.settings["ai_action_history"] = history[-300:]
-        if hasattr(self.window, "save_settings_to_disk"):
-            self.window.save_settings_to_disk()
 
-    def _prepare_prompt_for_send(self, prompt: str, action_title: str) -> str | None:
+    def _record_ai_timing(
+        self,
+        *,
+        action: str,
+        model: str,
+        started: float,
+        finished: float | None = None,
+        first_token: float | None = None,
+        prompt: str = "",
+        response: str = "",
+        status: str = STATUS_OK,
+        cache_hit: bool = False,
+        retries: int = 0,
+    ) -> None:
+        """Append one request to the metrics ledger; times are ``time.monotonic()`` values."""
+        end = time.monotonic() if finished is None else finished
+        try:
+            self.metrics_ledger.record(
+                action=action,
+                model=model,
+                status=status,
+                latency_ms=(end - started) * 1000.0,
+                ttft_ms=(first_token - started) * 1000.0 if first_token is not None else None,
+                prompt_chars=len(prompt),
+                response_chars=len(response),
+                prompt_tokens=self._estimate_tokens(prompt),
+                response_tokens=self._estimate_tokens(response),
+                cache_hit=cache_hit,
+                retries=retries,
+            )
+        except Exception:
+            _LOGGER.debug("AI metrics ledger record failed action=%r", action, exc_info=True)
+
+    def _context_budget_tokens(self) -> int:
+        try:
+            return max(1000, int(self.window.settings.get("ai_context_budget_tokens", DEFAULT_CONTEXT_BUDGET_TOKENS) or 0))
+        except (TypeError, ValueError):
+            return DEFAULT_CONTEXT_BUDGET_TOKENS
+
+    def _prepare_prompt_for_send(
+        self,
+        prompt: str,
+        action_title: str,
+        *,
+        context_sources: list[ContextSource] | None = None,
+    ) -> str | None:
         candidate = prompt.strip()
         if not candidate:
             self._log_ai(f"prepare prompt skipped (empty) action={action_title!r}")
@@ -462,18 +559,28 @@ class AIController:
             f"prepare prompt action={action_title!r} chars={len(candidate)}"
         )
         app_name = str(QApplication.applicationName() or "Pypad").strip() or "Pypad"
-        self.window.settings["ai_last_prompt_app_name"] = app_name
-        if hasattr(self.window, "save_settings_to_disk"):
-            self.window.save_settings_to_disk()
-        blocks = [
-            self._app_metadata_block,
-            self._build_app_knowledge_block(),
-            self._build_user_knowledge_block(),
-            self._build_advanced_personality_block(),
-            self._build_runtime_context_block(),
-            candidate,
+        if self.window.settings.get("ai_last_prompt_app_name") != app_name:
+            self.window.settings["ai_last_prompt_app_name"] = app_name
+            if hasattr(self.window, "save_settings_to_disk"):
+                self.window.save_settings_to_disk()
+        # Stable sources come first in a fixed order so consecutive requests share a
+        # byte-identical prefix that provider-side prompt caching can reuse.
+        sources = [
+            ContextSource("app_metadata", self._app_metadata_block, priority=100, stable=True, required=True),
+            ContextSource("app_knowledge", self._build_app_knowledge_block(), priority=40, stable=True),
+            ContextSource("user_knowledge", self._build_user_knowledge_block(), priority=90, stable=True),
+            ContextSource("personality", self._build_advanced_personality_block(), priority=85, stable=True),
+            *(context_sources or []),
+            ContextSource("runtime_context", self._build_runtime_context_block(), priority=70),
+            ContextSource("prompt", candidate, priority=100, required=True),
         ]
-        candidate = "\n\n".join(part for part in blocks if str(part).strip())
+        assembled = assemble_context(sources, budget_tokens=self._context_budget_tokens())
+        candidate = assembled.text
+        self._log_ai(
+            f"context assembled action={action_title!r} tokens={assembled.tokens} prefix_tokens={assembled.prefix_tokens} "
+            f"dropped={','.join(assembled.dropped) or '-'} truncated={','.join(assembled.truncated) or '-'} "
+            f"deduped_blocks={assembled.deduped_blocks}"
+        )
         redacted, changes = sanitize_prompt_text(candidate, self.window.settings)
         if not changes:
             self._log_ai(
@@ -492,14 +599,147 @@ class AIController:
             self._log_ai(f"redaction preview accepted action={action_title!r}")
         return redacted
 
-    @staticmethod
-    def _has_internet_connection(timeout_sec: float = 0.8) -> bool:
+    def _response_cache_for_settings(self) -> AIResponseCache | None:
+        settings = self.window.settings
+        if not bool(settings.get("ai_response_cache_enabled", True)):
+            return None
+        if self._provider_name() == PROVIDER_LOCAL:
+            # Simulated runs measure the full request path; a cache hit would skip it.
+            return None
         try:
-            sock = socket.create_connection(("1.1.1.1", 53), timeout=timeout_sec)
-            sock.close()
+            ttl_sec = max(0.0, float(settings.get("ai_response_cache_ttl_hours", 24) or 0)) * 3600.0
+            max_bytes = int(max(0.0, float(settings.get("ai_response_cache_max_mb", 32) or 0)) * 1024 * 1024)
+        except (TypeError, ValueError):
+            ttl_sec, max_bytes = 24 * 3600.0, 32 * 1024 * 1024
+        if self._response_cache is None:
+            self._response_cache = AIResponseCache(get_ai_response_cache_dir_path(), max_bytes=max_bytes, ttl_sec=ttl_sec)
+        else:
+            self._response_cache.configure(max_bytes=max_bytes, ttl_sec=ttl_sec)
+        return self._response_cache
+
+    def _lookup_cached_response(self, cache: AIResponseCache | None, key: str, action_name: str, *, use_cache: bool) -> str | None:
+        if cache is None or not use_cache:
+            return None
+        text = cache.get(key)
+        if text is not None:
+            self._log_ai(f"cache hit action={action_name!r} key={key[:12]} chars={len(text)}")
+        return text
+
+    def _store_cached_response(self, cache: AIResponseCache | None, key: str, text: str, model: str) -> None:
+        if cache is None or not str(text or "").strip():
+            return
+        cache.put(key, text, model=model)
+
+    def clear_response_cache(self) -> None:
+        """Delete every cached reply on disk, also while the cache is switched off."""
+        cache = self._response_cache or AIResponseCache(get_ai_response_cache_dir_path())
+        cache.clear()
+
+    def _has_internet_connection(self) -> bool:
+        if self._provider_name() == PROVIDER_LOCAL:
             return True
-        except OSError:
-            return False
+        # Cached for a short TTL by the client pool instead of probing on every request.
+        return self._client_pool.is_online()
+
+    def has_internet_connection(self) -> bool:
+        return self._has_internet_connection()
+
+    def prewarm_client(self) -> None:
+        """Warm the pooled SDK client for the configured key/model ahead of a request."""
+        if self._ai_private_mode_enabled() or self._provider_name() == PROVIDER_LOCAL:
+            return
+        if self._client_pool.prewarm(self._api_key(), self._model()):
+            self._log_ai(f"client prewarm started model={self._model()!r}")
+
+    def start_job_batch(
+        self,
+        action_name: str,
+        requests: list[tuple[str, str]],
+        *,
+        on_event: Callable[[AIJob], None],
+        on_ready: Callable[[AIJob], None],
+    ) -> AIJobScheduler | None:
+        """Run independent ``(label, prompt)`` requests concurrently.
+
+        Prompts are prepared (and redaction-previewed) up front on the UI thread.
+        ``on_event`` and ``on_ready`` are invoked on the UI thread; ``on_ready`` sees
+        settled jobs in submission order. Returns None when nothing was started.
+        """
+        if self._guard_ai_private_mode(action_name):
+            return None
+        if not self._has_internet_connection():
+            QMessageBox.information(self.window, action_name, "You're offline! Check your connection and try again.")
+            return None
+        prepared: list[tuple[str, str]] = []
+        for label, prompt in requests:
+            text = self._prepare_prompt_for_send(prompt, action_name)
+            if text:
+                prepared.append((label, text))
+            else:
+                self._log_ai(f"batch job skipped (prepare failed) action={action_name!r} label={label!r}")
+        if not prepared:
+            return None
+        settings = self.window.settings
+        try:
+            concurrency = int(settings.get("ai_batch_max_concurrency", 3) or 3)
+            rpm = float(settings.get("ai_requests_per_minute", 0) or 0)
+        except (TypeError, ValueError):
+            concurrency, rpm = 3, 0.0
+        provider = self._provider()
+        self._rate_limiter.set_limit(provider.name, rpm)
+        model = self._model()
+        cache = self._response_cache_for_settings()
+
+        def _run(job: AIJob) -> str:
+            prompt = str(job.payload)
+            key = response_cache_key(model, prompt) if cache is not None else ""
+            if cache is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    job.cache_hit = True
+                    return cached
+            text = provider.generate(prompt, model)
+            if cache is not None:
+                cache.put(key, text, model=model)
+            return text
+
+        def _event(job: AIJob) -> None:
+            QTimer.singleShot(0, self.window, lambda: on_event(job))
+
+        def _ready(job: AIJob) -> None:
+            def _apply() -> None:
+                if job.status == JOB_DONE:
+                    self._record_ai_metrics(action=action_name, prompt=str(job.payload), response=job.result, model=model)
+                if job.started_at:
+                    self._record_ai_timing(
+                        action=action_name,
+                        model=model,
+                        started=job.started_at,
+                        finished=job.finished_at or None,
+                        prompt=str(job.payload),
+                        response=job.result,
+                        status={JOB_DONE: STATUS_OK, JOB_CANCELLED: STATUS_CANCELLED}.get(job.status, STATUS_ERROR),
+                        cache_hit=job.cache_hit,
+                        retries=max(0, job.attempts - 1),
+                    )
+                self._log_ai(f"batch job settled action={action_name!r} label={job.label!r} status={job.status}")
+                on_ready(job)
+
+            QTimer.singleShot(0, self.window, _apply)
+
+        scheduler = AIJobScheduler(
+            _run,
+            max_concurrency=concurrency,
+            limiter=self._rate_limiter,
+            on_event=_event,
+            on_ready=_ready,
+        )
+        self._log_ai(
+            f"batch start action={action_name!r} jobs={len(prepared)} concurrency={scheduler.max_concurrency} rpm={rpm:g} model={model!r}"
+        )
+        for label, prompt in prepared:
+            scheduler.submit(label, prompt, provider=provider.name)
+        return scheduler
 
     def _start_stream_generation(
         self,
@@ -511,6 +751,9 @@ class AIController:
         on_cancel: Callable[[str], None] | None = None,
         *,
         debug_correlation_id: str | None = None,
+        use_cache: bool = True,
+        on_cached: Callable[[], None] | None = None,
+        context_sources: list[ContextSource] | None = None,
     ) -> None:
         self._ai_request_counter += 1
         request_id = self._ai_request_counter
@@ -518,12 +761,30 @@ class AIController:
             self._log_ai(f"stream start blocked (offline) action={action_name!r} id={request_id}")
             on_error("You're offline! Check your connection and try again.")
             return
-        prepared_prompt = self._prepare_prompt_for_send(prompt, action_name)
+        prepared_prompt = self._prepare_prompt_for_send(prompt, action_name, context_sources=context_sources)
         if not prepared_prompt:
             self._log_ai(f"stream start canceled (prepare failed) action={action_name!r} id={request_id}")
             return
-        api_key = self._api_key()
+        provider = self._provider()
         model = self._model()
+        cache = self._response_cache_for_settings()
+        cache_key = response_cache_key(model, prepared_prompt) if cache is not None else ""
+        started = time.monotonic()
+        cached = self._lookup_cached_response(cache, cache_key, action_name, use_cache=use_cache)
+        if cached is not None:
+            self._record_ai_timing(
+                action=action_name, model=model, started=started, prompt=prepared_prompt, response=cached, cache_hit=True
+            )
+
+            def _deliver_cached() -> None:
+                if on_cached is not None:
+                    on_cached()
+                on_chunk(cached)
+                on_done(cached)
+                self.window.show_status_message("AI response served from cache.", 3000)
+
+            QTimer.singleShot(0, self.window, _deliver_cached)
+            return
         self._log_ai(
             f"stream start action={action_name!r} id={request_id} model={model!r} prompt_chars={len(prepared_prompt)}"
         )
@@ -538,9 +799,21 @@ class AIController:
         )
 
         thread = QThread(self.window)
-        worker = _AIStreamWorker(prepared_prompt, api_key, model)
+        worker = _AIStreamWorker(prepared_prompt, provider, model)
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
+        first_token: list[float] = []
+
+        def _record_timing(text: str, status: str) -> None:
+            self._record_ai_timing(
+                action=action_name,
+                model=model,
+                started=started,
+                first_token=first_token[0] if first_token else None,
+                prompt=prepared_prompt,
+                response=text,
+                status=status,
+            )
 
         def _run_ui(action: Callable[[], None]) -> None:
             # Stream worker signals are connected to Python callables; without an explicit
@@ -548,6 +821,9 @@ class AIController:
             QTimer.singleShot(0, self.window, action)
 
         def _dispatch_chunk(piece: str) -> None:
+            if piece and not first_token:
+                first_token.append(time.monotonic())
+
             def _apply() -> None:
                 _LOGGER.debug(
                     "AIController stream callback on_chunk action=%r id=%d chars=%d",
@@ -600,6 +876,12 @@ class AIController:
                 lambda text=text: self._record_ai_metrics(action=action_name, prompt=prepared_prompt, response=text, model=model)
             )
         )
+        worker.finished.connect(lambda text: _record_timing(text, STATUS_OK))
+        worker.failed.connect(lambda _message: _record_timing("", STATUS_ERROR))
+        worker.cancelled.connect(lambda text: _record_timing(text, STATUS_CANCELLED))
+        worker.finished.connect(
+            lambda text: _run_ui(lambda text=text: self._store_cached_response(cache, cache_key, text, model))
+        )
         worker.finished.connect(
             lambda text: _run_ui(
                 lambda text=text: self._log_ai(
@@ -668,6 +950,7 @@ class AIController:
         auto_insert: bool = False,
         on_result: Callable[[str], None] | None = None,
         on_error: Callable[[str], None] | None = None,
+        use_cache: bool = True,
     ) -> None:
         self._ai_request_counter += 1
         request_id = self._ai_request_counter
@@ -683,19 +966,45 @@ class AIController:
         if not prepared_prompt:
             self._log_ai(f"start canceled (prepare failed) action={action_name!r} id={request_id}")
             return
-        api_key = self._api_key()
+        provider = self._provider()
         model = self._model()
+        cache = self._response_cache_for_settings()
+        cache_key = response_cache_key(model, prepared_prompt) if cache is not None else ""
+        started = time.monotonic()
+        cached = self._lookup_cached_response(cache, cache_key, action_name, use_cache=use_cache)
+        if cached is not None:
+            self._record_ai_timing(
+                action=action_name, model=model, started=started, prompt=prepared_prompt, response=cached, cache_hit=True
+            )
+            self.window.show_status_message("AI response served from cache.", 3000)
+            QTimer.singleShot(
+                0,
+                self.window,
+                lambda: self._on_result(None, result_title, cached, auto_insert, on_result=on_result),
+            )
+            return
         self._log_ai(
             f"start action={action_name!r} id={request_id} model={model!r} prompt_chars={len(prepared_prompt)}"
         )
 
         thread = QThread(self.window)
-        worker = _AIWorker(prepared_prompt, api_key, model)
+        worker = _AIWorker(prepared_prompt, provider, model)
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
         worker.finished.connect(
             lambda text: self._record_ai_metrics(action=action_name, prompt=prepared_prompt, response=text, model=model)
         )
+        worker.finished.connect(
+            lambda text: self._record_ai_timing(
+                action=action_name, model=model, started=started, prompt=prepared_prompt, response=text
+            )
+        )
+        worker.failed.connect(
+            lambda _message: self._record_ai_timing(
+                action=action_name, model=model, started=started, prompt=prepared_prompt, status=STATUS_ERROR
+            )
+        )
+        worker.finished.connect(lambda text: self._store_cached_response(cache, cache_key, text, model))
         worker.finished.connect(
             lambda text: self._log_ai(
                 f"finished action={action_name!r} id={request_id} chars={len(text)}"
@@ -736,7 +1045,7 @@ class AIController:
 
     def _on_result(
         self,
-        _thread: QThread,
+        _thread: QThread | None,
         title: str,
         text: str,
         auto_insert: bool,
@@ -924,6 +1233,9 @@ class AIController:
         on_cancel: Callable[[str], None] | None = None,
         *,
         debug_correlation_id: str | None = None,
+        use_cache: bool = True,
+        on_cached: Callable[[], None] | None = None,
+        context_sources: list[ContextSource] | None = None,
     ) -> None:
         if self._guard_ai_private_mode("AI Chat"):
             return
@@ -941,6 +1253,9 @@ class AIController:
             on_error,
             on_cancel=on_cancel,
             debug_correlation_id=debug_correlation_id,
+            use_cache=use_cache,
+            on_cached=on_cached,
+            context_sources=context_sources,
         )
 
     def cancel_active_chat_request(self) -> bool:
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from pypad.logging_utils import get_logger
+
+_LOGGER = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_RETRYING = "retrying"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINAL_JOB_STATES = frozenset({JOB_DONE, JOB_FAILED, JOB_CANCELLED})
+
+DEFAULT_MAX_CONCURRENCY = 3
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_BACKOFF_SEC = 2.0
+DEFAULT_MAX_BACKOFF_SEC = 60.0
+
+RETRYABLE_STATUS_CODES = frozenset({429, 503})
+_RETRYABLE_MESSAGE_RE = re.compile(
+    r"\b(?:429|503)\b|RESOURCE_EXHAUSTED|\bUNAVAILABLE\b|too many requests|rate limit exceeded|overloaded",
+    re.IGNORECASE,
+)
+
+
+def _exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def is_retryable_ai_error(exc: BaseException) -> bool:
+    """True for rate-limit / overload failures (HTTP 429 or 503) worth retrying.
+
+    SDK errors carry the status as ``code``/``status_code``; the controller wraps them
+    in a generic RuntimeError, so the whole cause chain is inspected. Only the root
+    cause's message is pattern-matched, never the user-facing wrapper text.
+    """
+    chain = list(_exception_chain(exc))
+    for item in chain:
+        for attr in ("code", "status_code", "status"):
+            value = getattr(item, attr, None)
+            try:
+                if int(value) in RETRYABLE_STATUS_CODES:  # type: ignore[arg-type]
+                    return True
+            except (TypeError, ValueError):
+                continue
+    return bool(_RETRYABLE_MESSAGE_RE.search(str(chain[-1])))
+
+
+class ProviderRateLimiter:
+    """Spaces request starts per provider and holds everyone back after a 429.
+
+    Shared by all schedulers so concurrent batches draw from the same budget.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rpm: dict[str, float] = {}
+        self._next_at: dict[str, float] = {}
+
+    def set_limit(self, provider: str, requests_per_minute: float) -> None:
+        with self._lock:
+            self._rpm[provider] = max(0.0, float(requests_per_minute or 0))
+
+    def reserve(self, provider: str) -> float:
+        """Claim the next start slot for ``provider``; returns seconds to wait for it."""
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_at.get(provider, now))
+            rpm = self._rpm.get(provider, 0.0)
+            self._next_at[provider] = start + (60.0 / rpm if rpm > 0 else 0.0)
+            return start - now
+
+    def acquire(self, provider: str, cancel_event: threading.Event) -> bool:
+        """Block until a slot is free. Returns False if cancelled while waiting."""
+        delay = self.reserve(provider)
+        if delay > 0 and cancel_event.wait(delay):
+            return False
+        return not cancel_event.is_set()
+
+    def penalize(self, provider: str, delay: float) -> None:
+        with self._lock:
+            until = self._clock() + max(0.0, delay)
+            self._next_at[provider] = max(self._next_at.get(provider, 0.0), until)
+
+
+@dataclass(eq=False)
+class AIJob:
+    job_id: int
+    label: str
+    payload: object
+    provider: str = "gemini"
+    status: str = JOB_QUEUED
+    attempts: int = 0
+    result: str = ""
+    error: str = ""
+    retry_in: float = 0.0
+    cache_hit: bool = False
+    # time.monotonic() of the first attempt's start and of settling; 0.0 until then.
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL_JOB_STATES
+
+
+class AIJobScheduler:
+    """Runs AI jobs on up to ``max_concurrency`` background threads.
+
+    ``run_job`` performs one blocking request and returns its text. Rate-limited or
+    overloaded requests are retried with exponential backoff and jitter. ``on_event``
+    fires on every status change (from a worker thread); ``on_ready`` receives
+    settled jobs strictly in submission order, so results can be applied in order
+    while later jobs are still running.
+    """
+
+    def __init__(
+        self,
+        run_job: Callable[[AIJob], str],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_backoff_sec: float = DEFAULT_BASE_BACKOFF_SEC,
+        max_backoff_sec: float = DEFAULT_MAX_BACKOFF_SEC,
+        limiter: ProviderRateLimiter | None = None,
+        on_event: Callable[[AIJob], None] | None = None,
+        on_ready: Callable[[AIJob], None] | None = None,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self._run_job = run_job
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self.base_backoff_sec = max(0.0, float(base_backoff_sec))
+        self.max_backoff_sec = max(self.base_backoff_sec, float(max_backoff_sec))
+        self._limiter = limiter or ProviderRateLimiter()
+        self._on_event = on_event
+        self._on_ready = on_ready
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self._settled = threading.Condition(self._lock)
+        self._release_lock = threading.Lock()
+        self._jobs: list[AIJob] = []
+        self._pending: deque[AIJob] = deque()
+        self._workers = 0
+        self._released = 0
+
+    def jobs(self) -> list[AIJob]:
+        with self._lock:
+            return list(self._jobs)
+
+    def submit(self, label: str, payload: object, *, provider: str = "gemini") -> AIJob:
+        with self._lock:
+            job = AIJob(job_id=len(self._jobs), label=label, payload=payload, provider=provider)
+            self._jobs.append(job)
+            self._pending.append(job)
+            start_worker = self._workers < self.max_concurrency
+            if start_worker:
+                self._workers += 1
+        self._emit(job)
+        if start_worker:
+            threading.Thread(target=self._worker, name="pypad-ai-job", daemon=True).start()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        with self._lock:
+            if not (0 <= job_id < len(self._jobs)):
+                return False
+            job = self._jobs[job_id]
+            if job.finished:
+                return False
+            job.status = JOB_CANCELLED
+            job.finished_at = time.monotonic()
+            job.cancel_event.set()
+            self._settled.notify_all()
+        self._emit(job)
+        self._release_ready()
+        return True
+
+    def cancel_all(self) -> int:
+        return sum(1 for job in self.jobs() if self.cancel(job.job_id))
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until every submitted job has settled; mainly for tests and shutdown."""
+        with self._settled:
+            return self._settled.wait_for(lambda: all(job.finished for job in self._jobs), timeout)
+
+    def backoff_delay(self, attempt: int) -> float:
+        ceiling = min(self.max_backoff_sec, self.base_backoff_sec * (2 ** max(0, attempt - 1)))
+        # Full jitter in the upper half keeps parallel retries from re-colliding.
+        return ceiling * (0.5 + 0.5 * self._jitter())
+
+    def _emit(self, job: AIJob) -> None:
+        if self._on_event is None:
+            return
+        try:
+            self._on_event(job)
+        except Exception:
+            _LOGGER.exception("AI job event handler failed job=%s", job.job_id)
+
+    def _finish(self, job: AIJob, status: str, *, result: str = "", error: str = "") -> None:
+        with self._lock:
+            if job.finished:  # cancelled while the request was in flight
+                return
+            job.status = status
+            job.result = result
+            job.error = error
+            job.retry_in = 0.0
+            job.finished_at = time.monotonic()
+            self._settled.notify_all()
+        self._emit(job)
+        self._release_ready()
+
+    def _release_ready(self) -> None:
+        with self._release_lock:
+            with self._lock:
+                ready: list[AIJob] = []
+                while self._released < len(self._jobs) and self._jobs[self._released].finished:
+                    ready.append(self._jobs[self._released])
+                    self._released += 1
+            if self._on_ready is None:
+                return
+            for job in ready:
+                try:
+                    self._on_ready(job)
+                except Exception:
+                    _LOGGER.exception("AI job result handler failed job=%s", job.job_id)
+
+    def _worker(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._workers -= 1
+                    return
+                job = self._pending.popleft()
+            if not job.finished:
+                self._run(job)
+
+    def _run(self, job: AIJob) -> None:
+        while True:
+            if not self._limiter.acquire(job.provider, job.cancel_event):
+                return
+            with self._lock:
+                if job.finished:
+                    return
+                job.attempts += 1
+                if not job.started_at:
+                    job.started_at = time.monotonic()
+                job.status = JOB_RUNNING
+                job.retry_in = 0.0
+            self._emit(job)
+            try:
+                text = self._run_job(job)
+            except Exception as exc:  # noqa: BLE001
+                if job.cancel_event.is_set():
+                    return
+                if job.attempts > self.max_retries or not is_retryable_ai_error(exc):
+                    self._finish(job, JOB_FAILED, error=str(exc))
+                    return
+                delay = self.backoff_delay(job.attempts)
+                with self._lock:
+                    if job.finished:
+                        return
+                    job.status = JOB_RETRYING
+                    job.error = str(exc)
+                    job.retry_in = delay
+                self._emit(job)
+                self._limiter.penalize(job.provider, delay)
+                _LOGGER.debug("AI job %s retrying in %.1fs after attempt %d", job.job_id, delay, job.attempts)
+                if job.cancel_event.wait(delay):
+                    return
+                continue
+            self._finish(job, JOB_DONE, result=str(text or ""))
+            return
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from pypad.logging_utils import get_logger
+
+_LOGGER = get_logger(__name__)
+
+LEDGER_FORMAT_VERSION = 1
+DEFAULT_LEDGER_MAX_BYTES = 1024 * 1024
+DEFAULT_LEDGER_BACKUPS = 3
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_CANCELLED = "cancelled"
+
+
+def percentile(values: Iterable[float], q: float) -> float | None:
+    """Linearly interpolated percentile (``q`` in 0..100); None for no values."""
+    ordered = sorted(float(v) for v in values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * max(0.0, min(100.0, q)) / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class AIMetricsLedger:
+    """Append-only JSON-lines ledger of AI request timings, kept outside settings.
+
+    ``ledger.jsonl`` is rotated to ``ledger.1.jsonl`` ... ``ledger.<backups>.jsonl`` once
+    it grows past ``max_bytes``, so the history stays bounded without rewriting it.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_bytes: int = DEFAULT_LEDGER_MAX_BYTES,
+        backups: int = DEFAULT_LEDGER_BACKUPS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(1024, int(max_bytes))
+        self.backups = max(0, int(backups))
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.root / "ledger.jsonl"
+
+    def _backup_path(self, index: int) -> Path:
+        return self.root / f"ledger.{index}.jsonl"
+
+    def record(
+        self,
+        *,
+        action: str,
+        model: str,
+        status: str = STATUS_OK,
+        latency_ms: float,
+        ttft_ms: float | None = None,
+        prompt_chars: int = 0,
+        response_chars: int = 0,
+        prompt_tokens: int = 0,
+        response_tokens: int = 0,
+        cache_hit: bool = False,
+        retries: int = 0,
+    ) -> dict[str, object]:
+        latency_ms = max(0.0, float(latency_ms))
+        # Throughput covers generation only: after the first token when streaming.
+        generating_ms = latency_ms - float(ttft_ms) if ttft_ms is not None else latency_ms
+        tokens_per_sec = response_tokens / (generating_ms / 1000.0) if generating_ms > 0 and response_tokens else None
+        row: dict[str, object] = {
+            "v": LEDGER_FORMAT_VERSION,
+            "ts": round(self._clock(), 3),
+            "action": str(action or ""),
+            "model": str(model or ""),
+            "status": str(status or STATUS_OK),
+            "latency_ms": round(latency_ms, 1),
+            "ttft_ms": round(float(ttft_ms), 1) if ttft_ms is not None else None,
+            "tokens_per_sec": round(tokens_per_sec, 2) if tokens_per_sec is not None else None,
+            "prompt_chars": int(prompt_chars),
+            "response_chars": int(response_chars),
+            "prompt_tokens": int(prompt_tokens),
+            "response_tokens": int(response_tokens),
+            "cache_hit": bool(cache_hit),
+            "retries": max(0, int(retries)),
+        }
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._rotate_locked(len(line.encode("utf-8")))
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.write(line)
+            except Exception:
+                _LOGGER.exception("Failed to append AI metrics ledger entry %s", self.path)
+        return row
+
+    def _rotate_locked(self, incoming: int) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            self.path.unlink()
+            return
+        self._backup_path(self.backups).unlink(missing_ok=True)
+        for index in range(self.backups - 1, 0, -1):
+            src = self._backup_path(index)
+            if src.exists():
+                src.replace(self._backup_path(index + 1))
+        self.path.replace(self._backup_path(1))
+
+    def read(self, *, since: float | None = None) -> list[dict[str, object]]:
+        """All records, oldest first, optionally only those with ``ts >= since``."""
+        paths = [self._backup_path(i) for i in range(self.backups, 0, -1)] + [self.path]
+        rows: list[dict[str, object]] = []
+        with self._lock:
+            for path in paths:
+                try:
+                    with path.open("r", encoding="utf-8") as handle:
+                        for line in handle:
+                            try:
+                                row = json.loads(line)
+                            except ValueError:
+                                continue
+                            if not isinstance(row, dict):
+                                continue
+                            if since is not None and float(row.get("ts", 0) or 0) < since:
+                                continue
+                            rows.append(row)
+                except FileNotFoundError:
+                    continue
+                except Exception:
+                    _LOGGER.exception("Failed to read AI metrics ledger %s", path)
+        return rows
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in [self.path] + [self._backup_path(i) for i in range(1, self.backups + 1)]:
+                path.unlink(missing_ok=True)
+
+
+def _values(rows: list[dict[str, object]], key: str) -> list[float]:
+    out: list[float] = []
+    for row in rows:
+        value = row.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            out.append(float(value))
+    return out
+
+
+def summarize_metrics(rows: list[dict[str, object]]) -> list[dict[str, object]]:
+    """Per ``(model, action)`` request counts and latency percentiles, busiest first.
+
+    Cache hits count towards the hit rate but not the network latency percentiles.
+    """
+    groups: dict[tuple[str, str], list[dict[str, object]]] = {}
+    for row in rows:
+        groups.setdefault((str(row.get("model", "")), str(row.get("action", ""))), []).append(row)
+    out: list[dict[str, object]] = []
+    for (model, action), items in groups.items():
+        live = [row for row in items if not row.get("cache_hit") and row.get("status") == STATUS_OK]
+        latency = _values(live, "latency_ms")
+        out.append(
+            {
+                "model": model,
+                "action": action,
+                "requests": len(items),
+                "errors": sum(1 for row in items if row.get("status") == STATUS_ERROR),
+                "cache_hits": sum(1 for row in items if row.get("cache_hit")),
+                "retries": sum(int(row.get("retries", 0) or 0) for row in items),
+                "latency_p50": percentile(latency, 50),
+                "latency_p90": percentile(latency, 90),
+                "latency_p99": percentile(latency, 99),
+                "ttft_p50": percentile(_values(live, "ttft_ms"), 50),
+                "tokens_per_sec_p50": percentile(_values(live, "tokens_per_sec"), 50),
+            }
+        )
+    out.sort(key=lambda row: (-int(row["requests"]), str(row["model"]), str(row["action"])))
+    return out
+
+
+def metrics_over_time(
+    rows: list[dict[str, object]], *, bucket_sec: float, utc_offset_sec: float = 0.0
+) -> list[dict[str, object]]:
+    """Latency percentiles per time bucket (bucket start as epoch seconds), oldest first.
+
+    ``utc_offset_sec`` aligns day buckets with local midnight instead of UTC.
+    """
+    bucket_sec = max(1.0, float(bucket_sec))
+    buckets: dict[float, list[dict[str, object]]] = {}
+    for row in rows:
+        local = float(row.get("ts", 0) or 0) + utc_offset_sec
+        buckets.setdefault(math.floor(local / bucket_sec) * bucket_sec - utc_offset_sec, []).append(row)
+    out: list[dict[str, object]] = []
+    for start in sorted(buckets):
+        items = buckets[start]
+        live = [row for row in items if not row.get("cache_hit") and row.get("status") == STATUS_OK]
+        latency = _values(live, "latency_ms")
+        out.append(
+            {
+                "start": start,
+                "requests": len(items),
+                "errors": sum(1 for row in items if row.get("status") == STATUS_ERROR),
+                "cache_hits": sum(1 for row in items if row.get("cache_hit")),
+                "latency_p50": percentile(latency, 50),
+                "latency_p90": percentile(latency, 90),
+                "latency_p99": percentile(latency, 99),
+                "ttft_p50": percentile(_values(live, "ttft_ms"), 50),
+            }
+        )
+    return out
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import threading
+import time
+from collections.abc import Iterator, Mapping
+
+PROVIDER_GEMINI = "gemini"
+PROVIDER_LOCAL = "local"
+LOCAL_MODEL_NAME = "local-simulator"
+
+_LOCAL_WORDS = (
+    "buffer cache editor thread signal layout render stream token widget queue index "
+    "commit branch merge parser syntax lexer scope value result error retry latency "
+    "request response window cursor selection document workspace session plugin"
+).split()
+
+
+class AIProvider:
+    """Backend that turns a prepared prompt into text for ``AIController``.
+
+    ``generate`` blocks and ``stream`` yields text pieces; both run on worker threads.
+    Errors are raised as exceptions; a ``code`` attribute of 429/503 marks them as
+    retryable for the batch scheduler.
+    """
+
+    name = ""
+    requires_network = True
+
+    def generate(self, prompt: str, model: str) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str, model: str) -> Iterator[str]:
+        text = self.generate(prompt, model)
+        if text:
+            yield text
+
+
+class LocalAIError(RuntimeError):
+    """Failure injected by the local provider, shaped like an SDK status error."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class LocalAIProvider(AIProvider):
+    """Offline, deterministic stand-in for a model, for load and latency testing.
+
+    Replies with ``canned_response`` or, when that is blank, with ``response_chars``
+    of filler text seeded by ``seed`` and the prompt, so the same prompt always gets
+    the same answer. Streams it in ``chunk_chars`` pieces after ``first_token_ms``,
+    ``chunk_delay_ms`` apart. ``error_percent`` and ``rate_limit_percent`` make that
+    share of requests fail (500 / 429); the failure sequence is also seeded.
+    """
+
+    name = PROVIDER_LOCAL
+    requires_network = False
+
+    def __init__(
+        self,
+        *,
+        canned_response: str = "",
+        response_chars: int = 2000,
+        chunk_chars: int = 24,
+        chunk_delay_ms: float = 30.0,
+        first_token_ms: float = 300.0,
+        error_percent: float = 0.0,
+        rate_limit_percent: float = 0.0,
+        seed: int = 0,
+        sleep=time.sleep,
+    ) -> None:
+        self.canned_response = str(canned_response or "")
+        self.response_chars = max(1, int(response_chars))
+        self.chunk_chars = max(1, int(chunk_chars))
+        self.chunk_delay_ms = max(0.0, float(chunk_delay_ms))
+        self.first_token_ms = max(0.0, float(first_token_ms))
+        self.error_percent = min(100.0, max(0.0, float(error_percent)))
+        self.rate_limit_percent = min(100.0, max(0.0, float(rate_limit_percent)))
+        self.seed = int(seed)
+        self._sleep = sleep
+        self._fault_rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Mapping[str, object]) -> LocalAIProvider:
+        def _number(key: str, default: float) -> float:
+            try:
+                return float(settings.get(key, default) or 0)
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            canned_response=str(settings.get("ai_local_canned_response", "") or ""),
+            response_chars=int(_number("ai_local_response_chars", 2000)),
+            chunk_chars=int(_number("ai_local_chunk_chars", 24)),
+            chunk_delay_ms=_number("ai_local_chunk_delay_ms", 30),
+            first_token_ms=_number("ai_local_first_token_ms", 300),
+            error_percent=_number("ai_local_error_percent", 0),
+            rate_limit_percent=_number("ai_local_rate_limit_percent", 0),
+            seed=int(_number("ai_local_seed", 0)),
+        )
+
+    def response_for(self, prompt: str) -> str:
+        if self.canned_response:
+            return self.canned_response
+        digest = hashlib.sha256(f"{self.seed}\0{prompt}".encode("utf-8", errors="replace")).hexdigest()
+        rng = random.Random(digest)
+        words: list[str] = []
+        size = 0
+        while size < self.response_chars:
+            word = rng.choice(_LOCAL_WORDS)
+            if rng.random() < 0.08:
+                word += "."
+            words.append(word)
+            size += len(word) + 1
+        return " ".join(words)[: self.response_chars].strip()
+
+    def _maybe_fail(self) -> None:
+        with self._lock:
+            roll = self._fault_rng.random() * 100.0
+        if roll < self.rate_limit_percent:
+            raise LocalAIError(429, "429 RESOURCE_EXHAUSTED: local provider rate limit")
+        if roll < self.rate_limit_percent + self.error_percent:
+            raise LocalAIError(500, "Local provider injected failure.")
+
+    def generate(self, prompt: str, model: str) -> str:
+        self._maybe_fail()
+        text = self.response_for(prompt)
+        chunks = -(-len(text) // self.chunk_chars)
+        self._sleep((self.first_token_ms + self.chunk_delay_ms * max(0, chunks - 1)) / 1000.0)
+        return text
+
+    def stream(self, prompt: str, model: str) -> Iterator[str]:
+        self._maybe_fail()
+        text = self.response_for(prompt)
+        for start in range(0, len(text), self.chunk_chars):
+            delay = self.first_token_ms if start == 0 else self.chunk_delay_ms
+            if delay:
+                self._sleep(delay / 1000.0)
+            yield text[start : start + self.chunk_chars]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from pypad.logging_utils import get_logger
+
+_LOGGER = get_logger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_TTL_SEC = 24 * 3600
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def response_cache_key(model: str, prompt: str, params: dict[str, object] | None = None) -> str:
+    """Content address of one request: model, fully rendered prompt and generation params.
+
+    The rendered prompt already carries the system blocks and editor context.
+    """
+    payload = json.dumps(
+        {
+            "v": CACHE_FORMAT_VERSION,
+            "model": str(model or "").strip(),
+            "prompt": str(prompt or ""),
+            "params": dict(params or {}),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache:
+    """Disk cache of AI responses, one JSON file per content-addressed key.
+
+    Entries expire after ``ttl_sec``; once the directory grows past ``max_bytes`` the
+    least recently used entries are evicted. A file's mtime is its last-use time, so
+    the LRU order survives restarts.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ttl_sec: float = DEFAULT_CACHE_TTL_SEC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_sec = max(0.0, float(ttl_sec))
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (size, last_used), oldest first; built from the directory on first use.
+        self._entries: OrderedDict[str, tuple[int, float]] | None = None
+        self._total_bytes = 0
+
+    def configure(self, *, max_bytes: int, ttl_sec: float) -> None:
+        max_bytes = max(0, int(max_bytes))
+        ttl_sec = max(0.0, float(ttl_sec))
+        with self._lock:
+            if (max_bytes, ttl_sec) == (self.max_bytes, self.ttl_sec):
+                return
+            self.max_bytes = max_bytes
+            self.ttl_sec = ttl_sec
+            if self._entries is not None:
+                self._evict_locked()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _load_entries_locked(self) -> OrderedDict[str, tuple[int, float]]:
+        if self._entries is not None:
+            return self._entries
+        rows: list[tuple[float, str, int]] = []
+        try:
+            for path in self.root.glob("*.json"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                rows.append((st.st_mtime, path.stem, st.st_size))
+        except OSError:
+            rows = []
+        rows.sort()
+        self._entries = OrderedDict((key, (size, mtime)) for mtime, key, size in rows)
+        self._total_bytes = sum(size for _mtime, _key, size in rows)
+        return self._entries
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entries = self._load_entries_locked()
+            if key not in entries:
+                return None
+            path = self._path(key)
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except Exception:
+                self._drop_locked(key)
+                return None
+            now = self._clock()
+            created = float(payload.get("created_at", 0.0) or 0.0) if isinstance(payload, dict) else 0.0
+            text = payload.get("text") if isinstance(payload, dict) else None
+            if not isinstance(text, str) or not text or (self.ttl_sec and now - created > self.ttl_sec):
+                self._drop_locked(key)
+                return None
+            size, _last_used = entries.pop(key)
+            entries[key] = (size, now)
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+            return text
+
+    def put(self, key: str, text: str, *, model: str = "") -> None:
+        if not text or self.max_bytes <= 0:
+            return
+        payload = json.dumps(
+            {"version": CACHE_FORMAT_VERSION, "model": str(model or ""), "created_at": self._clock(), "text": text},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            entries = self._load_entries_locked()
+            path = self._path(key)
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".json.tmp")
+                tmp.write_bytes(payload)
+                tmp.replace(path)
+            except Exception:
+                _LOGGER.exception("Failed to write AI response cache entry %s", path)
+                return
+            if key in entries:
+                self._total_bytes -= entries.pop(key)[0]
+            entries[key] = (len(payload), self._clock())
+            self._total_bytes += len(payload)
+            self._evict_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_entries_locked()):
+                self._drop_locked(key)
+
+    def _drop_locked(self, key: str) -> None:
+        entries = self._load_entries_locked()
+        row = entries.pop(key, None)
+        if row is not None:
+            self._total_bytes -= row[0]
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            _LOGGER.debug("Failed to remove AI response cache entry %s", key)
+
+    def _evict_locked(self) -> None:
+        entries = self._load_entries_locked()
+        if self.ttl_sec:
+            horizon = self._clock() - self.ttl_sec
+            # Last-use order is not creation order, but anything unused past the TTL is stale.
+            for key in [key for key, (_size, used) in entries.items() if used < horizon]:
+                self._drop_locked(key)
+        while entries and self._total_bytes > self.max_bytes:
+            self._drop_locked(next(iter(entries)))
@@ -23,13 +23,15 @@ class PaletteItem:
     action: QAction
     shortcut: str = ""
     keywords: str = ""
+    # Lowercased text to match against; built once by the action registry.
+    search_text: str = ""
 
 
-def _score(query: str, candidate: str) -> int:
+def _score(query: str, candidate: str, *, lowered: bool = False) -> int:
     if not query:
         return 0
     q = query.lower().strip()
-    c = candidate.lower()
+    c = candidate if lowered else candidate.lower()
     if q == c:
         return 100
     if c.startswith(q):
@@ -85,8 +87,10 @@ class CommandPaletteDialog(QDialog):
         self.list_widget.clear()
         scored: list[tuple[int, PaletteItem]] = []
         for item in self._items:
-            corpus = f"{item.section} {item.label} {item.shortcut} {item.keywords}".strip()
-            s = _score(query, corpus)
+            if item.search_text:
+                s = _score(query, item.search_text, lowered=True)
+            else:
+                s = _score(query, f"{item.section} {item.label} {item.shortcut} {item.keywords}".strip())
             if query and s < 0:
                 continue
             scored.append((s, item))
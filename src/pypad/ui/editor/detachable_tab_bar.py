@@ -151,8 +151,12 @@ class DetachableTabBar(QTabBar):
 
     def tabLayoutChange(self) -> None:  # type: ignore[override]
         super().tabLayoutChange()
+        # Accessories move with their tabs, so only tabs without one need work here;
+        # restyling every tab on every layout change made adding n tabs O(n^2).
         for index in range(self.count()):
-            self._install_close_button(index)
+            existing = self.tabButton(index, QTabBar.RightSide)
+            if not (isinstance(existing, QWidget) and bool(existing.property("pypad_tab_right_container"))):
+                self._install_close_button(index)
 
     def _emit_close_from_button(self) -> None:
         button = self.sender()
@@ -40,6 +40,9 @@ class EditorTab(QWidget):
         self.last_snapshot_time: float | None = None
         self.syntax_highlighter: Any = None
         self.syntax_language_override: str | None = None
+        self.symbol_model: Any = None
+        self.markdown_renderer: Any = None
+        self.search_highlighter: Any = None
         self.autosave_id: str | None = None
         self.autosave_path: str | None = None
         self.pinned = False
@@ -72,6 +75,11 @@ class EditorTab(QWidget):
         self.tags: list[str] = []
         self.encryption_enabled = False
         self.encryption_password: str | None = None
+        # Restored-session placeholder: the file is read when the tab is first shown.
+        self.session_load_pending = False
+        self.session_view_state: dict[str, Any] | None = None
+        # Left for activation: opening it may prompt, or a background load failed.
+        self.session_load_deferred = False
 
         self._setup_editor_context_menu()
 
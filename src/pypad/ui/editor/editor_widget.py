@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import itertools
+from typing import Any
+
 from PySide6.QtCore import QObject, Signal
 from PySide6.QtGui import QColor, QFont, QFontMetricsF, QTextCursor
 from PySide6.QtWidgets import QTextEdit
 from pypad.ui.editor.scintilla_compat import ScintillaCompatEditor
+from pypad.ui.editor.text_delta import TextChangeLog, TextDelta, diff_text, has_astral_chars
 
 try:
     from PySide6.Qsci import QsciScintilla, QsciAPIs, QsciLexerCustom
@@ -12,6 +16,9 @@ except Exception:  # noqa: BLE001
     QsciAPIs = None
     QsciLexerCustom = None
 
+# Shared by all editors so a revision also identifies its document.
+_REVISIONS = itertools.count(1)
+
 
 class EditorWidget(QObject):
     textChanged = Signal()
@@ -21,9 +28,20 @@ class EditorWidget(QObject):
     undoAvailable = Signal(bool)
     redoAvailable = Signal(bool)
     selectionChanged = Signal()
+    # TextDelta per edit, emitted just before textChanged while delta tracking is on.
+    textDelta = Signal(object)
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
+        self._revision = next(_REVISIONS)
+        self._change_log: TextChangeLog | None = None
+        self._delta_consumers = 0
+        self._delta_pending: list[tuple[int, int, str]] = []
+        self._delta_reset = False
+        self._delta_length = 0
+        self._delta_doc_revision = -1
+        self._delta_astral = False
+        self._delta_shadow: str | None = None
         self._native_scintilla = QsciScintilla is not None
         if QsciScintilla is not None:
             self.widget = QsciScintilla(parent)
@@ -43,6 +61,11 @@ class EditorWidget(QObject):
     def is_native_scintilla(self) -> bool:
         return self._native_scintilla
 
+    @property
+    def revision(self) -> int:
+        """Bumped on every text change; unique across editors. Keys derived caches."""
+        return self._revision
+
     def _wire_scintilla_signals(self) -> None:
         w = self.widget
         if hasattr(w, "textChanged"):
@@ -82,7 +105,91 @@ class EditorWidget(QObject):
         w.redoAvailable.connect(self.redoAvailable)
         w.document().modificationChanged.connect(self.modificationChanged)
 
+    def set_delta_tracking(self, enabled: bool) -> None:
+        """Reference-counted opt-in to ``textDelta``; costs nothing while nobody listens.
+
+        The compatibility backend reports edits from ``QTextDocument.contentsChange``
+        in O(edit). QScintilla has no equivalent signal, so there the text is diffed
+        against a shadow copy on each change. Documents holding characters outside the
+        BMP (where Qt positions count UTF-16 units) fall back to ``reset`` deltas.
+        """
+        was_active = self._delta_consumers > 0
+        self._delta_consumers = max(0, self._delta_consumers + (1 if enabled else -1))
+        active = self._delta_consumers > 0
+        if active == was_active:
+            return
+        self._delta_pending.clear()
+        self._delta_reset = False
+        doc = self.widget.document() if hasattr(self.widget, "document") else None
+        if doc is not None and hasattr(doc, "contentsChange"):
+            if active:
+                self._delta_length = max(0, doc.characterCount() - 1)
+                self._delta_doc_revision = doc.revision()
+                self._delta_astral = has_astral_chars(self.get_text())
+                doc.contentsChange.connect(self._on_contents_change)
+            else:
+                doc.contentsChange.disconnect(self._on_contents_change)
+            return
+        self._delta_shadow = self.get_text() if active else None
+
+    def _on_contents_change(self, position: int, removed: int, added: int) -> None:
+        doc = self.widget.document()
+        new_length = max(0, doc.characterCount() - 1)
+        # Qt counts the implicit final paragraph separator; clamp edits to the real text.
+        added = max(0, min(added, new_length - position))
+        removed = self._delta_length + added - new_length
+        self._delta_length = new_length
+        doc_revision = doc.revision()
+        if removed == added and (added == 0 or doc_revision == self._delta_doc_revision):
+            return  # formatting-only change (e.g. a highlighter marking blocks dirty)
+        self._delta_doc_revision = doc_revision
+        if self._delta_astral or removed < 0:
+            self._delta_reset = True
+            return
+        inserted = ""
+        if added:
+            cursor = QTextCursor(doc)
+            cursor.setPosition(position)
+            cursor.setPosition(position + added, QTextCursor.MoveMode.KeepAnchor)
+            inserted = cursor.selection().toPlainText()
+            if has_astral_chars(inserted):
+                self._delta_astral = True
+                self._delta_reset = True
+                return
+        self._delta_pending.append((position, removed, inserted))
+
+    def _flush_text_deltas(self) -> None:
+        revision = self._revision
+        if self._delta_shadow is not None:
+            text = self.get_text()
+            position, removed, inserted = diff_text(self._delta_shadow, text)
+            self._delta_shadow = text
+            self.textDelta.emit(TextDelta(revision, position, removed, inserted))
+            return
+        if self._delta_reset:
+            text = self.get_text()
+            self._delta_astral = has_astral_chars(text)
+            self._delta_reset = False
+            self._delta_pending.clear()
+            self.textDelta.emit(TextDelta(revision, 0, 0, text, reset=True))
+            return
+        # Every revision gets at least an empty delta, so listeners always reach it.
+        pending, self._delta_pending = self._delta_pending or [(0, 0, "")], []
+        for position, removed, inserted in pending:
+            self.textDelta.emit(TextDelta(revision, position, removed, inserted))
+
+    def change_log(self) -> TextChangeLog:
+        """Recent deltas of this document; recording starts on first use and stays on."""
+        if self._change_log is None:
+            self._change_log = TextChangeLog(self._revision)
+            self.set_delta_tracking(True)
+            self.textDelta.connect(self._change_log.record)
+        return self._change_log
+
     def _emit_text_changed(self) -> None:
+        self._revision = next(_REVISIONS)
+        if self._delta_consumers:
+            self._flush_text_deltas()
         self.textChanged.emit()
         self._emit_selection_changed()
 
@@ -165,6 +272,24 @@ class EditorWidget(QObject):
         block = self.widget.document().findBlockByNumber(line)
         return block.text() if block.isValid() else ""
 
+    def line_count(self) -> int:
+        return self._line_count()
+
+    def get_line_range(self, start: int, end: int) -> list[str]:
+        """Lines ``start`` (inclusive) to ``end`` (exclusive) without line endings, in O(range)."""
+        start = max(0, int(start))
+        end = min(self._line_count(), int(end))
+        if start >= end:
+            return []
+        if self._native_scintilla:
+            return [self.widget.text(line).rstrip("\r\n") for line in range(start, end)]
+        lines: list[str] = []
+        block = self.widget.document().findBlockByNumber(start)
+        while block.isValid() and len(lines) < end - start:
+            lines.append(block.text())
+            block = block.next()
+        return lines
+
     def current_line_text(self) -> str:
         line, _ = self.cursor_position()
         return self.get_line_text(line)
@@ -220,6 +345,21 @@ class EditorWidget(QObject):
             total = next_total
         return max(0, len(lines) - 1), max(0, index - total)
 
+    def line_from_position(self, position: int) -> int:
+        """Line holding character ``position`` in ``TextDelta`` coordinates.
+
+        O(log lines) on the compatibility backend; QScintilla counts in bytes, so there the
+        shadow copy kept for delta tracking (or the text) is scanned instead.
+        """
+        position = max(0, int(position))
+        if not self._native_scintilla and hasattr(self.widget, "document"):
+            block = self.widget.document().findBlock(position)
+            if block.isValid():
+                return block.blockNumber()
+            return max(0, self._line_count() - 1)
+        text = self._delta_shadow if self._delta_shadow is not None else self.get_text()
+        return text.count("\n", 0, position)
+
     def cursor_index(self) -> int:
         line, col = self.cursor_position()
         return self.index_from_line_col(line, col)
@@ -239,6 +379,49 @@ class EditorWidget(QObject):
         self.widget.setTextCursor(cursor)
 
     # ---- editing ----
+    def apply_edits(self, edits: list[tuple[int, int, str]]) -> None:
+        """Replace ``(start, end, text)`` ranges as a single undo step.
+
+        Offsets index the current text (before any of the edits) and ranges must not
+        overlap; they are applied back to front so earlier offsets stay valid.
+        """
+        text = self.get_text()
+        ordered = sorted(edits, key=lambda edit: (edit[0], edit[1]))
+        previous_end = 0
+        for start, end, _replacement in ordered:
+            if start < previous_end or end < start or end > len(text):
+                raise ValueError(f"edit {start}:{end} overlaps another edit or is out of range")
+            previous_end = end
+        ordered = [edit for edit in ordered if edit[0] != edit[1] or edit[2]]
+        if not ordered:
+            return
+        if self._native_scintilla:
+            self.widget.beginUndoAction()
+            try:
+                for start, end, replacement in reversed(ordered):
+                    line1, col1 = text.count("\n", 0, start), start - (text.rfind("\n", 0, start) + 1)
+                    line2, col2 = text.count("\n", 0, end), end - (text.rfind("\n", 0, end) + 1)
+                    self.widget.setSelection(line1, col1, line2, col2)
+                    self.widget.replaceSelectedText(replacement)
+            finally:
+                self.widget.endUndoAction()
+            return
+        # Qt positions count UTF-16 units; only characters outside the BMP make them differ.
+        astral = has_astral_chars(text)
+
+        def _position(index: int) -> int:
+            return len(text[:index].encode("utf-16-le")) // 2 if astral else index
+
+        cursor = QTextCursor(self.widget.document())
+        cursor.beginEditBlock()
+        try:
+            for start, end, replacement in reversed(ordered):
+                cursor.setPosition(_position(start))
+                cursor.setPosition(_position(end), QTextCursor.MoveMode.KeepAnchor)
+                cursor.insertText(replacement)
+        finally:
+            cursor.endEditBlock()
+
     def undo(self) -> None:
         self.widget.undo()
 
@@ -713,6 +896,54 @@ class EditorWidget(QObject):
             if fold_level == max(0, level - 1):
                 self._send_scintilla("SCI_FOLDLINE", line, action)
 
+    def set_search_highlight_source(self, source, color: str = "#f7e36d") -> bool:
+        """Route viewport-scoped search highlights to the compat backend; native Scintilla has its own."""
+        if not hasattr(self.widget, "set_search_highlight_source"):
+            return False
+        self.widget.set_search_highlight_source(source, QColor(color))
+        return True
+
+    def view_state(self) -> dict[str, Any]:
+        """Cursor, first visible line and collapsed folds, for ``apply_view_state`` later."""
+        line, index = self.cursor_position()
+        state: dict[str, Any] = {"cursor": [int(line), int(index)]}
+        if hasattr(self.widget, "firstVisibleLine"):
+            state["first_line"] = int(self.widget.firstVisibleLine())
+        if hasattr(self.widget, "contractedFolds"):
+            state["folds"] = [int(fold) for fold in self.widget.contractedFolds()]
+        return state
+
+    def apply_view_state(self, state: dict[str, Any]) -> None:
+        """Restore a ``view_state`` snapshot; positions past the end of the text are clamped."""
+        last_line = self._line_count() - 1
+        folds = state.get("folds")
+        if isinstance(folds, list) and folds and hasattr(self.widget, "setContractedFolds"):
+            try:
+                self.widget.setContractedFolds([int(fold) for fold in folds if 0 <= int(fold) <= last_line])
+            except (TypeError, ValueError):
+                pass
+        cursor = state.get("cursor")
+        if isinstance(cursor, list) and len(cursor) == 2:
+            try:
+                line = max(0, min(int(cursor[0]), last_line))
+                index = max(0, min(int(cursor[1]), len(self.get_line_text(line).rstrip("\r\n"))))
+                self.set_cursor_position(line, index)
+            except (TypeError, ValueError):
+                pass
+        first_line = state.get("first_line")
+        if first_line is not None and hasattr(self.widget, "setFirstVisibleLine"):
+            try:
+                self.widget.setFirstVisibleLine(max(0, min(int(first_line), last_line)))
+            except (TypeError, ValueError):
+                pass
+
+    def visible_line_range(self) -> tuple[int, int]:
+        """Return ``(first_visible_line, visible_line_count)`` from the vertical scrollbar."""
+        bar = self.widget.verticalScrollBar() if hasattr(self.widget, "verticalScrollBar") else None
+        if bar is None:
+            return 0, 0
+        return max(0, int(bar.value())), max(1, int(bar.pageStep()))
+
     def _line_count(self) -> int:
         if self._is_scintilla and hasattr(self.widget, "lines"):
             try:
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from PySide6.QtCore import QObject, QPoint, QTimer
+from PySide6.QtGui import QTextBlockFormat, QTextCharFormat, QTextCursor, QTextDocument, QTextDocumentFragment
+
+from pypad.logging_utils import get_logger
+
+_LOGGER = get_logger(__name__)
+
+DEFAULT_PREVIEW_FRAME_MS = 50
+_FENCE_RE = re.compile(r"^\s{0,3}(```+|~~~+)")
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}(\s|$)")
+_LIST_ITEM_RE = re.compile(r"^\s{0,3}(?:[-+*]|\d{1,9}[.)])(?:\s|$)")
+_LINK_DEFINITION_RE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*\S")
+
+
+def split_markdown_sections(text: str) -> list[str]:
+    """Split markdown source into independently renderable top-level sections.
+
+    Sections break on blank lines and before headings, but never inside fenced code
+    or inside a list, whose loose items and indented continuations stay together.
+    """
+    sections: list[str] = []
+    current: list[str] = []
+    blanks: list[str] = []
+    fence: str | None = None
+    in_list = False
+    for line in text.split("\n"):
+        match = _FENCE_RE.match(line)
+        if fence is not None:
+            current.append(line)
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+            continue
+        if not line.strip():
+            if current:
+                blanks.append(line)
+            continue
+        if blanks:
+            if in_list and (line[0] in " \t" or _LIST_ITEM_RE.match(line)):
+                current.extend(blanks)
+            else:
+                sections.append("\n".join(current))
+                current = []
+                in_list = False
+            blanks = []
+        if match:
+            fence = match.group(1)
+            current.append(line)
+            continue
+        if _HEADING_RE.match(line) and current:
+            sections.append("\n".join(current))
+            current = []
+            in_list = False
+        if _LIST_ITEM_RE.match(line):
+            in_list = True
+        current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return sections
+
+
+def link_reference_definitions(text: str) -> str:
+    """The ``[label]: url`` lines of a document, outside fenced code.
+
+    Sections are rendered on their own, so each one gets these appended; a
+    definition produces no output of its own.
+    """
+    definitions: list[str] = []
+    fence: str | None = None
+    for line in text.split("\n"):
+        match = _FENCE_RE.match(line)
+        if fence is not None:
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+            continue
+        if match:
+            fence = match.group(1)
+        elif _LINK_DEFINITION_RE.match(line):
+            definitions.append(line.strip())
+    return "\n".join(definitions)
+
+
+def _section_key(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8", errors="replace")).hexdigest()
+
+
+def render_section_html(source: str) -> str:
+    doc = QTextDocument()
+    doc.setMarkdown(source)
+    return doc.toHtml()
+
+
+@dataclass
+class _Section:
+    key: str
+    start: int
+    end: int
+
+
+class MarkdownPreviewRenderer(QObject):
+    """Keeps one tab's markdown preview in sync with its editor.
+
+    Requests are throttled to one render per frame budget. Sections are converted to
+    HTML on a worker thread (reusing cached HTML for unchanged sections), and on the UI
+    thread only the run of sections between the unchanged prefix and suffix is replaced
+    in the preview document, keeping the preview scrolled to the same section.
+    """
+
+    def __init__(self, editor, preview, *, frame_ms: int = DEFAULT_PREVIEW_FRAME_MS, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._editor = editor
+        self._preview = preview
+        self._sections: list[_Section] = []
+        self._html_cache: dict[str, str] = {}
+        self._rendered_revision = -1
+        self._doc_revision = -1
+        self._in_flight = False
+        self._pending = False
+        self._last_render = 0.0
+        self._frame_ms = max(0, int(frame_ms))
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start_render)
+
+    def set_frame_budget(self, frame_ms: int) -> None:
+        self._frame_ms = max(0, int(frame_ms))
+
+    def _document_in_sync(self) -> bool:
+        # Anything else touching the preview (clear(), setMarkdown()) forces a full rebuild.
+        return self._doc_revision == self._preview.document().revision()
+
+    def is_current(self) -> bool:
+        return self._rendered_revision == int(getattr(self._editor, "revision", 0)) and self._document_in_sync()
+
+    def invalidate(self) -> None:
+        self._rendered_revision = -1
+
+    def request(self, *, immediate: bool = False) -> None:
+        if self.is_current():
+            return
+        self._pending = True
+        if self._in_flight:
+            return
+        if immediate:
+            self._timer.start(0)
+            return
+        if self._timer.isActive():
+            return
+        elapsed_ms = (time.monotonic() - self._last_render) * 1000.0
+        self._timer.start(int(max(0.0, self._frame_ms - elapsed_ms)))
+
+    def _start_render(self) -> None:
+        if self._in_flight or not self._pending:
+            return
+        self._pending = False
+        if self.is_current():
+            return
+        revision = int(getattr(self._editor, "revision", 0))
+        text = self._editor.get_text()
+        sources = split_markdown_sections(text)
+        definitions = link_reference_definitions(text)
+        if definitions:
+            sources = [f"{source}\n\n{definitions}" for source in sources]
+        cache = dict(self._html_cache)
+        self._in_flight = True
+        self._last_render = time.monotonic()
+
+        def _worker() -> None:
+            rendered: list[tuple[str, str]] = []
+            try:
+                for source in sources:
+                    key = _section_key(source)
+                    html = cache.get(key)
+                    if html is None:
+                        html = render_section_html(source)
+                        cache[key] = html
+                    rendered.append((key, html))
+            except Exception:
+                _LOGGER.exception("markdown preview render failed revision=%d", revision)
+            QTimer.singleShot(0, self, lambda: self._apply(revision, rendered))
+
+        threading.Thread(target=_worker, name="pypad-markdown-preview", daemon=True).start()
+
+    def _apply(self, revision: int, rendered: list[tuple[str, str]]) -> None:
+        self._in_flight = False
+        try:
+            self._patch_document(rendered)
+        except RuntimeError:
+            return  # preview widget already destroyed
+        self._rendered_revision = revision
+        self._html_cache = {key: html for key, html in rendered}
+        if self._pending or revision != int(getattr(self._editor, "revision", 0)):
+            self.request()
+
+    def _anchor(self) -> tuple[int, float] | None:
+        if not self._sections:
+            return None
+        top = self._preview.cursorForPosition(QPoint(0, 0)).position()
+        index = 0
+        for idx, section in enumerate(self._sections):
+            if section.start > top:
+                break
+            index = idx
+        return index, self._preview.verticalScrollBar().value() - self._section_top(self._sections[index])
+
+    def _section_top(self, section: _Section) -> float:
+        doc = self._preview.document()
+        block = doc.findBlock(section.start)
+        return doc.documentLayout().blockBoundingRect(block).top()
+
+    def _patch_document(self, rendered: list[tuple[str, str]]) -> None:
+        doc = self._preview.document()
+        new_keys = [key for key, _html in rendered]
+        old = self._sections if self._document_in_sync() else []
+        if not old or not new_keys:
+            self._sections = []
+            doc.clear()
+            old = []
+        old_keys = [section.key for section in old]
+        prefix = 0
+        while prefix < min(len(old_keys), len(new_keys)) and old_keys[prefix] == new_keys[prefix]:
+            prefix += 1
+        suffix = 0
+        limit = min(len(old_keys), len(new_keys)) - prefix
+        while suffix < limit and old_keys[-1 - suffix] == new_keys[-1 - suffix]:
+            suffix += 1
+        if prefix == len(old_keys) == len(new_keys):
+            self._doc_revision = doc.revision()
+            return
+        # Pure inserts/deletes have nothing to select; widen by one neighbour so every
+        # patch is "replace old[lo:old_hi] with new[lo:new_hi]".
+        lo, old_hi, new_hi = prefix, len(old_keys) - suffix, len(new_keys) - suffix
+        if old and (lo == old_hi or lo == new_hi):
+            if suffix:
+                old_hi += 1
+                new_hi += 1
+            else:
+                lo -= 1
+        anchor = self._anchor() if old else None
+        bar = self._preview.verticalScrollBar()
+        cursor = QTextCursor(doc)
+        cursor.beginEditBlock()
+        if old:
+            cursor.setPosition(old[lo].start)
+            cursor.setPosition(old[old_hi - 1].end, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+            old_span_end = old[old_hi - 1].end
+            old_span_start = old[lo].start
+        else:
+            old_span_start = old_span_end = 0
+        fresh: list[_Section] = []
+        for idx in range(lo, new_hi):
+            if idx > lo:
+                # Plain formats, or the new block would continue a list ending the previous section.
+                cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+            start = cursor.position()
+            cursor.insertFragment(QTextDocumentFragment.fromHtml(rendered[idx][1]))
+            fresh.append(_Section(key=new_keys[idx], start=start, end=cursor.position()))
+        cursor.endEditBlock()
+        new_span_end = fresh[-1].end if fresh else old_span_start
+        delta = new_span_end - old_span_end
+        tail = [_Section(key=s.key, start=s.start + delta, end=s.end + delta) for s in old[old_hi:]]
+        self._sections = old[:lo] + fresh + tail
+        self._doc_revision = doc.revision()
+        if anchor is not None and self._sections:
+            index, offset = anchor
+            if index >= old_hi:
+                index += len(new_keys) - len(old_keys)
+            elif index >= lo:
+                index = lo
+            index = max(0, min(len(self._sections) - 1, index))
+            bar.setValue(int(self._section_top(self._sections[index]) + offset))
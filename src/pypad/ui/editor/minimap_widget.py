@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import re
+
+from PySide6.QtCore import QRectF, Qt, Signal
+from PySide6.QtGui import QColor, QImage, QMouseEvent, QPainter, QPaintEvent, QResizeEvent
+from PySide6.QtWidgets import QWidget
+
+LINE_BLANK = 0
+LINE_CODE = 1
+LINE_COMMENT = 2
+LINE_DEFINITION = 3
+LINE_STRING = 4
+
+MINIMAP_LINE_PX = 2.0  # pixel rows per line while the whole file fits
+MINIMAP_COLUMNS = 120  # columns mapped onto the widget width
+_SAMPLES_PER_ROW = 4
+_TAB_WIDTH = 4
+
+_DEFINITION_RE = re.compile(r"^(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:def|class|function|interface|enum|type)\b")
+_COMMENT_PREFIXES = ("#", "//", "/*", "*", "--", ";", "<!--")
+
+
+def classify_line(line: str) -> tuple[int, int, int]:
+    """Return ``(indent, length, token_class)`` for one line, in tab-expanded columns."""
+    line = line.rstrip("\r")
+    stripped = line.lstrip(" \t")
+    if not stripped:
+        return 0, 0, LINE_BLANK
+    lead = line[: len(line) - len(stripped)]
+    indent = lead.count(" ") + lead.count("\t") * _TAB_WIDTH
+    length = indent + len(stripped.rstrip())
+    if _DEFINITION_RE.match(stripped):
+        kind = LINE_DEFINITION
+    elif stripped.startswith(_COMMENT_PREFIXES):
+        kind = LINE_COMMENT
+    elif stripped[0] in "\"'`":
+        kind = LINE_STRING
+    else:
+        kind = LINE_CODE
+    return indent, length, kind
+
+
+class MinimapWidget(QWidget):
+    """Density overview of a whole document painted into a cached QImage.
+
+    Each line is reduced to ``(indent, length, token class)``. Edits arrive as line ranges
+    through ``apply_edit``: only those rows are reclassified, and only the pixel stripes
+    they map to are repainted; every pixel row samples a bounded number of lines, so
+    painting cost depends on the widget height rather than the document length.
+    """
+
+    jumpRequested = Signal(int)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setMinimumWidth(60)
+        self.setMouseTracking(False)
+        self._owner_id: int | None = None
+        self._revision = -1
+        self._meta: list[tuple[int, int, int]] = [(0, 0, LINE_BLANK)]
+        self._image: QImage | None = None
+        self._image_scale = 0.0
+        self._dirty_lines: tuple[int, int] | None = None
+        self._first_visible = 0
+        self._visible_count = 0
+
+    # ---- model ----
+    def line_count(self) -> int:
+        return len(self._meta)
+
+    def has_document(self, owner: object, revision: int) -> bool:
+        return self._owner_id == id(owner) and self._revision == int(revision)
+
+    def clear_document(self) -> None:
+        self.set_document(None, 0, "")
+
+    def set_document(self, owner: object, revision: int, text: str) -> None:
+        """Rebuild every row from ``text``; used when the document is switched or reset."""
+        if self.has_document(owner, revision):
+            return
+        self._owner_id = id(owner)
+        self._revision = int(revision)
+        self._meta = [classify_line(line) for line in text.split("\n")]
+        self._image = None
+        self.update()
+
+    def apply_edit(self, owner: object, revision: int, start_line: int, old_count: int, lines: list[str]) -> bool:
+        """Replace ``old_count`` rows from ``start_line`` with ``lines``, in O(edit).
+
+        Returns False when the map does not hold ``owner`` or the range does not fit; the
+        caller then falls back to ``set_document``.
+        """
+        if self._owner_id != id(owner) or start_line < 0 or old_count < 0:
+            return False
+        if start_line + old_count > len(self._meta) or (start_line == len(self._meta) and lines):
+            return False
+        self._revision = int(revision)
+        if not old_count and not lines:
+            return True
+        old_total = len(self._meta)
+        self._meta[start_line : start_line + old_count] = [classify_line(line) for line in lines]
+        if not self._meta:
+            self._meta = [(0, 0, LINE_BLANK)]
+        # Inserted or removed lines shift everything below the edit.
+        last = start_line + len(lines) if len(self._meta) == old_total else max(old_total, len(self._meta))
+        self._mark_dirty(start_line, last)
+        return True
+
+    def _mark_dirty(self, lo: int, hi: int) -> None:
+        if self._dirty_lines is None:
+            self._dirty_lines = (lo, hi)
+        else:
+            self._dirty_lines = (min(lo, self._dirty_lines[0]), max(hi, self._dirty_lines[1]))
+        self.update()
+
+    def set_viewport(self, first_line: int, visible_lines: int) -> None:
+        first_line = max(0, int(first_line))
+        visible_lines = max(0, int(visible_lines))
+        if (first_line, visible_lines) == (self._first_visible, self._visible_count):
+            return
+        self._first_visible = first_line
+        self._visible_count = visible_lines
+        self.update()
+
+    # ---- rendering ----
+    def _scale(self) -> float:
+        return min(MINIMAP_LINE_PX, max(1, self.height()) / max(1, len(self._meta)))
+
+    def _colors(self) -> dict[int, QColor]:
+        text = self.palette().color(self.foregroundRole())
+        code = QColor(text)
+        code.setAlpha(120)
+        comment = QColor(text)
+        comment.setAlpha(55)
+        definition = QColor(self.palette().color(self.palette().ColorRole.Highlight))
+        definition.setAlpha(220)
+        string = QColor(206, 145, 120, 170)
+        return {LINE_CODE: code, LINE_COMMENT: comment, LINE_DEFINITION: definition, LINE_STRING: string}
+
+    def _paint_rows(self, y0: int, y1: int) -> None:
+        image = self._image
+        if image is None:
+            return
+        scale = self._image_scale
+        count = len(self._meta)
+        width = image.width()
+        col_px = width / float(MINIMAP_COLUMNS)
+        colors = self._colors()
+        background = self.palette().color(self.backgroundRole())
+        y0 = max(0, y0)
+        y1 = min(image.height(), y1)
+        painter = QPainter(image)
+        try:
+            painter.fillRect(0, y0, width, y1 - y0, background)
+            for y in range(y0, y1):
+                lo = int(y / scale)
+                if lo >= count:
+                    break
+                hi = max(lo + 1, min(count, int((y + 1) / scale)))
+                if scale >= 2.0 and int((lo + 1) * scale) - 1 == y:
+                    continue  # leave a gap row between lines when zoomed in
+                step = max(1, (hi - lo) // _SAMPLES_PER_ROW)
+                best: tuple[int, int, int] | None = None
+                for idx in range(lo, hi, step):
+                    row = self._meta[idx]
+                    if row[2] == LINE_BLANK:
+                        continue
+                    if best is None or row[2] == LINE_DEFINITION or (best[2] != LINE_DEFINITION and row[1] > best[1]):
+                        best = row
+                if best is None:
+                    continue
+                indent, length, kind = best
+                x0 = min(indent, MINIMAP_COLUMNS) * col_px
+                x1 = min(length, MINIMAP_COLUMNS) * col_px
+                painter.fillRect(QRectF(x0, y, max(1.0, x1 - x0), 1.0), colors.get(kind, colors[LINE_CODE]))
+        finally:
+            painter.end()
+
+    def _ensure_image(self) -> None:
+        scale = self._scale()
+        if (
+            self._image is None
+            or self._image.width() != self.width()
+            or self._image.height() != self.height()
+            or abs(scale - self._image_scale) > 1e-9
+        ):
+            self._image = QImage(max(1, self.width()), max(1, self.height()), QImage.Format.Format_ARGB32_Premultiplied)
+            self._image_scale = scale
+            self._dirty_lines = None
+            self._paint_rows(0, self._image.height())
+            return
+        if self._dirty_lines is not None:
+            lo, hi = self._dirty_lines
+            self._dirty_lines = None
+            self._paint_rows(int(lo * scale), int(hi * scale) + 1)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        self._ensure_image()
+        painter = QPainter(self)
+        try:
+            if self._image is not None:
+                painter.drawImage(0, 0, self._image)
+            if self._visible_count > 0:
+                scale = self._image_scale or self._scale()
+                top = self._first_visible * scale
+                height = max(4.0, self._visible_count * scale)
+                shade = QColor(self.palette().color(self.palette().ColorRole.Highlight))
+                shade.setAlpha(45)
+                painter.fillRect(QRectF(0, top, self.width(), height), shade)
+                shade.setAlpha(140)
+                painter.setPen(shade)
+                painter.drawRect(QRectF(0, top, self.width() - 1, height))
+        finally:
+            painter.end()
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._image = None
+
+    def _jump_to(self, y: float) -> None:
+        scale = self._image_scale or self._scale()
+        line = int(max(0.0, y) / scale) if scale > 0 else 0
+        self.jumpRequested.emit(max(0, min(len(self._meta) - 1, line)))
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._jump_to(event.position().y())
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        if event.buttons() & Qt.MouseButton.LeftButton:
+            self._jump_to(event.position().y())
+        super().mouseMoveEvent(event)
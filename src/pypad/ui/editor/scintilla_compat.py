@@ -172,12 +172,16 @@ class ScintillaCompatEditor(QPlainTextEdit):
         self._style_formats: dict[int, QTextCharFormat] = {}
         self._style_ranges: list[tuple[int, int, int]] = []
         self._lexer_ranges: list[tuple[int, int, int]] = []
+        self._search_highlight_source = None
+        self._search_highlight_color = QColor("#f7e36d")
+        self._search_highlight_span: tuple[int, int] | None = None
 
         self._margin = _MarginArea(self)
         self.blockCountChanged.connect(self._update_margin_width)
         self.updateRequest.connect(self._update_margin_area)
         self.textChanged.connect(self._on_text_changed)
         self.cursorPositionChanged.connect(self._on_cursor_changed)
+        self.verticalScrollBar().valueChanged.connect(self._on_viewport_scrolled)
         self._update_margin_width(0)
         self._rebuild_fold_regions()
         self._refresh_extra_selections()
@@ -591,6 +595,23 @@ class ScintillaCompatEditor(QPlainTextEdit):
         self._rebuild_fold_hidden_lines()
         self._refresh_visibility()
 
+    def contractedFolds(self) -> list[int]:
+        return sorted(self._collapsed_headers)
+
+    def setContractedFolds(self, folds: list[int]) -> None:
+        if not self._folding_enabled:
+            return
+        self._rebuild_fold_regions()
+        self._collapsed_headers = {int(line) for line in folds if int(line) in self._fold_regions}
+        self._rebuild_fold_hidden_lines()
+        self._refresh_visibility()
+
+    def firstVisibleLine(self) -> int:
+        return max(0, int(self.verticalScrollBar().value()))
+
+    def setFirstVisibleLine(self, line: int) -> None:
+        self.verticalScrollBar().setValue(max(0, int(line)))
+
     def lines(self) -> int:
         return max(1, self.document().blockCount())
 
@@ -788,6 +809,7 @@ class ScintillaCompatEditor(QPlainTextEdit):
         cr = self.contentsRect()
         width = self.margin_width()
         self._margin.setGeometry(QRect(cr.left(), cr.top(), width, cr.height()))
+        self._on_viewport_scrolled()
 
     def paintEvent(self, event) -> None:
         super().paintEvent(event)
@@ -1813,6 +1835,40 @@ class ScintillaCompatEditor(QPlainTextEdit):
             fmt.setFontUnderline(under)
             self._style_formats[style_id] = fmt
 
+    def set_search_highlight_source(self, source, color: QColor | None = None) -> None:
+        """Highlight matches from ``source(lo, hi) -> [(start, end), ...]``, asked only for the visible range."""
+        self._search_highlight_source = source
+        if color is not None:
+            self._search_highlight_color = QColor(color)
+        self._search_highlight_span = None
+        self._refresh_extra_selections()
+
+    def refresh_search_highlights(self) -> None:
+        if self._search_highlight_source is not None:
+            self._refresh_extra_selections()
+
+    def _visible_position_range(self) -> tuple[int, int]:
+        block = self.firstVisibleBlock()
+        if not block.isValid():
+            return 0, 0
+        lo = block.position()
+        hi = lo
+        offset = self.contentOffset()
+        bottom = self.viewport().height()
+        while block.isValid():
+            if block.isVisible():
+                if self.blockBoundingGeometry(block).translated(offset).top() > bottom:
+                    break
+                hi = block.position() + block.length()
+            block = block.next()
+        return lo, hi
+
+    def _on_viewport_scrolled(self, _value: int = 0) -> None:
+        if self._search_highlight_source is None:
+            return
+        if self._visible_position_range() != self._search_highlight_span:
+            self._refresh_extra_selections()
+
     def _refresh_extra_selections(self) -> None:
         selections: list[QTextEdit.ExtraSelection] = []
         if self._caret_line_visible:
@@ -1827,7 +1883,19 @@ class ScintillaCompatEditor(QPlainTextEdit):
             line_fmt.setProperty(QTextCharFormat.FullWidthSelection, True)
             current_line.format = line_fmt
             selections.append(current_line)
-        doc_len = len(self.toPlainText())
+        doc_len = max(0, self.document().characterCount() - 1)
+        if self._search_highlight_source is not None:
+            lo, hi = self._visible_position_range()
+            self._search_highlight_span = (lo, hi)
+            search_fmt = QTextCharFormat()
+            search_fmt.setBackground(self._search_highlight_color)
+            for start, end in self._search_highlight_source(lo, hi):
+                sel = QTextEdit.ExtraSelection()
+                sel.cursor = self.textCursor()
+                sel.cursor.setPosition(max(0, min(start, doc_len)))
+                sel.cursor.setPosition(max(0, min(end, doc_len)), QTextCursor.KeepAnchor)
+                sel.format = search_fmt
+                selections.append(sel)
         for lo, hi, style_id in [*self._lexer_ranges, *self._style_ranges]:
             fmt = self._style_formats.get(style_id)
             if fmt is None:
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QTextCursor
+
+from pypad.logging_utils import get_logger
+
+_LOGGER = get_logger(__name__)
+
+# Edits touching more than this many characters are rescanned on the worker instead.
+MAX_INLINE_RESCAN_CHARS = 200_000
+_ASTRAL_RE = re.compile("[\U00010000-\U0010ffff]")
+
+
+def utf16_length(text: str) -> int:
+    return len(text) + len(_ASTRAL_RE.findall(text))
+
+
+def find_match_offsets(text: str, query: str, *, case_sensitive: bool) -> list[int]:
+    """Return sorted UTF-16 start offsets of non-overlapping ``query`` matches in ``text``.
+
+    Offsets are in UTF-16 code units so they line up with QTextDocument positions.
+    """
+    if not query or not text:
+        return []
+    if case_sensitive:
+        starts: list[int] = []
+        step = len(query)
+        idx = text.find(query)
+        while idx >= 0:
+            starts.append(idx)
+            idx = text.find(query, idx + step)
+    else:
+        starts = [m.start() for m in re.finditer(re.escape(query), text, re.IGNORECASE)]
+    if starts and _ASTRAL_RE.search(text):
+        astral = [m.start() for m in _ASTRAL_RE.finditer(text)]
+        starts = [pos + bisect.bisect_left(astral, pos) for pos in starts]
+    return starts
+
+
+class SearchMatchIndex:
+    """Sorted match start offsets for one query, updatable in place as the text is edited."""
+
+    def __init__(self, query: str, *, case_sensitive: bool, starts: list[int] | None = None) -> None:
+        self.query = query
+        self.case_sensitive = bool(case_sensitive)
+        self.length = utf16_length(query)
+        self.starts: list[int] = list(starts or [])
+
+    @property
+    def count(self) -> int:
+        return len(self.starts)
+
+    def apply_edit(self, position: int, removed: int, added: int) -> tuple[int, int]:
+        """Drop matches overlapping the edit, shift the ones after it, and return the
+        ``[lo, hi)`` range of start offsets that must be rescanned."""
+        position = max(0, int(position))
+        removed = max(0, int(removed))
+        added = max(0, int(added))
+        lo = max(0, position - self.length + 1)
+        first = bisect.bisect_left(self.starts, lo)
+        last = bisect.bisect_left(self.starts, position + removed)
+        delta = added - removed
+        tail = self.starts[last:]
+        if delta:
+            tail = [pos + delta for pos in tail]
+        self.starts[first:] = tail
+        return lo, position + added
+
+    def rescan(self, lo: int, hi: int, window_text: str) -> None:
+        """Replace matches starting in ``[lo, hi)`` with those found in ``window_text``,
+        which must cover ``[lo, hi + length - 1)``."""
+        found = [lo + pos for pos in find_match_offsets(window_text, self.query, case_sensitive=self.case_sensitive)]
+        found = [pos for pos in found if pos < hi]
+        first = bisect.bisect_left(self.starts, lo)
+        last = bisect.bisect_left(self.starts, hi)
+        self.starts[first:last] = found
+
+    def ordinal_at(self, position: int) -> int:
+        """1-based ordinal of the match starting at ``position``, or 0 if none does."""
+        idx = bisect.bisect_left(self.starts, position)
+        if idx < len(self.starts) and self.starts[idx] == position:
+            return idx + 1
+        return 0
+
+    def next_start(self, position: int, *, backward: bool = False) -> int | None:
+        if not self.starts:
+            return None
+        if backward:
+            idx = bisect.bisect_left(self.starts, position) - 1
+            return self.starts[idx]  # wraps to the last match when idx == -1
+        idx = bisect.bisect_left(self.starts, position)
+        return self.starts[idx if idx < len(self.starts) else 0]
+
+    def ranges_between(self, lo: int, hi: int) -> list[tuple[int, int]]:
+        first = bisect.bisect_left(self.starts, max(0, lo - self.length + 1))
+        last = bisect.bisect_left(self.starts, hi)
+        return [(pos, pos + self.length) for pos in self.starts[first:last]]
+
+
+def _map_offset(offset: int, position: int, removed: int, added: int, *, upper: bool) -> int:
+    """Map an offset across an edit; offsets inside the replaced span snap to its edge."""
+    if offset >= position + removed:
+        return offset + added - removed
+    if offset > position:
+        return position + added if upper else position
+    return offset
+
+
+class DocumentSearchHighlighter(QObject):
+    """Keeps a :class:`SearchMatchIndex` for one QTextDocument-backed editor widget.
+
+    The full scan runs on a worker thread from a text snapshot; afterwards the index
+    follows ``contentsChange`` and only rescans the text around each edit. Edits that
+    land while a scan is in flight are replayed onto its result.
+    """
+
+    changed = Signal()
+
+    def __init__(self, widget, *, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._widget = widget
+        self._doc = widget.document()
+        self._index: SearchMatchIndex | None = None
+        self._query: tuple[str, bool] | None = None
+        self._generation = 0
+        self._scanning = False
+        self._pending_edits: list[tuple[int, int, int]] = []
+        self._doc.contentsChange.connect(self._on_contents_change)
+
+    def index(self) -> SearchMatchIndex | None:
+        return self._index
+
+    def is_ready(self) -> bool:
+        return self._index is not None and not self._scanning
+
+    def is_scanning(self) -> bool:
+        return self._scanning
+
+    def ranges_between(self, lo: int, hi: int) -> list[tuple[int, int]]:
+        return self._index.ranges_between(lo, hi) if self._index is not None else []
+
+    def matches_query(self, query: str, case_sensitive: bool) -> bool:
+        return self._query == (query, bool(case_sensitive))
+
+    def set_query(self, query: str, *, case_sensitive: bool) -> None:
+        key = (query, bool(case_sensitive))
+        if key == self._query and (self._index is not None or self._scanning):
+            return
+        self._query = key
+        self._start_scan()
+
+    def clear(self) -> None:
+        self._query = None
+        self._generation += 1
+        self._scanning = False
+        self._pending_edits = []
+        self._index = None
+        self.changed.emit()
+
+    def _start_scan(self) -> None:
+        if self._query is None:
+            return
+        self._generation += 1
+        generation = self._generation
+        query, case_sensitive = self._query
+        text = self._widget.toPlainText()
+        self._scanning = True
+        self._pending_edits = []
+        self._index = None
+        self.changed.emit()
+
+        def _worker() -> None:
+            try:
+                starts = find_match_offsets(text, query, case_sensitive=case_sensitive)
+            except Exception:
+                _LOGGER.exception("search index scan failed")
+                starts = []
+            QTimer.singleShot(0, self, lambda: self._finish_scan(generation, starts))
+
+        threading.Thread(target=_worker, name="pypad-search-index", daemon=True).start()
+
+    def _finish_scan(self, generation: int, starts: list[int]) -> None:
+        if generation != self._generation or self._query is None:
+            return
+        query, case_sensitive = self._query
+        index = SearchMatchIndex(query, case_sensitive=case_sensitive, starts=starts)
+        edits, self._pending_edits = self._pending_edits, []
+        self._scanning = False
+        self._index = index
+        if edits and not self._replay_edits(edits):
+            return
+        self.changed.emit()
+
+    def _replay_edits(self, edits: list[tuple[int, int, int]]) -> bool:
+        index = self._index
+        if index is None:
+            return False
+        if sum(max(removed, added) for _pos, removed, added in edits) > MAX_INLINE_RESCAN_CHARS:
+            self._start_scan()
+            return False
+        dirty: tuple[int, int] | None = None
+        for position, removed, added in edits:
+            if dirty is not None:
+                dirty = (
+                    _map_offset(dirty[0], position, removed, added, upper=False),
+                    _map_offset(dirty[1], position, removed, added, upper=True),
+                )
+            lo, hi = index.apply_edit(position, removed, added)
+            dirty = (lo, hi) if dirty is None else (min(dirty[0], lo), max(dirty[1], hi))
+        if dirty is not None:
+            # Windows can only be read from the final text, so rescan once at the end.
+            lo, hi = dirty
+            index.rescan(lo, hi, self._window_text(lo, hi + index.length - 1))
+        return True
+
+    def _window_text(self, lo: int, hi: int) -> str:
+        cursor = QTextCursor(self._doc)
+        end = max(0, self._doc.characterCount() - 1)
+        cursor.setPosition(max(0, min(lo, end)))
+        cursor.setPosition(max(0, min(hi, end)), QTextCursor.MoveMode.KeepAnchor)
+        return cursor.selectedText().replace("\u2029", "\n")
+
+    def _on_contents_change(self, position: int, removed: int, added: int) -> None:
+        if self._query is None:
+            return
+        if self._scanning:
+            self._pending_edits.append((position, removed, added))
+            return
+        if self._replay_edits([(position, removed, added)]):
+            self.changed.emit()
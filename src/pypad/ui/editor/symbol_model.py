@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from pypad.logging_utils import get_logger
+from pypad.ui.editor.quick_open_dialog import extract_symbol_rows
+
+_LOGGER = get_logger(__name__)
+
+DEFAULT_SYMBOL_IDLE_MS = 400
+
+
+@dataclass(frozen=True)
+class SymbolSnapshot:
+    revision: int
+    language: str
+    rows: tuple[tuple[int, str], ...] = ()  # (1-based line, title)
+
+    def enclosing(self, line: int) -> str | None:
+        """Title of the last symbol declared at or above 1-based ``line``."""
+        found: str | None = None
+        for row_line, title in self.rows:
+            if row_line > line:
+                break
+            found = title
+        return found
+
+
+class DocumentSymbolModel(QObject):
+    """Symbols for one editor document, keyed by the editor's text revision.
+
+    Consumers (outline, breadcrumbs, quick open ``@``) call :meth:`request` as often as
+    they like; the parse runs on a worker thread from a text snapshot at most once per
+    idle period, and :attr:`changed` fires on the UI thread when a new snapshot lands.
+    """
+
+    changed = Signal(object)
+
+    def __init__(
+        self,
+        editor,
+        language_provider: Callable[[], str],
+        *,
+        idle_ms: int = DEFAULT_SYMBOL_IDLE_MS,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._editor = editor
+        self._language_provider = language_provider
+        self._snapshot = SymbolSnapshot(revision=-1, language="")
+        self._in_flight: tuple[int, str] | None = None
+        self._requested = False
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(max(0, int(idle_ms)))
+        self._idle_timer.timeout.connect(self._start_parse)
+        editor.textChanged.connect(self._on_text_changed)
+
+    def snapshot(self) -> SymbolSnapshot:
+        return self._snapshot
+
+    def _current_key(self) -> tuple[int, str]:
+        try:
+            language = str(self._language_provider() or "plain").lower()
+        except Exception:
+            language = "plain"
+        return int(getattr(self._editor, "revision", 0)), language
+
+    def is_current(self) -> bool:
+        return (self._snapshot.revision, self._snapshot.language) == self._current_key()
+
+    def request(self, *, immediate: bool = False) -> None:
+        """Ask for symbols matching the current revision; cheap when already up to date."""
+        if self.is_current() or self._in_flight == self._current_key():
+            return
+        self._requested = True
+        if immediate:
+            self._idle_timer.start(0)
+        elif not self._idle_timer.isActive():
+            self._idle_timer.start()
+
+    def _on_text_changed(self) -> None:
+        # Typing keeps pushing the parse back until the document goes idle.
+        if self._requested:
+            self._idle_timer.start()
+
+    def _start_parse(self) -> None:
+        key = self._current_key()
+        if (self._snapshot.revision, self._snapshot.language) == key:
+            self._requested = False
+            return
+        if self._in_flight is not None:
+            # One parse at a time; the result handler re-requests if it turns out stale.
+            return
+        self._requested = False
+        self._in_flight = key
+        revision, language = key
+        text = self._editor.get_text()
+
+        def _worker() -> None:
+            try:
+                rows = tuple(extract_symbol_rows(language, text))
+            except Exception:
+                _LOGGER.exception("symbol parse failed language=%s revision=%d", language, revision)
+                rows = ()
+            QTimer.singleShot(0, self, lambda: self._apply(SymbolSnapshot(revision=revision, language=language, rows=rows)))
+
+        threading.Thread(target=_worker, name="pypad-symbol-model", daemon=True).start()
+
+    def _apply(self, snapshot: SymbolSnapshot) -> None:
+        self._in_flight = None
+        self._snapshot = snapshot
+        self.changed.emit(snapshot)
+        if self._requested and not self.is_current() and not self._idle_timer.isActive():
+            self._idle_timer.start()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+_SCAN_BLOCK = 4096
+
+
+@dataclass(frozen=True)
+class TextDelta:
+    """One edit to a document: ``removed`` characters at ``position`` became ``inserted``.
+
+    ``revision`` is the editor revision after the edit; one edit step may produce
+    several deltas with the same revision. A ``reset`` delta carries the whole new text
+    in ``inserted`` and replaces the document outright.
+    """
+
+    revision: int
+    position: int
+    removed: int
+    inserted: str
+    reset: bool = False
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "revision": self.revision,
+            "position": self.position,
+            "removed": self.removed,
+            "inserted": self.inserted,
+            "reset": self.reset,
+        }
+
+
+def apply_text_delta(text: str, delta: TextDelta) -> str:
+    if delta.reset:
+        return delta.inserted
+    end = delta.position + delta.removed
+    if delta.position < 0 or delta.removed < 0 or end > len(text):
+        raise ValueError(f"delta out of range: {delta.position}+{delta.removed} > {len(text)}")
+    return text[: delta.position] + delta.inserted + text[end:]
+
+
+def line_range(text: str, start: int, end: int) -> list[str]:
+    """Lines ``start`` (inclusive) to ``end`` (exclusive) of ``text``, without newlines.
+
+    Scans only up to the last requested line instead of splitting the whole text.
+    """
+    start = max(0, start)
+    lines: list[str] = []
+    offset = 0
+    line = 0
+    while line < end:
+        newline = text.find("\n", offset)
+        if line >= start:
+            lines.append(text[offset:] if newline < 0 else text[offset:newline])
+        if newline < 0:
+            break
+        offset = newline + 1
+        line += 1
+    return lines
+
+
+def has_astral_chars(text: str) -> bool:
+    """True if ``text`` holds characters outside the BMP (two UTF-16 units each)."""
+    return len(text.encode("utf-16-le", errors="surrogatepass")) != 2 * len(text)
+
+
+def _common_prefix(a: str, b: str, limit: int) -> int:
+    start = 0
+    while start < limit:
+        stop = min(limit, start + _SCAN_BLOCK)
+        if a[start:stop] == b[start:stop]:
+            start = stop
+            continue
+        while start < stop and a[start] == b[start]:
+            start += 1
+        return start
+    return limit
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    size = 0
+    len_a = len(a)
+    len_b = len(b)
+    while size < limit:
+        step = min(limit, size + _SCAN_BLOCK)
+        if a[len_a - step : len_a - size] == b[len_b - step : len_b - size]:
+            size = step
+            continue
+        while size < step and a[len_a - size - 1] == b[len_b - size - 1]:
+            size += 1
+        return size
+    return limit
+
+
+def diff_text(old: str, new: str) -> tuple[int, int, str]:
+    """Smallest single ``(position, removed, inserted)`` edit turning ``old`` into ``new``."""
+    prefix = _common_prefix(old, new, min(len(old), len(new)))
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    return prefix, len(old) - prefix - suffix, new[prefix : len(new) - suffix]
+
+
+class TextChangeLog:
+    """Recent deltas of one document, so a reader can catch up from a revision it knows.
+
+    History is bounded by ``max_deltas`` and by ``max_chars`` of inserted text.
+    ``since`` returns None for a revision it cannot replay from: one that fell out of
+    the history or one that never belonged to this document. Revisions are unique
+    across documents (see ``EditorWidget.revision``), so a stale id from another tab
+    is never mistaken for one of ours.
+    """
+
+    def __init__(self, revision: int, *, max_deltas: int = 2048, max_chars: int = 1_000_000) -> None:
+        self.max_deltas = max(1, int(max_deltas))
+        self.max_chars = max(1, int(max_chars))
+        self._base = revision
+        self._deltas: deque[TextDelta] = deque()
+        self._chars = 0
+
+    @property
+    def revision(self) -> int:
+        return self._deltas[-1].revision if self._deltas else self._base
+
+    def reset(self, revision: int) -> None:
+        self._base = revision
+        self._deltas.clear()
+        self._chars = 0
+
+    def record(self, delta: TextDelta) -> None:
+        self._deltas.append(delta)
+        self._chars += len(delta.inserted)
+        while self._deltas and (len(self._deltas) > self.max_deltas or self._chars > self.max_chars):
+            oldest = self._deltas.popleft()
+            self._chars -= len(oldest.inserted)
+            self._base = oldest.revision
+
+    def since(self, revision: int) -> list[TextDelta] | None:
+        if revision == self.revision:
+            return []
+        if revision != self._base and not any(delta.revision == revision for delta in self._deltas):
+            return None
+        return [delta for delta in self._deltas if delta.revision > revision]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import ast
 import hashlib
 import hmac
 import json
@@ -45,9 +44,44 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from pypad.app_settings.paths import get_plugins_dir_path
+from pypad.app_settings.paths import (
+    get_index_cache_dir_path,
+    get_plugin_discovery_cache_path,
+    get_plugins_dir_path,
+)
+from pypad.services.definition_index import (
+    DefinitionIndex,
+    extract_definitions,
+    find_definition_in_files,
+    language_for_path,
+)
+from pypad.services.retrieval_index import RetrievalIndex
+from pypad.ui.ai.ai_collaboration import (
+    CitationSnippet,
+    build_indexed_citation_snippets,
+    build_workspace_citation_snippets,
+)
 from pypad.ui.features.extensibility_ops import assess_plugin_security
+from pypad.ui.features.plugin_discovery_cache import PluginDiscoveryCache, compute_plugin_digest
+from pypad.ui.features.plugin_event_bus import (
+    COALESCED_EVENTS,
+    STATE_SUSPENDED,
+    EventSubscriber,
+    PluginEventBus,
+    PluginEventStats,
+)
+from pypad.ui.features.plugin_process import (
+    CPU_LIMIT_STRIKES,
+    DEFAULT_PROCESS_CPU_LIMIT_MS,
+    RUNTIME_IN_PROCESS,
+    RUNTIME_PROCESS,
+    PluginProcess,
+    ProcessPluginProxy,
+    process_runtime_available,
+)
 from pypad.ui.editor.editor_tab import EditorTab
+from pypad.ui.editor.minimap_widget import MinimapWidget
+from pypad.ui.editor.symbol_model import SymbolSnapshot
 from pypad.ui.workspace.project_workflow import (
     apply_unified_patch_to_text,
     build_unified_diff_text,
@@ -60,6 +94,11 @@ def _root() -> Path:
     return Path(__file__).resolve().parents[4]
 
 
+DEFINITION_INDEX_REFRESH_MS = 60_000  # background refresh cadence once the index is built
+DEFINITION_INDEX_RETRY_MS = 1_500  # wait for the workspace file scan before the first build
+DEFINITION_SCAN_MAX_FILES = 5000
+
+
 @dataclass
 class PluginRecord:
     plugin_id: str
@@ -72,26 +111,16 @@ class PluginRecord:
     requested_permissions: set[str] = field(default_factory=set)
     quarantined: bool = False
     security_issues: list[str] = field(default_factory=list)
+    runtime: str = RUNTIME_IN_PROCESS
+    load_ms: float = 0.0
     instance: Any = None
+    process: PluginProcess | None = None
     actions: list[QAction] = field(default_factory=list)
     toolbars: list[QToolBar] = field(default_factory=list)
     panels: list[QDockWidget] = field(default_factory=list)
     timers: list[QTimer] = field(default_factory=list)
 
 
-def compute_plugin_digest(plugin_dir: Path) -> str:
-    hasher = hashlib.sha256()
-    for rel in ("plugin.json", "plugin.py"):
-        path = plugin_dir / rel
-        if not path.exists():
-            continue
-        hasher.update(rel.encode("utf-8"))
-        hasher.update(b"\0")
-        hasher.update(path.read_bytes())
-        hasher.update(b"\0")
-    return hasher.hexdigest()
-
-
 def apply_text_operations(text: str, operations: list[dict[str, Any]]) -> str:
     out = text
     for op in operations:
@@ -177,6 +206,25 @@ class PluginAPI:
         tab = self.window.active_tab()
         return tab.text_edit.get_text() if tab is not None else ""
 
+    def revision(self) -> int:
+        tab = self.window.active_tab()
+        return tab.text_edit.revision if tab is not None else 0
+
+    def changes_since(self, revision: int) -> list[dict[str, Any]] | None:
+        tab = self.window.active_tab()
+        if tab is None:
+            return None
+        deltas = tab.text_edit.change_log().since(int(revision))
+        return None if deltas is None else [delta.to_dict() for delta in deltas]
+
+    def line_count(self) -> int:
+        tab = self.window.active_tab()
+        return tab.text_edit.line_count() if tab is not None else 0
+
+    def text_lines(self, start: int, end: int) -> list[str]:
+        tab = self.window.active_tab()
+        return tab.text_edit.get_line_range(int(start), int(end)) if tab is not None else []
+
     def selection_text(self) -> str:
         tab = self.window.active_tab()
         return tab.text_edit.selected_text() if tab is not None else ""
@@ -226,6 +274,23 @@ class PluginAPI:
             return
         tab.text_edit.insert_text(text)
 
+    def apply_edits(self, edits: list[Any], expected_revision: int | None = None) -> int:
+        self._allow("file")
+        tab = self.window.active_tab()
+        if tab is None or tab.text_edit.is_read_only():
+            return self.revision()
+        if expected_revision is not None and tab.text_edit.revision != int(expected_revision):
+            raise RuntimeError(f"Text changed: revision is {tab.text_edit.revision}, expected {expected_revision}")
+        parsed: list[tuple[int, int, str]] = []
+        for edit in edits:
+            if isinstance(edit, dict):
+                parsed.append((int(edit.get("start", -1)), int(edit.get("end", -1)), str(edit.get("text", ""))))
+            else:
+                start, end, replacement = edit
+                parsed.append((int(start), int(end), str(replacement)))
+        tab.text_edit.apply_edits(parsed)
+        return tab.text_edit.revision
+
     def replace_selection(self, text: str) -> None:
         self._allow("file")
         tab = self.window.active_tab()
@@ -267,6 +332,10 @@ class PluginAPI:
         action.triggered.connect(callback)
         menu.addAction(action)
         self.record.actions.append(action)
+        parts = [part.strip() for part in (menu_path or "Plugins").split("/") if part.strip()]
+        if parts and parts[0].lower() == "plugins":
+            parts = parts[1:]
+        self._register_action(action, label, " > ".join(["Plugins", *parts]))
         return action
 
     def add_toolbar_action(self, toolbar_name: str, label: str, callback, shortcut: str | None = None) -> QAction:
@@ -280,8 +349,14 @@ class PluginAPI:
         self.record.actions.append(action)
         if toolbar not in self.record.toolbars:
             self.record.toolbars.append(toolbar)
+        self._register_action(action, label, f"Plugins > {self.record.plugin_id}")
         return action
 
+    def _register_action(self, action: QAction, label: str, section: str) -> None:
+        registry = getattr(self.window, "action_registry", None)
+        if registry is not None:
+            registry.register(f"plugin:{self.record.plugin_id}:{label}", action, section=section)
+
     def add_panel(self, title: str, widget: QWidget, area: Qt.DockWidgetArea = Qt.RightDockWidgetArea) -> QDockWidget:
         self._allow_any({"panel", "ui"})
         dock = QDockWidget(title, self.window)
@@ -331,6 +406,20 @@ class PluginHost:
         self._install_example_plugins_if_missing()
         self.records: list[PluginRecord] = []
         self._startup_plugins_loaded = False
+        self.startup_load_finished = False
+        self.event_bus = PluginEventBus(on_error=self._on_plugin_event_error, on_slow=self._on_plugin_slow)
+        self._event_flush_timer = QTimer(window)
+        self._event_flush_timer.setSingleShot(True)
+        self._event_flush_timer.timeout.connect(self._flush_plugin_events)
+        self._event_first_pending_at = 0.0
+        self._mirror_editor = None
+        self._mirror_doc: int | None = None
+        self._mirror_tab_signal_connected = False
+        self._discovery_cache = PluginDiscoveryCache(get_plugin_discovery_cache_path())
+        self._discovery_cache.load()
+        self._discovery_verifying = False
+        self._discovery_verify_timer = QTimer(window)
+        self._discovery_verify_timer.timeout.connect(self.schedule_discovery_verify)
         defer_load = bool(self.window.settings.get("defer_plugin_load_on_startup", True))
         delay_ms = int(self.window.settings.get("plugin_startup_defer_ms", 1200) or 0)
         if defer_load:
@@ -342,7 +431,12 @@ class PluginHost:
         if self._startup_plugins_loaded:
             return
         self._startup_plugins_loaded = True
-        self.reload(startup=True)
+        try:
+            self.reload(startup=True)
+        finally:
+            self.startup_load_finished = True
+            self.window._mark_startup_stage("plugins_loaded")
+            self.window._finish_startup_profile()
 
     def _packaged_plugins_dir(self) -> Path:
         if getattr(sys, "frozen", False):
@@ -518,12 +612,11 @@ class PluginHost:
             }
             override = overrides.get(pid)
             perms = requested if override is None else (requested & override)
-            issues = assess_plugin_security(
-                plugin_root=self.plugins_dir,
-                plugin_dir=folder,
-                plugin_id=pid,
-                permissions=perms,
-            )
+            runtime = str(meta.get("runtime", "") or "").strip().lower()
+            if runtime not in {RUNTIME_IN_PROCESS, RUNTIME_PROCESS}:
+                isolate = bool(self.window.settings.get("plugin_process_runtime_default", False))
+                runtime = RUNTIME_PROCESS if isolate else RUNTIME_IN_PROCESS
+            digest, issues = self._discovery_cache.lookup(folder, pid, perms, self._assess_plugin)
             out.append(
                 PluginRecord(
                     plugin_id=pid,
@@ -533,31 +626,138 @@ class PluginHost:
                     requested_permissions=requested,
                     path=folder,
                     enabled=pid in enabled,
-                    digest=compute_plugin_digest(folder),
+                    digest=digest,
                     quarantined=(pid in quarantined) or bool(issues),
                     security_issues=issues,
+                    runtime=runtime,
                 )
             )
+        self._discovery_cache.prune({str(rec.path) for rec in out})
+        try:
+            self._discovery_cache.save()
+        except OSError as exc:
+            self.window.log_event("Error", f"Plugin discovery cache save failed: {exc}")
         return out
 
-    def emit_event(self, event_name: str, **payload) -> None:
-        for rec in list(self.records):
-            if rec.instance is None:
-                continue
-            if "hooks" not in rec.permissions:
-                continue
+    def _assess_plugin(self, plugin_dir: Path, plugin_id: str, permissions: set[str]) -> list[str]:
+        return assess_plugin_security(
+            plugin_root=self.plugins_dir,
+            plugin_dir=plugin_dir,
+            plugin_id=plugin_id,
+            permissions=permissions,
+        )
+
+    def _restart_discovery_verify_timer(self) -> None:
+        minutes = int(self.window.settings.get("plugin_discovery_verify_minutes", 60) or 0)
+        if minutes <= 0:
+            self._discovery_verify_timer.stop()
+            return
+        interval_ms = minutes * 60_000
+        if not self._discovery_verify_timer.isActive() or self._discovery_verify_timer.interval() != interval_ms:
+            self._discovery_verify_timer.start(interval_ms)
+
+    def schedule_discovery_verify(self) -> None:
+        """Rehash and reassess all plugins in the background, bypassing the discovery cache."""
+        if self._discovery_verifying:
+            return
+        self._discovery_verifying = True
+        cache = self._discovery_cache
+
+        def _worker() -> None:
             try:
-                event_payload = dict(payload)
-                if "ui" not in rec.permissions and "tab" in event_payload:
-                    event_payload.pop("tab", None)
-                on_event = getattr(rec.instance, "on_event", None)
-                if callable(on_event):
-                    on_event(event_name, dict(event_payload))
-                handler = getattr(rec.instance, f"on_{event_name}", None)
-                if callable(handler):
-                    handler(dict(event_payload))
+                changed = cache.verify(self._assess_plugin)
+                if changed:
+                    cache.save()
+                    QTimer.singleShot(0, self.window, lambda: self._on_discovery_verify_mismatch(changed))
             except Exception as exc:  # noqa: BLE001
-                self.window.log_event("Error", f"Plugin hook error ({rec.plugin_id}:{event_name}): {exc}")
+                error = str(exc)
+                QTimer.singleShot(
+                    0, self.window, lambda: self.window.log_event("Error", f"Plugin re-verification failed: {error}")
+                )
+            finally:
+                self._discovery_verifying = False
+
+        threading.Thread(target=_worker, name="pypad-plugin-verify", daemon=True).start()
+
+    def _on_discovery_verify_mismatch(self, folders: list[str]) -> None:
+        names = ", ".join(Path(folder).name for folder in folders)
+        self.window.log_event("Info", f"Plugin files changed without a new timestamp; rediscovering: {names}")
+        changed = set(folders)
+        if any(str(rec.path) in changed and (rec.enabled or rec.instance is not None) for rec in self.records):
+            self.reload()
+
+    def has_event_subscribers(self, event_name: str) -> bool:
+        return self.event_bus.has_subscribers(event_name)
+
+    def emit_event(self, event_name: str, **payload) -> None:
+        if event_name not in COALESCED_EVENTS:
+            if self._event_flush_timer.isActive():
+                # Keep order: queued edits reach plugins before save/close/tab events.
+                self._event_flush_timer.stop()
+                self._flush_plugin_events()
+            self.event_bus.dispatch(event_name, payload)
+            return
+        tab = payload.get("tab")
+        self.event_bus.post(event_name, payload, key=id(tab) if tab is not None else None)
+        if not self.event_bus.has_pending():
+            return
+        # Debounce to the end of a typing burst, but never hold events back for more than a few periods.
+        delay_ms = max(0, int(self.window.settings.get("plugin_event_coalesce_ms", 150) or 0))
+        now = time.monotonic()
+        if not self._event_flush_timer.isActive():
+            self._event_first_pending_at = now
+            self._event_flush_timer.start(delay_ms)
+        elif (now - self._event_first_pending_at) * 1000.0 < delay_ms * 4:
+            self._event_flush_timer.start(delay_ms)
+
+    def _flush_plugin_events(self) -> None:
+        retry_ms = self.event_bus.flush()
+        if retry_ms is not None:
+            self._event_first_pending_at = time.monotonic()
+            self._event_flush_timer.start(max(1, int(retry_ms)))
+
+    def _on_plugin_event_error(self, sub: EventSubscriber, event_name: str, exc: Exception) -> None:
+        self.window.log_event("Error", f"Plugin hook error ({sub.plugin_id}:{event_name}): {exc}")
+
+    def _on_plugin_slow(self, sub: EventSubscriber, stats: PluginEventStats, elapsed_ms: float) -> None:
+        budget = self.event_bus.budget_ms
+        if stats.state == STATE_SUSPENDED:
+            message = f"Plugin '{sub.name}' stopped receiving editor events: it keeps exceeding {budget:.0f} ms."
+            self.window.log_event(
+                "Error",
+                f"Plugin events suspended ({sub.plugin_id}): {stats.last_event} took {elapsed_ms:.1f} ms "
+                f"(budget {budget:.0f} ms, avg {stats.avg_ms:.1f} ms). Reload plugins to resume.",
+            )
+        else:
+            message = f"Plugin '{sub.name}' is slowing typing; its editor events are now throttled."
+            self.window.log_event(
+                "Info",
+                f"Plugin events throttled ({sub.plugin_id}): {stats.last_event} took {elapsed_ms:.1f} ms "
+                f"(budget {budget:.0f} ms).",
+            )
+        self.window.show_status_message(message, 6000)
+
+    def _refresh_event_subscribers(self) -> None:
+        settings = self.window.settings
+        try:
+            budget_ms = float(settings.get("plugin_event_budget_ms", 16) or 16)
+            strikes = int(settings.get("plugin_event_slow_strikes", 3) or 3)
+        except (TypeError, ValueError):
+            budget_ms, strikes = 16.0, 3
+        self.event_bus.configure(budget_ms=budget_ms, slow_strikes=strikes, throttle_interval_ms=1000.0)
+        self._event_flush_timer.stop()
+        self.event_bus.set_subscribers(
+            [
+                EventSubscriber(
+                    rec.plugin_id,
+                    rec.name,
+                    rec.instance,
+                    allow_tab="ui" in rec.permissions and rec.process is None,
+                )
+                for rec in self.records
+                if rec.instance is not None and "hooks" in rec.permissions
+            ]
+        )
 
     def _unload_record(self, rec: PluginRecord) -> None:
         try:
@@ -571,7 +771,10 @@ class PluginHost:
                 timer.stop()
             except Exception:
                 pass
+        registry = getattr(self.window, "action_registry", None)
         for action in rec.actions:
+            if registry is not None:
+                registry.unregister_action(action)
             try:
                 for widget in action.associatedWidgets():
                     widget.removeAction(action)
@@ -602,17 +805,149 @@ class PluginHost:
         rec.panels.clear()
         rec.toolbars.clear()
         rec.instance = None
+        if rec.process is not None:
+            rec.process.deleteLater()
+            rec.process = None
 
     def _unload_all(self) -> None:
         for rec in list(self.records):
             if rec.instance is not None:
                 self._unload_record(rec)
+        self._set_mirror_editor(None, None)
+
+    # ---- out-of-process runtime ----
+    def _process_plugins(self) -> list[PluginProcess]:
+        return [rec.process for rec in self.records if rec.process is not None]
+
+    def _start_process_plugin(self, rec: PluginRecord) -> None:
+        try:
+            limit_ms = int(self.window.settings.get("plugin_process_cpu_limit_ms", DEFAULT_PROCESS_CPU_LIMIT_MS))
+        except (TypeError, ValueError):
+            limit_ms = DEFAULT_PROCESS_CPU_LIMIT_MS
+        process = PluginProcess(
+            self.window,
+            rec,
+            PluginAPI(self.window, rec),
+            cpu_limit_ms=limit_ms,
+            on_ready=self._on_plugin_process_ready,
+            on_exit=self._on_plugin_process_exit,
+            on_done=self._on_plugin_process_done,
+            on_resync=lambda proc: proc.send_snapshot(self._mirror_snapshot()),
+            on_output=lambda proc, line: self.window.log_event("Info", f"[plugin:{proc.record.plugin_id}] {line}"),
+        )
+        if not self._mirror_tab_signal_connected and hasattr(self.window, "tab_widget"):
+            self.window.tab_widget.currentChanged.connect(self._sync_process_text)
+            self._mirror_tab_signal_connected = True
+        if self._mirror_editor is None:
+            tab = self.window.active_tab()
+            if tab is not None:
+                self._set_mirror_editor(tab.text_edit, id(tab))
+        rec.process = process
+        rec.instance = ProcessPluginProxy(process)
+        process.start(self._mirror_snapshot())
+
+    def _mirror_snapshot(self) -> dict[str, Any]:
+        editor = self._mirror_editor
+        tab = self.window.active_tab() if editor is not None else None
+        return {
+            "doc": self._mirror_doc,
+            "rev": editor.revision if editor is not None else 0,
+            "text": editor.get_text() if editor is not None else "",
+            "path": (tab.current_file or "") if tab is not None else "",
+        }
+
+    def _set_mirror_editor(self, editor, doc: int | None) -> None:
+        old = self._mirror_editor
+        if old is editor:
+            return
+        if old is not None:
+            try:
+                old.textDelta.disconnect(self._on_mirror_delta)
+                old.set_delta_tracking(False)
+            except (RuntimeError, TypeError):
+                pass  # tab already closed
+        self._mirror_editor = editor
+        self._mirror_doc = doc
+        if editor is not None:
+            editor.set_delta_tracking(True)
+            editor.textDelta.connect(self._on_mirror_delta)
+
+    def _sync_process_text(self, *_args) -> None:
+        """Mirror the active tab into worker processes: a snapshot on switch, deltas after."""
+        processes = self._process_plugins()
+        tab = self.window.active_tab() if processes else None
+        editor = tab.text_edit if tab is not None else None
+        if editor is self._mirror_editor:
+            return
+        self._set_mirror_editor(editor, id(tab) if tab is not None else None)
+        snapshot = self._mirror_snapshot()
+        for process in processes:
+            process.send_snapshot(snapshot)
+
+    def _on_mirror_delta(self, delta) -> None:
+        if self._mirror_doc is None:
+            return
+        for process in self._process_plugins():
+            process.send_delta(self._mirror_doc, delta)
+
+    def _on_plugin_process_ready(self, process: PluginProcess) -> None:
+        self.event_bus.invalidate()
+        self.window.log_event(
+            "Info", f"Plugin started out of process ({process.record.plugin_id}, pid {process.pid})"
+        )
+
+    def _on_plugin_process_done(self, process: PluginProcess, result: dict[str, Any]) -> None:
+        rec = process.record
+        error = str(result.get("error", "") or "")
+        if not error:
+            return
+        label = f"{rec.plugin_id}:{result.get('kind', '')} {result.get('name', '')}".strip()
+        if not result.get("limited"):
+            self.window.log_event("Error", f"Plugin hook error ({label}): {error}")
+            return
+        self.window.log_event(
+            "Info",
+            f"Plugin CPU limit hit ({label}): {float(result.get('cpu_ms', 0) or 0):.0f} ms "
+            f"(limit {process.cpu_limit_ms} ms)",
+        )
+        if process.limit_strikes >= CPU_LIMIT_STRIKES:
+            # Stop outside the QProcess signal handler that delivered this result.
+            QTimer.singleShot(0, self.window, lambda: self._stop_process_plugin(process, "kept exceeding its CPU limit"))
+
+    def _stop_process_plugin(self, process: PluginProcess, reason: str) -> None:
+        if process.record.process is not process:
+            return
+        process.stop()
+        self._on_plugin_process_exit(process, reason)
+
+    def _on_plugin_process_exit(self, process: PluginProcess, reason: str) -> None:
+        rec = process.record
+        if rec.process is not process:
+            return
+        detail = " | ".join(list(process.stderr_tail)[-3:])
+        self.window.log_event(
+            "Error", f"Plugin process stopped ({rec.plugin_id}): {reason}" + (f" | {detail}" if detail else "")
+        )
+        loaded = process.ready
+        self._unload_record(rec)
+        self.event_bus.remove_subscriber(rec.plugin_id)
+        if not self._process_plugins():
+            self._set_mirror_editor(None, None)
+        if not loaded:
+            self._quarantine_plugin(rec, reason)
+            self.window.show_status_message(f"Plugin quarantined: {rec.plugin_id}", 3500)
+            return
+        self.window.show_status_message(
+            f"Plugin '{rec.name}' stopped ({reason}). Reload plugins to restart it.", 6000
+        )
 
     def reload(self, *, startup: bool = False) -> None:
         import importlib.util
 
         self._unload_all()
         self.records = self.discover()
+        self._restart_discovery_verify_timer()
+        self._refresh_event_subscribers()
         if startup and self._is_startup_safe_mode():
             self.window.show_status_message("Plugin startup safe mode is enabled.", 3000)
             return
@@ -632,6 +967,15 @@ class PluginHost:
                     self.window.log_event("Info", f"Plugin trust denied: {rec.plugin_id}")
                     continue
                 self._mark_trusted(rec)
+            load_started = time.perf_counter()
+            if rec.runtime == RUNTIME_PROCESS:
+                if process_runtime_available():
+                    self._start_process_plugin(rec)
+                    rec.load_ms = (time.perf_counter() - load_started) * 1000.0
+                    continue
+                self.window.log_event(
+                    "Info", f"Out-of-process plugins are unavailable in this build; loading {rec.plugin_id} in-process"
+                )
             try:
                 spec = importlib.util.spec_from_file_location(f"np_plugin_{rec.plugin_id}", rec.path / "plugin.py")
                 if spec is None or spec.loader is None:
@@ -648,6 +992,8 @@ class PluginHost:
             except Exception as exc:  # noqa: BLE001
                 self._quarantine_plugin(rec, str(exc))
                 self.window.show_status_message(f"Plugin quarantined: {rec.plugin_id}", 3500)
+            rec.load_ms = (time.perf_counter() - load_started) * 1000.0
+        self._refresh_event_subscribers()
 
     def set_enabled(self, plugin_id: str, enabled: bool) -> None:
         ids = self._enabled()
@@ -722,6 +1068,21 @@ class PluginManagerDialog(QDialog):
                 state = "QUARANTINED" if rec.quarantined else "ok"
             requested = ", ".join(sorted(rec.requested_permissions)) or "none"
             effective = ", ".join(sorted(rec.permissions)) or "none"
+            event_stats = self.host.event_bus.stats(rec.plugin_id)
+            if event_stats is not None and event_stats.calls:
+                state += (
+                    f" | events: avg {event_stats.avg_ms:.1f} ms, max {event_stats.max_ms:.1f} ms"
+                    f" ({event_stats.state})"
+                )
+            if rec.runtime == RUNTIME_PROCESS:
+                live = next((r for r in self.host.records if r.plugin_id == rec.plugin_id), None)
+                process = live.process if live is not None else None
+                state += " | runtime: process"
+                if process is not None and process.calls:
+                    state += (
+                        f" (cpu avg {process.cpu_avg_ms:.1f} ms, max {process.cpu_max_ms:.1f} ms,"
+                        f" limit hits {process.limit_hits})"
+                    )
             details = (
                 (
                     f"{rec.description} | perms: {effective} | requested: {requested} | "
@@ -785,22 +1146,83 @@ class PluginManagerDialog(QDialog):
 
 
 class MinimapDock(QDockWidget):
-    def __init__(self, parent) -> None:
+    def __init__(self, parent, jump_cb) -> None:
         super().__init__("Minimap", parent)
-        self.text = QTextEdit(self)
-        self.text.setReadOnly(True)
-        f = self.text.font()
-        f.setPointSize(max(6, f.pointSize() - 4))
-        self.text.setFont(f)
-        self.setWidget(self.text)
-
-    def refresh(self, src: str, *, show_line_numbers: bool = False) -> None:
-        lines = src.splitlines()[:1800]
-        if show_line_numbers:
-            rendered = [f"{idx + 1:5d}  {line}" for idx, line in enumerate(lines)]
-        else:
-            rendered = lines
-        self.text.setPlainText("\n".join(rendered))
+        self.jump_cb = jump_cb
+        self.map = MinimapWidget(self)
+        self.map.jumpRequested.connect(self._jump)
+        self.setWidget(self.map)
+        self._editor = None
+        self._scrollbar = None
+        self._delta_stale = True
+
+    def _jump(self, line: int) -> None:
+        self.jump_cb(line)
+
+    def _sync_viewport(self, *_args) -> None:
+        if self._editor is not None:
+            self.map.set_viewport(*self._editor.visible_line_range())
+
+    def _watch_editor(self, editor) -> None:
+        if editor is self._editor:
+            return
+        old = self._editor
+        if old is not None:
+            try:
+                old.textDelta.disconnect(self._on_text_delta)
+                old.set_delta_tracking(False)
+            except (RuntimeError, TypeError):
+                pass  # tab already closed
+        if self._scrollbar is not None:
+            try:
+                self._scrollbar.valueChanged.disconnect(self._sync_viewport)
+                self._scrollbar.rangeChanged.disconnect(self._sync_viewport)
+            except (RuntimeError, TypeError):
+                pass
+        self._editor = editor
+        self._scrollbar = None
+        self._delta_stale = True
+        if editor is not None and hasattr(editor, "textDelta"):
+            editor.set_delta_tracking(True)
+            editor.textDelta.connect(self._on_text_delta)
+        widget = getattr(editor, "widget", None)
+        if widget is not None and hasattr(widget, "verticalScrollBar"):
+            self._scrollbar = widget.verticalScrollBar()
+            self._scrollbar.valueChanged.connect(self._sync_viewport)
+            self._scrollbar.rangeChanged.connect(self._sync_viewport)
+
+    def _on_text_delta(self, delta) -> None:
+        """Update only the rows an edit touched; its line span follows from the line counts."""
+        editor = self._editor
+        if self._delta_stale or editor is None:
+            return
+        # A second delta for one revision sees the document after all of them; rebuild instead.
+        if delta.reset or self.map.has_document(editor, delta.revision):
+            self._delta_stale = True
+            return
+        start = editor.line_from_position(delta.position) if (delta.removed or delta.inserted) else 0
+        new_span = delta.inserted.count("\n")
+        old_span = new_span + self.map.line_count() - editor.line_count()
+        lines = editor.get_line_range(start, start + new_span + 1) if (delta.removed or delta.inserted) else []
+        count = old_span + 1 if lines else 0
+        if old_span < 0 or not self.map.apply_edit(editor, delta.revision, start, count, lines):
+            self._delta_stale = True
+
+    def refresh(self, editor) -> None:
+        if editor is None:
+            self._watch_editor(None)
+            self.map.clear_document()
+            self.map.set_viewport(0, 0)
+            return
+        self._watch_editor(editor)
+        revision = int(getattr(editor, "revision", 0))
+        # Edits are applied from text deltas; the full text is only read on a switch or reset.
+        if self._delta_stale or not self.map.has_document(editor, revision):
+            if self._delta_stale:
+                self.map.clear_document()
+            self.map.set_document(editor, revision, editor.get_text())
+            self._delta_stale = False
+        self._sync_viewport()
 
 
 class OutlineDock(QDockWidget):
@@ -810,37 +1232,24 @@ class OutlineDock(QDockWidget):
         self.list_widget = QListWidget(self)
         self.setWidget(self.list_widget)
         self.list_widget.itemDoubleClicked.connect(self._jump)
+        self._shown_key: tuple[int, int, str] | None = None
 
     def _jump(self, item: QListWidgetItem) -> None:
         line = item.data(Qt.ItemDataRole.UserRole)
         if isinstance(line, int):
             self.jump_cb(line)
 
-    def refresh(self, language: str, text: str) -> None:
+    def show_snapshot(self, owner: object, snapshot: SymbolSnapshot | None) -> None:
+        key = (id(owner), snapshot.revision, snapshot.language) if snapshot is not None else None
+        if key == self._shown_key:
+            return
+        self._shown_key = key
         self.list_widget.clear()
-        rows: list[tuple[int, str]] = []
-        if language == "python":
-            try:
-                tree = ast.parse(text)
-                for n in ast.walk(tree):
-                    if isinstance(n, ast.ClassDef):
-                        rows.append((n.lineno - 1, f"class {n.name}"))
-                    if isinstance(n, ast.FunctionDef):
-                        rows.append((n.lineno - 1, f"def {n.name}"))
-            except Exception:
-                pass
-        if language == "markdown":
-            for i, ln in enumerate(text.splitlines()):
-                if ln.strip().startswith("#"):
-                    rows.append((i, ln.strip()))
-        if not rows:
-            for i, ln in enumerate(text.splitlines()):
-                s = ln.strip()
-                if re.match(r"^(class|def|function)\s+\w+", s):
-                    rows.append((i, s))
-        for line, title in rows[:500]:
-            item = QListWidgetItem(f"{line + 1}: {title}")
-            item.setData(Qt.ItemDataRole.UserRole, line)
+        if snapshot is None:
+            return
+        for line_no, title in snapshot.rows:
+            item = QListWidgetItem(f"{line_no}: {title}")
+            item.setData(Qt.ItemDataRole.UserRole, line_no - 1)
             self.list_widget.addItem(item)
 
 
@@ -1120,7 +1529,7 @@ class AdvancedFeaturesController:
             )
         except Exception:
             pass
-        self.minimap_dock = MinimapDock(window)
+        self.minimap_dock = MinimapDock(window, self._jump_line)
         self.minimap_dock.setObjectName("minimapDock")
         self.minimap_dock.setAllowedAreas(Qt.AllDockWidgetAreas)
         self.minimap_dock.hide()
@@ -1139,6 +1548,19 @@ class AdvancedFeaturesController:
         except Exception:
             pass
         self.collab = CollaborationServer(window)
+        self._definition_index: DefinitionIndex | None = None
+        self._definition_index_lock = threading.Lock()
+        self._definition_index_refreshing = False
+        self._definition_index_files: list[str] = []
+        self._definition_scan_token = 0
+        # The index is built and kept current from here and on workspace changes, never on F12.
+        self.definition_index_timer = QTimer(window)
+        self.definition_index_timer.setSingleShot(True)
+        self.definition_index_timer.timeout.connect(self.schedule_definition_index_refresh)
+        self.definition_index_timer.start(DEFINITION_INDEX_RETRY_MS)
+        self._retrieval_index: RetrievalIndex | None = None
+        self._retrieval_index_lock = threading.Lock()
+        self._retrieval_index_refreshing = False
         self.backup_timer = QTimer(window)
         self.backup_timer.timeout.connect(self.backup_now)
         self.apply_backup_schedule()
@@ -1160,25 +1582,31 @@ class AdvancedFeaturesController:
     def refresh_views(self) -> None:
         tab = self.window.active_tab()
         if tab is None:
-            self.minimap_dock.refresh("")
-            self.outline_dock.refresh("plain", "")
+            self.minimap_dock.refresh(None)
+            self.outline_dock.show_snapshot(None, None)
             self.window._set_breadcrumb_text("-")
             return
-        txt = tab.text_edit.get_text()
-        self.minimap_dock.refresh(txt, show_line_numbers=not bool(tab.text_edit.is_scintilla))
-        lang = self.window._detect_language_for_tab(tab)
-        self.outline_dock.refresh(lang, txt)
+        # A hidden minimap lets go of the editor so it stops listening to edits.
+        self.minimap_dock.refresh(tab.text_edit if self.minimap_dock.isVisible() else None)
+        self.window._symbol_model_for_tab(tab).request()
+        self.refresh_symbol_views()
+
+    def refresh_symbol_views(self) -> None:
+        tab = self.window.active_tab()
+        if tab is None:
+            return
+        snapshot = self.window._symbol_model_for_tab(tab).snapshot()
+        self.outline_dock.show_snapshot(tab, snapshot)
         line, _ = tab.text_edit.cursor_position()
-        self.window._set_breadcrumb_text(f"{tab.current_file or 'Untitled'} > line {line + 1}")
+        crumbs = [tab.current_file or "Untitled"]
+        symbol = snapshot.enclosing(line + 1)
+        if symbol:
+            crumbs.append(symbol)
+        crumbs.append(f"line {line + 1}")
+        self.window._set_breadcrumb_text(" > ".join(crumbs))
 
     def toggle_minimap(self, checked: bool) -> None:
         self.minimap_dock.setVisible(bool(checked))
-        tab = self.window.active_tab()
-        if checked and tab is not None and not bool(tab.text_edit.is_scintilla):
-            self.window.show_status_message(
-                "Minimap fallback mode: line-numbered text preview (QScintilla not available).",
-                3000,
-            )
         self.refresh_views()
 
     def toggle_outline(self, checked: bool) -> None:
@@ -1227,10 +1655,15 @@ class AdvancedFeaturesController:
             self._lsp_log("LSP definition lookup disabled by settings.")
         if resolved is None:
             resolved = self._resolve_definition_fallback(symbol=symbol, language=language, source_text=source, current_file=current_path)
+        if resolved is None and self.definition_index_cold():
+            self._find_definition_in_background(tab, symbol=symbol, current_file=current_path)
+            return
         if resolved is None:
             self.window.show_status_message("Definition not found.", 2500)
             return
+        self._jump_to_definition(tab, resolved, current_path)
 
+    def _jump_to_definition(self, tab: EditorTab, resolved: tuple[str, int], current_path: str) -> None:
         target_path, target_line = resolved
         if target_path and target_path != current_path:
             if not self.window._open_file_path(target_path):
@@ -1536,36 +1969,212 @@ class AdvancedFeaturesController:
         source_text: str,
         current_file: str,
     ) -> tuple[str, int] | None:
-        patterns: list[str] = []
-        if language == "python":
-            patterns = [rf"^\s*def\s+{re.escape(symbol)}\b", rf"^\s*class\s+{re.escape(symbol)}\b", rf"^\s*{re.escape(symbol)}\s*="]
-        elif language in {"javascript", "typescript"}:
-            patterns = [
-                rf"^\s*function\s+{re.escape(symbol)}\b",
-                rf"^\s*(const|let|var)\s+{re.escape(symbol)}\b",
-                rf"^\s*class\s+{re.escape(symbol)}\b",
-                rf"^\s*export\s+(function|class|const|let|var)\s+{re.escape(symbol)}\b",
-            ]
-        else:
-            patterns = [rf"^\s*{re.escape(symbol)}\s*="]
-        for idx, ln in enumerate(source_text.splitlines()):
-            if any(re.search(p, ln) for p in patterns):
-                return current_file, idx
+        local = [(line, kind) for name, line, kind in extract_definitions(language, source_text) if name == symbol]
+        if local:
+            local.sort(key=lambda row: (0 if row[1] in {"class", "function", "type"} else 1, row[0]))
+            return current_file, local[0][0]
+
+        index = self._definition_index_for_workspace()
+        if index is not None:
+            current_norm = str(Path(current_file).resolve()) if current_file else ""
+            for entry in index.lookup(symbol, current_file=current_file, language=language):
+                # The live buffer was already searched above; its on-disk copy may be stale.
+                if current_norm and str(Path(entry.path).resolve()) == current_norm:
+                    continue
+                return entry.path, entry.line
+            if index.built:
+                return None
+        # Without a built index only open documents are searched here; workspace files are
+        # scanned off the UI thread by _find_definition_in_background.
+        for path, text in self._open_document_texts(exclude=current_file):
+            for name, line, _kind in extract_definitions(language_for_path(path), text):
+                if name == symbol:
+                    return path, line
+        return None
+
+    def _open_document_texts(self, *, exclude: str = "") -> list[tuple[str, str]]:
+        rows: list[tuple[str, str]] = []
+        seen = {str(Path(exclude).resolve())} if exclude else set()
+        for idx in range(self.window.tab_widget.count()):
+            tab = self.window._tab_at_index(idx)
+            path = str(getattr(tab, "current_file", "") or "").strip() if tab is not None else ""
+            if not path or tab.session_load_pending:
+                continue
+            norm = str(Path(path).resolve())
+            if norm not in seen:
+                seen.add(norm)
+                rows.append((path, tab.text_edit.get_text()))
+        return rows
+
+    def definition_index_cold(self) -> bool:
+        """True while the workspace has a definition index that has never been fully built."""
+        index = self._definition_index_for_workspace()
+        return index is not None and not index.built
+
+    def _find_definition_in_background(self, tab: EditorTab, *, symbol: str, current_file: str) -> None:
+        """Scan workspace files for ``symbol`` on a worker thread, then jump if still relevant."""
+        files = self._definition_index_files[:DEFINITION_SCAN_MAX_FILES]
+        if not files:
+            self.window.show_status_message("Definition not found (workspace definition index is still building).", 3000)
+            return
+        searched = [current_file] if current_file else []
+        searched += [path for path, _text in self._open_document_texts()]
+        self._definition_scan_token += 1
+        token = self._definition_scan_token
+        self.window.show_status_message(f"Searching workspace for {symbol}...", 2000)
+
+        def _worker() -> None:
+            skip = {str(Path(path).resolve()) for path in searched}
+            resolved = find_definition_in_files(symbol, files, skip=skip)
+            QTimer.singleShot(0, self.window, lambda: self._finish_background_definition(token, tab, resolved, current_file))
+
+        threading.Thread(target=_worker, name="pypad-definition-scan", daemon=True).start()
+
+    def _finish_background_definition(
+        self, token: int, tab: EditorTab, resolved: tuple[str, int] | None, current_file: str
+    ) -> None:
+        # A newer F12 or a tab switch supersedes this lookup.
+        if token != self._definition_scan_token or self.window.active_tab() is not tab:
+            return
+        if resolved is None:
+            self.window.show_status_message("Definition not found.", 2500)
+            return
+        self._jump_to_definition(tab, resolved, current_file)
+
+    def _definition_index_for_workspace(self) -> DefinitionIndex | None:
+        root = str(self.window._workspace_root() or "").strip()
+        if not root:
+            return None
+        with self._definition_index_lock:
+            index = self._definition_index
+            if index is None or index.root != root:
+                index = DefinitionIndex.for_workspace(get_index_cache_dir_path(), root)
+                index.load()
+                self._definition_index = index
+                self._definition_index_files = []
+            return index
+
+    def schedule_definition_index_refresh(self) -> None:
+        """Bring the definition index up to date on a worker thread, then re-arm the idle timer."""
+        if self._definition_index_refreshing:
+            return
+        index = self._definition_index_for_workspace()
+        files = self.window._indexed_workspace_files() if index is not None else None
+        if files is None:
+            # No workspace yet, or its file scan is still running; look again later.
+            self.definition_index_timer.start(DEFINITION_INDEX_RETRY_MS if index is not None else DEFINITION_INDEX_REFRESH_MS)
+            return
+        self.definition_index_timer.stop()
+        self._definition_index_files = files
+        self._definition_index_refreshing = True
 
-        workspace_files = []
+        def _worker() -> None:
+            try:
+                changed = index.refresh(files)
+                index.save()
+                if changed:
+                    self._lsp_log(f"Definition index refreshed: {changed} file(s) reparsed, {index.file_count} indexed.")
+            except Exception as exc:  # noqa: BLE001
+                self._lsp_log(f"Definition index refresh failed: {exc}", level="Warning")
+            finally:
+                self._definition_index_refreshing = False
+                QTimer.singleShot(0, self.window, lambda: self.definition_index_timer.start(DEFINITION_INDEX_REFRESH_MS))
+
+        threading.Thread(target=_worker, name="pypad-definition-index", daemon=True).start()
+
+    def _retrieval_index_for_workspace(self) -> RetrievalIndex | None:
+        root = str(self.window._workspace_root() or "").strip()
+        if not root:
+            return None
+        with self._retrieval_index_lock:
+            index = self._retrieval_index
+            if index is None or index.root != root:
+                index = RetrievalIndex(root)
+                self._retrieval_index = index
+            return index
+
+    def schedule_retrieval_index_refresh(self) -> None:
+        if self._retrieval_index_refreshing:
+            return
+        index = self._retrieval_index_for_workspace()
+        if index is None:
+            return
         try:
-            workspace_files = list(self.window._workspace_files() or [])
+            files = [str(p) for p in (self.window._workspace_files() or [])]
         except Exception:
-            workspace_files = []
-        for path in workspace_files[:5000]:
+            return
+        self._retrieval_index_refreshing = True
+
+        def _worker() -> None:
             try:
-                text = Path(path).read_text(encoding="utf-8", errors="replace")
+                changed = index.refresh(files)
+                if changed:
+                    self._lsp_log(f"Retrieval index refreshed: {changed} file(s) reparsed, {index.file_count} indexed.")
+            except Exception as exc:  # noqa: BLE001
+                self._lsp_log(f"Retrieval index refresh failed: {exc}", level="Warning")
+            finally:
+                self._retrieval_index_refreshing = False
+
+        threading.Thread(target=_worker, name="pypad-retrieval-index", daemon=True).start()
+
+    def workspace_citation_snippets(
+        self,
+        question: str,
+        *,
+        max_files: int,
+        max_lines_per_file: int,
+        max_total_chars: int,
+    ) -> list[CitationSnippet]:
+        """Best-matching workspace excerpts for ``question``.
+
+        Served from the BM25 retrieval index once its first build has finished; until
+        then the build runs in the background and this falls back to a direct scan.
+        """
+        index = self._retrieval_index_for_workspace()
+        if index is None:
+            return []
+        self.schedule_retrieval_index_refresh()
+        if index.built:
+            return build_indexed_citation_snippets(
+                index,
+                question,
+                max_files=max_files,
+                max_lines_per_file=max_lines_per_file,
+                max_total_chars=max_total_chars,
+            )
+        files = [str(p) for p in (self.window._workspace_files() or [])]
+        return build_workspace_citation_snippets(
+            question,
+            files,
+            max_files=max_files,
+            max_lines_per_file=max_lines_per_file,
+            max_total_chars=max_total_chars,
+        )
+
+    def note_file_saved(self, path: str, text: str) -> None:
+        root = str(self.window._workspace_root() or "").strip()
+        if not path or not root:
+            return
+        index = self._definition_index if self._definition_index is not None and self._definition_index.root == root else None
+        retrieval = self._retrieval_index if self._retrieval_index is not None and self._retrieval_index.root == root else None
+        if index is None and retrieval is None:
+            return
+        try:
+            Path(path).resolve().relative_to(Path(root).resolve())
+        except Exception:
+            return
+
+        def _worker() -> None:
+            try:
+                if retrieval is not None:
+                    retrieval.update_text(path, text)
+                if index is not None:
+                    index.update_text(path, text)
+                    index.save()
             except Exception:
-                continue
-            for idx, ln in enumerate(text.splitlines()):
-                if any(re.search(p, ln) for p in patterns):
-                    return str(path), idx
-        return None
+                pass
+
+        threading.Thread(target=_worker, name="pypad-definition-index-save", daemon=True).start()
 
     def open_diff(self) -> None:
         tab = self.window.active_tab()
@@ -1861,6 +2470,7 @@ class AdvancedFeaturesController:
     def show_tasks(self) -> None:
         tasks: list[str] = []
         due = re.compile(r"due[:=]\s*(\d{4}-\d{2}-\d{2})", re.IGNORECASE)
+        self.window._materialize_session_tabs()
         for i in range(self.window.tab_widget.count()):
             tab = self.window.tab_widget.widget(i)
             if tab is None:
@@ -1904,6 +2514,7 @@ class AdvancedFeaturesController:
         dest = Path(configured) if configured else (_root() / "backups")
         dest.mkdir(parents=True, exist_ok=True)
         out = dest / f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        self.window._materialize_session_tabs()
         with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
             for i in range(self.window.tab_widget.count()):
                 tab = self.window.tab_widget.widget(i)
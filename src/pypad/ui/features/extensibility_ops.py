@@ -24,6 +24,7 @@ class DiscoverableAction:
     section: str
     action: QAction
     shortcut_text: str
+    search_text: str = ""
 
 
 def _clean_action_text(text: str) -> str:
@@ -56,7 +57,88 @@ def _walk_menu(menu: QMenu, parent_path: str, sink: dict[int, str]) -> None:
             _walk_menu(submenu, path, sink)
 
 
+class ActionRegistry:
+    """Window commands with the metadata the command palette and shortcut mapper need.
+
+    Actions are registered with a stable id and the menu section that shows them, so
+    menus can be filled lazily and nothing has to walk the menu tree to find commands.
+    ``index()`` is cached; it is rebuilt after ``register``/``unregister``, or after
+    ``invalidate()`` when labels or shortcuts changed (translation, shortcut mapping).
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[QAction, str, str]] = {}
+        self._index: list[DiscoverableAction] | None = None
+        self.version = 0
+
+    def register(self, action_id: str, action: QAction, *, section: str = "Global", keywords: str = "") -> None:
+        self._entries[action_id] = (action, section or "Global", keywords)
+        self.invalidate()
+
+    def unregister(self, action_id: str) -> None:
+        if self._entries.pop(action_id, None) is not None:
+            self.invalidate()
+
+    def unregister_action(self, action: QAction) -> None:
+        stale = [aid for aid, (registered, _section, _keywords) in self._entries.items() if registered is action]
+        for aid in stale:
+            del self._entries[aid]
+        if stale:
+            self.invalidate()
+
+    def get(self, action_id: str) -> QAction | None:
+        entry = self._entries.get(action_id)
+        return entry[0] if entry is not None else None
+
+    def __contains__(self, action_id: object) -> bool:
+        return action_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self) -> None:
+        self._index = None
+        self.version += 1
+
+    def index(self) -> list[DiscoverableAction]:
+        """Registered actions sorted by section and label, with lowercased search text."""
+        if self._index is not None:
+            return self._index
+        out: list[DiscoverableAction] = []
+        deleted: list[str] = []
+        for action_id, (action, section, keywords) in self._entries.items():
+            try:
+                if action.isSeparator():
+                    continue
+                label = _clean_action_text(action.text())
+                shortcut = _action_shortcut_text(action)
+            except RuntimeError:
+                deleted.append(action_id)
+                continue
+            if not label:
+                continue
+            search_text = " ".join(part for part in (section, label, shortcut, action_id, keywords) if part).lower()
+            out.append(
+                DiscoverableAction(
+                    action_id=action_id,
+                    label=label,
+                    section=section,
+                    action=action,
+                    shortcut_text=shortcut,
+                    search_text=search_text,
+                )
+            )
+        for action_id in deleted:
+            del self._entries[action_id]
+        out.sort(key=lambda x: (x.section.lower(), x.label.lower(), x.action_id.lower()))
+        self._index = out
+        return out
+
+
 def discover_window_actions(window: Any) -> list[DiscoverableAction]:
+    registry = getattr(window, "action_registry", None)
+    if registry is not None:
+        return list(registry.index())
     attr_name_by_action_id: dict[int, str] = {}
     for name, value in vars(window).items():
         if isinstance(value, QAction):
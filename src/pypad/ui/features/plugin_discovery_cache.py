@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+CACHE_FORMAT_VERSION = 1
+DIGEST_FILES = ("plugin.json", "plugin.py")
+# Distinct (plugin id, permissions) assessments kept per plugin; overrides rarely churn.
+MAX_ASSESSMENTS_PER_PLUGIN = 8
+
+Assess = Callable[[Path, str, set[str]], list[str]]
+
+
+def compute_plugin_digest(plugin_dir: Path) -> str:
+    hasher = hashlib.sha256()
+    for rel in DIGEST_FILES:
+        path = plugin_dir / rel
+        if not path.exists():
+            continue
+        hasher.update(rel.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(path.read_bytes())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def plugin_tree_fingerprint(plugin_dir: Path) -> list[list[Any]]:
+    """``[relpath, size, mtime_ns, is_symlink]`` for every entry under ``plugin_dir``.
+
+    Only ``lstat`` is used, so this costs one syscall per entry and never reads file
+    contents. Symlinks are listed but not followed.
+    """
+    rows: list[list[Any]] = []
+    pending = [plugin_dir]
+    while pending:
+        folder = pending.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+                is_link = entry.is_symlink()
+                is_dir = not is_link and entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            rel = Path(entry.path).relative_to(plugin_dir).as_posix()
+            rows.append([rel, -1 if is_dir else st.st_size, st.st_mtime_ns, is_link])
+            if is_dir:
+                pending.append(Path(entry.path))
+    rows.sort()
+    return rows
+
+
+def _assessment_key(plugin_id: str, permissions: set[str]) -> str:
+    return plugin_id + "|" + ",".join(sorted(permissions))
+
+
+class PluginDiscoveryCache:
+    """Remembers plugin digests and security assessments between discoveries.
+
+    Each plugin folder is fingerprinted by the ``(path, size, mtime_ns)`` of every
+    entry in it. While the fingerprint of ``plugin.json``/``plugin.py`` is unchanged,
+    the digest is not recomputed. While nothing in the folder changed, the security
+    assessment for a given ``(plugin id, permissions)`` is reused. A file rewritten
+    with its size and mtime preserved is not noticed until ``verify`` rehashes
+    everything.
+    """
+
+    def __init__(self, cache_path: Path) -> None:
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> None:
+        if not self.cache_path.exists():
+            return
+        try:
+            payload = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(payload, dict) or int(payload.get("version", 0) or 0) != CACHE_FORMAT_VERSION:
+            return
+        plugins = payload.get("plugins", {})
+        if not isinstance(plugins, dict):
+            return
+        with self._lock:
+            self._entries = {
+                str(folder): row
+                for folder, row in plugins.items()
+                if isinstance(row, dict)
+                and isinstance(row.get("tree"), list)
+                and isinstance(row.get("digest"), str)
+                and isinstance(row.get("assessments"), dict)
+            }
+            self._dirty = False
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"version": CACHE_FORMAT_VERSION, "plugins": dict(self._entries)}
+            self._dirty = False
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.cache_path)
+
+    def lookup(self, plugin_dir: Path, plugin_id: str, permissions: set[str], assess: Assess) -> tuple[str, list[str]]:
+        """Digest and security issues for ``plugin_dir``, recomputing only what changed."""
+        folder = str(plugin_dir)
+        tree = plugin_tree_fingerprint(plugin_dir)
+        key = _assessment_key(plugin_id, permissions)
+        with self._lock:
+            cached = self._entries.get(folder)
+        if cached is not None and cached["tree"] == tree:
+            issues = cached["assessments"].get(key)
+            if issues is not None:
+                self.hits += 1
+                return cached["digest"], list(issues)
+        self.misses += 1
+        digest_rows = [row for row in tree if row[0] in DIGEST_FILES]
+        if cached is not None and [row for row in cached["tree"] if row[0] in DIGEST_FILES] == digest_rows:
+            digest = cached["digest"]
+        else:
+            digest = compute_plugin_digest(plugin_dir)
+        assessments = dict(cached["assessments"]) if cached is not None and cached["tree"] == tree else {}
+        issues = list(assess(plugin_dir, plugin_id, set(permissions)))
+        assessments[key] = issues
+        while len(assessments) > MAX_ASSESSMENTS_PER_PLUGIN:
+            assessments.pop(next(iter(assessments)))
+        with self._lock:
+            self._entries[folder] = {"tree": tree, "digest": digest, "assessments": assessments}
+            self._dirty = True
+        return digest, list(issues)
+
+    def prune(self, folders: set[str]) -> None:
+        """Forget plugins whose folder is not in ``folders`` (uninstalled)."""
+        with self._lock:
+            stale = [folder for folder in self._entries if folder not in folders]
+            for folder in stale:
+                del self._entries[folder]
+            if stale:
+                self._dirty = True
+
+    def verify(self, assess: Assess) -> list[str]:
+        """Rehash and reassess every cached plugin, ignoring fingerprints.
+
+        Safe to call from a worker thread. Entries that no longer match are replaced
+        and their folders returned, so the caller can rediscover them.
+        """
+        with self._lock:
+            snapshot = {folder: dict(row) for folder, row in self._entries.items()}
+        changed: list[str] = []
+        for folder, row in snapshot.items():
+            plugin_dir = Path(folder)
+            if not plugin_dir.is_dir():
+                continue
+            tree = plugin_tree_fingerprint(plugin_dir)
+            digest = compute_plugin_digest(plugin_dir)
+            assessments: dict[str, list[str]] = {}
+            for key in row["assessments"]:
+                plugin_id, _, perms = key.partition("|")
+                assessments[key] = list(assess(plugin_dir, plugin_id, {p for p in perms.split(",") if p}))
+            if digest == row["digest"] and assessments == row["assessments"]:
+                continue
+            changed.append(folder)
+            with self._lock:
+                self._entries[folder] = {"tree": tree, "digest": digest, "assessments": assessments}
+                self._dirty = True
+        return changed
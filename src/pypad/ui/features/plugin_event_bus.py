@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Fired per keystroke / caret move; delivered once per idle period with the latest payload.
+COALESCED_EVENTS = frozenset({"change", "selection_changed", "cursor"})
+
+STATE_OK = "ok"
+STATE_THROTTLED = "throttled"
+STATE_SUSPENDED = "suspended"
+
+DEFAULT_EVENT_BUDGET_MS = 16.0
+DEFAULT_SLOW_STRIKES = 3
+DEFAULT_THROTTLE_INTERVAL_MS = 1000.0
+
+
+@dataclass(eq=False)
+class EventSubscriber:
+    plugin_id: str
+    name: str
+    instance: Any
+    # Plugins without the "ui" permission never see live widget objects.
+    allow_tab: bool = False
+
+
+@dataclass
+class PluginEventStats:
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    over_budget: int = 0
+    strikes: int = 0
+    state: str = STATE_OK
+    last_event: str = ""
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class PluginEventBus:
+    """Dispatches editor events to plugin hooks, timing every handler.
+
+    Only plugins that define ``on_<event>`` or ``on_event`` are called. Events in
+    ``COALESCED_EVENTS`` are queued with ``post`` and delivered by ``flush`` (the host
+    schedules it once typing goes idle), keeping only the latest payload per key.
+    A plugin whose handlers exceed ``budget_ms`` ``slow_strikes`` times in a row is
+    throttled to one coalesced delivery per ``throttle_interval_ms``; if it keeps
+    overrunning it is suspended from events until the plugins are reloaded.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget_ms: float = DEFAULT_EVENT_BUDGET_MS,
+        slow_strikes: int = DEFAULT_SLOW_STRIKES,
+        throttle_interval_ms: float = DEFAULT_THROTTLE_INTERVAL_MS,
+        on_error: Callable[[EventSubscriber, str, Exception], None] | None = None,
+        on_slow: Callable[[EventSubscriber, PluginEventStats, float], None] | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.budget_ms = float(budget_ms)
+        self.slow_strikes = int(slow_strikes)
+        self.throttle_interval_ms = float(throttle_interval_ms)
+        self._on_error = on_error
+        self._on_slow = on_slow
+        self._clock = clock
+        self._subscribers: list[EventSubscriber] = []
+        self._index: dict[str, list[tuple[EventSubscriber, Callable | None, Callable | None]]] = {}
+        self._stats: dict[str, PluginEventStats] = {}
+        self._pending: dict[tuple[str, object], dict[str, Any]] = {}
+        self._deferred: dict[str, dict[tuple[str, object], dict[str, Any]]] = {}
+        self._next_allowed: dict[str, float] = {}
+
+    def configure(self, *, budget_ms: float, slow_strikes: int, throttle_interval_ms: float) -> None:
+        self.budget_ms = max(1.0, float(budget_ms))
+        self.slow_strikes = max(1, int(slow_strikes))
+        self.throttle_interval_ms = max(0.0, float(throttle_interval_ms))
+
+    def set_subscribers(self, subscribers: list[EventSubscriber]) -> None:
+        """Replace the plugin set (after a reload); timing state starts fresh."""
+        self._subscribers = list(subscribers)
+        self._index.clear()
+        self._stats = {sub.plugin_id: PluginEventStats() for sub in self._subscribers}
+        self._pending.clear()
+        self._deferred.clear()
+        self._next_allowed.clear()
+
+    def invalidate(self) -> None:
+        """Re-resolve handlers on the next event (a subscriber's hooks changed)."""
+        self._index.clear()
+
+    def remove_subscriber(self, plugin_id: str) -> None:
+        self._subscribers = [sub for sub in self._subscribers if sub.plugin_id != plugin_id]
+        self._index.clear()
+        self._deferred.pop(plugin_id, None)
+        self._next_allowed.pop(plugin_id, None)
+
+    def stats(self, plugin_id: str) -> PluginEventStats | None:
+        return self._stats.get(plugin_id)
+
+    def _handlers(self, event: str) -> list[tuple[EventSubscriber, Callable | None, Callable | None]]:
+        entries = self._index.get(event)
+        if entries is None:
+            entries = []
+            for sub in self._subscribers:
+                generic = getattr(sub.instance, "on_event", None)
+                specific = getattr(sub.instance, f"on_{event}", None)
+                generic = generic if callable(generic) else None
+                specific = specific if callable(specific) else None
+                if generic is not None or specific is not None:
+                    entries.append((sub, generic, specific))
+            self._index[event] = entries
+        return entries
+
+    def has_subscribers(self, event: str) -> bool:
+        return any(self._stats[sub.plugin_id].state != STATE_SUSPENDED for sub, _g, _s in self._handlers(event))
+
+    def dispatch(self, event: str, payload: dict[str, Any]) -> None:
+        """Deliver immediately to every subscribed, non-suspended plugin."""
+        for entry in self._handlers(event):
+            if self._stats[entry[0].plugin_id].state != STATE_SUSPENDED:
+                self._deliver(entry, event, payload)
+
+    def post(self, event: str, payload: dict[str, Any], *, key: object = None) -> None:
+        """Queue a coalesced event; a later post with the same key replaces it."""
+        if not self._handlers(event):
+            return
+        self._pending.pop((event, key), None)
+        self._pending[(event, key)] = payload
+
+    def has_pending(self) -> bool:
+        return bool(self._pending or self._deferred)
+
+    def flush(self) -> float | None:
+        """Deliver queued events. Returns ms until throttled deliveries are due, if any."""
+        now = self._clock()
+        pending, self._pending = self._pending, {}
+        for plugin_id in list(self._deferred):
+            if self._next_allowed.get(plugin_id, 0.0) <= now:
+                for (event, _key), payload in self._deferred.pop(plugin_id).items():
+                    for entry in self._handlers(event):
+                        if entry[0].plugin_id == plugin_id:
+                            self._deliver_throttled(entry, event, payload, now)
+        for (event, key), payload in pending.items():
+            for entry in self._handlers(event):
+                sub = entry[0]
+                state = self._stats[sub.plugin_id].state
+                if state == STATE_SUSPENDED:
+                    continue
+                if state == STATE_THROTTLED and self._next_allowed.get(sub.plugin_id, 0.0) > now:
+                    self._deferred.setdefault(sub.plugin_id, {})[(event, key)] = payload
+                    continue
+                self._deliver_throttled(entry, event, payload, now)
+        if not self._deferred:
+            return None
+        due = min(self._next_allowed.get(pid, now) for pid in self._deferred)
+        return max(0.0, (due - now) * 1000.0)
+
+    def _deliver_throttled(self, entry, event: str, payload: dict[str, Any], now: float) -> None:
+        sub = entry[0]
+        if self._stats[sub.plugin_id].state == STATE_SUSPENDED:
+            return
+        self._deliver(entry, event, payload)
+        if self._stats[sub.plugin_id].state == STATE_THROTTLED:
+            self._next_allowed[sub.plugin_id] = now + self.throttle_interval_ms / 1000.0
+
+    def _deliver(self, entry, event: str, payload: dict[str, Any]) -> None:
+        sub, generic, specific = entry
+        event_payload = dict(payload)
+        if not sub.allow_tab:
+            event_payload.pop("tab", None)
+        started = self._clock()
+        try:
+            if generic is not None:
+                generic(event, dict(event_payload))
+            if specific is not None:
+                specific(dict(event_payload))
+        except Exception as exc:  # noqa: BLE001
+            if self._on_error is not None:
+                self._on_error(sub, event, exc)
+        self._account(sub, event, (self._clock() - started) * 1000.0)
+
+    def _account(self, sub: EventSubscriber, event: str, elapsed_ms: float) -> None:
+        stats = self._stats[sub.plugin_id]
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.last_event = event
+        if elapsed_ms <= self.budget_ms:
+            stats.strikes = 0
+            return
+        stats.over_budget += 1
+        stats.strikes += 1
+        if stats.strikes < self.slow_strikes:
+            return
+        stats.strikes = 0
+        stats.state = STATE_THROTTLED if stats.state == STATE_OK else STATE_SUSPENDED
+        if stats.state == STATE_SUSPENDED:
+            self._deferred.pop(sub.plugin_id, None)
+        if self._on_slow is not None:
+            self._on_slow(sub, stats, elapsed_ms)
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from PySide6.QtCore import QObject, QProcess, QProcessEnvironment, QTimer
+
+from pypad.ui.editor.text_delta import TextDelta
+from pypad.ui.features.plugin_event_bus import COALESCED_EVENTS
+from pypad.ui.features.plugin_worker import (
+    BRIDGED_CALLS,
+    WORKER_MODULE,
+    decode_message,
+    delta_message,
+    encode_message,
+)
+
+RUNTIME_IN_PROCESS = "inprocess"
+RUNTIME_PROCESS = "process"
+
+DEFAULT_PROCESS_CPU_LIMIT_MS = 2000
+CPU_LIMIT_STRIKES = 3
+_STDERR_TAIL_LINES = 20
+
+
+def process_runtime_available() -> bool:
+    """Frozen builds have no interpreter to start the worker with."""
+    return not getattr(sys, "frozen", False)
+
+
+def _src_root() -> Path:
+    # src/pypad/ui/features/plugin_process.py -> src at parents[3]
+    return Path(__file__).resolve().parents[3]
+
+
+class ProcessPluginProxy:
+    """Stands in for the plugin instance so ``PluginEventBus`` can address it.
+
+    Exposes ``on_<event>`` only for hooks the worker reported; a plugin with a generic
+    ``on_event`` gets every event through it (the worker calls both handlers).
+    """
+
+    def __init__(self, process: PluginProcess) -> None:
+        self._process = process
+
+    def on_unload(self) -> None:
+        self._process.stop()
+
+    def __getattr__(self, name: str):
+        hooks = self._process.hooks
+        if name == "on_event" and "event" in hooks:
+            return self._process.send_event
+        if name.startswith("on_") and name != "on_event" and "event" not in hooks and name[3:] in hooks:
+            return lambda payload, _event=name[3:]: self._process.send_event(_event, payload)
+        raise AttributeError(name)
+
+
+class PluginProcess(QObject):
+    """Host side of one plugin running in a worker process (see ``plugin_worker``).
+
+    Bridged calls from the worker are executed on the UI thread through ``api`` (a
+    regular ``PluginAPI``, so permissions and menu bookkeeping are shared with
+    in-process plugins). Events are sent without waiting; while the worker is still
+    busy, coalesced events are parked and only the latest one is delivered once it
+    catches up, so a slow plugin never queues up work behind typing. A worker that
+    stops answering for ``hang_ms`` is killed.
+    """
+
+    def __init__(
+        self,
+        parent: QObject,
+        record: Any,
+        api: Any,
+        *,
+        cpu_limit_ms: int = DEFAULT_PROCESS_CPU_LIMIT_MS,
+        on_ready: Callable[[PluginProcess], None],
+        on_exit: Callable[[PluginProcess, str], None],
+        on_done: Callable[[PluginProcess, dict[str, Any]], None],
+        on_resync: Callable[[PluginProcess], None],
+        on_output: Callable[[PluginProcess, str], None],
+    ) -> None:
+        super().__init__(parent)
+        self.record = record
+        self.api = api
+        self.cpu_limit_ms = max(1, int(cpu_limit_ms))
+        self.hang_ms = max(10_000, self.cpu_limit_ms * 5)
+        self.hooks: frozenset[str] = frozenset()
+        self.ready = False
+        self.pid = 0
+        self.calls = 0
+        self.cpu_total_ms = 0.0
+        self.cpu_max_ms = 0.0
+        self.limit_hits = 0
+        self.limit_strikes = 0
+        self.doc: int | None = None
+        self._on_ready = on_ready
+        self._on_exit = on_exit
+        self._on_done = on_done
+        self._on_resync = on_resync
+        self._on_output = on_output
+        self._stdout_buffer = b""
+        self._stderr_buffer = b""
+        self.stderr_tail: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+        self._in_flight: deque[float] = deque()
+        self._parked: dict[str, dict[str, Any]] = {}
+        self._stopping = False
+        self._exited = False
+        self._process = QProcess(self)
+        self._process.readyReadStandardOutput.connect(self._read_stdout)
+        self._process.readyReadStandardError.connect(self._read_stderr)
+        self._process.finished.connect(self._finished)
+        self._process.errorOccurred.connect(self._error)
+        self._watchdog = QTimer(self)
+        self._watchdog.setInterval(1000)
+        self._watchdog.timeout.connect(self._check_hung)
+
+    @property
+    def running(self) -> bool:
+        return not self._exited and self._process.state() != QProcess.ProcessState.NotRunning
+
+    @property
+    def cpu_avg_ms(self) -> float:
+        return self.cpu_total_ms / self.calls if self.calls else 0.0
+
+    def start(self, snapshot: dict[str, Any] | None = None) -> None:
+        self.doc = snapshot.get("doc") if snapshot else None
+        env = QProcessEnvironment.systemEnvironment()
+        paths = [str(_src_root())]
+        if env.value("PYTHONPATH"):
+            paths.append(env.value("PYTHONPATH"))
+        env.insert("PYTHONPATH", os.pathsep.join(paths))
+        env.insert("PYTHONIOENCODING", "utf-8")
+        self._process.setProcessEnvironment(env)
+        self._process.setWorkingDirectory(str(self.record.path))
+        self._process.start(sys.executable, ["-u", "-m", WORKER_MODULE, str(self.record.path)])
+        self.send(
+            {
+                "t": "init",
+                "plugin_id": self.record.plugin_id,
+                "name": self.record.name,
+                "permissions": sorted(self.record.permissions),
+                "cpu_limit_ms": self.cpu_limit_ms,
+                "text": snapshot,
+            }
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._watchdog.stop()
+        if self._process.state() == QProcess.ProcessState.NotRunning:
+            self._stopping = True
+            return
+        if not self._stopping:
+            self.send({"t": "shutdown"})
+            self._process.closeWriteChannel()
+        self._stopping = True
+        if not self._process.waitForFinished(1000):
+            self._process.kill()
+            self._process.waitForFinished(500)
+
+    def send(self, message: dict[str, Any]) -> None:
+        if self._exited:
+            return
+        self._process.write(encode_message(message))
+
+    def send_snapshot(self, snapshot: dict[str, Any]) -> None:
+        self.doc = snapshot.get("doc")
+        self.send({**snapshot, "t": "text"})
+
+    def send_delta(self, doc: int, delta: TextDelta) -> None:
+        if doc == self.doc:
+            self.send(delta_message(doc, delta))
+
+    def send_event(self, name: str, payload: dict[str, Any]) -> None:
+        if name in COALESCED_EVENTS and self._in_flight:
+            self._parked[name] = dict(payload)
+            return
+        self._in_flight.append(time.monotonic())
+        self.send({"t": "event", "name": name, "payload": payload})
+
+    def invoke(self, action_id: int) -> None:
+        self._in_flight.append(time.monotonic())
+        self.send({"t": "invoke", "action": action_id})
+
+    def _read_stdout(self) -> None:
+        self._stdout_buffer += bytes(self._process.readAllStandardOutput())
+        *lines, self._stdout_buffer = self._stdout_buffer.split(b"\n")
+        for line in lines:
+            message = decode_message(line)
+            if message is not None:
+                self._handle(message)
+
+    def _read_stderr(self) -> None:
+        self._stderr_buffer += bytes(self._process.readAllStandardError())
+        *lines, self._stderr_buffer = self._stderr_buffer.split(b"\n")
+        for raw in lines:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if line:
+                self.stderr_tail.append(line)
+                self._on_output(self, line)
+
+    def _handle(self, message: dict[str, Any]) -> None:
+        kind = message.get("t")
+        if kind == "call":
+            self._handle_call(message)
+        elif kind == "done":
+            self._handle_done(message)
+        elif kind == "ready":
+            self.ready = True
+            self.pid = int(message.get("pid", 0) or 0)
+            self.hooks = frozenset(str(h) for h in message.get("hooks", []))
+            self._on_ready(self)
+        elif kind == "resync":
+            self._on_resync(self)
+        elif kind == "fatal":
+            self._stopping = True
+            self._exit(f"failed to load: {message.get('error', '')}")
+
+    def _handle_call(self, message: dict[str, Any]) -> None:
+        method = str(message.get("method", ""))
+        args = message.get("args") if isinstance(message.get("args"), list) else []
+        call_id = message.get("id")
+        try:
+            if method not in BRIDGED_CALLS:
+                raise RuntimeError(f"Unsupported plugin call: {method}")
+            if method in {"add_menu_action", "add_toolbar_action"}:
+                where, label, action_id = args[0], args[1], int(args[2])
+                shortcut = args[3] if len(args) > 3 else None
+                getattr(self.api, method)(where, label, lambda _checked=False: self.invoke(action_id), shortcut)
+                result = None
+            else:
+                result = getattr(self.api, method)(*args)
+            reply = {"t": "reply", "id": call_id, "ok": True, "result": result}
+        except Exception as exc:  # noqa: BLE001
+            reply = {"t": "reply", "id": call_id, "ok": False, "error": str(exc)}
+        if call_id is not None:
+            self.send(reply)
+        elif not reply["ok"]:
+            self._on_output(self, f"{method}() failed: {reply['error']}")
+
+    def _handle_done(self, message: dict[str, Any]) -> None:
+        if message.get("kind") in {"event", "action"} and self._in_flight:
+            self._in_flight.popleft()
+        cpu_ms = float(message.get("cpu_ms", 0.0) or 0.0)
+        self.calls += 1
+        self.cpu_total_ms += cpu_ms
+        self.cpu_max_ms = max(self.cpu_max_ms, cpu_ms)
+        if message.get("limited"):
+            self.limit_hits += 1
+            self.limit_strikes += 1
+        else:
+            self.limit_strikes = 0
+        self._on_done(self, message)
+        if not self._in_flight and self._parked and not self._stopping:
+            parked, self._parked = self._parked, {}
+            for name, payload in parked.items():
+                self.send_event(name, payload)
+
+    def _check_hung(self) -> None:
+        if self._in_flight and (time.monotonic() - self._in_flight[0]) * 1000.0 > self.hang_ms:
+            self._stopping = True
+            self._process.kill()
+            self._exit(f"not responding for {self.hang_ms / 1000.0:.0f} s")
+
+    def _error(self, error: QProcess.ProcessError) -> None:
+        if error == QProcess.ProcessError.FailedToStart:
+            self._exit(f"could not start worker: {self._process.errorString()}")
+
+    def _finished(self, exit_code: int, exit_status: QProcess.ExitStatus) -> None:
+        if self._stopping and not self._exited:
+            self._exited = True
+            self._watchdog.stop()
+            return
+        crashed = exit_status == QProcess.ExitStatus.CrashExit
+        self._exit("crashed" if crashed else f"exited with code {exit_code}")
+
+    def _exit(self, reason: str) -> None:
+        if self._exited:
+            return
+        self._exited = True
+        self._watchdog.stop()
+        self._in_flight.clear()
+        self._parked.clear()
+        self._on_exit(self, reason)
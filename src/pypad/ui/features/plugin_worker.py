@@ -0,0 +1,479 @@
+from __future__ import annotations
+
+import _thread
+import importlib.util
+import json
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from pypad.ui.editor.text_delta import TextChangeLog, TextDelta, apply_text_delta, line_range
+
+# Kept free of Qt: this module is the entry point of the plugin worker process.
+
+DEFAULT_CPU_LIMIT_MS = 2000
+WORKER_MODULE = "pypad.ui.features.plugin_worker"
+
+# PluginAPI methods the worker forwards to the host, which runs them on the UI thread.
+BRIDGED_CALLS = frozenset(
+    {
+        "notify",
+        "workspace_root",
+        "workspace_files",
+        "refresh_workspace_index",
+        "workspace_index_status",
+        "selection_text",
+        "selection_range",
+        "open_tabs",
+        "open_file",
+        "save_active",
+        "replace_text",
+        "insert_text",
+        "replace_selection",
+        "apply_edits",
+        "ask_ai",
+        "add_menu_action",
+        "add_toolbar_action",
+    }
+)
+_LIFECYCLE_HOOKS = frozenset({"on_load", "on_unload"})
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(",", ":"), default=str) + "\n").encode("ascii")
+
+
+def decode_message(line: bytes) -> dict[str, Any] | None:
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def delta_message(doc: int, delta: TextDelta) -> dict[str, Any]:
+    return {
+        "t": "delta",
+        "doc": doc,
+        "rev": delta.revision,
+        "pos": delta.position,
+        "removed": delta.removed,
+        "inserted": delta.inserted,
+        "reset": delta.reset,
+    }
+
+
+def delta_from_message(message: dict[str, Any]) -> TextDelta:
+    return TextDelta(
+        revision=int(message.get("rev", 0)),
+        position=int(message.get("pos", 0)),
+        removed=int(message.get("removed", 0)),
+        inserted=str(message.get("inserted", "")),
+        reset=bool(message.get("reset", False)),
+    )
+
+
+class PluginCPUTimeExceeded(RuntimeError):
+    pass
+
+
+def _main_thread_cpu_clock() -> Callable[[], float]:
+    getter = getattr(time, "pthread_getcpuclockid", None)
+    if getter is not None:
+        try:
+            clock_id = getter(threading.get_ident())
+            time.clock_gettime(clock_id)
+            return lambda: time.clock_gettime(clock_id)
+        except (OSError, AttributeError):
+            pass
+    return time.process_time
+
+
+class CpuGuard:
+    """Stops a plugin call on the main thread once it has used ``limit_ms`` of CPU.
+
+    A watchdog thread samples the main thread's CPU clock (the whole process's where
+    per-thread clocks are unavailable) and interrupts it, which raises
+    ``PluginCPUTimeExceeded`` inside the plugin code. Must be created on the main thread.
+    """
+
+    def __init__(self, limit_ms: float, *, poll_sec: float = 0.005) -> None:
+        self.limit_ms = max(1.0, float(limit_ms))
+        self._poll_sec = poll_sec
+        self._clock = _main_thread_cpu_clock()
+        self._lock = threading.Lock()
+        self._started: float | None = None
+        self._tripped = False
+        self._wake = threading.Event()
+        signal.signal(signal.SIGINT, self._on_interrupt)
+        threading.Thread(target=self._watch, name="plugin-cpu-guard", daemon=True).start()
+
+    def _on_interrupt(self, _signum, _frame) -> None:
+        # Only ever raise inside a guarded call; a late interrupt is dropped.
+        if self._started is not None and self._tripped:
+            raise PluginCPUTimeExceeded(f"CPU limit of {self.limit_ms:.0f} ms exceeded")
+
+    def _watch(self) -> None:
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if self._started is None:
+                    self._wake.clear()
+                    continue
+                if not self._tripped and (self._clock() - self._started) * 1000.0 > self.limit_ms:
+                    self._tripped = True
+                    _thread.interrupt_main(signal.SIGINT)
+            time.sleep(self._poll_sec)
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> tuple[float, str, bool]:
+        """Call ``fn``; returns ``(cpu_ms, error, limited)`` instead of raising."""
+        with self._lock:
+            started = self._clock()
+            self._started = started
+            self._tripped = False
+        self._wake.set()
+        error = ""
+        try:
+            fn(*args)
+        except PluginCPUTimeExceeded as exc:
+            error = str(exc)
+        except Exception as exc:  # noqa: BLE001
+            error = f"{type(exc).__name__}: {exc}"
+        finally:
+            with self._lock:
+                self._started = None
+                limited = self._tripped
+        cpu_ms = (self._clock() - started) * 1000.0
+        if limited and not error:
+            error = f"CPU limit of {self.limit_ms:.0f} ms exceeded"
+        return cpu_ms, error, limited
+
+
+class _WorkerTimer:
+    def __init__(self, worker: PluginWorker, timer_id: int, interval_ms: int, fn: Callable[[], Any]) -> None:
+        self.timer_id = timer_id
+        self.fn = fn
+        self.queued = False
+        self._interval = max(10, int(interval_ms)) / 1000.0
+        self._worker = worker
+        self._stopped = threading.Event()
+        threading.Thread(target=self._run, name=f"plugin-timer-{timer_id}", daemon=True).start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            # A busy plugin gets at most one queued tick per timer, never a backlog.
+            if not self.queued:
+                self.queued = True
+                self._worker.post({"t": "timer", "id": self.timer_id})
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def isActive(self) -> bool:  # noqa: N802 - mirrors QTimer for plugin code
+        return not self._stopped.is_set()
+
+
+class WorkerPluginAPI:
+    """``PluginAPI`` as seen by a plugin running in the worker process.
+
+    ``current_text`` and the other text readers use the worker's mirror of the active
+    document, which the host keeps current with snapshots and deltas. Calls that
+    touch the editor are sent to the host and block until it answers; permission
+    checks happen there. Widgets cannot cross the process boundary, so
+    ``app_window``, ``active_tab`` and ``add_panel`` are unavailable.
+    """
+
+    def __init__(self, worker: PluginWorker) -> None:
+        self._worker = worker
+
+    def _allow(self, perm: str) -> None:
+        if perm not in self._worker.permissions:
+            raise RuntimeError(f"Plugin '{self._worker.plugin_id}' missing permission: {perm}")
+
+    def _unavailable(self, name: str) -> RuntimeError:
+        return RuntimeError(f"{name}() is not available to plugins running out of process")
+
+    def app_window(self):
+        raise self._unavailable("app_window")
+
+    def active_tab(self):
+        raise self._unavailable("active_tab")
+
+    def add_panel(self, *_args, **_kwargs):
+        raise self._unavailable("add_panel")
+
+    def notify(self, text: str) -> None:
+        self._worker.call("notify", str(text), wait=False)
+
+    def current_text(self) -> str:
+        return self._worker.text
+
+    def revision(self) -> int:
+        return self._worker.changes.revision
+
+    def changes_since(self, revision: int) -> list[dict[str, Any]] | None:
+        deltas = self._worker.changes.since(int(revision))
+        return None if deltas is None else [delta.to_dict() for delta in deltas]
+
+    def line_count(self) -> int:
+        return self._worker.text.count("\n") + 1
+
+    def text_lines(self, start: int, end: int) -> list[str]:
+        return line_range(self._worker.text, int(start), int(end))
+
+    def apply_edits(self, edits, expected_revision: int | None = None) -> int:
+        return self._worker.call("apply_edits", list(edits), expected_revision)
+
+    def selection_range(self):
+        value = self._worker.call("selection_range")
+        return tuple(value) if isinstance(value, list) else value
+
+    def network_allowed(self) -> bool:
+        self._allow("network")
+        return True
+
+    def run_background(self, fn, *, name: str | None = None) -> None:
+        self._allow("background")
+        thread = threading.Thread(target=fn, name=name or f"plugin-{self._worker.plugin_id}", daemon=True)
+        thread.start()
+
+    def start_timer(self, interval_ms: int, fn) -> _WorkerTimer:
+        self._allow("background")
+        return self._worker.add_timer(interval_ms, fn)
+
+    def add_menu_action(self, menu_path: str, label: str, callback, shortcut: str | None = None) -> None:
+        action_id = self._worker.add_callback(callback)
+        self._worker.call("add_menu_action", menu_path, label, action_id, shortcut)
+
+    def add_toolbar_action(self, toolbar_name: str, label: str, callback, shortcut: str | None = None) -> None:
+        action_id = self._worker.add_callback(callback)
+        self._worker.call("add_toolbar_action", toolbar_name, label, action_id, shortcut)
+
+    def __getattr__(self, name: str):
+        if name in BRIDGED_CALLS:
+            return lambda *args: self._worker.call(name, *args)
+        raise AttributeError(name)
+
+
+class PluginWorker:
+    """Hosts one plugin and speaks JSON lines with the editor over stdin/stdout.
+
+    Host to worker: ``init`` (with the first snapshot), ``text`` (snapshot), ``delta``, ``event``, ``invoke``
+    (menu/toolbar action), ``reply`` and ``shutdown``. Worker to host: ``ready`` (with
+    the hooks the plugin implements), ``fatal``, ``call``, ``done`` (per handler, with
+    its CPU time) and ``resync`` (the text mirror went out of step). Plugin code only
+    ever runs on the main thread, one message at a time, under ``CpuGuard``.
+    """
+
+    def __init__(self, plugin_dir: Path, reader: BinaryIO, writer: BinaryIO) -> None:
+        self.plugin_dir = Path(plugin_dir)
+        self.plugin_id = self.plugin_dir.name
+        self.name = self.plugin_id
+        self.permissions: set[str] = set()
+        self.text = ""
+        self.doc: int | None = None
+        self.changes = TextChangeLog(0)
+        self.instance: Any = None
+        self._reader = reader
+        self._writer = writer
+        self._write_lock = threading.Lock()
+        self._inbox: queue.Queue[dict[str, Any] | None] = queue.Queue()
+        self._deferred: deque[dict[str, Any] | None] = deque()
+        self._next_call_id = 0
+        self._callbacks: dict[int, Callable[..., Any]] = {}
+        self._timers: dict[int, _WorkerTimer] = {}
+        self._guard: CpuGuard | None = None
+
+    def send(self, message: dict[str, Any]) -> None:
+        data = encode_message(message)
+        with self._write_lock:
+            self._writer.write(data)
+            self._writer.flush()
+
+    def post(self, message: dict[str, Any]) -> None:
+        self._inbox.put(message)
+
+    def _read_loop(self) -> None:
+        for line in iter(self._reader.readline, b""):
+            message = decode_message(line)
+            if message is not None:
+                self._inbox.put(message)
+        self._inbox.put(None)
+
+    def call(self, method: str, *args: Any, wait: bool = True) -> Any:
+        if not wait:
+            self.send({"t": "call", "method": method, "args": list(args)})
+            return None
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError(f"{method}() must be called from the plugin's main thread (use start_timer)")
+        self._next_call_id += 1
+        call_id = self._next_call_id
+        self.send({"t": "call", "id": call_id, "method": method, "args": list(args)})
+        while True:
+            message = self._inbox.get()
+            if message is None:
+                self._deferred.append(None)
+                raise RuntimeError("Editor connection closed")
+            kind = message.get("t")
+            if kind == "reply" and message.get("id") == call_id:
+                break
+            if kind in {"text", "delta"}:
+                # Edits made by this very call arrive before its reply; apply them now.
+                self._apply_text(message)
+            else:
+                self._deferred.append(message)
+        if not message.get("ok", False):
+            raise RuntimeError(str(message.get("error", "call failed")))
+        return message.get("result")
+
+    def add_callback(self, fn: Callable[..., Any]) -> int:
+        action_id = len(self._callbacks) + 1
+        self._callbacks[action_id] = fn
+        return action_id
+
+    def add_timer(self, interval_ms: int, fn: Callable[[], Any]) -> _WorkerTimer:
+        timer = _WorkerTimer(self, len(self._timers) + 1, interval_ms, fn)
+        self._timers[timer.timer_id] = timer
+        return timer
+
+    def _apply_text(self, message: dict[str, Any]) -> None:
+        doc = message.get("doc")
+        if message.get("t") == "text":
+            self.doc = doc if isinstance(doc, int) else None
+            self.text = str(message.get("text", ""))
+            self.changes.reset(int(message.get("rev", 0)))
+            return
+        if doc != self.doc:
+            return  # delta for a document we no longer mirror
+        delta = delta_from_message(message)
+        try:
+            self.text = apply_text_delta(self.text, delta)
+        except ValueError:
+            self.send({"t": "resync", "doc": doc})
+            return
+        self.changes.record(delta)
+
+    def _run_guarded(self, kind: str, name: str, fn: Callable[..., Any], *args: Any) -> None:
+        assert self._guard is not None
+        started = time.perf_counter()
+        cpu_ms, error, limited = self._guard.run(fn, *args)
+        self.send(
+            {
+                "t": "done",
+                "kind": kind,
+                "name": name,
+                "cpu_ms": round(cpu_ms, 2),
+                "wall_ms": round((time.perf_counter() - started) * 1000.0, 2),
+                "error": error,
+                "limited": limited,
+            }
+        )
+
+    def _dispatch_event(self, name: str, payload: dict[str, Any]) -> None:
+        generic = getattr(self.instance, "on_event", None)
+        specific = getattr(self.instance, f"on_{name}", None)
+        if callable(generic):
+            generic(name, dict(payload))
+        if callable(specific):
+            specific(dict(payload))
+
+    def _load(self, init: dict[str, Any]) -> bool:
+        self.plugin_id = str(init.get("plugin_id", self.plugin_id))
+        self.name = str(init.get("name", self.plugin_id))
+        self.permissions = {str(p) for p in init.get("permissions", [])}
+        self._guard = CpuGuard(float(init.get("cpu_limit_ms", DEFAULT_CPU_LIMIT_MS)))
+        if isinstance(init.get("text"), dict):
+            self._apply_text({**init["text"], "t": "text"})
+
+        def _instantiate() -> None:
+            spec = importlib.util.spec_from_file_location(f"np_plugin_{self.plugin_id}", self.plugin_dir / "plugin.py")
+            if spec is None or spec.loader is None:
+                raise RuntimeError("plugin.py cannot be imported")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            cls = getattr(module, "Plugin", None)
+            if cls is None:
+                raise RuntimeError("plugin.py defines no Plugin class")
+            self.instance = cls(WorkerPluginAPI(self))
+            on_load = getattr(self.instance, "on_load", None)
+            if callable(on_load):
+                on_load()
+
+        _cpu_ms, error, _limited = self._guard.run(_instantiate)
+        if error:
+            self.send({"t": "fatal", "error": error})
+            return False
+        hooks = sorted(
+            attr[3:]
+            for attr in dir(self.instance)
+            if attr.startswith("on_") and attr not in _LIFECYCLE_HOOKS and callable(getattr(self.instance, attr, None))
+        )
+        self.send({"t": "ready", "hooks": hooks, "pid": os.getpid()})
+        return True
+
+    def _handle(self, message: dict[str, Any]) -> bool:
+        kind = message.get("t")
+        if kind in {"text", "delta"}:
+            self._apply_text(message)
+        elif kind == "event":
+            name = str(message.get("name", ""))
+            payload = message.get("payload")
+            self._run_guarded("event", name, self._dispatch_event, name, payload if isinstance(payload, dict) else {})
+        elif kind == "invoke":
+            callback = self._callbacks.get(int(message.get("action", 0)))
+            if callback is not None:
+                self._run_guarded("action", str(message.get("action")), callback)
+        elif kind == "timer":
+            timer = self._timers.get(int(message.get("id", 0)))
+            if timer is not None and timer.isActive():
+                timer.queued = False
+                self._run_guarded("timer", str(timer.timer_id), timer.fn)
+        elif kind == "shutdown":
+            return False
+        return True
+
+    def serve(self) -> int:
+        threading.Thread(target=self._read_loop, name="plugin-worker-reader", daemon=True).start()
+        init = self._inbox.get()
+        if init is None or init.get("t") != "init" or not self._load(init):
+            return 1
+        while True:
+            message = self._deferred.popleft() if self._deferred else self._inbox.get()
+            if message is None or not self._handle(message):
+                break
+        for timer in self._timers.values():
+            timer.stop()
+        on_unload = getattr(self.instance, "on_unload", None)
+        if callable(on_unload) and self._guard is not None:
+            self._guard.run(on_unload)
+        return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args:
+        print("usage: plugin_worker <plugin_dir>", file=sys.stderr)
+        return 2
+    protocol_out = sys.stdout.buffer
+    # Plugin print() output must not corrupt the protocol; the host logs stderr.
+    sys.stdout = sys.stderr
+    if hasattr(os, "nice"):
+        try:
+            os.nice(5)  # yield the CPU to the editor's UI thread
+        except OSError:
+            pass
+    code = PluginWorker(Path(args[0]), sys.stdin.buffer, protocol_out).serve()
+    sys.stderr.flush()
+    # Skip interpreter teardown: the stdin reader thread may still be blocked in readline.
+    os._exit(code)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
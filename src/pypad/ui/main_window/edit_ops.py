@@ -60,22 +60,17 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtPrintSupport import QPrintDialog, QPrintPreviewDialog, QPrinter
 
 from pypad.ui.debug.debug_logs_dialog import DebugLogsDialog
 from pypad.ui.editor.detachable_tab_bar import DetachableTabBar
 from pypad.ui.editor.editor_tab import EditorTab
-from pypad.ui.ai.ai_controller import AIController
 from pypad.ui.theme.asset_paths import resolve_asset_path
 from pypad.ui.system.autosave import AutoSaveRecoveryDialog, AutoSaveStore
 from pypad.ui.system.reminders import ReminderStore, RemindersDialog
-from pypad.ui.security.security_controller import SecurityController
 from pypad.ui.editor.syntax_highlighter import CodeSyntaxHighlighter
-from pypad.ui.system.updater_controller import UpdaterController
 from pypad.ui.system.version_history import VersionHistoryDialog
-from pypad.ui.workspace.workspace_controller import WorkspaceController
 from pypad.ui.editor.advanced_text_tools import compute_regex_filtered_replacement
+from pypad.ui.editor.search_index import DocumentSearchHighlighter
 from pypad.ui.document.document_fidelity import clipboard_paste_special_options, convert_clipboard_for_paste
 
 
@@ -147,8 +142,22 @@ class EditOpsMixin:
     def _do_find(self, text: str, backward: bool = False) -> bool:
         if not text:
             return False
-        source = self.text_edit.get_text()
         case_sensitive = bool(getattr(self, "search_case_checkbox", None) and self.search_case_checkbox.isChecked())
+        tab = self.active_tab()
+        highlighter = tab.search_highlighter if tab is not None else None
+        if highlighter is not None and highlighter.is_ready() and highlighter.matches_query(text, case_sensitive):
+            # The highlight index already knows every match; jump with a bisect instead of rescanning.
+            index = highlighter.index()
+            cursor = tab.text_edit.widget.textCursor()
+            anchor = cursor.selectionStart() if backward else cursor.selectionEnd()
+            found = index.next_start(anchor, backward=backward)
+            if found is None:
+                return False
+            cursor.setPosition(found)
+            cursor.setPosition(found + index.length, QTextCursor.KeepAnchor)
+            tab.text_edit.widget.setTextCursor(cursor)
+            return True
+        source = self.text_edit.get_text()
         haystack = source if case_sensitive else source.lower()
         needle = text if case_sensitive else text.lower()
         sel_range = self.text_edit.selection_range()
@@ -560,11 +569,6 @@ class EditOpsMixin:
         self._clear_search_highlights()
 
     def _on_search_text_changed(self) -> None:
-        tab = self.active_tab()
-        if tab is not None and tab.large_file:
-            self._clear_search_highlights()
-            self.update_action_states()
-            return
         text = self.search_input.text().strip()
         if text:
             self.last_search_text = text
@@ -575,32 +579,61 @@ class EditOpsMixin:
         self._apply_search_highlights(text)
         self.update_action_states()
 
+    def _search_highlighter_for_tab(self, tab: EditorTab) -> DocumentSearchHighlighter | None:
+        if tab.text_edit.is_native_scintilla:
+            return None
+        highlighter = tab.search_highlighter
+        if highlighter is None:
+            highlighter = DocumentSearchHighlighter(tab.text_edit.widget, parent=tab)
+            highlighter.changed.connect(lambda t=tab: self._on_search_matches_changed(t))
+            tab.search_highlighter = highlighter
+        return highlighter
+
+    def _on_search_matches_changed(self, tab: EditorTab) -> None:
+        if hasattr(tab.text_edit.widget, "refresh_search_highlights"):
+            tab.text_edit.widget.refresh_search_highlights()
+        if tab is self.active_tab():
+            self._update_search_match_label()
+
+    def _update_search_match_label(self) -> None:
+        label = getattr(self, "search_match_label", None)
+        if label is None:
+            return
+        tab = self.active_tab()
+        highlighter = tab.search_highlighter if tab is not None else None
+        if highlighter is None or (highlighter.index() is None and not highlighter.is_scanning()):
+            label.setText("")
+            return
+        index = highlighter.index()
+        if index is None:
+            label.setText("Searching...")
+            return
+        if index.count == 0:
+            label.setText("No matches")
+            return
+        cursor = tab.text_edit.widget.textCursor()
+        ordinal = index.ordinal_at(cursor.selectionStart()) if cursor.hasSelection() else 0
+        label.setText(f"{ordinal} of {index.count}" if ordinal else f"{index.count} matches")
+
     def _clear_search_highlights(self) -> None:
         tab = self.active_tab()
         if tab is not None:
-            if not tab.text_edit.is_native_scintilla:
-                tab.text_edit.widget.setExtraSelections([])
+            tab.text_edit.set_search_highlight_source(None)
+            if tab.search_highlighter is not None:
+                tab.search_highlighter.clear()
+        self._update_search_match_label()
 
     def _apply_search_highlights(self, query: str) -> None:
         tab = self.active_tab()
         if tab is None:
             return
-        if tab.text_edit.is_native_scintilla:
+        highlighter = self._search_highlighter_for_tab(tab)
+        if highlighter is None:
             return
-        flags = QTextDocument.FindFlag()
-        if self.search_case_checkbox.isChecked():
-            flags |= QTextDocument.FindCaseSensitively
-
-        selections: list[QTextEdit.ExtraSelection] = []
-        doc = tab.text_edit.widget.document()
-        cursor = QTextCursor(doc)
-        cursor = doc.find(query, cursor, flags)
-        while not cursor.isNull():
-            selection = QTextEdit.ExtraSelection()
-            selection.cursor = cursor
-            selection.format.setBackground(QColor("#f7e36d"))
-            selections.append(selection)
-            cursor = doc.find(query, cursor, flags)
-        tab.text_edit.widget.setExtraSelections(selections)
+        case_sensitive = self.search_case_checkbox.isChecked()
+        highlighter.set_query(query, case_sensitive=case_sensitive)
+        # Only the blocks on screen are turned into extra selections.
+        tab.text_edit.set_search_highlight_source(highlighter.ranges_between)
+        self._update_search_match_label()
 
 
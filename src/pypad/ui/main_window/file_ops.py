@@ -59,21 +59,15 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtPrintSupport import QPrintDialog, QPrintPreviewDialog, QPrinter
 
 from pypad.ui.debug.debug_logs_dialog import DebugLogsDialog
 from pypad.ui.editor.detachable_tab_bar import DetachableTabBar
 from pypad.ui.editor.editor_tab import EditorTab
-from pypad.ui.ai.ai_controller import AIController
 from pypad.ui.theme.asset_paths import resolve_asset_path
 from pypad.ui.system.autosave import AutoSaveRecoveryDialog, AutoSaveStore
 from pypad.ui.system.reminders import ReminderStore, RemindersDialog
-from pypad.ui.security.security_controller import SecurityController
 from pypad.ui.editor.syntax_highlighter import CodeSyntaxHighlighter
-from pypad.ui.system.updater_controller import UpdaterController
 from pypad.ui.system.version_history import VersionHistoryDialog
-from pypad.ui.workspace.workspace_controller import WorkspaceController
 from pypad.ui.document.document_authoring import PageLayoutConfig, build_layout_html
 from pypad.ui.workspace.project_workflow import read_text_with_large_file_preview
 from pypad.ui.document.document_fidelity import DocumentFidelityError, export_document_text, import_document_text
@@ -82,6 +76,7 @@ from pypad.logging_utils import get_logger
 from .notepadpp_pref_runtime import apply_npp_print_preferences_to_page_layout
 
 _LOGGER = get_logger(__name__)
+STRUCTURED_IMPORT_SUFFIXES = frozenset({".docx", ".odt", ".html", ".htm", ".pdf"})
 
 
 class FileOpsMixin:
@@ -131,9 +126,21 @@ class FileOpsMixin:
     def _load_text_from_path(self, path: str, encoding: str = "utf-8") -> tuple[str, bool, str | None]:
         return self.security_controller.load_text_from_path(path, encoding=encoding)
 
-    def _open_file_path(self, path: str) -> bool:
+    def _open_needs_interaction(self, path: str) -> bool:
+        """True when opening ``path`` may prompt (encrypted notes) or run a document import."""
         suffix = Path(path).suffix.lower()
-        structured_import = suffix in {".docx", ".odt", ".html", ".htm", ".pdf"}
+        if suffix in STRUCTURED_IMPORT_SUFFIXES or suffix == ".encnote":
+            return True
+        try:
+            with open(path, "r", encoding=self._encoding_for_path(path), errors="replace") as handle:
+                return handle.read(32).startswith(ENCRYPTED_NOTE_HEADER + "\n")
+        except Exception:
+            return False
+
+    def _open_file_path(self, path: str, *, make_current: bool = True, quiet: bool = False) -> bool:
+        """Open ``path`` in a tab; ``quiet`` logs failures instead of showing a dialog."""
+        suffix = Path(path).suffix.lower()
+        structured_import = suffix in STRUCTURED_IMPORT_SUFFIXES
         encoding = self._encoding_for_path(path)
         preview = None
         fast_open_enabled = bool(self.settings.get("large_file_fast_open_enabled", True))
@@ -192,20 +199,22 @@ class FileOpsMixin:
         except DocumentFidelityError as e:
             _LOGGER.debug("_open_file_path document fidelity error path=%s error=%s", path, e)
             self.log_event("Error", f'Open failed: "{path}" - {e}')
-            QMessageBox.critical(self, "Import Failed", f"Could not import document:\n{e}")
+            if not quiet:
+                QMessageBox.critical(self, "Import Failed", f"Could not import document:\n{e}")
             return False
         except Exception as e:  # noqa: BLE001
             _LOGGER.exception("_open_file_path exception path=%s", path)
             self.log_event("Error", f'Open failed: "{path}" - {e}')
-            QMessageBox.critical(self, "Error", f"Could not open file:\n{e}")
+            if not quiet:
+                QMessageBox.critical(self, "Error", f"Could not open file:\n{e}")
             return False
 
-        active = self.active_tab()
+        active = self.active_tab() if make_current else None
         if active and not active.current_file and not active.text_edit.is_modified() and not active.text_edit.get_text().strip():
             tab = active
             tab.text_edit.set_text(text)
         else:
-            tab = self.add_new_tab(text=text, file_path=path, make_current=True)
+            tab = self.add_new_tab(text=text, file_path=path, make_current=make_current)
         if hasattr(self, "_ensure_tab_autosave_meta"):
             if suffix == ".pdf" and not bool(self.settings.get("autosave_include_pdf", False)):
                 pass
@@ -239,7 +248,7 @@ class FileOpsMixin:
         ) and not tab.large_file
         tab.markdown_preview.setVisible(tab.markdown_mode_enabled)
         if tab.markdown_mode_enabled:
-            tab.markdown_preview.setMarkdown(tab.text_edit.get_text())
+            self._markdown_renderer_for_tab(tab).request(immediate=True)
         if hasattr(self, "_notify_large_file_mode"):
             self._notify_large_file_mode(tab)
         self._apply_syntax_highlighting(tab)
@@ -283,6 +292,9 @@ class FileOpsMixin:
         return self.file_save_tab(tab)
 
     def file_save_tab(self, tab: EditorTab) -> bool:
+        if tab.session_load_pending:
+            # Not read yet, so the file on disk is already what the tab holds.
+            return True
         if getattr(tab, "partial_large_preview", False):
             QMessageBox.information(
                 self,
@@ -352,6 +364,9 @@ class FileOpsMixin:
         _LOGGER.debug("file_save_tab complete path=%s bytes=%d", tab.current_file, len(payload))
         self._add_recent_file(tab.current_file)
         self._clear_tab_autosave(tab)
+        advanced_features = self.loaded_service("advanced_features")
+        if advanced_features is not None and not tab.encryption_enabled and not structured_export:
+            advanced_features.note_file_saved(tab.current_file, tab.text_edit.get_text())
         self.log_event("Info", f'Save succeeded: "{tab.current_file}"')
         if hasattr(self, "_emit_plugin_event"):
             save_mode = "export" if structured_export else "text"
@@ -388,7 +403,7 @@ class FileOpsMixin:
         tab.markdown_mode_enabled = self._is_markdown_path(tab.current_file) and not tab.large_file
         tab.markdown_preview.setVisible(tab.markdown_mode_enabled)
         if tab.markdown_mode_enabled:
-            tab.markdown_preview.setMarkdown(text)
+            self._markdown_renderer_for_tab(tab).request(immediate=True)
         self._apply_syntax_highlighting(tab)
         self._refresh_tab_title(tab)
         self.show_status_message("Full large file loaded.", 3000)
@@ -400,6 +415,11 @@ class FileOpsMixin:
         return self.file_save_as_tab(tab)
 
     def file_save_as_tab(self, tab: EditorTab) -> bool:
+        if tab.session_load_pending:
+            loaded = self._materialize_session_tab(tab)
+            if loaded is None:
+                return False
+            tab = loaded
         was_unsaved = tab.current_file is None
         previous_favorite = tab.favorite
         previous_tags = list(tab.tags)
@@ -435,7 +455,7 @@ class FileOpsMixin:
         tab.markdown_mode_enabled = self._is_markdown_path(path)
         tab.markdown_preview.setVisible(tab.markdown_mode_enabled)
         if tab.markdown_mode_enabled:
-            tab.markdown_preview.setMarkdown(tab.text_edit.get_text())
+            self._markdown_renderer_for_tab(tab).request(immediate=True)
         self._apply_syntax_highlighting(tab)
         if path in set(self.settings.get("pinned_files", [])):
             tab.pinned = True
@@ -461,6 +481,8 @@ class FileOpsMixin:
         return self.file_save_tab(tab)
 
     def file_print(self) -> None:
+        from PySide6.QtPrintSupport import QPrintDialog, QPrinter
+
         tab = self.active_tab()
         if tab is None:
             return
@@ -478,6 +500,8 @@ class FileOpsMixin:
         self.show_status_message("Print job sent to printer", 3000)
 
     def file_print_preview(self) -> None:
+        from PySide6.QtPrintSupport import QPrintPreviewDialog, QPrinter
+
         tab = self.active_tab()
         if tab is None:
             return
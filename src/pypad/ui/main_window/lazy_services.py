@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+
+class LazyService:
+    """Window attribute whose subsystem is built on first access.
+
+    ``factory`` names a window method that builds and returns the subsystem; it
+    should import its module locally so the import cost moves with it. The result is
+    stored in the instance ``__dict__``, which shadows this (non-data) descriptor, so
+    later reads are plain attribute lookups.
+
+    Code that only wants to refresh a subsystem if it already exists should use
+    ``loaded_service`` instead of ``hasattr``/``getattr``, which would build it.
+    """
+
+    def __init__(self, factory: str) -> None:
+        self.factory = factory
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return self
+        building: set[str] = obj.__dict__.setdefault("_lazy_services_building", set())
+        if self.name in building:
+            raise RuntimeError(f"{self.name} was used while it was being created")
+        building.add(self.name)
+        started = time.perf_counter()
+        try:
+            value = getattr(obj, self.factory)()
+        finally:
+            building.discard(self.name)
+        obj.__dict__[self.name] = value
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        try:
+            obj.log_event("Info", f"[Startup] Service created: {self.name} in {elapsed_ms:.0f}ms")
+        except Exception:
+            pass
+        return value
+
+
+def loaded_service(obj: Any, name: str) -> Any:
+    """``obj.<name>`` if it has been set or built, else None; never builds a ``LazyService``."""
+    return obj.__dict__.get(name)
+
+
+def lazy_service_names(cls: type) -> list[str]:
+    names: list[str] = []
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, LazyService) and name not in names:
+                names.append(name)
+    return names
@@ -14,6 +14,7 @@ import time
 import webbrowser
 import subprocess
 import threading
+from collections import deque
 from typing import TYPE_CHECKING, Any
 from datetime import datetime
 from pathlib import Path
@@ -73,8 +74,6 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtPrintSupport import QPrintDialog, QPrintPreviewDialog, QPrinter
 from pypad.logging_utils import get_logger
 
 _LOGGER = get_logger(__name__)
@@ -87,17 +86,17 @@ from ...app_settings import (
     migrate_settings,
 )
 from pypad.app_settings.defaults import DEFAULT_UPDATE_FEED_URL
+from pypad.app_settings.paths import get_ai_response_cache_dir_path
 from pypad.app_settings.scintilla_profile import ScintillaProfile
-from pypad.ui.ai.ai_controller import AIController
+from pypad.ui.ai.ai_batch_panel import AIBatchJobsDialog
 from pypad.ui.ai.ai_edit_preview_dialog import AIEditPreviewDialog
+from pypad.ui.ai.ai_job_scheduler import JOB_DONE, AIJob, AIJobScheduler
+from pypad.ui.ai.ai_response_cache import AIResponseCache
 from pypad.ui.theme.asset_paths import resolve_asset_path
 from pypad.ui.system.autosave import AutoSaveRecoveryDialog, AutoSaveStore
 from pypad.ui.system.reminders import ReminderStore, RemindersDialog
-from pypad.ui.security.security_controller import SecurityController
 from pypad.ui.editor.syntax_highlighter import CodeSyntaxHighlighter
-from pypad.ui.system.updater_controller import UpdaterController
 from pypad.ui.system.version_history import VersionEntry, VersionHistoryDialog
-from pypad.ui.workspace.workspace_controller import WorkspaceController
 from pypad.ui.theme.dialog_theme import apply_dialog_theme_from_window, ensure_dialog_theme_filter_installed
 from pypad.ui.theme.theme_tokens import build_main_window_qss, build_tokens_from_settings
 from pypad.ui.system.session_recovery import local_history_key
@@ -112,7 +111,6 @@ from pypad.ui.ai.ai_collaboration import (
     build_ai_conflict_merge_prompt,
     build_conflict_markers,
     build_project_qa_prompt,
-    build_workspace_citation_snippets,
     build_collab_presence_text,
     paragraph_bounds,
     strip_model_fences,
@@ -298,6 +296,9 @@ class MiscMixin(
     def _workspace_files(self) -> list[str]:
         return self.workspace_controller.workspace_files()
 
+    def _indexed_workspace_files(self) -> list[str] | None:
+        return self.workspace_controller.indexed_workspace_files()
+
     def show_workspace_files(self) -> None:
         self.workspace_controller.show_workspace_files()
 
@@ -410,6 +411,7 @@ class MiscMixin(
             return
         for action in getattr(self, "_saved_macro_menu_actions", []):
             menu.removeAction(action)
+            self.action_registry.unregister_action(action)
         separator = getattr(self, "_saved_macro_menu_separator", None)
         if separator is not None:
             menu.removeAction(separator)
@@ -431,6 +433,7 @@ class MiscMixin(
             action.triggered.connect(lambda _checked=False, macro_name=name: self.run_saved_macro(macro_name))
             menu.addAction(action)
             self._saved_macro_menu_actions.append(action)
+            self.action_registry.register(f"macro:{name}", action, section="Macro")
 
     def save_current_recorded_macro(self) -> None:
         if self.macro_recording:
@@ -744,71 +747,6 @@ class MiscMixin(
             return None
         return getattr(self, "ai_chat_dock", None)
 
-    def _ensure_ai_chat_apply_signal_connected(self) -> None:
-        dock = self._with_ai_chat_dock()
-        if dock is None:
-            return
-        if bool(getattr(self, "_ai_batch_apply_signal_connected", False)):
-            return
-        sig = getattr(dock, "apply_completed", None)
-        if sig is None:
-            return
-        try:
-            sig.connect(self._on_ai_chat_apply_completed)
-            self._ai_batch_apply_signal_connected = True
-            self._log_ai_feature("connected ai_chat_dock.apply_completed signal")
-        except Exception as exc:
-            self._log_ai_feature(f"failed to connect ai_chat_dock.apply_completed signal: {exc!r}")
-
-    def _on_ai_chat_apply_completed(self, kind: str, success: bool, detail: str) -> None:
-        self._log_ai_feature(f"apply_completed signal kind={kind!r} success={success} detail={detail!r}")
-        state = getattr(self, "_ai_batch_refactor_state", None)
-        if not isinstance(state, dict):
-            return
-        if not bool(state.get("active", False)):
-            return
-        kind_s = str(kind or "")
-        if kind_s not in {"set_file", "patch"}:
-            return
-        if not bool(state.get("awaiting_apply", False)):
-            return
-        if not bool(success):
-            if str(detail or "") == "declined":
-                state["active"] = False
-                state["awaiting_apply"] = False
-                self.show_status_message("Batch AI refactor queue canceled after declined apply.", 4500)
-                self._log_ai_feature("batch refactor queue canceled by explicit no/decline")
-            return
-        rows = state.get("rows", [])
-        instruction = str(state.get("instruction", "") or "")
-        idx = int(state.get("index", 0) or 0)
-        if not isinstance(rows, list):
-            return
-        state["awaiting_apply"] = False
-        next_idx = idx + 1
-        if next_idx >= len(rows):
-            self.show_status_message("Batch AI refactor queue finished.", 5000)
-            state["active"] = False
-            self._log_ai_feature("batch refactor queue finished after apply confirmation")
-            return
-        current_path = str(state.get("path", "") or "")
-        ans = QMessageBox.question(
-            self,
-            "Batch Refactor",
-            (
-                f"Applied AI result for:\n{current_path}\n\n"
-                "Continue to the next file in the batch?"
-            ),
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.Yes,
-        )
-        if ans == QMessageBox.Yes:
-            self._log_ai_feature(f"batch refactor continuing to index={next_idx}")
-            self._run_batch_refactor_queue(rows, instruction, next_idx)
-            return
-        state["active"] = False
-        self._log_ai_feature("batch refactor paused/stopped by user after apply")
-
     def ai_attach_current_file_to_chat(self) -> None:
         dock = self._with_ai_chat_dock()
         if dock is not None and hasattr(dock, "_attach_current_file_to_chat"):
@@ -1247,17 +1185,8 @@ class MiscMixin(
             if not selected:
                 self._log_ai_feature("batch planner selection canceled/empty")
                 return
-            self._ensure_ai_chat_apply_signal_connected()
-            self._ai_batch_refactor_state = {
-                "active": True,
-                "awaiting_apply": False,
-                "rows": list(selected),
-                "instruction": instruction,
-                "index": 0,
-                "path": "",
-            }
-            self._log_ai_feature(f"batch refactor queue initialized selected_files={len(selected)}")
-            self._run_batch_refactor_queue(selected, instruction, 0)
+            self._log_ai_feature(f"batch refactor jobs initialized selected_files={len(selected)}")
+            self._start_batch_refactor_jobs(selected, instruction)
 
         self._send_ai_chat_prompt(
             prompt=planner_prompt,
@@ -1406,73 +1335,141 @@ class MiscMixin(
                 selected.append(dict(rows[idx]))
         return selected[:max_files]
 
-    def _run_batch_refactor_queue(self, selected_rows: list[dict[str, object]], instruction: str, index: int) -> None:
-        if index >= len(selected_rows):
-            state = getattr(self, "_ai_batch_refactor_state", None)
-            if isinstance(state, dict):
-                state["active"] = False
-                state["awaiting_apply"] = False
-            self.show_status_message("Batch AI refactor queue finished.", 4000)
-            self._log_ai_feature("batch refactor queue reached end")
-            return
-        row = selected_rows[index]
-        path = str(row.get("path", "") or "")
-        reason = str(row.get("reason", "") or "")
-        self._log_ai_feature(f"batch refactor queue send index={index} path={path!r}")
-        state = getattr(self, "_ai_batch_refactor_state", None)
-        if isinstance(state, dict):
-            state.update({"active": True, "awaiting_apply": False, "rows": list(selected_rows), "instruction": instruction, "index": index, "path": path})
-        if not path:
-            self._run_batch_refactor_queue(selected_rows, instruction, index + 1)
-            return
-        try:
-            file_text = Path(path).read_text(encoding="utf-8", errors="replace")
-        except Exception as exc:
-            ans = QMessageBox.question(
+    def _batch_refactor_prompt(self, *, path: str, file_text: str, instruction: str, reason: str) -> str:
+        return "\n\n".join(
+            part
+            for part in [
+                "You are editing one file of a batch refactor in PyPad.",
+                "Return only the complete updated file contents: no explanation, no code fences, no patch.",
+                self._ai_regression_guard_block(),
+                f"File: {path}",
+                f"Global instruction:\n{instruction}",
+                f"Why this file was selected:\n{reason or '(no reason provided)'}",
+                "Apply the instruction to this file only and keep unrelated content unchanged.",
+                "Current file contents:",
+                file_text,
+            ]
+            if str(part or "").strip()
+        )
+
+    def _start_batch_refactor_jobs(self, selected_rows: list[dict[str, object]], instruction: str) -> None:
+        requests: list[tuple[str, str]] = []
+        unreadable: list[str] = []
+        for row in selected_rows:
+            path = str(row.get("path", "") or "")
+            if not path:
+                continue
+            try:
+                file_text = Path(path).read_text(encoding="utf-8", errors="replace")
+            except Exception as exc:
+                self._log_ai_feature(f"batch refactor skipped unreadable path={path!r} error={exc!r}")
+                unreadable.append(path)
+                continue
+            prompt = self._batch_refactor_prompt(
+                path=path,
+                file_text=file_text[:30000],
+                instruction=instruction,
+                reason=str(row.get("reason", "") or ""),
+            )
+            requests.append((path, prompt))
+        if unreadable:
+            QMessageBox.warning(
                 self,
                 "Batch Refactor",
-                f"Could not read file:\n{path}\n\n{exc}\n\nContinue to next file?",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.Yes,
-            )
-            if ans == QMessageBox.Yes:
-                self._run_batch_refactor_queue(selected_rows, instruction, index + 1)
-            else:
-                if isinstance(state, dict):
-                    state["active"] = False
-            return
-        if len(file_text) > 30000:
-            file_text = file_text[:30000]
-        file_name = Path(path).name
-
-        def _after_ai_response(_text: str) -> None:
-            st = getattr(self, "_ai_batch_refactor_state", None)
-            if isinstance(st, dict):
-                st["awaiting_apply"] = True
-                st["index"] = index
-                st["path"] = path
-            self._log_ai_feature(f"batch refactor awaiting apply confirmation path={path!r}")
-            self.show_status_message(
-                f"Batch refactor draft ready for {file_name}. Review and confirm in AI Chat to continue.",
-                5000,
+                "Could not read these files; they were left out of the batch:\n" + "\n".join(unreadable[:20]),
             )
+        if not requests:
+            return
+        state: dict[str, object] = {"queue": deque(), "applying": False}
 
-        self._send_ai_file_replace_request(
-            action_label="Batch AI Refactor",
-            user_visible_prompt=f"Batch Refactor: {file_name}",
-            task_instructions=(
-                f"Apply the batch refactor instruction to this file only.\n\n"
-                f"Global instruction:\n{instruction}\n\n"
-                f"Why this file was selected:\n{reason or '(no reason provided)'}"
-            ),
-            file_text=file_text,
-            extra_context=(
-                f"File path: {path}\n"
-                "Return the entire updated file contents via the hidden set-file command. "
-                "Keep unrelated content unchanged."
-            ),
-            on_done=_after_ai_response,
+        def _on_event(job: AIJob) -> None:
+            panel = state.get("panel")
+            if isinstance(panel, AIBatchJobsDialog):
+                panel.update_job(job)
+
+        def _on_ready(job: AIJob) -> None:
+            state["queue"].append(job)
+            self._apply_ready_batch_refactor_results(state)
+
+        scheduler = self.ai_controller.start_job_batch(
+            "Batch AI Refactor",
+            requests,
+            on_event=_on_event,
+            on_ready=_on_ready,
         )
+        if scheduler is None:
+            return
+        panel = AIBatchJobsDialog(
+            self,
+            "Batch AI Refactor",
+            [job.label for job in scheduler.jobs()],
+            on_cancel=scheduler.cancel,
+        )
+        apply_dialog_theme_from_window(self, panel)
+        state["panel"] = panel
+        state["scheduler"] = scheduler
+        self._ai_batch_refactor_state = state
+        panel.show()
+        self.show_status_message(f"Batch AI refactor started for {len(scheduler.jobs())} file(s).", 4000)
+
+    def _apply_ready_batch_refactor_results(self, state: dict[str, object]) -> None:
+        # Preview dialogs run a nested event loop; results settling meanwhile are queued
+        # and picked up by the loop below, which keeps application in submission order.
+        if state.get("applying"):
+            return
+        queue = state["queue"]
+        panel = state.get("panel")
+        state["applying"] = True
+        try:
+            while queue:
+                job = queue.popleft()
+                if job.status != JOB_DONE:
+                    continue
+                applied, detail = self._apply_batch_refactor_result(job.label, job.result)
+                if isinstance(panel, AIBatchJobsDialog):
+                    panel.set_detail(job.job_id, "Applied" if applied else "Not applied", detail)
+        finally:
+            state["applying"] = False
+        scheduler = state.get("scheduler")
+        if isinstance(scheduler, AIJobScheduler) and all(job.finished for job in scheduler.jobs()) and not queue:
+            self.show_status_message("Batch AI refactor finished.", 4000)
+
+    def _apply_batch_refactor_result(self, path: str, response: str) -> tuple[bool, str]:
+        proposed = strip_model_fences(response or "")
+        if not proposed.strip():
+            return False, "AI returned no file contents."
+        tab = None
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if isinstance(widget, EditorTab) and widget.current_file == path:
+                self.tab_widget.setCurrentIndex(i)
+                tab = widget
+                break
+        if tab is None and self._open_file_path(path):
+            tab = self.active_tab()
+        if tab is None:
+            return False, "Could not open the file."
+        if tab.text_edit.is_read_only():
+            return False, "File is read-only."
+        original = tab.text_edit.get_text()
+        if original.endswith("\n") and not proposed.endswith("\n"):
+            proposed += "\n"
+        if proposed == original:
+            return False, "No changes proposed."
+        mode = str(self.settings.get("ai_apply_review_mode", "always_preview") or "always_preview").strip().lower()
+        final_text = proposed
+        if mode != "legacy_direct_apply":
+            dlg = AIEditPreviewDialog(self, original, proposed, title=f"Batch Refactor Preview: {Path(path).name}")
+            if dlg.exec() != QDialog.Accepted:
+                return False, "Preview declined."
+            final_text = dlg.final_text
+        tab.text_edit.set_text(final_text)
+        try:
+            tab.text_edit.set_modified(True)
+        except Exception:
+            pass
+        self._log_ai_feature(f"batch refactor applied path={path!r} chars={len(final_text)}")
+        return True, ""
 
     def ai_ask_file_with_citations(self) -> None:
         tab = self.active_tab()
@@ -1554,9 +1551,8 @@ class MiscMixin(
         question, ok = QInputDialog.getMultiLineText(self, "Ask Workspace (Citations)", "Question:")
         if not ok or not question.strip():
             return
-        snippets = build_workspace_citation_snippets(
+        snippets = self.advanced_features.workspace_citation_snippets(
             question.strip(),
-            files,
             max_files=int(self.settings.get("ai_workspace_qa_max_files", 10) or 10),
             max_lines_per_file=int(self.settings.get("ai_workspace_qa_max_lines_per_file", 60) or 60),
             max_total_chars=30000,
@@ -1669,9 +1665,8 @@ class MiscMixin(
         if not ok:
             return
         focus = (focus or "").strip() or "bugs regressions risky patterns"
-        snippets = build_workspace_citation_snippets(
+        snippets = self.advanced_features.workspace_citation_snippets(
             focus,
-            files,
             max_files=int(self.settings.get("ai_workspace_qa_max_files", 10) or 10),
             max_lines_per_file=int(self.settings.get("ai_workspace_qa_max_lines_per_file", 60) or 60),
             max_total_chars=30000,
@@ -2431,9 +2426,10 @@ class MiscMixin(
             self.syntax_label.setEnabled(self.settings.get("syntax_highlighting_enabled", True))
         self._refresh_recent_files_menu()
         self._refresh_favorite_files_menu()
-        if hasattr(self, "advanced_features"):
-            self.advanced_features.apply_backup_schedule()
-            self.advanced_features.toggle_keyboard_only(bool(self.settings.get("keyboard_only_mode", False)))
+        advanced_features = self.loaded_service("advanced_features")
+        if advanced_features is not None:
+            advanced_features.apply_backup_schedule()
+            advanced_features.toggle_keyboard_only(bool(self.settings.get("keyboard_only_mode", False)))
 
         for index in range(self.tab_widget.count()):
             tab = self.tab_widget.widget(index)
@@ -2468,8 +2464,9 @@ class MiscMixin(
                 if hasattr(self, "_apply_scintilla_modes"):
                     self._apply_scintilla_modes(tab)
                 apply_indentation_defaults_to_tab(self, tab)
-        if hasattr(self, "ai_chat_dock") and self.ai_chat_dock is not None:
-            self.ai_chat_dock.refresh_theme()
+        ai_chat_dock = self.loaded_service("ai_chat_dock")
+        if ai_chat_dock is not None:
+            ai_chat_dock.refresh_theme()
         if bool(self.settings.get("simple_mode", False)):
             self.toggle_simple_mode(True)
         else:
@@ -2499,7 +2496,11 @@ class MiscMixin(
     def apply_language(self) -> None:
         lang_label = str(self.settings.get("language", "English") or "English")
         lang_code = language_code_for(lang_label)
+        previous = getattr(self, "_ui_language_code", "en")
         self._ui_language_code = lang_code
+        if lang_code == "en" and previous == "en":
+            # Nothing has been translated yet, so every label is already English.
+            return
         self._translate_actions(lang_code)
         self._translate_widgets(lang_code)
 
@@ -2510,6 +2511,15 @@ class MiscMixin(
         translator.clear_cache()
         self.log_event("Info", "Translation cache cleared")
 
+    def clear_ai_response_cache(self) -> None:
+        controller = self.loaded_service("ai_controller")
+        if controller is not None:
+            controller.clear_response_cache()
+        else:
+            # Clearing the files does not need the AI subsystem; do not build it for this.
+            AIResponseCache(get_ai_response_cache_dir_path()).clear()
+        self.log_event("Info", "AI response cache cleared")
+
     def show_status_message(self, text: str, timeout_ms: int = 0) -> None:
         lang_code = getattr(self, "_ui_language_code", "en")
         self.status.showMessage(self._translate_text(text, lang_code), timeout_ms)
@@ -2676,6 +2686,7 @@ class MiscMixin(
             action.setProperty("i18n_original_statustip", original_status)
             if original_status:
                 action.setStatusTip(self._translate_text(str(original_status), lang_code))
+        self.action_registry.invalidate()
 
     def _translate_widgets(self, lang_code: str) -> None:
         for widget in self.findChildren(QWidget):
@@ -2867,6 +2878,7 @@ class MiscMixin(
                 row.action.setShortcuts(keyseqs)
             except RuntimeError:
                 continue
+        self.action_registry.invalidate()
         if hasattr(self, "configure_action_tooltips"):
             self.configure_action_tooltips()
 
@@ -2941,6 +2953,7 @@ class MiscMixin(
         self.settings["last_session_files"] = session_state["files"]
         self.settings["last_session_active_file"] = session_state["active_file"]
         self.settings["last_session_workspace_root"] = session_state["workspace_root"]
+        self.settings["last_session_view_states"] = session_state["views"]
         if hasattr(self, "save_current_layout"):
             try:
                 self.save_current_layout()
@@ -2951,6 +2964,7 @@ class MiscMixin(
             self.reminders_store.save()
         except Exception as exc:  # noqa: BLE001
             self.log_event("Error", f"Failed to save reminders: {exc}")
+        self.translator.flush()
         try:
             self._run_autosave_cycle()
         except Exception as exc:  # noqa: BLE001
@@ -2966,6 +2980,7 @@ class MiscMixin(
 
     def _collect_session_state(self) -> dict[str, object]:
         files: list[str] = []
+        views: dict[str, dict[str, Any]] = {}
         seen: set[str] = set()
         for index in range(self.tab_widget.count()):
             tab = self.tab_widget.widget(index)
@@ -2975,6 +2990,13 @@ class MiscMixin(
                 continue
             seen.add(tab.current_file)
             files.append(tab.current_file)
+            if tab.session_load_pending:
+                views[tab.current_file] = dict(tab.session_view_state or {})
+            else:
+                try:
+                    views[tab.current_file] = tab.text_edit.view_state()
+                except Exception:
+                    pass
         active_tab = self.active_tab()
         active_file = active_tab.current_file if active_tab is not None and active_tab.current_file else ""
         workspace_root = str(self.settings.get("workspace_root", "") or "")
@@ -2983,6 +3005,7 @@ class MiscMixin(
             "files": files,
             "active_file": active_file,
             "workspace_root": workspace_root,
+            "views": views,
         }
 
     def _save_session_to_path(self, path: str) -> bool:
@@ -3047,15 +3070,7 @@ class MiscMixin(
             if tab is not None:
                 tab.deleteLater()
 
-        opened: list[str] = []
-        for path in unique_files:
-            if not Path(path).exists():
-                continue
-            if self._open_file_path(path):
-                tab = self.active_tab()
-                if tab is not None and hasattr(self, "_ensure_tab_autosave_meta"):
-                    self._ensure_tab_autosave_meta(tab)
-                opened.append(path)
+        opened = self._restore_session_tabs(unique_files, active_file, payload.get("views"))
 
         resolved_active_file = active_file if active_file in opened else (opened[0] if opened else "")
 
@@ -3063,12 +3078,6 @@ class MiscMixin(
             tab = self.add_new_tab(make_current=True)
             if hasattr(self, "_ensure_tab_autosave_meta"):
                 self._ensure_tab_autosave_meta(tab)
-        elif resolved_active_file:
-            for index in range(self.tab_widget.count()):
-                tab = self.tab_widget.widget(index)
-                if isinstance(tab, EditorTab) and tab.current_file == resolved_active_file:
-                    self.tab_widget.setCurrentIndex(index)
-                    break
 
         if workspace_root and Path(workspace_root).exists():
             self.settings["workspace_root"] = workspace_root
@@ -3123,21 +3132,152 @@ class MiscMixin(
             self._ensure_tab_autosave_meta(active)
         active_file = str(self.settings.get("last_session_active_file", "") or "")
         workspace_root = str(self.settings.get("last_session_workspace_root", "") or "")
-        for path in files:
-            if Path(path).exists():
-                if self._open_file_path(path):
-                    tab = self.active_tab()
-                    if tab is not None and hasattr(self, "_ensure_tab_autosave_meta"):
-                        self._ensure_tab_autosave_meta(tab)
-        if active_file:
-            for index in range(self.tab_widget.count()):
-                tab = self.tab_widget.widget(index)
-                if isinstance(tab, EditorTab) and tab.current_file == active_file:
-                    self.tab_widget.setCurrentIndex(index)
-                    break
+        self._restore_session_tabs(files, active_file, self.settings.get("last_session_view_states", {}))
         if workspace_root and Path(workspace_root).exists():
             self.settings["workspace_root"] = workspace_root
 
+    def _restore_session_tabs(self, files: list[str], active_file: str, views: object) -> list[str]:
+        """Add session files as placeholder tabs; only the active one is read now.
+
+        The others are read when first activated, or one at a time in the background
+        every ``session_background_load_ms``. Returns the paths that were restored.
+        """
+        view_states = views if isinstance(views, dict) else {}
+        pinned = set(self.settings.get("pinned_files", []))
+        placeholders: list[EditorTab] = []
+        for path in files:
+            if not Path(path).exists():
+                continue
+            state = view_states.get(path)
+            tab = EditorTab(self)
+            tab.current_file = path
+            tab.pinned = path in pinned
+            tab.session_load_pending = True
+            tab.session_view_state = dict(state) if isinstance(state, dict) else None
+            self.tab_widget.addTab(tab, self._tab_display_name(tab))
+            self._apply_file_metadata_to_tab(tab)
+            placeholders.append(tab)
+        if not placeholders:
+            return []
+        if any(tab.pinned for tab in placeholders):
+            self._sort_tabs_by_pinned()
+        target = next((tab for tab in placeholders if tab.current_file == active_file), placeholders[0])
+        self.tab_widget.setCurrentWidget(target)
+        self._materialize_session_tab(target)
+        self._sync_tab_empty_state()
+        self._schedule_session_background_load()
+        return [str(tab.current_file) for tab in placeholders]
+
+    def _pending_session_tabs(self) -> list[EditorTab]:
+        tabs: list[EditorTab] = []
+        for index in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(index)
+            if isinstance(tab, EditorTab) and tab.session_load_pending:
+                tabs.append(tab)
+        return tabs
+
+    def _materialize_session_tab(self, placeholder: EditorTab, *, background: bool = False) -> EditorTab | None:
+        """Read a placeholder's file and put the opened tab in its place.
+
+        Returns the opened tab, or None if the file could not be opened. The placeholder
+        is kept for a later retry unless its file is gone. ``background`` loads never show
+        dialogs. Tabs that are already loaded are returned unchanged.
+        """
+        if not placeholder.session_load_pending:
+            return placeholder
+        if self.tab_widget.indexOf(placeholder) < 0:
+            return None
+        placeholder.session_load_pending = False
+        path = str(placeholder.current_file or "")
+        exists = Path(path).exists()
+        previous = self.tab_widget.currentWidget()
+        was_current = previous is placeholder
+        existing = [self.tab_widget.widget(index) for index in range(self.tab_widget.count())]
+        started = time.perf_counter()
+        tab: EditorTab | None = None
+        # The swap goes through intermediate current tabs; listeners hear only the result.
+        self.tab_widget.blockSignals(True)
+        try:
+            if exists and self._open_file_path(path, make_current=False, quiet=background):
+                for index in range(self.tab_widget.count()):
+                    widget = self.tab_widget.widget(index)
+                    if isinstance(widget, EditorTab) and widget not in existing:
+                        tab = widget
+                        break
+            if tab is not None:
+                self.tab_widget.removeTab(self.tab_widget.indexOf(tab))
+                self.tab_widget.insertTab(self.tab_widget.indexOf(placeholder), tab, self._tab_display_name(tab))
+            if tab is not None or not exists:
+                self.tab_widget.removeTab(self.tab_widget.indexOf(placeholder))
+                placeholder.deleteLater()
+            if tab is not None:
+                self._refresh_tab_title(tab)
+                if placeholder.session_view_state:
+                    tab.text_edit.apply_view_state(placeholder.session_view_state)
+            if was_current:
+                if tab is not None:
+                    self.tab_widget.setCurrentWidget(tab)
+            elif previous is not None and self.tab_widget.indexOf(previous) >= 0:
+                self.tab_widget.setCurrentWidget(previous)
+        finally:
+            self.tab_widget.blockSignals(False)
+        if tab is None:
+            self.log_event("Error", f'[Session] Could not restore "{path}"')
+            if exists:
+                # Keep the tab so the file stays in the session; it is retried when activated.
+                placeholder.session_load_pending = True
+                placeholder.session_load_deferred = True
+            elif self.tab_widget.count() == 0:
+                self.add_new_tab(make_current=True)
+            self._refresh_window_menu_entries()
+        else:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self.log_event("Info", f'[Session] Loaded "{path}" in {elapsed_ms:.0f}ms')
+        if was_current and (tab is not None or not exists):
+            self.tab_widget.currentChanged.emit(self.tab_widget.currentIndex())
+        return tab
+
+    def _materialize_current_session_tab(self) -> None:
+        tab = self.active_tab()
+        if tab is not None and tab.session_load_pending:
+            self._materialize_session_tab(tab)
+
+    def _materialize_session_tabs(self) -> None:
+        """Read every remaining placeholder now, for features that need all open text."""
+        for tab in self._pending_session_tabs():
+            self._materialize_session_tab(tab)
+
+    def _schedule_session_background_load(self) -> None:
+        interval_ms = int(self.settings.get("session_background_load_ms", 150) or 0)
+        if interval_ms <= 0 or self._session_background_load_scheduled:
+            return
+        if not any(not tab.session_load_deferred for tab in self._pending_session_tabs()):
+            return
+        self._session_background_load_scheduled = True
+        QTimer.singleShot(interval_ms, self, self._load_next_session_tab)
+
+    def _next_background_session_tab(self) -> EditorTab | None:
+        """First placeholder that can load without asking the user anything.
+
+        Encrypted notes (password prompt) and document imports wait until activated.
+        """
+        for tab in self._pending_session_tabs():
+            if tab.session_load_deferred:
+                continue
+            if self._open_needs_interaction(str(tab.current_file or "")):
+                tab.session_load_deferred = True
+                continue
+            return tab
+        return None
+
+    def _load_next_session_tab(self) -> None:
+        self._session_background_load_scheduled = False
+        tab = self._next_background_session_tab()
+        if tab is None:
+            return
+        self._materialize_session_tab(tab, background=True)
+        self._schedule_session_background_load()
+
     def _watch_file(self, path: str) -> None:
         watcher = getattr(self, "file_watcher", None)
         if watcher is None:
@@ -3170,7 +3310,7 @@ class MiscMixin(
             if isinstance(widget, EditorTab) and widget.current_file == path:
                 tab = widget
                 break
-        if tab is None:
+        if tab is None or tab.session_load_pending:
             return
         if not Path(path).exists():
             QMessageBox.warning(self, "File Changed", f"File was removed or renamed:\n{path}")
@@ -3962,12 +4102,10 @@ class MiscMixin(
             "minimap_dock",
             "outline_dock",
         ):
-            dock = getattr(self, name, None)
+            dock = self.loaded_service(name)
             if dock is None:
                 continue
-            dock.dockLocationChanged.connect(lambda _area, _dock=dock: self._schedule_layout_auto_save())
-            dock.topLevelChanged.connect(lambda _floating, _dock=dock: self._schedule_layout_auto_save())
-            dock.visibilityChanged.connect(lambda _visible, _dock=dock: self._schedule_layout_auto_save())
+            self._watch_dock_for_layout_auto_save(dock)
         for toolbar_name in ("main_toolbar", "markdown_toolbar", "search_toolbar"):
             toolbar = getattr(self, toolbar_name, None)
             if toolbar is None:
@@ -3975,6 +4113,23 @@ class MiscMixin(
             toolbar.topLevelChanged.connect(lambda _floating, _tb=toolbar: self._schedule_layout_auto_save())
             toolbar.visibilityChanged.connect(lambda _visible, _tb=toolbar: self._schedule_layout_auto_save())
 
+    def _watch_dock_for_layout_auto_save(self, dock: QDockWidget) -> None:
+        dock.dockLocationChanged.connect(lambda _area, _dock=dock: self._schedule_layout_auto_save())
+        dock.topLevelChanged.connect(lambda _floating, _dock=dock: self._schedule_layout_auto_save())
+        dock.visibilityChanged.connect(lambda _visible, _dock=dock: self._schedule_layout_auto_save())
+
+    def _register_late_dock(self, dock: QDockWidget, *, watch_layout: bool = True) -> None:
+        """Fit a dock built after startup (by a lazy subsystem) into the current layout."""
+        if getattr(self, "_layout_restored_once", False) and not getattr(
+            self, "_layout_restore_pending_after_show", False
+        ):
+            self.restoreDockWidget(dock)
+        if not watch_layout:
+            return
+        if getattr(self, "_layout_auto_save_ready", False):
+            self._watch_dock_for_layout_auto_save(dock)
+        self._apply_layout_lock()
+
     def _schedule_layout_auto_save(self) -> None:
         if getattr(self, "_layout_restore_in_progress", False):
             return
@@ -4076,7 +4231,7 @@ class MiscMixin(
             "minimap_dock",
             "outline_dock",
         ):
-            dock = getattr(self, name, None)
+            dock = self.loaded_service(name)
             if dock is not None:
                 docks.append(dock)
         if not hasattr(self, "_dock_default_features"):
@@ -1,12 +1,58 @@
 from __future__ import annotations
 
+import time
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QDialog, QDialogButtonBox, QMessageBox, QTextEdit, QVBoxLayout
+from PySide6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QLabel,
+    QMessageBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QTextEdit,
+    QVBoxLayout,
+)
 
+from pypad.ui.ai.ai_metrics_ledger import metrics_over_time, summarize_metrics
 from pypad.ui.theme.dialog_theme import apply_dialog_theme_from_window
 
+# (label, window seconds or None for everything, bucket seconds)
+_AI_METRICS_RANGES = (
+    ("Last 24 hours", 24 * 3600, 3600),
+    ("Last 7 days", 7 * 86400, 86400),
+    ("Last 30 days", 30 * 86400, 86400),
+    ("All time", None, 86400),
+)
+
+
+def _fmt_ms(value: object) -> str:
+    return f"{float(value):.0f}" if isinstance(value, (int, float)) else "-"
+
+
+def _fill_table(table: QTableWidget, rows: list[list[str]]) -> None:
+    table.setRowCount(len(rows))
+    for r, values in enumerate(rows):
+        for c, text in enumerate(values):
+            item = QTableWidgetItem(text)
+            if c >= 1 and text.replace(".", "", 1).replace("-", "", 1).isdigit():
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(r, c, item)
+    table.resizeColumnsToContents()
+
+
+def _metrics_table(parent, headers: list[str]) -> QTableWidget:
+    table = QTableWidget(0, len(headers), parent)
+    table.setHorizontalHeaderLabels(headers)
+    table.verticalHeader().setVisible(False)
+    table.setEditTriggers(QTableWidget.NoEditTriggers)
+    table.horizontalHeader().setStretchLastSection(True)
+    return table
+
 
 class MiscAiUsageMixin:
     if TYPE_CHECKING:
@@ -69,8 +115,86 @@ class MiscAiUsageMixin:
         requests = int(usage.get("requests", 0))
         tokens = int(usage.get("tokens", 0))
         cost = float(usage.get("estimated_cost", 0.0))
-        QMessageBox.information(
-            self,
-            "AI Usage Summary",
-            f"Session requests: {requests}\nEstimated tokens: {tokens}\nEstimated cost: ${cost:.4f}",
+        session_text = f"Session requests: {requests} | Estimated tokens: {tokens} | Estimated cost: ${cost:.4f}"
+        ledger = getattr(getattr(self, "ai_controller", None), "metrics_ledger", None)
+        if ledger is None:
+            QMessageBox.information(self, "AI Usage Summary", session_text.replace(" | ", "\n"))
+            return
+
+        dlg = QDialog(self)
+        dlg.setWindowTitle("AI Usage Summary")
+        dlg.resize(900, 560)
+        apply_dialog_theme_from_window(self, dlg)
+        v = QVBoxLayout(dlg)
+        v.addWidget(QLabel(session_text, dlg))
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Range:", dlg))
+        range_combo = QComboBox(dlg)
+        for label, _window, _bucket in _AI_METRICS_RANGES:
+            range_combo.addItem(label)
+        top.addWidget(range_combo)
+        top.addStretch(1)
+        totals = QLabel(dlg)
+        top.addWidget(totals)
+        v.addLayout(top)
+        v.addWidget(QLabel("By model and action (latency in ms, cache hits excluded):", dlg))
+        by_model = _metrics_table(
+            dlg,
+            ["Model", "Action", "Requests", "Errors", "Cache hits", "Retries", "p50", "p90", "p99", "TTFT p50", "Tok/s p50"],
         )
+        v.addWidget(by_model, 1)
+        v.addWidget(QLabel("Over time:", dlg))
+        over_time = _metrics_table(dlg, ["Period", "Requests", "Errors", "Cache hits", "p50", "p90", "p99", "TTFT p50"])
+        v.addWidget(over_time, 1)
+        buttons = QDialogButtonBox(QDialogButtonBox.Close, Qt.Horizontal, dlg)
+        refresh_btn = buttons.addButton("Refresh", QDialogButtonBox.ActionRole)
+        buttons.rejected.connect(dlg.reject)
+        v.addWidget(buttons)
+
+        def _refresh() -> None:
+            _label, window, bucket = _AI_METRICS_RANGES[max(0, range_combo.currentIndex())]
+            rows = ledger.read(since=time.time() - window if window else None)
+            hits = sum(1 for row in rows if row.get("cache_hit"))
+            totals.setText(f"{len(rows)} request(s), {hits} cache hit(s)")
+            _fill_table(
+                by_model,
+                [
+                    [
+                        str(row["model"]),
+                        str(row["action"]),
+                        str(row["requests"]),
+                        str(row["errors"]),
+                        str(row["cache_hits"]),
+                        str(row["retries"]),
+                        _fmt_ms(row["latency_p50"]),
+                        _fmt_ms(row["latency_p90"]),
+                        _fmt_ms(row["latency_p99"]),
+                        _fmt_ms(row["ttft_p50"]),
+                        f"{row['tokens_per_sec_p50']:.1f}" if row["tokens_per_sec_p50"] is not None else "-",
+                    ]
+                    for row in summarize_metrics(rows)
+                ],
+            )
+            stamp = "%Y-%m-%d %H:00" if bucket < 86400 else "%Y-%m-%d"
+            offset = (datetime.now().astimezone().utcoffset() or timedelta()).total_seconds()
+            _fill_table(
+                over_time,
+                [
+                    [
+                        datetime.fromtimestamp(float(row["start"])).strftime(stamp),
+                        str(row["requests"]),
+                        str(row["errors"]),
+                        str(row["cache_hits"]),
+                        _fmt_ms(row["latency_p50"]),
+                        _fmt_ms(row["latency_p90"]),
+                        _fmt_ms(row["latency_p99"]),
+                        _fmt_ms(row["ttft_p50"]),
+                    ]
+                    for row in reversed(metrics_over_time(rows, bucket_sec=bucket, utc_offset_sec=offset))
+                ],
+            )
+
+        range_combo.currentIndexChanged.connect(lambda _index: _refresh())
+        refresh_btn.clicked.connect(_refresh)
+        _refresh()
+        dlg.exec()
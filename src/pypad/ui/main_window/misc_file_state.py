@@ -32,7 +32,7 @@ class MiscFileStateMixin:
             )
 
     def reload_tab_from_disk(self, tab: EditorTab) -> None:
-        if not tab.current_file:
+        if not tab.current_file or tab.session_load_pending:
             return
         if tab.text_edit.is_modified():
             ret = QMessageBox.warning(
@@ -65,7 +65,7 @@ class MiscFileStateMixin:
         tab.markdown_mode_enabled = self._is_markdown_path(tab.current_file) and not tab.large_file
         tab.markdown_preview.setVisible(tab.markdown_mode_enabled)
         if tab.markdown_mode_enabled:
-            tab.markdown_preview.setMarkdown(text)
+            self._markdown_renderer_for_tab(tab).request(immediate=True)
         self._notify_large_file_mode(tab)
         tab.text_edit.set_modified(False)
         self._apply_file_metadata_to_tab(tab)
@@ -200,12 +200,9 @@ class MiscQuickOpenMixin:
         tab = self.active_tab()
         if tab is None:
             return []
-        try:
-            language = self._detect_language_for_tab(tab)
-            text = tab.text_edit.get_text()
-        except Exception:
-            return []
-        rows = extract_symbol_rows(language, text)
+        model = self._symbol_model_for_tab(tab)
+        model.request(immediate=True)
+        rows = model.snapshot().rows
         tab_label = self._tab_display_name(tab)
         return [
             QuickOpenEntry(
@@ -426,19 +423,28 @@ class MiscQuickOpenMixin:
             return
         self._quick_open_apply_selection(entry, line=dialog.selected_line, col=dialog.selected_col)
 
-    def open_command_palette(self, initial_query: str = "") -> None:
-        actions: list[PaletteItem] = []
-        for entry in discover_window_actions(self):
-            actions.append(
-                PaletteItem(
-                    label=entry.label,
-                    section=entry.section,
-                    action=entry.action,
-                    shortcut=entry.shortcut_text,
-                    keywords=f"{entry.action_id} {entry.section}",
-                )
+    def _command_palette_items(self) -> list[PaletteItem]:
+        registry = self.action_registry
+        cached = getattr(self, "_command_palette_items_cache", None)
+        if cached is not None and cached[0] == registry.version:
+            return cached[1]
+        actions = [
+            PaletteItem(
+                label=entry.label,
+                section=entry.section,
+                action=entry.action,
+                shortcut=entry.shortcut_text,
+                keywords=f"{entry.action_id} {entry.section}",
+                search_text=entry.search_text,
             )
-        dialog = CommandPaletteDialog(self, actions, initial_query=initial_query)
+            for entry in discover_window_actions(self)
+        ]
+        # The index may drop deleted actions while building, which bumps the version.
+        self._command_palette_items_cache = (registry.version, actions)
+        return actions
+
+    def open_command_palette(self, initial_query: str = "") -> None:
+        dialog = CommandPaletteDialog(self, self._command_palette_items(), initial_query=initial_query)
         if dialog.exec() != QDialog.Accepted or dialog.selected_action is None:
             return
         dialog.selected_action.trigger()
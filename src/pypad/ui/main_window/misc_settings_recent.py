@@ -13,6 +13,7 @@ from ...app_settings import (
     get_password_file_path,
     get_reminders_file_path,
     get_settings_file_path,
+    get_startup_history_path,
     get_translation_cache_path,
 )
 from .notepadpp_pref_runtime import recent_file_max_entries, recent_file_menu_label
@@ -54,6 +55,10 @@ class MiscSettingsRecentMixin:
     def _get_crash_logs_file_path() -> Path:
         return get_crash_logs_file_path()
 
+    @staticmethod
+    def _get_startup_history_path() -> Path:
+        return get_startup_history_path()
+
     def _add_recent_file(self, path: str | None) -> None:
         if not path:
             return
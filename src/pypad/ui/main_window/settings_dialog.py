@@ -827,6 +827,29 @@ class SettingsDialog(QDialog):
         self.ai_session_default_allow_hidden_apply_commands_checkbox = self._add_check(
             ai_layout, idx, "Default chat memory: allow hidden apply commands"
         )
+        self.ai_response_cache_checkbox = self._add_check(ai_layout, idx, "Reuse cached responses for identical AI requests")
+        self.ai_response_cache_ttl_spin = self._add_spin(ai_layout, idx, "AI response cache lifetime (hours)", 1, 720)
+        self.ai_response_cache_max_mb_spin = self._add_spin(ai_layout, idx, "AI response cache size (MB)", 1, 1024)
+        self.clear_ai_response_cache_btn = QPushButton("Clear AI response cache", ai)
+        ai_layout.addRow("", self.clear_ai_response_cache_btn)
+        self._register_search(idx, "Clear AI response cache", self.clear_ai_response_cache_btn)
+        self.clear_ai_response_cache_btn.clicked.connect(self._clear_ai_response_cache)
+        self.ai_context_budget_spin = self._add_spin(ai_layout, idx, "AI context budget (tokens)", 1000, 200000)
+        self.ai_batch_concurrency_spin = self._add_spin(ai_layout, idx, "Concurrent AI batch requests", 1, 16)
+        self.ai_requests_per_minute_spin = self._add_spin(ai_layout, idx, "AI requests per minute (0 = no limit)", 0, 10000)
+        self.ai_provider_combo = self._add_combo(ai_layout, idx, "AI provider", ["gemini", "local"])
+        self.ai_provider_combo.setToolTip("'local' answers offline with simulated responses for load and latency testing.")
+        self.ai_local_canned_response_edit = QLineEdit(ai)
+        self.ai_local_canned_response_edit.setPlaceholderText("Blank = seeded filler text")
+        ai_layout.addRow("Local provider canned response", self.ai_local_canned_response_edit)
+        self._register_search(idx, "Local provider canned response", self.ai_local_canned_response_edit)
+        self.ai_local_response_chars_spin = self._add_spin(ai_layout, idx, "Local provider response length (chars)", 1, 1000000)
+        self.ai_local_chunk_chars_spin = self._add_spin(ai_layout, idx, "Local provider chunk size (chars)", 1, 100000)
+        self.ai_local_chunk_delay_spin = self._add_spin(ai_layout, idx, "Local provider chunk delay (ms)", 0, 10000)
+        self.ai_local_first_token_spin = self._add_spin(ai_layout, idx, "Local provider first token delay (ms)", 0, 60000)
+        self.ai_local_error_percent_spin = self._add_spin(ai_layout, idx, "Local provider error rate (%)", 0, 100)
+        self.ai_local_rate_limit_percent_spin = self._add_spin(ai_layout, idx, "Local provider rate-limit rate (%)", 0, 100)
+        self.ai_local_seed_spin = self._add_spin(ai_layout, idx, "Local provider seed", 0, 1000000)
         self.ai_verbose_logging_checkbox = self._add_check(ai_layout, idx, "Enable AI verbose logging")
         self.ai_cost_rate_spin = QDoubleSpinBox(ai)
         self.ai_cost_rate_spin.setDecimals(6)
@@ -968,6 +991,53 @@ class SettingsDialog(QDialog):
             0,
             15000,
         )
+        self.plugin_event_coalesce_ms_spin = self._add_spin(
+            advanced_layout,
+            idx,
+            "Plugin typing event delay (ms)",
+            0,
+            2000,
+        )
+        self.plugin_event_budget_ms_spin = self._add_spin(
+            advanced_layout,
+            idx,
+            "Plugin event time budget (ms)",
+            1,
+            1000,
+        )
+        self.plugin_event_slow_strikes_spin = self._add_spin(
+            advanced_layout,
+            idx,
+            "Slow plugin events before throttling",
+            1,
+            50,
+        )
+        self.plugin_process_runtime_default_checkbox = self._add_check(
+            advanced_layout,
+            idx,
+            "Run plugins in a separate process unless they opt out",
+        )
+        self.plugin_process_cpu_limit_ms_spin = self._add_spin(
+            advanced_layout,
+            idx,
+            "Out-of-process plugin CPU limit per call (ms)",
+            50,
+            60000,
+        )
+        self.plugin_discovery_verify_minutes_spin = self._add_spin(
+            advanced_layout,
+            idx,
+            "Re-verify cached plugin checks every (min, 0 = off)",
+            0,
+            1440,
+        )
+        self.session_background_load_ms_spin = self._add_spin(
+            advanced_layout,
+            idx,
+            "Load restored session tabs in background every (ms, 0 = when opened)",
+            0,
+            10000,
+        )
         self.settings_schema_version_label = QLabel("2", advanced)
         advanced_layout.addRow("Settings schema version", self.settings_schema_version_label)
         self._register_search(idx, "Settings schema version", self.settings_schema_version_label)
@@ -1450,6 +1520,21 @@ class SettingsDialog(QDialog):
         self.ai_session_default_allow_hidden_apply_commands_checkbox.setChecked(
             bool(s.get("ai_session_default_allow_hidden_apply_commands", True))
         )
+        self.ai_response_cache_checkbox.setChecked(bool(s.get("ai_response_cache_enabled", True)))
+        self.ai_response_cache_ttl_spin.setValue(int(s.get("ai_response_cache_ttl_hours", 24)))
+        self.ai_response_cache_max_mb_spin.setValue(int(s.get("ai_response_cache_max_mb", 32)))
+        self.ai_context_budget_spin.setValue(int(s.get("ai_context_budget_tokens", 16000)))
+        self.ai_batch_concurrency_spin.setValue(int(s.get("ai_batch_max_concurrency", 3)))
+        self.ai_requests_per_minute_spin.setValue(int(s.get("ai_requests_per_minute", 0)))
+        self.ai_provider_combo.setCurrentText(str(s.get("ai_provider", "gemini")))
+        self.ai_local_canned_response_edit.setText(str(s.get("ai_local_canned_response", "")))
+        self.ai_local_response_chars_spin.setValue(int(s.get("ai_local_response_chars", 2000)))
+        self.ai_local_chunk_chars_spin.setValue(int(s.get("ai_local_chunk_chars", 24)))
+        self.ai_local_chunk_delay_spin.setValue(int(s.get("ai_local_chunk_delay_ms", 30)))
+        self.ai_local_first_token_spin.setValue(int(s.get("ai_local_first_token_ms", 300)))
+        self.ai_local_error_percent_spin.setValue(int(s.get("ai_local_error_percent", 0)))
+        self.ai_local_rate_limit_percent_spin.setValue(int(s.get("ai_local_rate_limit_percent", 0)))
+        self.ai_local_seed_spin.setValue(int(s.get("ai_local_seed", 0)))
         self.ai_verbose_logging_checkbox.setChecked(bool(s.get("ai_verbose_logging", False)))
         self.ai_cost_rate_spin.setValue(float(s.get("ai_estimated_cost_per_1k_tokens", 0.0005) or 0.0005))
         self.lsp_definition_enabled_checkbox.setChecked(bool(s.get("lsp_definition_enabled", True)))
@@ -1488,6 +1573,13 @@ class SettingsDialog(QDialog):
         self.plugin_startup_safe_mode_checkbox.setChecked(bool(s.get("plugin_startup_safe_mode", False)))
         self.defer_plugin_load_checkbox.setChecked(bool(s.get("defer_plugin_load_on_startup", True)))
         self.plugin_startup_defer_ms_spin.setValue(int(s.get("plugin_startup_defer_ms", 1200)))
+        self.plugin_event_coalesce_ms_spin.setValue(int(s.get("plugin_event_coalesce_ms", 150)))
+        self.plugin_event_budget_ms_spin.setValue(int(s.get("plugin_event_budget_ms", 16)))
+        self.plugin_event_slow_strikes_spin.setValue(int(s.get("plugin_event_slow_strikes", 3)))
+        self.plugin_process_runtime_default_checkbox.setChecked(bool(s.get("plugin_process_runtime_default", False)))
+        self.plugin_process_cpu_limit_ms_spin.setValue(int(s.get("plugin_process_cpu_limit_ms", 2000)))
+        self.plugin_discovery_verify_minutes_spin.setValue(int(s.get("plugin_discovery_verify_minutes", 60)))
+        self.session_background_load_ms_spin.setValue(int(s.get("session_background_load_ms", 150)))
         self.layout_auto_save_checkbox.setChecked(bool(s.get("layout_auto_save_enabled", True)))
         self.snap_dock_shortcuts_checkbox.setChecked(bool(s.get("snap_dock_shortcuts_enabled", True)))
         self.per_tab_splitter_sizes_checkbox.setChecked(bool(s.get("per_tab_splitter_sizes_enabled", True)))
@@ -1578,6 +1670,21 @@ class SettingsDialog(QDialog):
         s["ai_session_default_allow_hidden_apply_commands"] = (
             self.ai_session_default_allow_hidden_apply_commands_checkbox.isChecked()
         )
+        s["ai_response_cache_enabled"] = self.ai_response_cache_checkbox.isChecked()
+        s["ai_response_cache_ttl_hours"] = int(self.ai_response_cache_ttl_spin.value())
+        s["ai_response_cache_max_mb"] = int(self.ai_response_cache_max_mb_spin.value())
+        s["ai_context_budget_tokens"] = int(self.ai_context_budget_spin.value())
+        s["ai_batch_max_concurrency"] = int(self.ai_batch_concurrency_spin.value())
+        s["ai_requests_per_minute"] = int(self.ai_requests_per_minute_spin.value())
+        s["ai_provider"] = self.ai_provider_combo.currentText()
+        s["ai_local_canned_response"] = self.ai_local_canned_response_edit.text()
+        s["ai_local_response_chars"] = int(self.ai_local_response_chars_spin.value())
+        s["ai_local_chunk_chars"] = int(self.ai_local_chunk_chars_spin.value())
+        s["ai_local_chunk_delay_ms"] = int(self.ai_local_chunk_delay_spin.value())
+        s["ai_local_first_token_ms"] = int(self.ai_local_first_token_spin.value())
+        s["ai_local_error_percent"] = int(self.ai_local_error_percent_spin.value())
+        s["ai_local_rate_limit_percent"] = int(self.ai_local_rate_limit_percent_spin.value())
+        s["ai_local_seed"] = int(self.ai_local_seed_spin.value())
         s["ai_verbose_logging"] = self.ai_verbose_logging_checkbox.isChecked()
         s["ai_estimated_cost_per_1k_tokens"] = float(self.ai_cost_rate_spin.value())
         s["lsp_definition_enabled"] = self.lsp_definition_enabled_checkbox.isChecked()
@@ -1605,6 +1712,13 @@ class SettingsDialog(QDialog):
         s["plugin_startup_safe_mode"] = self.plugin_startup_safe_mode_checkbox.isChecked()
         s["defer_plugin_load_on_startup"] = self.defer_plugin_load_checkbox.isChecked()
         s["plugin_startup_defer_ms"] = int(self.plugin_startup_defer_ms_spin.value())
+        s["plugin_event_coalesce_ms"] = int(self.plugin_event_coalesce_ms_spin.value())
+        s["plugin_event_budget_ms"] = int(self.plugin_event_budget_ms_spin.value())
+        s["plugin_event_slow_strikes"] = int(self.plugin_event_slow_strikes_spin.value())
+        s["plugin_process_runtime_default"] = self.plugin_process_runtime_default_checkbox.isChecked()
+        s["plugin_process_cpu_limit_ms"] = int(self.plugin_process_cpu_limit_ms_spin.value())
+        s["plugin_discovery_verify_minutes"] = int(self.plugin_discovery_verify_minutes_spin.value())
+        s["session_background_load_ms"] = int(self.session_background_load_ms_spin.value())
         s["layout_auto_save_enabled"] = self.layout_auto_save_checkbox.isChecked()
         s["snap_dock_shortcuts_enabled"] = self.snap_dock_shortcuts_checkbox.isChecked()
         s["per_tab_splitter_sizes_enabled"] = self.per_tab_splitter_sizes_checkbox.isChecked()
@@ -1757,4 +1871,9 @@ class SettingsDialog(QDialog):
             self._parent_window.clear_translation_cache()
             QMessageBox.information(self, "Translation Cache", "Translation cache cleared.")
 
+    def _clear_ai_response_cache(self) -> None:
+        if hasattr(self._parent_window, "clear_ai_response_cache"):
+            self._parent_window.clear_ai_response_cache()
+            QMessageBox.information(self, "AI Response Cache", "Cached AI responses cleared.")
+
 
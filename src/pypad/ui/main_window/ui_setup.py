@@ -64,26 +64,25 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtPrintSupport import QPrintDialog, QPrintPreviewDialog, QPrinter
 
 from pypad.ui.debug.debug_logs_dialog import DebugLogsDialog
 from pypad.ui.editor.detachable_tab_bar import DetachableTabBar
 from pypad.ui.editor.editor_tab import EditorTab
 from ...app_settings import build_default_settings
-from pypad.ui.ai.ai_controller import AIController
 from pypad.ui.theme.asset_paths import resolve_asset_path
 from pypad.ui.system.autosave import AutoSaveRecoveryDialog, AutoSaveStore
 from pypad.ui.system.reminders import ReminderStore, RemindersDialog
-from pypad.ui.security.security_controller import SecurityController
+from pypad.ui.editor.markdown_preview import MarkdownPreviewRenderer
+from pypad.ui.editor.symbol_model import DocumentSymbolModel
 from pypad.ui.editor.syntax_highlighter import CodeSyntaxHighlighter
-from pypad.ui.system.updater_controller import UpdaterController
 from pypad.ui.system.version_history import LocalHistoryTimelineDialog, VersionHistoryDialog
-from pypad.ui.workspace.workspace_controller import WorkspaceController
 from pypad.logging_utils import (
     clear_console_log_lines,
     configure_app_logging,
+    format_log_line,
     get_console_log_lines,
     get_level_number,
+    get_log_file_writer,
     get_logger,
     normalize_log_level_name,
 )
@@ -236,11 +235,7 @@ class UiSetupMixin:
 
     @staticmethod
     def _format_log_line(level: str, message: str) -> str:
-        now = datetime.now()
-        timestamp = now.strftime("%H:%M:%S.%f")[:-3]
-        date = f"{now.month}/{now.day}/{now.year}"
-        level_title = level.capitalize()
-        return f"[{level_title}] [{timestamp} {date}] {message}"
+        return format_log_line(level.capitalize(), message)
 
     def log_event(self, level: str, message: str) -> None:
         normalized_level = self._normalize_log_event_level(level)
@@ -255,30 +250,22 @@ class UiSetupMixin:
         except Exception:
             print(line)
         self.debug_logs.append(line)
-        if len(self.debug_logs) > 5000:
-            self.debug_logs = self.debug_logs[-5000:]
         if bool(self.settings.get("save_debug_logs_to_appdata", False)):
-            self._append_line_to_log_file(self._get_debug_logs_file_path(), line)
+            path = getattr(self, "_debug_logs_file_path", None)
+            if path is None:
+                path = self._debug_logs_file_path = self._get_debug_logs_file_path()
+            get_log_file_writer().write(path, line)
         if self.debug_logs_dialog is not None and self.debug_logs_dialog.isVisible():
             self.debug_logs_dialog.append_line(line)
 
-    @staticmethod
-    def _append_line_to_log_file(path: Path, line: str) -> None:
-        try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "a", encoding="utf-8") as handle:
-                handle.write(line.rstrip("\n"))
-                handle.write("\n")
-        except Exception:
-            pass
-
     def save_crash_traceback(self, traceback_text: str) -> None:
         if not bool(self.settings.get("save_debug_logs_to_appdata", False)):
             return
         header = self._format_log_line("Error", "Unhandled traceback captured")
-        self._append_line_to_log_file(self._get_crash_logs_file_path(), header)
-        for line in traceback_text.splitlines():
-            self._append_line_to_log_file(self._get_crash_logs_file_path(), line)
+        writer = get_log_file_writer()
+        writer.write_lines(self._get_crash_logs_file_path(), [header, *traceback_text.splitlines()])
+        # The process may be about to die; do not leave the traceback in the queue.
+        writer.flush()
 
     def clear_debug_logs(self) -> None:
         self.debug_logs.clear()
@@ -452,7 +439,7 @@ class UiSetupMixin:
             self._refresh_window_menu_entries()
 
     def _sync_tab_modified_state_with_current_file(self, tab: EditorTab | None) -> None:
-        if tab is None:
+        if tab is None or tab.session_load_pending:
             return
         path = str(getattr(tab, "current_file", "") or "").strip()
         if not path:
@@ -559,8 +546,8 @@ class UiSetupMixin:
         return None
 
     def _emit_plugin_event(self, event_name: str, tab: EditorTab | None = None, **extra) -> None:
-        host = getattr(getattr(self, "advanced_features", None), "plugin_host", None)
-        if host is None:
+        host = getattr(self.loaded_service("advanced_features"), "plugin_host", None)
+        if host is None or not host.has_event_subscribers(event_name):
             return
         payload = dict(extra)
         if tab is not None:
@@ -568,6 +555,7 @@ class UiSetupMixin:
             payload.setdefault("path", tab.current_file or "")
             payload.setdefault("title", self._tab_display_name(tab))
             payload.setdefault("modified", bool(tab.text_edit.is_modified()))
+            payload.setdefault("revision", tab.text_edit.revision)
         host.emit_event(event_name, **payload)
 
     def _handle_text_changed(self) -> None:
@@ -647,6 +635,28 @@ class UiSetupMixin:
             return "markdown"
         return "plain"
 
+    def _symbol_model_for_tab(self, tab: EditorTab) -> DocumentSymbolModel:
+        model = tab.symbol_model
+        if model is None:
+            model = DocumentSymbolModel(tab.text_edit, lambda t=tab: self._detect_language_for_tab(t), parent=tab)
+            model.changed.connect(lambda _snapshot, t=tab: self._on_tab_symbols_changed(t))
+            tab.symbol_model = model
+        return model
+
+    def _markdown_renderer_for_tab(self, tab: EditorTab) -> MarkdownPreviewRenderer:
+        renderer = tab.markdown_renderer
+        if renderer is None:
+            renderer = MarkdownPreviewRenderer(tab.text_edit, tab.markdown_preview, parent=tab)
+            tab.markdown_renderer = renderer
+        return renderer
+
+    def _on_tab_symbols_changed(self, tab: EditorTab) -> None:
+        if tab is not self.active_tab():
+            return
+        advanced_features = self.loaded_service("advanced_features")
+        if advanced_features is not None:
+            advanced_features.refresh_symbol_views()
+
     def _apply_syntax_highlighting(self, tab: EditorTab) -> None:
         if not self.settings.get("syntax_highlighting_enabled", True):
             if tab.syntax_highlighter is not None:
@@ -1003,7 +1013,7 @@ class UiSetupMixin:
         tab.text_edit.set_modified(False)
         self._refresh_tab_title(tab)
         if tab.markdown_mode_enabled:
-            tab.markdown_preview.setMarkdown(tab.text_edit.get_text())
+            self._markdown_renderer_for_tab(tab).request(immediate=True)
         self._apply_syntax_highlighting(tab)
         self._seed_version_history(tab, label="New")
         if tab.pinned:
@@ -1021,6 +1031,10 @@ class UiSetupMixin:
         tab = self.active_tab()
         if tab is None:
             return
+        if tab.session_load_pending:
+            # Let the tab bar repaint first; the loaded tab then comes back through here.
+            QTimer.singleShot(0, self, self._materialize_current_session_tab)
+            return
         self._sync_tab_modified_state_with_current_file(tab)
         self.log_event("Info", f'Active tab: "{self._tab_display_name(tab)}"')
         if hasattr(self, "md_toggle_preview_action"):
@@ -1090,7 +1104,8 @@ class UiSetupMixin:
         if not self.maybe_save_tab(widget):
             self.log_event("Info", f'Tab close cancelled: "{self._tab_display_name(widget)}"')
             return
-        self._emit_plugin_event("close", tab=widget)
+        if not widget.session_load_pending:
+            self._emit_plugin_event("close", tab=widget)
         self._clear_tab_autosave(widget)
         self.tab_widget.removeTab(index)
         widget.deleteLater()
@@ -1612,8 +1627,8 @@ class UiSetupMixin:
         self.change_note_password_action.setEnabled(has_tab and bool(tab and tab.encryption_enabled))
         self.ask_ai_action.setEnabled(not ai_private_mode)
         self.ai_chat_panel_action.setEnabled(not ai_private_mode)
-        if hasattr(self, "ai_chat_dock"):
-            self.ai_chat_panel_action.setChecked(self.ai_chat_dock.isVisible())
+        ai_chat_dock = self.loaded_service("ai_chat_dock")
+        self.ai_chat_panel_action.setChecked(ai_chat_dock is not None and ai_chat_dock.isVisible())
         self.explain_selection_ai_action.setEnabled(has_tab and has_selection and not ai_private_mode)
         self.ai_inline_edit_action.setEnabled(has_tab and not ai_private_mode and not is_read_only)
         self.ai_rewrite_shorten_action.setEnabled(has_tab and has_selection and not ai_private_mode and not is_read_only)
@@ -1919,8 +1934,6 @@ class UiSetupMixin:
         self.simple_mode_action.blockSignals(True)
         self.simple_mode_action.setChecked(bool(self.settings.get("simple_mode", False)))
         self.simple_mode_action.blockSignals(False)
-        if hasattr(self, "search_highlight_checkbox"):
-            self.search_highlight_checkbox.setEnabled(not is_large_file)
 
         # Format / view / markdown actions
         for action in (
@@ -3113,9 +3126,6 @@ class UiSetupMixin:
         if hasattr(self, "_sync_layout_panel_actions"):
             self._sync_layout_panel_actions()
 
-        if hasattr(self, "_capture_default_shortcuts"):
-            self._capture_default_shortcuts()
-
     def _apply_markdown_icons(self) -> None:
         icon_map = {
             self.md_heading1_action: "md-heading",
@@ -3378,6 +3388,72 @@ class UiSetupMixin:
         overflow_button.setVisible(bool(overflow_menu.actions()))
         self._position_main_toolbar_overflow_button()
 
+    def _add_lazy_menu(self: Any, parent: QMenu, title: str, actions: list[QAction | None]) -> QMenu:
+        """Add a submenu that is filled with ``actions`` (None = separator) when first shown.
+
+        The actions are added to the window right away so their shortcuts work before that.
+        """
+        menu = parent.addMenu(title)
+        pending = list(actions)
+        self._lazy_menu_actions[id(menu)] = pending
+        self.addActions([action for action in pending if action is not None])
+
+        def _fill() -> None:
+            if self._lazy_menu_actions.pop(id(menu), None) is None:
+                return
+            for action in pending:
+                if action is None:
+                    menu.addSeparator()
+                else:
+                    menu.addAction(action)
+
+        menu.aboutToShow.connect(_fill)
+        return menu
+
+    def _menu_entries(self: Any, menu: QWidget) -> list[tuple[QAction, QMenu | None]]:
+        """A menu's actions and their submenus, including entries a lazy menu has not added yet.
+
+        Submenus are looked up among the menu's children: on some PySide6 releases the
+        wrapper returned by ``QAction.menu()`` owns the menu and deletes it when released.
+        """
+        submenus: dict[int, tuple[QAction, QMenu]] = {}
+        for child in menu.findChildren(QMenu, options=Qt.FindChildOption.FindDirectChildrenOnly):
+            menu_action = child.menuAction()
+            submenus[id(menu_action)] = (menu_action, child)
+        pending = self._lazy_menu_actions.get(id(menu))
+        actions = [action for action in pending if action is not None] if pending is not None else menu.actions()
+        return [(action, submenus[id(action)][1] if id(action) in submenus else None) for action in actions]
+
+    def _register_window_actions(self: Any) -> None:
+        """Register the window's actions, using the menu path that shows each as its section."""
+        sections: dict[QAction, str] = {}
+
+        def _walk(menu: QWidget, path: str) -> None:
+            for action, submenu in self._menu_entries(menu):
+                sections[action] = path or "Global"
+                if submenu is not None:
+                    title = submenu.title().replace("&", "").strip()
+                    _walk(submenu, f"{path} > {title}" if path and title else (title or path))
+
+        _walk(self.menuBar(), "")
+
+        found: list[tuple[str, QAction]] = []
+        for name, value in list(vars(self).items()):
+            if name.startswith("_"):
+                continue
+            if isinstance(value, QAction):
+                found.append((name, value))
+            elif name.endswith("_actions") and isinstance(value, list):
+                prefix = name[: -len("_actions")]
+                found.extend((f"{prefix}_{n}", a) for n, a in enumerate(value, start=1) if isinstance(a, QAction))
+        for name, action in found:
+            try:
+                action_id = action.objectName().strip() or name
+            except RuntimeError:
+                # Skip stale Python wrappers whose underlying Qt object was deleted.
+                continue
+            self.action_registry.register(action_id, action, section=sections.get(action, "Global"))
+
     def create_menus(self: Any) -> None:
         menu_bar = self.menuBar()
 
@@ -3393,12 +3469,17 @@ class UiSetupMixin:
         self.file_menu.addSeparator()
         self.file_menu.addAction(self.close_tab_action)
         self.file_menu.addAction(self.close_all_action)
-        close_multi_menu = self.file_menu.addMenu("Close Multiple Documents")
-        close_multi_menu.addAction(self.close_all_but_active_action)
-        close_multi_menu.addAction(self.close_all_but_pinned_action)
-        close_multi_menu.addAction(self.close_all_left_action)
-        close_multi_menu.addAction(self.close_all_right_action)
-        close_multi_menu.addAction(self.close_all_unchanged_action)
+        self._add_lazy_menu(
+            self.file_menu,
+            "Close Multiple Documents",
+            [
+                self.close_all_but_active_action,
+                self.close_all_but_pinned_action,
+                self.close_all_left_action,
+                self.close_all_right_action,
+                self.close_all_unchanged_action,
+            ],
+        )
         self.file_menu.addSeparator()
         self.file_menu.addAction(self.print_action)
         self.file_menu.addAction(self.print_preview_action)
@@ -3409,73 +3490,113 @@ class UiSetupMixin:
         self.file_menu.addAction(self.favorite_tab_action)
         self.file_menu.addAction(self.edit_tags_action)
         self.file_menu.addSeparator()
-        self.templates_menu = self.file_menu.addMenu("Templates")
-        self.templates_menu.addAction(self.new_from_meeting_template_action)
-        self.templates_menu.addAction(self.new_from_daily_template_action)
-        self.templates_menu.addAction(self.new_from_checklist_template_action)
-        self.templates_menu.addSeparator()
-        self.templates_menu.addAction(self.insert_meeting_template_action)
-        self.templates_menu.addAction(self.insert_daily_template_action)
-        self.templates_menu.addAction(self.insert_checklist_template_action)
-        self.export_menu = self.file_menu.addMenu("Export")
-        self.export_menu.addAction(self.export_pdf_action)
-        self.export_menu.addAction(self.export_markdown_action)
-        self.export_menu.addAction(self.export_html_action)
-        self.export_menu.addAction(self.export_docx_action)
-        self.export_menu.addAction(self.export_odt_action)
-        self.encoding_menu = self.file_menu.addMenu("Encoding")
-        self.encoding_menu.addAction(self.encoding_utf8_action)
-        self.encoding_menu.addAction(self.encoding_utf16_action)
-        self.encoding_menu.addAction(self.encoding_ansi_action)
-        self.eol_menu = self.file_menu.addMenu("EOL")
-        self.eol_menu.addAction(self.eol_lf_action)
-        self.eol_menu.addAction(self.eol_crlf_action)
-        self.workspace_menu = self.file_menu.addMenu("Workspace")
-        self.workspace_menu.addAction(self.open_workspace_action)
-        self.workspace_menu.addAction(self.workspace_files_action)
-        self.workspace_menu.addAction(self.workspace_search_action)
-        self.workspace_menu.addSeparator()
-        self.workspace_menu.addAction(self.workspace_save_profile_action)
-        self.workspace_menu.addAction(self.workspace_load_profile_action)
-        self.workspace_menu.addAction(self.workspace_startup_picker_action)
-        self.session_menu = self.file_menu.addMenu("Session")
-        self.session_menu.addAction(self.save_session_action)
-        self.session_menu.addAction(self.save_session_as_action)
-        self.session_menu.addAction(self.load_session_action)
-        self.security_menu = self.file_menu.addMenu("Security")
-        self.security_menu.addAction(self.encrypt_note_action)
-        self.security_menu.addAction(self.decrypt_note_action)
-        self.security_menu.addAction(self.change_note_password_action)
-        self.ai_menu = self.file_menu.addMenu("AI")
-        self.ai_menu.addAction(self.ask_ai_action)
-        self.ai_menu.addAction(self.ai_chat_panel_action)
-        self.ai_menu.addAction(self.explain_selection_ai_action)
-        self.ai_menu.addAction(self.ai_inline_edit_action)
-        self.ai_menu.addSeparator()
-        self.ai_menu.addAction(self.ai_rewrite_shorten_action)
-        self.ai_menu.addAction(self.ai_rewrite_formal_action)
-        self.ai_menu.addAction(self.ai_rewrite_grammar_action)
-        self.ai_menu.addAction(self.ai_rewrite_summarize_action)
-        self.ai_menu.addSeparator()
-        self.ai_menu.addAction(self.ai_ask_context_action)
-        self.ai_menu.addAction(self.ai_workspace_citations_action)
-        self.ai_menu.addAction(self.ai_review_file_citations_action)
-        self.ai_menu.addAction(self.ai_review_workspace_citations_action)
-        self.ai_menu.addSeparator()
-        self.ai_menu.addAction(self.ai_attach_current_file_chat_action)
-        self.ai_menu.addAction(self.ai_attach_selection_chat_action)
-        self.ai_menu.addAction(self.ai_attach_workspace_search_chat_action)
-        self.ai_menu.addAction(self.ai_run_template_action)
-        self.ai_menu.addAction(self.ai_save_template_action)
-        self.ai_menu.addSeparator()
-        self.ai_menu.addAction(self.ai_usage_summary_action)
-        self.ai_menu.addAction(self.ai_action_history_action)
-        self.ai_menu.addAction(self.ai_private_mode_action)
-        self.ai_menu.addSeparator()
-        self.ai_menu.addAction(self.ai_file_citations_action)
-        self.ai_menu.addAction(self.ai_commit_changelog_action)
-        self.ai_menu.addAction(self.ai_batch_refactor_action)
-        self.ai_menu.addAction(self.ai_collab_merge_action)
+        self.templates_menu = self._add_lazy_menu(
+            self.file_menu,
+            "Templates",
+            [
+                self.new_from_meeting_template_action,
+                self.new_from_daily_template_action,
+                self.new_from_checklist_template_action,
+                None,
+                self.insert_meeting_template_action,
+                self.insert_daily_template_action,
+                self.insert_checklist_template_action,
+            ],
+        )
+        self.export_menu = self._add_lazy_menu(
+            self.file_menu,
+            "Export",
+            [
+                self.export_pdf_action,
+                self.export_markdown_action,
+                self.export_html_action,
+                self.export_docx_action,
+                self.export_odt_action,
+            ],
+        )
+        self.encoding_menu = self._add_lazy_menu(
+            self.file_menu,
+            "Encoding",
+            [
+                self.encoding_utf8_action,
+                self.encoding_utf16_action,
+                self.encoding_ansi_action,
+            ],
+        )
+        self.eol_menu = self._add_lazy_menu(
+            self.file_menu,
+            "EOL",
+            [
+                self.eol_lf_action,
+                self.eol_crlf_action,
+            ],
+        )
+        self.workspace_menu = self._add_lazy_menu(
+            self.file_menu,
+            "Workspace",
+            [
+                self.open_workspace_action,
+                self.workspace_files_action,
+                self.workspace_search_action,
+                None,
+                self.workspace_save_profile_action,
+                self.workspace_load_profile_action,
+                self.workspace_startup_picker_action,
+            ],
+        )
+        self.session_menu = self._add_lazy_menu(
+            self.file_menu,
+            "Session",
+            [
+                self.save_session_action,
+                self.save_session_as_action,
+                self.load_session_action,
+            ],
+        )
+        self.security_menu = self._add_lazy_menu(
+            self.file_menu,
+            "Security",
+            [
+                self.encrypt_note_action,
+                self.decrypt_note_action,
+                self.change_note_password_action,
+            ],
+        )
+        self.ai_menu = self._add_lazy_menu(
+            self.file_menu,
+            "AI",
+            [
+                self.ask_ai_action,
+                self.ai_chat_panel_action,
+                self.explain_selection_ai_action,
+                self.ai_inline_edit_action,
+                None,
+                self.ai_rewrite_shorten_action,
+                self.ai_rewrite_formal_action,
+                self.ai_rewrite_grammar_action,
+                self.ai_rewrite_summarize_action,
+                None,
+                self.ai_ask_context_action,
+                self.ai_workspace_citations_action,
+                self.ai_review_file_citations_action,
+                self.ai_review_workspace_citations_action,
+                None,
+                self.ai_attach_current_file_chat_action,
+                self.ai_attach_selection_chat_action,
+                self.ai_attach_workspace_search_chat_action,
+                self.ai_run_template_action,
+                self.ai_save_template_action,
+                None,
+                self.ai_usage_summary_action,
+                self.ai_action_history_action,
+                self.ai_private_mode_action,
+                None,
+                self.ai_file_citations_action,
+                self.ai_commit_changelog_action,
+                self.ai_batch_refactor_action,
+                self.ai_collab_merge_action,
+            ],
+        )
         self.recent_files_menu = self.file_menu.addMenu("Recent Files")
         self._refresh_recent_files_menu()
         self.favorite_files_menu = self.file_menu.addMenu("Favorite Files")
@@ -3497,85 +3618,135 @@ class UiSetupMixin:
         self.edit_menu.addAction(self.select_all_action)
         self.edit_menu.addAction(self.begin_end_select_action)
         self.edit_menu.addAction(self.begin_end_select_column_action)
-        insert_menu = self.edit_menu.addMenu("Insert")
-        insert_menu.addAction(self.time_date_action)
-        insert_menu.addAction(self.insert_media_action)
-        insert_menu.addSeparator()
-        insert_menu.addAction(self.insert_meeting_template_action)
-        insert_menu.addAction(self.insert_daily_template_action)
-        insert_menu.addAction(self.insert_checklist_template_action)
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Insert",
+            [
+                self.time_date_action,
+                self.insert_media_action,
+                None,
+                self.insert_meeting_template_action,
+                self.insert_daily_template_action,
+                self.insert_checklist_template_action,
+            ],
+        )
         self.edit_menu.addAction(self.reminders_action)
-        copy_menu = self.edit_menu.addMenu("Copy to Clipboard")
-        copy_menu.addAction(self.copy_full_path_action)
-        copy_menu.addAction(self.copy_filename_action)
-        copy_menu.addAction(self.copy_dir_action)
-        copy_menu.addSeparator()
-        copy_menu.addAction(self.copy_all_filenames_action)
-        copy_menu.addAction(self.copy_all_paths_action)
-        indent_menu = self.edit_menu.addMenu("Indent")
-        indent_menu.addAction(self.indent_action)
-        indent_menu.addAction(self.unindent_action)
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Copy to Clipboard",
+            [
+                self.copy_full_path_action,
+                self.copy_filename_action,
+                self.copy_dir_action,
+                None,
+                self.copy_all_filenames_action,
+                self.copy_all_paths_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Indent",
+            [
+                self.indent_action,
+                self.unindent_action,
+            ],
+        )
         self.edit_menu.addSeparator()
         self.edit_menu.addAction(self.clipboard_history_action)
-        convert_case_menu = self.edit_menu.addMenu("Convert Case to")
-        convert_case_menu.addAction(self.convert_uppercase_action)
-        convert_case_menu.addAction(self.convert_lowercase_action)
-        convert_case_menu.addAction(self.convert_propercase_action)
-        convert_case_menu.addAction(self.convert_sentencecase_action)
-        convert_case_menu.addAction(self.convert_invertcase_action)
-        convert_case_menu.addAction(self.convert_randomcase_action)
-        line_ops_menu = self.edit_menu.addMenu("Line Operations")
-        line_ops_menu.addAction(self.line_duplicate_action)
-        line_ops_menu.addAction(self.line_remove_duplicates_action)
-        line_ops_menu.addAction(self.line_remove_consecutive_duplicates_action)
-        line_ops_menu.addSeparator()
-        line_ops_menu.addAction(self.line_split_action)
-        line_ops_menu.addAction(self.line_join_action)
-        line_ops_menu.addSeparator()
-        line_ops_menu.addAction(self.line_move_up_action)
-        line_ops_menu.addAction(self.line_move_down_action)
-        line_ops_menu.addSeparator()
-        line_ops_menu.addAction(self.line_insert_blank_above_action)
-        line_ops_menu.addAction(self.line_insert_blank_below_action)
-        line_ops_menu.addAction(self.line_remove_empty_action)
-        line_ops_menu.addAction(self.line_remove_empty_ws_action)
-        line_ops_menu.addSeparator()
-        line_ops_menu.addAction(self.line_reverse_action)
-        line_ops_menu.addSeparator()
-        line_ops_menu.addAction(self.line_sort_asc_action)
-        line_ops_menu.addAction(self.line_sort_asc_icase_action)
-        line_ops_menu.addAction(self.line_sort_desc_action)
-        line_ops_menu.addAction(self.line_sort_desc_icase_action)
-        blank_ops_menu = self.edit_menu.addMenu("Blank Operations")
-        blank_ops_menu.addAction(self.blank_trim_trailing_action)
-        blank_ops_menu.addAction(self.blank_trim_leading_action)
-        blank_ops_menu.addSeparator()
-        blank_ops_menu.addAction(self.blank_remove_leading_blanks_action)
-        blank_ops_menu.addAction(self.blank_remove_trailing_blanks_action)
-        blank_ops_menu.addSeparator()
-        blank_ops_menu.addAction(self.line_remove_empty_action)
-        blank_ops_menu.addAction(self.line_remove_empty_ws_action)
-        comment_menu = self.edit_menu.addMenu("Comment/Uncomment")
-        comment_menu.addAction(self.comment_toggle_action)
-        comment_menu.addAction(self.comment_single_action)
-        comment_menu.addAction(self.comment_single_un_action)
-        comment_menu.addAction(self.comment_block_action)
-        comment_menu.addAction(self.comment_block_un_action)
-        auto_completion_menu = self.edit_menu.addMenu("Auto-Completion")
-        auto_completion_menu.addAction(self.auto_completion_off_action)
-        auto_completion_menu.addAction(self.auto_completion_all_action)
-        auto_completion_menu.addAction(self.auto_completion_doc_action)
-        auto_completion_menu.addAction(self.auto_completion_api_action)
-        auto_completion_menu.addAction(self.auto_completion_open_docs_action)
-        eol_menu = self.edit_menu.addMenu("EOL Conversion")
-        eol_menu.addAction(self.eol_crlf_action)
-        eol_menu.addAction(self.eol_lf_action)
-        eol_menu.addAction(self.eol_cr_action)
-        on_selection_menu = self.edit_menu.addMenu("On Selection")
-        on_selection_menu.addAction(self.open_selection_file_action)
-        on_selection_menu.addAction(self.open_selection_folder_action)
-        on_selection_menu.addSeparator()
-        on_selection_menu.addAction(self.search_selection_web_action)
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Convert Case to",
+            [
+                self.convert_uppercase_action,
+                self.convert_lowercase_action,
+                self.convert_propercase_action,
+                self.convert_sentencecase_action,
+                self.convert_invertcase_action,
+                self.convert_randomcase_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Line Operations",
+            [
+                self.line_duplicate_action,
+                self.line_remove_duplicates_action,
+                self.line_remove_consecutive_duplicates_action,
+                None,
+                self.line_split_action,
+                self.line_join_action,
+                None,
+                self.line_move_up_action,
+                self.line_move_down_action,
+                None,
+                self.line_insert_blank_above_action,
+                self.line_insert_blank_below_action,
+                self.line_remove_empty_action,
+                self.line_remove_empty_ws_action,
+                None,
+                self.line_reverse_action,
+                None,
+                self.line_sort_asc_action,
+                self.line_sort_asc_icase_action,
+                self.line_sort_desc_action,
+                self.line_sort_desc_icase_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Blank Operations",
+            [
+                self.blank_trim_trailing_action,
+                self.blank_trim_leading_action,
+                None,
+                self.blank_remove_leading_blanks_action,
+                self.blank_remove_trailing_blanks_action,
+                None,
+                self.line_remove_empty_action,
+                self.line_remove_empty_ws_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Comment/Uncomment",
+            [
+                self.comment_toggle_action,
+                self.comment_single_action,
+                self.comment_single_un_action,
+                self.comment_block_action,
+                self.comment_block_un_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.edit_menu,
+            "Auto-Completion",
+            [
+                self.auto_completion_off_action,
+                self.auto_completion_all_action,
+                self.auto_completion_doc_action,
+                self.auto_completion_api_action,
+                self.auto_completion_open_docs_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.edit_menu,
+            "EOL Conversion",
+            [
+                self.eol_crlf_action,
+                self.eol_lf_action,
+                self.eol_cr_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.edit_menu,
+            "On Selection",
+            [
+                self.open_selection_file_action,
+                self.open_selection_folder_action,
+                None,
+                self.search_selection_web_action,
+            ],
+        )
         self.edit_menu.addSeparator()
         self.edit_menu.addAction(self.column_mode_action)
         self.edit_menu.addAction(self.multi_caret_action)
@@ -3613,54 +3784,84 @@ class UiSetupMixin:
         self.search_menu.addAction(self.select_in_between_braces_action)
         self.search_menu.addAction(self.mark_action)
         self.search_menu.addSeparator()
-        change_history_menu = self.search_menu.addMenu("Change History")
-        change_history_menu.addAction(self.change_history_next_action)
-        change_history_menu.addAction(self.change_history_prev_action)
-        change_history_menu.addAction(self.change_history_clear_action)
-        style_all_menu = self.search_menu.addMenu("Style All Occurrences of Token")
-        style_all_menu.addAction(self.style_all_1_action)
-        style_all_menu.addAction(self.style_all_2_action)
-        style_all_menu.addAction(self.style_all_3_action)
-        style_all_menu.addAction(self.style_all_4_action)
-        style_all_menu.addAction(self.style_all_5_action)
-        style_all_menu.addAction(self.style_all_find_action)
-        style_one_menu = self.search_menu.addMenu("Style One Token")
-        style_one_menu.addAction(self.style_one_1_action)
-        style_one_menu.addAction(self.style_one_2_action)
-        style_one_menu.addAction(self.style_one_3_action)
-        style_one_menu.addAction(self.style_one_4_action)
-        style_one_menu.addAction(self.style_one_5_action)
-        style_one_menu.addAction(self.style_one_find_action)
-        clear_style_menu = self.search_menu.addMenu("Clear Style")
-        clear_style_menu.addAction(self.clear_style_1_action)
-        clear_style_menu.addAction(self.clear_style_2_action)
-        clear_style_menu.addAction(self.clear_style_3_action)
-        clear_style_menu.addAction(self.clear_style_4_action)
-        clear_style_menu.addAction(self.clear_style_5_action)
-        clear_style_menu.addAction(self.clear_style_all_action)
+        self._add_lazy_menu(
+            self.search_menu,
+            "Change History",
+            [
+                self.change_history_next_action,
+                self.change_history_prev_action,
+                self.change_history_clear_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.search_menu,
+            "Style All Occurrences of Token",
+            [
+                self.style_all_1_action,
+                self.style_all_2_action,
+                self.style_all_3_action,
+                self.style_all_4_action,
+                self.style_all_5_action,
+                self.style_all_find_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.search_menu,
+            "Style One Token",
+            [
+                self.style_one_1_action,
+                self.style_one_2_action,
+                self.style_one_3_action,
+                self.style_one_4_action,
+                self.style_one_5_action,
+                self.style_one_find_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.search_menu,
+            "Clear Style",
+            [
+                self.clear_style_1_action,
+                self.clear_style_2_action,
+                self.clear_style_3_action,
+                self.clear_style_4_action,
+                self.clear_style_5_action,
+                self.clear_style_all_action,
+            ],
+        )
         self.search_menu.addAction(self.jump_up_action)
         self.search_menu.addAction(self.jump_down_action)
-        copy_styled_menu = self.search_menu.addMenu("Copy Styled Text")
-        copy_styled_menu.addAction(self.copy_styled_1_action)
-        copy_styled_menu.addAction(self.copy_styled_2_action)
-        copy_styled_menu.addAction(self.copy_styled_3_action)
-        copy_styled_menu.addAction(self.copy_styled_4_action)
-        copy_styled_menu.addAction(self.copy_styled_5_action)
-        copy_styled_menu.addAction(self.copy_styled_all_action)
+        self._add_lazy_menu(
+            self.search_menu,
+            "Copy Styled Text",
+            [
+                self.copy_styled_1_action,
+                self.copy_styled_2_action,
+                self.copy_styled_3_action,
+                self.copy_styled_4_action,
+                self.copy_styled_5_action,
+                self.copy_styled_all_action,
+            ],
+        )
         self.search_menu.addSeparator()
-        bookmark_menu = self.search_menu.addMenu("Bookmark")
-        bookmark_menu.addAction(self.toggle_bookmark_action)
-        bookmark_menu.addAction(self.next_bookmark_action)
-        bookmark_menu.addAction(self.prev_bookmark_action)
-        bookmark_menu.addAction(self.clear_bookmarks_action)
-        bookmark_menu.addAction(self.marks_bookmarks_panel_action)
-        bookmark_menu.addSeparator()
-        bookmark_menu.addAction(self.cut_bookmarked_lines_action)
-        bookmark_menu.addAction(self.copy_bookmarked_lines_action)
-        bookmark_menu.addAction(self.paste_replace_bookmarked_lines_action)
-        bookmark_menu.addAction(self.remove_bookmarked_lines_action)
-        bookmark_menu.addAction(self.remove_non_bookmarked_lines_action)
-        bookmark_menu.addAction(self.inverse_bookmarks_action)
+        self._add_lazy_menu(
+            self.search_menu,
+            "Bookmark",
+            [
+                self.toggle_bookmark_action,
+                self.next_bookmark_action,
+                self.prev_bookmark_action,
+                self.clear_bookmarks_action,
+                self.marks_bookmarks_panel_action,
+                None,
+                self.cut_bookmarked_lines_action,
+                self.copy_bookmarked_lines_action,
+                self.paste_replace_bookmarked_lines_action,
+                self.remove_bookmarked_lines_action,
+                self.remove_non_bookmarked_lines_action,
+                self.inverse_bookmarks_action,
+            ],
+        )
         self.search_menu.addSeparator()
         self.search_menu.addAction(self.find_chars_in_range_action)
 
@@ -3672,25 +3873,35 @@ class UiSetupMixin:
         self.format_menu.addAction(self.strikethrough_action)
         self.format_menu.addAction(self.text_size_selection_action)
         self.format_menu.addSeparator()
-        style_menu = self.format_menu.addMenu("Styles")
-        style_menu.addAction(self.style_heading1_action)
-        style_menu.addAction(self.style_heading2_action)
-        style_menu.addAction(self.style_heading3_action)
-        style_menu.addAction(self.style_heading4_action)
-        style_menu.addAction(self.style_heading5_action)
-        style_menu.addAction(self.style_heading6_action)
-        style_menu.addSeparator()
-        style_menu.addAction(self.style_body_action)
-        style_menu.addAction(self.style_quote_action)
-        style_menu.addAction(self.style_code_action)
+        self._add_lazy_menu(
+            self.format_menu,
+            "Styles",
+            [
+                self.style_heading1_action,
+                self.style_heading2_action,
+                self.style_heading3_action,
+                self.style_heading4_action,
+                self.style_heading5_action,
+                self.style_heading6_action,
+                None,
+                self.style_body_action,
+                self.style_quote_action,
+                self.style_code_action,
+            ],
+        )
         markdown_menu = self.format_menu.addMenu("Markdown")
-        markdown_headings_menu = markdown_menu.addMenu("Headings")
-        markdown_headings_menu.addAction(self.md_heading1_action)
-        markdown_headings_menu.addAction(self.md_heading2_action)
-        markdown_headings_menu.addAction(self.md_heading3_action)
-        markdown_headings_menu.addAction(self.md_heading4_action)
-        markdown_headings_menu.addAction(self.md_heading5_action)
-        markdown_headings_menu.addAction(self.md_heading6_action)
+        self._add_lazy_menu(
+            markdown_menu,
+            "Headings",
+            [
+                self.md_heading1_action,
+                self.md_heading2_action,
+                self.md_heading3_action,
+                self.md_heading4_action,
+                self.md_heading5_action,
+                self.md_heading6_action,
+            ],
+        )
         markdown_menu.addAction(self.md_bold_action)
         markdown_menu.addAction(self.md_italic_action)
         markdown_menu.addAction(self.md_strike_action)
@@ -3712,23 +3923,33 @@ class UiSetupMixin:
         markdown_menu.addAction(self.md_toolbar_visible_action)
         self.format_menu.addSeparator()
 
-        review_menu = self.format_menu.addMenu("Review")
-        review_menu.addAction(self.track_changes_toggle_action)
-        review_menu.addAction(self.insert_tracked_text_action)
-        review_menu.addAction(self.mark_tracked_deletion_action)
-        review_menu.addAction(self.next_change_action)
-        review_menu.addSeparator()
-        review_menu.addAction(self.accept_change_action)
-        review_menu.addAction(self.reject_change_action)
-        review_menu.addAction(self.accept_all_changes_action)
-        review_menu.addAction(self.reject_all_changes_action)
-        review_menu.addSeparator()
-        review_menu.addAction(self.add_comment_action)
-        review_menu.addAction(self.review_comments_action)
-        references_menu = self.format_menu.addMenu("References")
-        references_menu.addAction(self.insert_footnote_action)
-        references_menu.addAction(self.insert_endnote_action)
-        references_menu.addAction(self.insert_cross_reference_action)
+        self._add_lazy_menu(
+            self.format_menu,
+            "Review",
+            [
+                self.track_changes_toggle_action,
+                self.insert_tracked_text_action,
+                self.mark_tracked_deletion_action,
+                self.next_change_action,
+                None,
+                self.accept_change_action,
+                self.reject_change_action,
+                self.accept_all_changes_action,
+                self.reject_all_changes_action,
+                None,
+                self.add_comment_action,
+                self.review_comments_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.format_menu,
+            "References",
+            [
+                self.insert_footnote_action,
+                self.insert_endnote_action,
+                self.insert_cross_reference_action,
+            ],
+        )
         self.format_menu.addAction(self.insert_page_break_action)
         self.format_menu.addAction(self.generate_toc_action)
         self.format_menu.addSeparator()
@@ -3744,29 +3965,49 @@ class UiSetupMixin:
         self.view_menu.addAction(self.print_view_action)
         self.view_menu.addAction(self.page_layout_view_action)
         self.view_menu.addSeparator()
-        view_current_file_menu = self.view_menu.addMenu("View Current File in")
-        view_current_file_menu.addAction(self.view_file_explorer_action)
-        view_current_file_menu.addAction(self.view_file_default_action)
-        view_current_file_menu.addAction(self.view_file_cmd_action)
-        show_symbol_menu = self.view_menu.addMenu("Show Symbol")
-        show_symbol_menu.addAction(self.show_space_tab_action)
-        show_symbol_menu.addAction(self.show_end_of_line_action)
-        show_symbol_menu.addAction(self.show_non_printing_action)
-        show_symbol_menu.addAction(self.show_control_unicode_eol_action)
-        show_symbol_menu.addAction(self.show_all_chars_action)
-        show_symbol_menu.addSeparator()
-        show_symbol_menu.addAction(self.show_indent_guide_action)
-        show_symbol_menu.addAction(self.show_wrap_symbol_action)
-        zoom_menu = self.view_menu.addMenu("&Zoom")
-        zoom_menu.addAction(self.zoom_in_action)
-        zoom_menu.addAction(self.zoom_out_action)
-        zoom_menu.addSeparator()
-        zoom_menu.addAction(self.zoom_reset_action)
-        move_clone_menu = self.view_menu.addMenu("Move/Clone Current Document")
-        move_clone_menu.addAction(self.clone_view_action)
-        move_clone_menu.addAction(self.split_vertical_action)
-        move_clone_menu.addAction(self.split_horizontal_action)
-        move_clone_menu.addAction(self.split_close_action)
+        self._add_lazy_menu(
+            self.view_menu,
+            "View Current File in",
+            [
+                self.view_file_explorer_action,
+                self.view_file_default_action,
+                self.view_file_cmd_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.view_menu,
+            "Show Symbol",
+            [
+                self.show_space_tab_action,
+                self.show_end_of_line_action,
+                self.show_non_printing_action,
+                self.show_control_unicode_eol_action,
+                self.show_all_chars_action,
+                None,
+                self.show_indent_guide_action,
+                self.show_wrap_symbol_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.view_menu,
+            "&Zoom",
+            [
+                self.zoom_in_action,
+                self.zoom_out_action,
+                None,
+                self.zoom_reset_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.view_menu,
+            "Move/Clone Current Document",
+            [
+                self.clone_view_action,
+                self.split_vertical_action,
+                self.split_horizontal_action,
+                self.split_close_action,
+            ],
+        )
         self.view_menu.addAction(self.word_wrap_action)
         self.view_menu.addAction(self.show_line_numbers_action)
         self.view_menu.addAction(self.focus_other_view_action)
@@ -3786,17 +4027,22 @@ class UiSetupMixin:
         self.view_menu.addSeparator()
         self.view_menu.addAction(self.summary_action)
         self.view_menu.addSeparator()
-        project_panels_menu = self.view_menu.addMenu("Project Panels")
-        project_panels_menu.addAction(self.document_map_action)
-        project_panels_menu.addAction(self.document_list_action)
-        project_panels_menu.addAction(self.function_list_action)
-        project_panels_menu.addSeparator()
-        project_panels_menu.addAction(self.minimap_action)
-        project_panels_menu.addAction(self.symbol_outline_action)
-        project_panels_menu.addSeparator()
-        project_panels_menu.addAction(self.workspace_panel_action)
-        project_panels_menu.addAction(self.search_results_panel_action)
-        project_panels_menu.addAction(self.editor_panel_action)
+        self._add_lazy_menu(
+            self.view_menu,
+            "Project Panels",
+            [
+                self.document_map_action,
+                self.document_list_action,
+                self.function_list_action,
+                None,
+                self.minimap_action,
+                self.symbol_outline_action,
+                None,
+                self.workspace_panel_action,
+                self.search_results_panel_action,
+                self.editor_panel_action,
+            ],
+        )
         self.view_menu.addAction(self.define_language_action)
         self.view_menu.addAction(self.open_workspace_action)
         self.view_menu.addSeparator()
@@ -3812,18 +4058,28 @@ class UiSetupMixin:
         self.view_menu.addAction(self.status_bar_action)
         self.view_menu.addAction(self.status_panel_action)
         self.view_menu.addSeparator()
-        snap_menu = self.view_menu.addMenu("Snap Dock")
-        snap_menu.addAction(self.snap_dock_left_action)
-        snap_menu.addAction(self.snap_dock_right_action)
-        snap_menu.addAction(self.snap_dock_bottom_action)
-        layout_menu = self.view_menu.addMenu("Layouts")
-        layout_menu.addAction(self.layout_save_action)
-        layout_menu.addAction(self.layout_save_as_action)
-        layout_menu.addAction(self.layout_load_action)
-        layout_menu.addSeparator()
-        layout_menu.addAction(self.layout_reset_action)
-        layout_menu.addSeparator()
-        layout_menu.addAction(self.lock_layout_action)
+        self._add_lazy_menu(
+            self.view_menu,
+            "Snap Dock",
+            [
+                self.snap_dock_left_action,
+                self.snap_dock_right_action,
+                self.snap_dock_bottom_action,
+            ],
+        )
+        self._add_lazy_menu(
+            self.view_menu,
+            "Layouts",
+            [
+                self.layout_save_action,
+                self.layout_save_as_action,
+                self.layout_load_action,
+                None,
+                self.layout_reset_action,
+                None,
+                self.lock_layout_action,
+            ],
+        )
         self.view_menu.addAction(self.focus_mode_action)
         self.view_menu.addAction(self.column_mode_action)
         self.view_menu.addAction(self.multi_caret_action)
@@ -3837,13 +4093,23 @@ class UiSetupMixin:
         self.settings_menu.addAction(self.shortcut_mapper_action)
         self.settings_menu.addAction(self.command_palette_action)
         self.settings_menu.addAction(self.simple_mode_action)
-        self.ui_presets_menu = self.settings_menu.addMenu("UI Presets")
-        self.ui_presets_menu.addAction(self.preset_reading_action)
-        self.ui_presets_menu.addAction(self.preset_coding_action)
-        self.ui_presets_menu.addAction(self.preset_focus_action)
-        self.accessibility_menu = self.settings_menu.addMenu("Accessibility")
-        self.accessibility_menu.addAction(self.accessibility_high_contrast_action)
-        self.accessibility_menu.addAction(self.accessibility_dyslexic_action)
+        self.ui_presets_menu = self._add_lazy_menu(
+            self.settings_menu,
+            "UI Presets",
+            [
+                self.preset_reading_action,
+                self.preset_coding_action,
+                self.preset_focus_action,
+            ],
+        )
+        self.accessibility_menu = self._add_lazy_menu(
+            self.settings_menu,
+            "Accessibility",
+            [
+                self.accessibility_high_contrast_action,
+                self.accessibility_dyslexic_action,
+            ],
+        )
 
         self.tools_menu = menu_bar.addMenu("&Tools")
         self.tools_menu.addAction(self.goto_definition_action)
@@ -3892,17 +4158,22 @@ class UiSetupMixin:
 
         # Window
         self.window_menu = menu_bar.addMenu("&Window")
-        sort_by_menu = self.window_menu.addMenu("Sort By")
-        sort_by_menu.addAction(self.window_sort_name_asc_action)
-        sort_by_menu.addAction(self.window_sort_name_desc_action)
-        sort_by_menu.addAction(self.window_sort_path_asc_action)
-        sort_by_menu.addAction(self.window_sort_path_desc_action)
-        sort_by_menu.addAction(self.window_sort_type_asc_action)
-        sort_by_menu.addAction(self.window_sort_type_desc_action)
-        sort_by_menu.addAction(self.window_sort_len_asc_action)
-        sort_by_menu.addAction(self.window_sort_len_desc_action)
-        sort_by_menu.addAction(self.window_sort_modified_asc_action)
-        sort_by_menu.addAction(self.window_sort_modified_desc_action)
+        self._add_lazy_menu(
+            self.window_menu,
+            "Sort By",
+            [
+                self.window_sort_name_asc_action,
+                self.window_sort_name_desc_action,
+                self.window_sort_path_asc_action,
+                self.window_sort_path_desc_action,
+                self.window_sort_type_asc_action,
+                self.window_sort_type_desc_action,
+                self.window_sort_len_asc_action,
+                self.window_sort_len_desc_action,
+                self.window_sort_modified_asc_action,
+                self.window_sort_modified_desc_action,
+            ],
+        )
         self.window_menu.addAction(self.windows_manager_action)
         self.window_tabs_separator = self.window_menu.addSeparator()
         self._refresh_window_menu_entries()
@@ -3922,19 +4193,18 @@ class UiSetupMixin:
 
         if hasattr(self, "log_event"):
             try:
-                for action in menu_bar.actions():
-                    menu = action.menu()
+                for _action, menu in self._menu_entries(menu_bar):
                     if menu is None:
                         continue
                     title = menu.title().replace("&", "").strip() or "Menu"
-                    count = len([a for a in menu.actions() if not a.isSeparator()])
+                    entries = self._menu_entries(menu)
+                    count = len([a for a, _sub in entries if not a.isSeparator()])
                     self.log_event("Info", f"[Startup] Menu ready: {title} ({count} actions)")
-                    for sub_action in menu.actions():
-                        sub_menu = sub_action.menu()
+                    for _sub_action, sub_menu in entries:
                         if sub_menu is None:
                             continue
                         sub_title = sub_menu.title().replace("&", "").strip() or "Submenu"
-                        sub_count = len([a for a in sub_menu.actions() if not a.isSeparator()])
+                        sub_count = len([a for a, _sub in self._menu_entries(sub_menu) if not a.isSeparator()])
                         self.log_event("Info", f"[Startup] Submenu ready: {title} > {sub_title} ({sub_count} actions)")
             except Exception:
                 pass
@@ -4112,6 +4382,9 @@ class UiSetupMixin:
         self.search_case_checkbox.toggled.connect(self._on_search_text_changed)
         self.search_toolbar.addWidget(self.search_case_checkbox)
 
+        self.search_match_label = QLabel("", self.search_toolbar)
+        self.search_toolbar.addWidget(self.search_match_label)
+
         self.search_prev_btn = QPushButton("Previous", self.search_toolbar)
         self.search_prev_btn.clicked.connect(self.edit_find_previous)
         self.search_toolbar.addWidget(self.search_prev_btn)
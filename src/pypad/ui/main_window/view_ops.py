@@ -5,6 +5,7 @@ import hashlib
 import json
 import os
 import random
+import re
 import subprocess
 import sys
 import time
@@ -60,23 +61,17 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtPrintSupport import QPrintDialog, QPrintPreviewDialog, QPrinter
 
 from pypad.ui.debug.debug_logs_dialog import DebugLogsDialog
 from pypad.ui.editor.detachable_tab_bar import DetachableTabBar
 from pypad.ui.editor.editor_tab import EditorTab
 from pypad.app_settings.scintilla_profile import ScintillaProfile
 from pypad.ui.editor.editor_widget import EditorWidget
-from pypad.ui.ai.ai_controller import AIController
 from pypad.ui.theme.asset_paths import resolve_asset_path
 from pypad.ui.system.autosave import AutoSaveRecoveryDialog, AutoSaveStore
 from pypad.ui.system.reminders import ReminderStore, RemindersDialog
-from pypad.ui.security.security_controller import SecurityController
 from pypad.ui.editor.syntax_highlighter import CodeSyntaxHighlighter
-from pypad.ui.system.updater_controller import UpdaterController
 from pypad.ui.system.version_history import VersionHistoryDialog
-from pypad.ui.workspace.workspace_controller import WorkspaceController
 from pypad.ui.theme.theme_tokens import build_dialog_theme_qss_from_tokens, build_tokens_from_settings, build_tool_dialog_qss
 from pypad.ui.document.document_authoring import (
     PageLayoutConfig,
@@ -772,7 +767,8 @@ class ViewOpsMixin:
         max_words = 4000
         for idx in range(self.tab_widget.count()):
             tab = self._tab_at_index(idx)
-            if tab is None:
+            if tab is None or tab.session_load_pending:
+                # Restored tabs that were never shown hold no text yet; do not read them here.
                 continue
             text = tab.text_edit.get_text()
             if not text:
@@ -1521,7 +1517,7 @@ class ViewOpsMixin:
         self.md_toggle_preview_action.setChecked(enabled)
         self.markdown_preview.setVisible(enabled)
         if enabled:
-            self.update_markdown_preview()
+            self.update_markdown_preview(immediate=True)
         else:
             self.markdown_preview.clear()
         tab = self.active_tab()
@@ -1535,11 +1531,14 @@ class ViewOpsMixin:
         else:
             self.show_status_message("Markdown preview disabled", 2000)
 
-    def update_markdown_preview(self) -> None:
+    def update_markdown_preview(self, *, immediate: bool = False) -> None:
         if not self.markdown_mode_enabled:
             return
-        source_markdown = self.text_edit.get_text()
-        self.markdown_preview.setMarkdown(source_markdown)
+        tab = self.active_tab()
+        if tab is None:
+            return
+        # Throttled and incremental; a no-op when the preview already matches the text.
+        self._markdown_renderer_for_tab(tab).request(immediate=immediate)
 
     def toggle_status_bar(self, checked: bool) -> None:
         self.status.setVisible(checked)
@@ -1597,6 +1596,8 @@ class ViewOpsMixin:
         col_label = self._translate_text("Col", lang_code)
         self.position_label.setText(f"{ln_label} {line}, {col_label} {column}")
         self.update_markdown_preview()
+        if hasattr(self, "_update_search_match_label"):
+            self._update_search_match_label()
         if hasattr(self, "ruler_label"):
             show_ruler = bool(getattr(self, "_page_layout_view_enabled", False) and self.settings.get("page_layout_show_ruler", True))
             self.ruler_label.setVisible(show_ruler)
@@ -1634,8 +1635,9 @@ class ViewOpsMixin:
             self.full_screen_action.blockSignals(True)
             self.full_screen_action.setChecked(bool(self.isFullScreen()))
             self.full_screen_action.blockSignals(False)
-        if hasattr(self, "advanced_features"):
-            self.advanced_features.refresh_views()
+        advanced_features = self.loaded_service("advanced_features")
+        if advanced_features is not None:
+            advanced_features.refresh_views()
         self.update_action_states()
 
 
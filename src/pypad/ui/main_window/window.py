@@ -8,6 +8,7 @@ import sys
 import time
 import traceback
 import webbrowser
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import quote_plus
@@ -61,26 +62,22 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtPrintSupport import QPrintDialog, QPrintPreviewDialog, QPrinter
 
 from pypad.ui.debug.debug_logs_dialog import DebugLogsDialog
 from pypad.ui.editor.detachable_tab_bar import DetachableTabBar
 from pypad.ui.editor.editor_tab import EditorTab
-from pypad.ui.ai.ai_controller import AIController
-from pypad.ui.ai.ai_chat_dock import AIChatDock
 from pypad.ui.theme.asset_paths import resolve_asset_path
 from pypad.ui.system.autosave import AutoSaveRecoveryDialog, AutoSaveStore
 from pypad.ui.system.session_recovery import RecoveryStateStore
 from pypad.ui.system.reminders import ReminderStore, RemindersDialog
-from pypad.ui.security.security_controller import SecurityController
 from pypad.ui.editor.syntax_highlighter import CodeSyntaxHighlighter
-from pypad.ui.system.updater_controller import UpdaterController
-from pypad.ui.system.version_history import VersionHistoryDialog
-from pypad.ui.workspace.workspace_controller import WorkspaceController
-from pypad.ui.features.advanced_features import AdvancedFeaturesController
 from pypad.i18n.translator import AppTranslator
+from pypad.ui.features.extensibility_ops import ActionRegistry
+from pypad.logging_utils import DEBUG_LOG_LIMIT
+from pypad.services.open_targets import OpenTarget, collect_open_targets
+from pypad.services.startup_profile import StartupHistory, active_startup_recorder, find_regressions
 
+from .lazy_services import LazyService, lazy_service_names, loaded_service
 from .ui_setup import UiSetupMixin
 from .file_ops import FileOpsMixin
 from .edit_ops import EditOpsMixin
@@ -95,18 +92,26 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
         "Checklist": "## Checklist\n\n- [ ] Item 1\n- [ ] Item 2\n- [ ] Item 3\n",
     }
 
+    # Heavy subsystems are built on first use, or when idle after the first paint.
+    workspace_controller = LazyService("_create_workspace_controller")
+    security_controller = LazyService("_create_security_controller")
+    updater_controller = LazyService("_create_updater_controller")
+    ai_controller = LazyService("_create_ai_controller")
+    ai_chat_dock = LazyService("_create_ai_chat_dock")
+    advanced_features = LazyService("_create_advanced_features")
+    # Only the first window of a launch is profiled.
+    _startup_profile_saved = False
+
     def __init__(self) -> None:
         super().__init__()
-        startup_t0 = time.perf_counter()
-        startup_stages: list[tuple[str, int]] = []
-
-        def _mark_startup_stage(name: str) -> None:
-            elapsed_ms = int((time.perf_counter() - startup_t0) * 1000)
-            startup_stages.append((name, elapsed_ms))
-            try:
-                self.log_event("Info", f"[Startup] {name} at {elapsed_ms}ms")
-            except Exception:
-                pass
+        recorder = active_startup_recorder()
+        if recorder is not None and not Notepad._startup_profile_saved:
+            recorder.mark("window_init")
+        self._startup_t0 = time.perf_counter()
+        self._startup_stages: list[tuple[str, int]] = []
+        self._first_paint_seen = False
+        self._idle_service_failures: set[str] = set()
+        self._session_background_load_scheduled = False
 
         app = QApplication.instance()
         if Notepad.system_style_name is None and app is not None:
@@ -144,7 +149,7 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
             "estimated_cost": 0.0,
         }
         self.detached_windows: list["Notepad"] = []
-        self.debug_logs: list[str] = []
+        self.debug_logs: deque[str] = deque(maxlen=DEBUG_LOG_LIMIT)
         self.debug_logs_dialog: DebugLogsDialog | None = None
         self._icon_color: QColor | None = None
 
@@ -193,23 +198,11 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
         self.log_event("Info", f"[Startup] Settings loaded from: {self.settings_file}")
         self._page_layout_view_enabled = bool(self.settings.get("page_layout_view_enabled", False))
         self.line_numbers_enabled = bool(self.settings.get("npp_margin_line_numbers_enabled", True))
-        _mark_startup_stage("settings_loaded")
-        self.translator = AppTranslator(self._get_translation_cache_path())
+        self._mark_startup_stage("settings_loaded")
+        self.translator = AppTranslator(
+            self._get_translation_cache_path(), catalog_dir=resolve_asset_path("i18n")
+        )
         self.log_event("Info", "[Startup] Translator initialized")
-        self.workspace_controller = WorkspaceController(self)
-        self.log_event("Info", "[Startup] Workspace controller initialized")
-        self.security_controller = SecurityController(self)
-        self.log_event("Info", "[Startup] Security controller initialized")
-        self.ai_controller = AIController(self)
-        self.log_event("Info", "[Startup] AI controller initialized")
-        self.ai_chat_dock = AIChatDock(self, self.ai_controller)
-        self.ai_chat_dock.setObjectName("aiChatDock")
-        self.ai_chat_dock.setMinimumWidth(320)
-        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.ai_chat_dock)
-        self.ai_chat_dock.visibilityChanged.connect(self.update_action_states)
-        self.ai_chat_dock.hide()
-        self.updater_controller = UpdaterController(self)
-        self.log_event("Info", "[Startup] Updater controller initialized")
         self.reminders_store = ReminderStore(self._get_reminders_file_path())
         self.reminders_store.load()
         self.log_event("Info", "[Startup] Reminders loaded")
@@ -223,7 +216,7 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
         self.reminder_timer.timeout.connect(self._check_reminders)
         self.file_watcher = QFileSystemWatcher(self)
         self.file_watcher.fileChanged.connect(self._on_file_changed)
-        _mark_startup_stage("controllers_initialized")
+        self._mark_startup_stage("controllers_initialized")
 
         # Status bar
         self.status = QStatusBar(self)
@@ -263,9 +256,6 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
         self.autosave_status_label.setMargin(3)
         self.status.addPermanentWidget(self.autosave_status_label)
         self.log_event("Info", "[Startup] Status bar widgets attached")
-        self.advanced_features = AdvancedFeaturesController(self)
-        _mark_startup_stage("advanced_features_ready")
-        self.log_event("Info", "[Startup] Advanced features ready")
         self.setDockOptions(
             QMainWindow.DockOption.AnimatedDocks
             | QMainWindow.DockOption.AllowTabbedDocks
@@ -280,6 +270,8 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
         self.update_status_bar()
         self.log_event("Info", "[Startup] Initial tab created")
 
+        self.action_registry = ActionRegistry()
+        self._lazy_menu_actions: dict[int, list[QAction | None]] = {}
         self.create_actions()
         self.log_event("Info", "[Startup] Actions created")
         self._connect_action_debug_tracing()
@@ -289,10 +281,12 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
         self.configure_menu_tooltips()
         self.create_toolbars()
         self.log_event("Info", "[Startup] Toolbars created")
+        self._register_window_actions()
+        self._capture_default_shortcuts()
         if bool(self.settings.get("simple_mode", False)):
             self.toggle_simple_mode(True)
         self._offer_crash_recovery()
-        _mark_startup_stage("ui_ready")
+        self._mark_startup_stage("ui_ready")
         self.log_event("Info", "[Startup] UI ready")
 
         # Finish startup before showing the window.
@@ -319,9 +313,9 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
             self.log_event("Info", "[Startup] Session restore completed")
             self.update_action_states()
             self.log_event("Info", "Pypad initialized")
-            _mark_startup_stage("session_restored")
-            startup_total_ms = int((time.perf_counter() - startup_t0) * 1000)
-            stage_summary = ", ".join(f"{name}={ms}ms" for name, ms in startup_stages)
+            self._mark_startup_stage("session_restored")
+            startup_total_ms = int((time.perf_counter() - self._startup_t0) * 1000)
+            stage_summary = ", ".join(f"{name}={ms}ms" for name, ms in self._startup_stages)
             print(f"[startup] pypad_init_total={startup_total_ms}ms | {stage_summary}")
             self.log_event("Info", f"Startup timing: total={startup_total_ms}ms; {stage_summary}")
             if self.settings.get("auto_check_updates", True):
@@ -332,6 +326,132 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
 
         # Lock screen enforcement is triggered from main() after the window is shown.
 
+    def _mark_startup_stage(self, name: str) -> None:
+        elapsed_ms = int((time.perf_counter() - self._startup_t0) * 1000)
+        self._startup_stages.append((name, elapsed_ms))
+        try:
+            self.log_event("Info", f"[Startup] {name} at {elapsed_ms}ms")
+        except Exception:
+            pass
+
+    def loaded_service(self, name: str):
+        """The subsystem ``name`` if it exists already; never builds a lazy service."""
+        return loaded_service(self, name)
+
+    def _create_workspace_controller(self):
+        from pypad.ui.workspace.workspace_controller import WorkspaceController
+
+        return WorkspaceController(self)
+
+    def _create_security_controller(self):
+        from pypad.ui.security.security_controller import SecurityController
+
+        return SecurityController(self)
+
+    def _create_updater_controller(self):
+        from pypad.ui.system.updater_controller import UpdaterController
+
+        return UpdaterController(self)
+
+    def _create_ai_controller(self):
+        from pypad.ui.ai.ai_controller import AIController
+
+        return AIController(self)
+
+    def _create_ai_chat_dock(self):
+        from pypad.ui.ai.ai_chat_dock import AIChatDock
+
+        dock = AIChatDock(self, self.ai_controller)
+        dock.setObjectName("aiChatDock")
+        dock.setMinimumWidth(320)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, dock)
+        dock.hide()
+        dock.visibilityChanged.connect(self.update_action_states)
+        self._register_late_dock(dock)
+        return dock
+
+    def _create_advanced_features(self):
+        from pypad.ui.features.advanced_features import AdvancedFeaturesController
+
+        controller = AdvancedFeaturesController(self)
+        controller.toggle_keyboard_only(bool(self.settings.get("keyboard_only_mode", False)))
+        self._register_late_dock(controller.minimap_dock)
+        self._register_late_dock(controller.outline_dock)
+        QTimer.singleShot(0, self, controller.refresh_views)
+        return controller
+
+    def paintEvent(self, event) -> None:  # type: ignore[override]
+        super().paintEvent(event)
+        if self._first_paint_seen:
+            return
+        self._first_paint_seen = True
+        self._mark_startup_stage("first_paint")
+        QTimer.singleShot(0, self, self._materialize_next_service)
+
+    def _materialize_next_service(self) -> None:
+        """Build one pending lazy subsystem per event-loop turn, so input stays responsive."""
+        for name in lazy_service_names(type(self)):
+            if name in self.__dict__ or name in self._idle_service_failures:
+                continue
+            try:
+                getattr(self, name)
+            except Exception as exc:  # noqa: BLE001
+                # Left unbuilt; first use retries and raises where it can be reported.
+                self._idle_service_failures.add(name)
+                self.log_event("Error", f"[Startup] Failed to create {name}: {exc!r}")
+            QTimer.singleShot(0, self, self._materialize_next_service)
+            return
+        self._mark_startup_stage("services_ready")
+        stage_summary = ", ".join(f"{name}={ms}ms" for name, ms in self._startup_stages)
+        self.log_event("Info", f"Startup timing (after first paint): {stage_summary}")
+        self._finish_startup_profile()
+
+    def _finish_startup_profile(self) -> None:
+        """Save this launch's startup profile once services and startup plugins are loaded."""
+        recorder = active_startup_recorder()
+        if recorder is None or Notepad._startup_profile_saved:
+            return
+        if "services_ready" not in {name for name, _ms in self._startup_stages}:
+            return
+        features = self.loaded_service("advanced_features")
+        host = getattr(features, "plugin_host", None)
+        if host is None or not host.startup_load_finished:
+            return
+        Notepad._startup_profile_saved = True
+        session_files = [p for p in self.settings.get("last_session_files", []) if isinstance(p, str) and p]
+        open_paths: list[str] = []
+        for index in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, EditorTab) and widget.current_file:
+                open_paths.append(widget.current_file)
+        session_bytes = 0
+        for path in open_paths:
+            try:
+                session_bytes += os.path.getsize(path)
+            except OSError:
+                pass
+        try:
+            settings_bytes = self.settings_file.stat().st_size
+        except OSError:
+            settings_bytes = 0
+        counts = {
+            "settings_keys": len(self.settings),
+            "settings_bytes": settings_bytes,
+            "session_files": len(session_files),
+            "open_tabs": self.tab_widget.count(),
+            "session_bytes": session_bytes,
+            "plugins": len(host.records),
+        }
+        plugin_times = {rec.plugin_id: rec.load_ms for rec in host.records if rec.load_ms > 0}
+        profile = recorder.build_profile(stages=self._startup_stages, counts=counts, plugins=plugin_times)
+        try:
+            runs = StartupHistory(self._get_startup_history_path()).append(profile)
+        except OSError as exc:
+            self.log_event("Error", f"[Startup] Could not save startup profile: {exc!r}")
+            return
+        for stage, ms, median in find_regressions(profile, runs[:-1]):
+            self.log_event("Info", f"[Startup] {stage} took {ms:.0f}ms (median {median:.0f}ms); see run.py --startup-report")
+
     def focusInEvent(self, event: QEvent) -> None:  # type: ignore[override]
         super().focusInEvent(event)
         if hasattr(self, "_emit_plugin_event"):
@@ -342,41 +462,23 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
         if hasattr(self, "_emit_plugin_event"):
             self._emit_plugin_event("window_blur", tab=self.active_tab())
 
-    def _collect_startup_items(self) -> tuple[list[str], list[str]]:
+    def _collect_startup_items(self) -> tuple[list[OpenTarget], list[str]]:
         app = QApplication.instance()
         if app is None:
             return [], []
-        args = list(app.arguments())[1:]
-        if not args:
-            return [], []
-        seen: set[str] = set()
-        files: list[str] = []
-        folders: list[str] = []
-        for arg in args:
-            if not arg:
-                continue
-            if arg.startswith("-") and not Path(arg).exists():
-                continue
-            candidate = Path(arg)
-            if not candidate.is_absolute():
-                candidate = Path.cwd() / candidate
-            try:
-                resolved = candidate.resolve()
-            except Exception:
-                resolved = candidate
-            if not resolved.exists():
-                continue
-            path_str = str(resolved)
-            if path_str in seen:
-                continue
-            seen.add(path_str)
-            if resolved.is_dir():
-                folders.append(path_str)
-            elif resolved.is_file():
-                files.append(path_str)
-        return files, folders
-
-    def _open_startup_items(self, files: list[str], folders: list[str]) -> None:
+        return collect_open_targets(list(app.arguments())[1:])
+
+    def _open_startup_items(self, files: list[OpenTarget], folders: list[str]) -> None:
+        opened = self._open_targets(files, folders)
+        if opened:
+            self.log_event("Info", f"Opened on startup: {', '.join(opened)}")
+
+    def _open_targets(self, files: list[OpenTarget], folders: list[str]) -> list[str]:
+        """Open files (placing the cursor at their line/column) and the first folder as workspace.
+
+        Files that are already open are focused instead of opened twice. The first target
+        becomes the current tab. Returns the paths that were opened or focused.
+        """
         if folders:
             workspace_root = folders[0]
             self.settings["workspace_root"] = workspace_root
@@ -386,18 +488,42 @@ class Notepad(UiSetupMixin, FileOpsMixin, EditOpsMixin, ViewOpsMixin, MiscMixin,
             self.show_workspace_files()
 
         opened: list[str] = []
-        first_opened: str | None = None
-        for path in files:
-            if self._open_file_path(path):
-                opened.append(path)
-                if first_opened is None:
-                    first_opened = path
-        if first_opened:
-            for index in range(self.tab_widget.count()):
-                tab = self.tab_widget.widget(index)
-                if isinstance(tab, EditorTab) and tab.current_file == first_opened:
-                    self.tab_widget.setCurrentIndex(index)
-                    break
+        first_tab: EditorTab | None = None
+        for target in files:
+            tab = self._tab_for_path(target.path)
+            if tab is None and self._open_file_path(target.path):
+                tab = self._tab_for_path(target.path)
+            if tab is None:
+                continue
+            opened.append(target.path)
+            if target.line > 0:
+                tab.text_edit.apply_view_state({"cursor": [target.line - 1, max(0, target.column - 1)]})
+                tab.session_view_state = None
+            if first_tab is None:
+                first_tab = tab
+        if first_tab is not None and self.tab_widget.indexOf(first_tab) >= 0:
+            self.tab_widget.setCurrentWidget(first_tab)
+        return opened
+
+    def _tab_for_path(self, path: str) -> EditorTab | None:
+        """The loaded tab showing ``path``; a restored session placeholder is loaded first."""
+        for index in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(index)
+            if isinstance(tab, EditorTab) and tab.current_file == path:
+                if tab.session_load_pending:
+                    return self._materialize_session_tab(tab)
+                return tab
+        return None
+
+    def open_forwarded_items(self, files: list[OpenTarget], folders: list[str]) -> None:
+        """Open what a later launch handed over, then bring this window to the front."""
+        if self.isMinimized():
+            self.showNormal()
+        elif not self.isVisible():
+            self.show()
+        opened = self._open_targets(files, folders)
         if opened:
-            self.log_event("Info", f"Opened on startup: {', '.join(opened)}")
+            self.log_event("Info", f"Opened from another launch: {', '.join(opened)}")
+        self.raise_()
+        self.activateWindow()
 
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import getpass
+import hashlib
+import json
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from pypad.app_settings import get_settings_file_path
+from pypad.logging_utils import get_logger
+from pypad.services.open_targets import OpenTarget, resolve_path
+
+_LOGGER = get_logger(__name__)
+
+PROTOCOL_VERSION = 1
+CONNECT_TIMEOUT_MS = 250
+REPLY_TIMEOUT_MS = 3000
+# A request is one JSON line; anything bigger is not from us.
+MAX_REQUEST_BYTES = 1 << 20
+_REPLY_OK = b"ok"
+
+
+def instance_server_name() -> str:
+    """Local socket name shared by launches of the same user and settings profile."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = ""
+    key = f"{user}\n{get_settings_file_path().parent}".encode("utf-8", errors="replace")
+    return "pypad-" + hashlib.sha1(key).hexdigest()[:16]
+
+
+def encode_request(files: list[OpenTarget], folders: list[str], cwd: str) -> bytes:
+    payload = {
+        "version": PROTOCOL_VERSION,
+        "cwd": cwd,
+        "files": [target.to_payload() for target in files],
+        "folders": list(folders),
+    }
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def decode_request(data: bytes) -> tuple[list[OpenTarget], list[str]] | None:
+    """Targets and folders from one request line; None if it is not a valid request."""
+    try:
+        payload = json.loads(data.decode("utf-8"))
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != PROTOCOL_VERSION:
+        return None
+    cwd = str(payload.get("cwd", "") or "")
+    raw_files = payload.get("files", [])
+    raw_folders = payload.get("folders", [])
+    if not isinstance(raw_files, list) or not isinstance(raw_folders, list):
+        return None
+    files = [target for target in (OpenTarget.from_payload(item, cwd) for item in raw_files) if target is not None]
+    folders = [resolve_path(item, cwd) for item in raw_folders if isinstance(item, str) and item]
+    return files, folders
+
+
+def forward_to_running_instance(
+    files: list[OpenTarget],
+    folders: list[str],
+    cwd: str,
+    *,
+    server_name: str | None = None,
+    connect_timeout_ms: int = CONNECT_TIMEOUT_MS,
+    reply_timeout_ms: int = REPLY_TIMEOUT_MS,
+) -> bool:
+    """Hand the targets to a running instance; False when none answered.
+
+    Uses blocking socket calls, so it works before a ``QApplication`` exists.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(server_name or instance_server_name())
+    if not socket.waitForConnected(connect_timeout_ms):
+        return False
+    try:
+        socket.write(encode_request(files, folders, cwd))
+        if not socket.waitForBytesWritten(reply_timeout_ms):
+            return False
+        while not socket.canReadLine():
+            if not socket.waitForReadyRead(reply_timeout_ms):
+                return False
+        return bytes(socket.readLine().data()).strip() == _REPLY_OK
+    finally:
+        socket.abort()
+
+
+class SingleInstanceServer(QObject):
+    """Accepts handoff requests from later launches on the UI thread."""
+
+    open_requested = Signal(object, object)  # list[OpenTarget], list[str] folders
+
+    def __init__(self, parent: QObject | None = None, server_name: str | None = None) -> None:
+        super().__init__(parent)
+        self.server_name = server_name or instance_server_name()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._clients: dict[QLocalSocket, bytearray] = {}
+
+    def listen(self) -> bool:
+        if self._server.listen(self.server_name):
+            return True
+        # A crashed instance can leave its socket file behind; reclaim it unless someone answers.
+        probe = QLocalSocket()
+        probe.connectToServer(self.server_name)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.abort()
+            _LOGGER.info("Another instance owns %s; running without handoff", self.server_name)
+            return False
+        QLocalServer.removeServer(self.server_name)
+        if self._server.listen(self.server_name):
+            return True
+        _LOGGER.warning("Single-instance server failed to listen: %s", self._server.errorString())
+        return False
+
+    def is_listening(self) -> bool:
+        return self._server.isListening()
+
+    def close(self) -> None:
+        self._server.close()
+        for socket in list(self._clients):
+            self._release(socket)
+
+    def _release(self, socket: QLocalSocket) -> None:
+        if self._clients.pop(socket, None) is None:
+            return
+        socket.blockSignals(True)
+        socket.abort()
+        # Detach first: a pending deleteLater on a child the server also owns is deleted twice
+        # when the server goes away before the event loop runs.
+        socket.setParent(None)
+        socket.deleteLater()
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            if socket is None:
+                break
+            self._clients[socket] = bytearray()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._release(s))
+            # Drop clients that connect and never finish a request.
+            QTimer.singleShot(REPLY_TIMEOUT_MS, socket, lambda s=socket: self._release(s))
+
+    def _on_ready_read(self, socket: QLocalSocket) -> None:
+        buffer = self._clients.get(socket)
+        if buffer is None:
+            return
+        buffer.extend(bytes(socket.readAll().data()))
+        if b"\n" not in buffer:
+            if len(buffer) > MAX_REQUEST_BYTES:
+                self._release(socket)
+            return
+        request = decode_request(bytes(buffer.split(b"\n", 1)[0]))
+        if request is None:
+            _LOGGER.warning("Ignored malformed single-instance request")
+            self._release(socket)
+            return
+        socket.write(_REPLY_OK + b"\n")
+        socket.flush()
+        socket.disconnectFromServer()
+        files, folders = request
+        self.open_requested.emit(files, folders)
@@ -497,6 +497,9 @@ def build_ai_chat_qss(tokens: UIThemeTokens) -> tuple[str, str]:
         QLabel#aiChatSessionTitle {{
             color: {tokens.text}; background: transparent; border: none; padding: 0px 4px; font-weight: 600;
         }}
+        QLabel#aiChatCachedBadge {{
+            color: {tokens.text_muted}; background: transparent; border: none; padding: 0px; font-size: 11px;
+        }}
         QPushButton {{
             background: {tokens.button_bg};
             color: {tokens.text};
@@ -71,6 +71,10 @@ class WorkspaceController:
         self.window.settings["workspace_root"] = root
         self.window.show_status_message(f"Workspace: {root}", 3000)
         self._start_background_scan(force=True)
+        features = self.window.loaded_service("advanced_features")
+        if features is not None:
+            # Start the definition index for the new root as soon as its file scan lands.
+            features.schedule_definition_index_refresh()
         if hasattr(self.window, "_refresh_workspace_dock"):
             self.window._refresh_workspace_dock()
         self.show_workspace_files()
@@ -101,6 +105,18 @@ class WorkspaceController:
             follow_symlinks=bool(self.window.settings.get("workspace_follow_symlinks", False)),
         )
 
+    def indexed_workspace_files(self) -> list[str] | None:
+        """The background scan's file list, or None (starting the scan) while it is not ready."""
+        root = self.workspace_root()
+        if not root:
+            return None
+        key = self._build_index_key(root)
+        with self._index_lock:
+            if self._index_ready and self._index_key == key:
+                return list(self._index_files)
+        self._start_background_scan()
+        return None
+
     def _allowed_suffixes(self) -> set[str]:
         return {".txt", ".md", ".markdown", ".mdown", ".py", ".json", ".js", ".ts", ".encnote"}
 
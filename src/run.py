@@ -7,21 +7,25 @@ import threading
 import traceback
 from pathlib import Path
 from time import perf_counter
-from PySide6.QtWidgets import QApplication, QSplashScreen
-from PySide6.QtGui import QPixmap, QPainter, QFontDatabase, QFont
-from PySide6.QtCore import QObject, QEvent, Qt, QTimer, qInstallMessageHandler, QtMsgType
-
-_MAIN_WINDOW = None
 
 # --- Add ROOT for imports ---
 ROOT = Path(__file__).resolve().parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from pypad.app import main
-from pypad.app_settings import get_crash_logs_file_path
-from pypad.logging_utils import configure_app_logging, get_logger
-from pypad.ui.theme.asset_paths import resolve_asset_path
+# Start the startup profile before the heavy imports so their cost is recorded.
+from pypad.services.startup_profile import StartupHistory, begin_startup_recording, build_startup_report
+
+STARTUP_RECORDER = begin_startup_recording()
+
+from PySide6.QtCore import QObject, QEvent, Qt, QTimer, qInstallMessageHandler, QtMsgType
+
+_MAIN_WINDOW = None
+
+from pypad.app_settings import get_crash_logs_file_path, get_startup_history_path
+from pypad.logging_utils import configure_app_logging, flush_app_logging, get_logger, shutdown_app_logging
+from pypad.services.open_targets import collect_open_targets
+from pypad.ui.system.single_instance import SingleInstanceServer, forward_to_running_instance
 
 configure_app_logging("INFO")
 LOGGER = get_logger(__name__)
@@ -100,6 +104,7 @@ def _install_startup_exception_hooks() -> None:
             traceback.format_exception(exc_type, exc_value, exc_tb)
         ).strip()
         _save_startup_traceback(error_text)
+        flush_app_logging()
         sys.__excepthook__(exc_type, exc_value, exc_tb)
 
     def _handle_thread_exception(args: threading.ExceptHookArgs) -> None:
@@ -107,6 +112,7 @@ def _install_startup_exception_hooks() -> None:
             traceback.format_exception(args.exc_type, args.exc_value, args.exc_traceback)
         ).strip()
         _save_startup_traceback(error_text)
+        flush_app_logging()
         if args.thread is not None:
             sys.__excepthook__(args.exc_type, args.exc_value, args.exc_traceback)
 
@@ -154,6 +160,16 @@ if __name__ == "__main__":
         action="store_true",
         help="Remove 'Open with Pypad' from File Explorer context menu (current user).",
     )
+    parser.add_argument(
+        "--new-instance",
+        action="store_true",
+        help="Start a separate window instead of handing files to an already running Pypad.",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Print the last launch's startup profile compared with earlier launches, then exit.",
+    )
     parsed_args, qt_args = parser.parse_known_args(sys.argv[1:])
     LOGGER.debug("Parsed startup args: parsed=%s qt=%s", parsed_args, qt_args)
 
@@ -176,6 +192,23 @@ if __name__ == "__main__":
             print(f"Failed to unregister shell menu: {exc}")
             sys.exit(1)
         sys.exit(0)
+    if parsed_args.startup_report:
+        print(build_startup_report(StartupHistory(get_startup_history_path()).load()))
+        sys.exit(0)
+
+    # Hand files to a running instance before paying for the GUI imports.
+    open_files, open_folders = collect_open_targets(qt_args)
+    if not parsed_args.new_instance and forward_to_running_instance(open_files, open_folders, os.getcwd()):
+        LOGGER.info("Handed %d file(s) to the running instance", len(open_files))
+        sys.exit(0)
+
+    from PySide6.QtWidgets import QApplication, QSplashScreen
+    from PySide6.QtGui import QPixmap, QPainter, QFontDatabase, QFont
+
+    from pypad.app import main
+    from pypad.ui.theme.asset_paths import resolve_asset_path
+
+    STARTUP_RECORDER.mark("imports_done")
 
     _install_startup_exception_hooks()
     LOGGER.info("Startup exception hooks installed")
@@ -184,9 +217,25 @@ if __name__ == "__main__":
     startup_reported = [False]
     app = QApplication([sys.argv[0], *qt_args])
     LOGGER.info("QApplication created")
+    STARTUP_RECORDER.mark("qapplication_created")
     # Closing the main window should terminate the app process.
     app.setQuitOnLastWindowClosed(True)
 
+    # Listen right away; requests that arrive before the window exists wait for it.
+    pending_handoffs: list[tuple[list, list]] = []
+    instance_server = None
+    if not parsed_args.new_instance:
+        instance_server = SingleInstanceServer(app)
+        if instance_server.listen():
+            def _on_handoff(files, folders) -> None:
+                if _MAIN_WINDOW is None:
+                    pending_handoffs.append((files, folders))
+                else:
+                    _MAIN_WINDOW.open_forwarded_items(files, folders)
+
+            instance_server.open_requested.connect(_on_handoff)
+            LOGGER.info("Single-instance server listening as %s", instance_server.server_name)
+
     # Load splash image
     splash_asset = resolve_asset_path("splash.png")
     splash_path = str(splash_asset) if splash_asset is not None else ""
@@ -277,11 +326,15 @@ if __name__ == "__main__":
         # Keep a strong reference so Qt doesn't destroy the window.
         global _MAIN_WINDOW
         _MAIN_WINDOW = window
+        for files, folders in pending_handoffs:
+            QTimer.singleShot(0, window, lambda f=files, d=folders: window.open_forwarded_items(f, d))
+        pending_handoffs.clear()
         # Diagnostics for unexpected exits (connect before showing in case startup quits immediately)
         def _log_quit(reason: str) -> None:
             _startup_log(f"App quitting ({reason})")
 
         app.aboutToQuit.connect(lambda: _log_quit("aboutToQuit"))
+        app.aboutToQuit.connect(shutdown_app_logging)
         app.lastWindowClosed.connect(lambda: _log_quit("lastWindowClosed"))
 
         # Make sure app exits cleanly when main window closes
@@ -307,6 +360,7 @@ if __name__ == "__main__":
                 except Exception as exc:
                     _startup_log(f"Warning: deferred layout restore failed: {exc}")
             mark_app_started(window)
+            STARTUP_RECORDER.mark("main_window_shown")
             # Defer native activation calls; they can be fragile during first show on some setups.
             def _activate_main_window() -> None:
                 try:
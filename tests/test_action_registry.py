@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtWidgets import QApplication
+
+from pypad.ui.features.extensibility_ops import ActionRegistry
+
+
+class ActionRegistryTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_index_is_cached_until_actions_change(self) -> None:
+        registry = ActionRegistry()
+        save = QAction("&Save As...")
+        save.setShortcut(QKeySequence("Ctrl+Shift+S"))
+        registry.register("save_as_action", save, section="File")
+        registry.register("zoom_in_action", QAction("Zoom &In"), section="View > Zoom", keywords="bigger")
+        index = registry.index()
+        self.assertIs(registry.index(), index)
+        self.assertEqual([entry.action_id for entry in index], ["save_as_action", "zoom_in_action"])
+        self.assertEqual(index[0].label, "Save As...")
+        self.assertIn("ctrl+shift+s", index[0].search_text)
+        self.assertIn("bigger", index[1].search_text)
+
+        save.setText("Guardar como...")
+        self.assertIs(registry.index(), index)
+        registry.invalidate()
+        self.assertEqual(registry.index()[0].label, "Guardar como...")
+
+        version = registry.version
+        registry.unregister_action(save)
+        self.assertGreater(registry.version, version)
+        self.assertNotIn("save_as_action", registry)
+        self.assertEqual([entry.action_id for entry in registry.index()], ["zoom_in_action"])
+
+    def test_window_registers_sections_and_fills_submenus_on_show(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            settings_dir = Path(tmp) / "notepadclone"
+            settings_dir.mkdir(parents=True)
+            settings = {"welcome_tutorial_seen": True, "auto_check_updates": False}
+            (settings_dir / "settings.json").write_text(json.dumps(settings), encoding="utf-8")
+            with mock.patch.dict(os.environ, {"APPDATA": tmp}):
+                from pypad.ui.main_window.window import Notepad
+
+                window = Notepad()
+                try:
+                    sections = {entry.action_id: entry.section for entry in window.action_registry.index()}
+                    self.assertEqual(sections["new_action"], "File")
+                    self.assertEqual(sections["export_pdf_action"], "File > Export")
+                    self.assertEqual(sections["md_heading1_action"], "Format > Markdown > Headings")
+                    self.assertEqual(sections["fold_level_3"], "View > Fold Level")
+
+                    # Entries of a submenu that was never opened still have working shortcuts.
+                    self.assertEqual(window.templates_menu.actions(), [])
+                    self.assertIn(window.new_from_meeting_template_action, window.actions())
+                    window.templates_menu.aboutToShow.emit()
+                    window.templates_menu.aboutToShow.emit()
+                    self.assertEqual(len(window.templates_menu.actions()), 7)
+
+                    items = window._command_palette_items()
+                    self.assertIs(window._command_palette_items(), items)
+                    window.settings["language"] = "Deutsch"
+                    with mock.patch.object(window.translator, "translate", side_effect=lambda text, _lang: text):
+                        window.apply_language()
+                    self.assertIsNot(window._command_palette_items(), items)
+                finally:
+                    window.close()
+                    window.deleteLater()
+                    self.app.processEvents()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtWidgets import QApplication
+
+from pypad.ui.ai.ai_chat_dock import _Bubble
+
+
+def _blocks(bubble: _Bubble) -> list[str]:
+    rows = []
+    block = bubble._view.document().begin()
+    while block.isValid():
+        if block.text().strip():
+            rows.append(block.text())
+        block = block.next()
+    return rows
+
+
+class StreamingBubbleTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_streamed_chunks_render_like_a_full_render(self) -> None:
+        answer = (
+            "# Plan\n\nFirst paragraph with **bold**.\n\n"
+            "```python\nx = 1\n\ny = 2\n```\n\n"
+            "- one\n- two\n\nSee pypad://settings for more.\n"
+        )
+        streamed = _Bubble("", "assistant")
+        for idx in range(0, len(answer), 7):
+            streamed.append_text(answer[idx : idx + 7])
+        full = _Bubble(answer, "assistant")
+        self.assertEqual(_blocks(streamed), _blocks(full))
+        self.assertEqual(streamed._code_blocks, ["x = 1\n\ny = 2"])
+        # Everything up to the last blank line is committed; only the tail is re-rendered.
+        self.assertEqual(streamed._stream_committed, answer.rindex("\n\n") + 2)
+
+    def test_hidden_command_never_flashes_while_streaming(self) -> None:
+        bubble = _Bubble("", "assistant")
+        seen: list[str] = []
+        parts = ["Done.\n\n[PYPAD_CM", "D_OFFER_INSERT_BEGIN]\nsecret\n\n", "more\n[PYPAD_CMD_OFFER_INSERT_END]\n\nBye"]
+        for part in parts:
+            bubble.append_text(part)
+            seen.extend(_blocks(bubble))
+        self.assertFalse(any("PYPAD" in row or "secret" in row for row in seen))
+        self.assertEqual(_blocks(bubble), ["Done.", "Bye"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import sys
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.ai.ai_client_pool import AIClientPool
+from pypad.ui.ai.ai_controller import _generate_sync
+
+
+class _FakeResponse:
+    text = "OK"
+
+
+class _FakeModels:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def generate_content(self, *, model: str, contents: str) -> _FakeResponse:
+        self.calls.append(contents)
+        return _FakeResponse()
+
+    def get(self, *, model: str) -> object:
+        self.calls.append(f"get:{model}")
+        return object()
+
+
+def _fake_google(created: list) -> types.ModuleType:
+    class _FakeClient:
+        def __init__(self, api_key: str) -> None:
+            self.api_key = api_key
+            self.models = _FakeModels()
+            created.append(self)
+
+    fake_google = types.ModuleType("google")
+    fake_google.genai = types.SimpleNamespace(Client=_FakeClient)
+    return fake_google
+
+
+class AIClientPoolTests(unittest.TestCase):
+    def test_clients_are_reused_per_key_and_model(self) -> None:
+        created: list = []
+        pool = AIClientPool(probe=lambda: True)
+        with patch.dict(sys.modules, {"google": _fake_google(created)}, clear=False):
+            self.assertEqual(_generate_sync("one", "k", "m", pool=pool), "OK")
+            self.assertEqual(_generate_sync("two", "k", "m", pool=pool), "OK")
+            _generate_sync("three", "other", "m", pool=pool)
+        self.assertEqual(len(created), 2)
+        self.assertEqual(created[0].models.calls, ["one", "two"])
+
+    def test_connectivity_probe_is_cached_for_its_ttl(self) -> None:
+        now = [0.0]
+        probes: list[bool] = []
+
+        def probe() -> bool:
+            probes.append(True)
+            return False
+
+        pool = AIClientPool(probe=probe, online_ttl=30.0, offline_ttl=3.0, clock=lambda: now[0])
+        self.assertFalse(pool.is_online())
+        now[0] = 2.0
+        self.assertFalse(pool.is_online())
+        self.assertEqual(len(probes), 1)
+        now[0] = 4.0
+        pool.is_online()
+        self.assertEqual(len(probes), 2)
+        pool.mark_online()
+        now[0] = 20.0
+        self.assertTrue(pool.is_online())
+        self.assertEqual(len(probes), 2)
+
+    def test_prewarm_builds_client_once_in_background(self) -> None:
+        created: list = []
+        pool = AIClientPool(probe=lambda: True)
+        with patch.dict(sys.modules, {"google": _fake_google(created)}, clear=False):
+            self.assertTrue(pool.prewarm("k", "m"))
+            deadline = time.time() + 3.0
+            while time.time() < deadline and not (created and created[0].models.calls):
+                time.sleep(0.005)
+            self.assertFalse(pool.prewarm("k", "m"))
+            self.assertIs(pool.genai_client("k", "m"), created[0])
+        self.assertEqual(created[0].models.calls, ["get:m"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.ai.ai_context_assembler import (
+    TRUNCATION_MARKER,
+    ContextSource,
+    assemble_context,
+    estimate_tokens,
+)
+
+SHARED = "def load_settings(path):\n    return json.loads(Path(path).read_text(encoding='utf-8'))"
+
+
+class EstimateTokensTests(unittest.TestCase):
+    def test_counts_words_numbers_and_punctuation(self) -> None:
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("hello world"), 2)
+        self.assertEqual(estimate_tokens("123456"), 2)
+        self.assertEqual(estimate_tokens("a = b"), 3)
+        self.assertEqual(estimate_tokens("-" * 40), 10)
+        self.assertGreater(estimate_tokens("internationalization"), 1)
+
+    def test_non_ascii_counts_per_character(self) -> None:
+        self.assertEqual(estimate_tokens("日本語"), 3)
+
+
+class AssembleContextTests(unittest.TestCase):
+    def test_stable_prefix_is_identical_across_turns(self) -> None:
+        def turn(question: str, current_file: str) -> str:
+            return assemble_context(
+                [
+                    ContextSource("meta", "[META]", stable=True, required=True),
+                    ContextSource("knowledge", "app knowledge " * 20, priority=40, stable=True),
+                    ContextSource("file", current_file, priority=60, truncatable=True),
+                    ContextSource("prompt", question, required=True),
+                ],
+                budget_tokens=4000,
+            ).text
+
+        first = turn("first question", "alpha = 1")
+        second = turn("second question", "beta = 2")
+        prefix = "[META]\n\n" + "app knowledge " * 20
+        self.assertTrue(first.startswith(prefix))
+        self.assertTrue(second.startswith(prefix))
+
+    def test_duplicate_paragraphs_are_emitted_once(self) -> None:
+        result = assemble_context(
+            [
+                ContextSource("attachments", SHARED, stable=True),
+                ContextSource("file", "header line\n\n" + SHARED, priority=60),
+                ContextSource("snippets", SHARED, priority=50),
+                ContextSource("prompt", "why?", required=True),
+            ],
+            budget_tokens=4000,
+        )
+        self.assertEqual(result.text.count("def load_settings"), 1)
+        self.assertEqual(result.deduped_blocks, 2)
+        self.assertIn("snippets", result.dropped)
+        self.assertEqual(result.included, ["attachments", "file", "prompt"])
+
+    def test_budget_keeps_higher_priority_and_truncates(self) -> None:
+        long_file = "\n".join(f"line_{i} = compute(value_{i})" for i in range(400))
+        result = assemble_context(
+            [
+                ContextSource("snippets", "lookup " * 300, priority=50),
+                ContextSource("file", long_file, priority=60, truncatable=True, header="[FILE]", footer="[/FILE]"),
+                ContextSource("prompt", "summarize this", required=True),
+            ],
+            budget_tokens=600,
+        )
+        self.assertEqual(result.truncated, ["file"])
+        self.assertEqual(result.dropped, ["snippets"])
+        self.assertIn(TRUNCATION_MARKER + "\n[/FILE]", result.text)
+        self.assertLessEqual(result.tokens, 600)
+        self.assertTrue(result.text.endswith("summarize this"))
+
+    def test_required_sources_survive_an_exhausted_budget(self) -> None:
+        result = assemble_context(
+            [
+                ContextSource("knowledge", "knowledge " * 200, stable=True),
+                ContextSource("prompt", "question " * 200, required=True),
+            ],
+            budget_tokens=100,
+        )
+        self.assertEqual(result.included, ["prompt"])
+        self.assertEqual(result.prefix_tokens, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
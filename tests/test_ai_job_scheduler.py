@@ -0,0 +1,132 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.ai.ai_job_scheduler import (
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_RETRYING,
+    AIJobScheduler,
+    ProviderRateLimiter,
+    is_retryable_ai_error,
+)
+
+
+class _StatusError(Exception):
+    def __init__(self, code: int) -> None:
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+class RetryClassificationTests(unittest.TestCase):
+    def test_status_codes_and_wrapped_causes(self) -> None:
+        self.assertTrue(is_retryable_ai_error(_StatusError(429)))
+        self.assertTrue(is_retryable_ai_error(_StatusError(503)))
+        self.assertFalse(is_retryable_ai_error(_StatusError(400)))
+        try:
+            try:
+                raise _StatusError(429)
+            except _StatusError as inner:
+                raise RuntimeError("AI request failed.") from inner
+        except RuntimeError as outer:
+            self.assertTrue(is_retryable_ai_error(outer))
+        self.assertTrue(is_retryable_ai_error(RuntimeError("429 RESOURCE_EXHAUSTED")))
+        self.assertFalse(is_retryable_ai_error(RuntimeError("It is possible that the rate limit has been exceeded")))
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_slots_are_spaced_per_provider(self) -> None:
+        now = [100.0]
+        limiter = ProviderRateLimiter(clock=lambda: now[0])
+        limiter.set_limit("gemini", 60)
+        self.assertEqual(limiter.reserve("gemini"), 0.0)
+        self.assertEqual(limiter.reserve("gemini"), 1.0)
+        self.assertEqual(limiter.reserve("other"), 0.0)
+        limiter.penalize("other", 5.0)
+        self.assertEqual(limiter.reserve("other"), 5.0)
+
+
+class AIJobSchedulerTests(unittest.TestCase):
+    def test_runs_concurrently_and_releases_in_order(self) -> None:
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+        delays = {"a": 0.15, "b": 0.01, "c": 0.05, "d": 0.01}
+
+        def run(job):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(delays[job.label])
+            with lock:
+                active[0] -= 1
+            return job.label.upper()
+
+        ready: list[str] = []
+        scheduler = AIJobScheduler(run, max_concurrency=3, on_ready=lambda job: ready.append(job.result))
+        for label in "abcd":
+            scheduler.submit(label, label)
+        self.assertTrue(scheduler.wait(5))
+        self.assertEqual(ready, ["A", "B", "C", "D"])
+        self.assertEqual(peak[0], 3)
+
+    def test_retries_rate_limited_jobs_with_backoff(self) -> None:
+        calls = [0]
+        events: list[str] = []
+
+        def run(job):
+            calls[0] += 1
+            if calls[0] < 3:
+                raise _StatusError(429)
+            return "ok"
+
+        scheduler = AIJobScheduler(
+            run,
+            base_backoff_sec=0.01,
+            max_backoff_sec=0.02,
+            on_event=lambda job: events.append(job.status),
+        )
+        job = scheduler.submit("x", "x")
+        self.assertTrue(scheduler.wait(5))
+        self.assertEqual((job.status, job.attempts, job.result), (JOB_DONE, 3, "ok"))
+        self.assertEqual(events.count(JOB_RETRYING), 2)
+
+    def test_non_retryable_errors_fail_immediately(self) -> None:
+        def run(job):
+            raise ValueError("bad request")
+
+        scheduler = AIJobScheduler(run)
+        job = scheduler.submit("x", "x")
+        self.assertTrue(scheduler.wait(5))
+        self.assertEqual((job.status, job.attempts, job.error), (JOB_FAILED, 1, "bad request"))
+
+    def test_cancelled_job_does_not_block_later_results(self) -> None:
+        gate = threading.Event()
+
+        def run(job):
+            if job.label == "slow":
+                gate.wait(5)
+            return job.label
+
+        ready: list[tuple[str, str]] = []
+        scheduler = AIJobScheduler(run, max_concurrency=2, on_ready=lambda job: ready.append((job.label, job.status)))
+        slow = scheduler.submit("slow", None)
+        scheduler.submit("fast", None)
+        time.sleep(0.05)
+        self.assertTrue(scheduler.cancel(slow.job_id))
+        self.assertTrue(scheduler.wait(5))
+        gate.set()
+        self.assertEqual(ready, [("slow", JOB_CANCELLED), ("fast", JOB_DONE)])
+        self.assertFalse(scheduler.cancel(slow.job_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.ai.ai_metrics_ledger import (
+    STATUS_ERROR,
+    AIMetricsLedger,
+    metrics_over_time,
+    percentile,
+    summarize_metrics,
+)
+
+
+class PercentileTests(unittest.TestCase):
+    def test_interpolates_between_ranks(self) -> None:
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([5], 99), 5.0)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertEqual(percentile(range(1, 101), 90), 90.1)
+
+
+class AIMetricsLedgerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.now = [1000.0]
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _ledger(self, **kwargs) -> AIMetricsLedger:
+        return AIMetricsLedger(self.root, clock=lambda: self.now[0], **kwargs)
+
+    def test_record_and_read_since(self) -> None:
+        ledger = self._ledger()
+        row = ledger.record(action="Explain", model="m", latency_ms=1500, ttft_ms=500, response_tokens=200)
+        self.assertEqual(row["tokens_per_sec"], 200.0)
+        self.now[0] = 2000.0
+        ledger.record(action="Explain", model="m", latency_ms=20, cache_hit=True)
+        self.assertEqual(len(ledger.read()), 2)
+        self.assertEqual([r["cache_hit"] for r in ledger.read(since=1500)], [True])
+
+    def test_rotation_keeps_bounded_backups(self) -> None:
+        ledger = self._ledger(max_bytes=1024, backups=2)
+        for i in range(60):
+            ledger.record(action=f"a{i}", model="m", latency_ms=i)
+        self.assertTrue(ledger.path.exists())
+        self.assertTrue((self.root / "ledger.2.jsonl").exists())
+        self.assertFalse((self.root / "ledger.3.jsonl").exists())
+        rows = ledger.read()
+        self.assertLess(len(rows), 60)
+        self.assertEqual(rows[-1]["action"], "a59")
+        self.assertEqual([r["latency_ms"] for r in rows], sorted(r["latency_ms"] for r in rows))
+        ledger.clear()
+        self.assertEqual(ledger.read(), [])
+
+    def test_summaries_exclude_cache_hits_from_latency(self) -> None:
+        ledger = self._ledger()
+        for ms in (100, 200, 300):
+            ledger.record(action="Ask", model="m", latency_ms=ms, retries=1)
+        ledger.record(action="Ask", model="m", latency_ms=1, cache_hit=True)
+        ledger.record(action="Ask", model="m", latency_ms=9000, status=STATUS_ERROR)
+        self.now[0] = 1000.0 + 7200
+        ledger.record(action="Fix", model="m", latency_ms=50)
+        rows = ledger.read()
+
+        summary = summarize_metrics(rows)
+        self.assertEqual([(s["action"], s["requests"]) for s in summary], [("Ask", 5), ("Fix", 1)])
+        ask = summary[0]
+        self.assertEqual((ask["errors"], ask["cache_hits"], ask["retries"]), (1, 1, 3))
+        self.assertEqual((ask["latency_p50"], ask["latency_p99"]), (200.0, 298.0))
+
+        buckets = metrics_over_time(rows, bucket_sec=3600)
+        self.assertEqual([(b["start"], b["requests"]) for b in buckets], [(0.0, 5), (7200.0, 1)])
+        shifted = metrics_over_time(rows, bucket_sec=3600, utc_offset_sec=1800)
+        self.assertEqual(shifted[0]["start"], -1800.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
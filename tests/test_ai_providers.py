@@ -0,0 +1,61 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.ai.ai_job_scheduler import is_retryable_ai_error
+from pypad.ui.ai.ai_providers import LocalAIError, LocalAIProvider
+
+
+class LocalAIProviderTests(unittest.TestCase):
+    def test_seeded_responses_are_repeatable_and_streamed_in_chunks(self) -> None:
+        sleeps: list[float] = []
+        provider = LocalAIProvider(
+            response_chars=100, chunk_chars=10, first_token_ms=200, chunk_delay_ms=5, seed=7, sleep=sleeps.append
+        )
+        pieces = list(provider.stream("explain", "m"))
+        text = "".join(pieces)
+        self.assertTrue(text)
+        self.assertLessEqual(len(text), 100)
+        self.assertTrue(all(len(piece) <= 10 for piece in pieces))
+        self.assertEqual(sleeps[0], 0.2)
+        self.assertEqual(sleeps[1:], [0.005] * (len(pieces) - 1))
+        self.assertEqual(LocalAIProvider(response_chars=100, seed=7, sleep=lambda _s: None).generate("explain", "m"), text)
+        self.assertNotEqual(provider.response_for("other"), text)
+        self.assertNotEqual(LocalAIProvider(response_chars=100, seed=8).response_for("explain"), text)
+
+    def test_canned_response_and_settings(self) -> None:
+        provider = LocalAIProvider.from_settings(
+            {"ai_local_canned_response": "fixed", "ai_local_first_token_ms": 0, "ai_local_chunk_delay_ms": "bad"}
+        )
+        self.assertEqual(provider.generate("anything", "m"), "fixed")
+        self.assertEqual(provider.chunk_delay_ms, 30.0)
+
+    def test_injected_failures_are_seeded_and_classified(self) -> None:
+        def outcomes(seed: int) -> list[int]:
+            provider = LocalAIProvider(
+                canned_response="ok", error_percent=20, rate_limit_percent=30, seed=seed, sleep=lambda _s: None
+            )
+            codes = []
+            for _ in range(200):
+                try:
+                    provider.generate("p", "m")
+                    codes.append(200)
+                except LocalAIError as exc:
+                    codes.append(exc.code)
+            return codes
+
+        codes = outcomes(3)
+        self.assertEqual(codes, outcomes(3))
+        self.assertTrue(40 <= codes.count(429) <= 80)
+        self.assertTrue(20 <= codes.count(500) <= 60)
+        self.assertTrue(is_retryable_ai_error(LocalAIError(429, "429 RESOURCE_EXHAUSTED")))
+        self.assertFalse(is_retryable_ai_error(LocalAIError(500, "Local provider injected failure.")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.ai.ai_response_cache import AIResponseCache, response_cache_key
+
+
+class AIResponseCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.now = [1000.0]
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _cache(self, **kwargs) -> AIResponseCache:
+        return AIResponseCache(self.root, clock=lambda: self.now[0], **kwargs)
+
+    def test_key_covers_model_prompt_and_params(self) -> None:
+        base = response_cache_key("m", "prompt")
+        self.assertEqual(base, response_cache_key("m", "prompt", {}))
+        self.assertNotEqual(base, response_cache_key("other", "prompt"))
+        self.assertNotEqual(base, response_cache_key("m", "prompt "))
+        self.assertNotEqual(base, response_cache_key("m", "prompt", {"temperature": 0.2}))
+
+    def test_hit_survives_restart_and_expires_after_ttl(self) -> None:
+        key = response_cache_key("m", "explain x")
+        self._cache(ttl_sec=60).put(key, "answer", model="m")
+        self.now[0] += 30
+        self.assertEqual(self._cache(ttl_sec=60).get(key), "answer")
+        self.now[0] += 31
+        self.assertIsNone(self._cache(ttl_sec=60).get(key))
+        self.assertEqual(list(self.root.glob("*.json")), [])
+
+    def test_size_cap_evicts_least_recently_used(self) -> None:
+        cache = self._cache(max_bytes=400, ttl_sec=0)
+        keys = [response_cache_key("m", f"p{idx}") for idx in range(3)]
+        for key in keys[:2]:
+            cache.put(key, "x" * 100)
+            self.now[0] += 1
+        self.assertEqual(cache.get(keys[0]), "x" * 100)  # keys[1] is now least recently used
+        self.now[0] += 1
+        cache.put(keys[2], "x" * 100)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_controller_clears_the_disk_cache_even_while_disabled(self) -> None:
+        from pypad.ui.ai import ai_controller
+        from pypad.ui.ai.ai_controller import AIController
+
+        key = response_cache_key("m", "explain x")
+        self._cache().put(key, "answer", model="m")
+        controller = AIController.__new__(AIController)
+        controller._response_cache = None
+        with mock.patch.object(ai_controller, "get_ai_response_cache_dir_path", return_value=self.root):
+            controller.clear_response_cache()
+        self.assertIsNone(self._cache().get(key))
+        self.assertEqual(list(self.root.glob("*.json")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
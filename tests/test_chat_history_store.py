@@ -0,0 +1,83 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.services.chat_history_store import ChatHistoryStore
+
+
+def _msg(role: str, text: str) -> dict[str, str]:
+    return {"role": role, "text": text}
+
+
+class ChatHistoryStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_streaming_appends_only_to_the_session_tail(self) -> None:
+        store = ChatHistoryStore(self.root)
+        history = [_msg("user", "hi"), _msg("assistant", "")]
+        store.sync_messages("chat-1", history)
+        for chunk in ["Hel", "lo ", "there"]:
+            history[-1]["text"] += chunk
+            store.sync_messages("chat-1", history)
+        lines = store.session_path("chat-1").read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn('"op": "extend"', lines[-1])
+        self.assertEqual(ChatHistoryStore(self.root).load_messages("chat-1"), history)
+
+    def test_streaming_at_the_cap_appends_one_record_per_flush(self) -> None:
+        store = ChatHistoryStore(self.root, max_messages=4)
+        history = [_msg("user" if idx % 2 == 0 else "assistant", f"m{idx}") for idx in range(4)]
+        store.sync_messages("chat-1", history)
+        path = store.session_path("chat-1")
+        count = len(path.read_text(encoding="utf-8").splitlines())
+        for chunk in ["a", "b", "c"]:
+            history[-1]["text"] += chunk
+            store.sync_messages("chat-1", history)
+            lines = path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len(lines), count + 1)
+            self.assertIn('"op": "extend"', lines[-1])
+            count += 1
+        self.assertEqual(ChatHistoryStore(self.root, max_messages=4).load_messages("chat-1"), history)
+
+    def test_rewrites_and_cap_replay_to_the_same_messages(self) -> None:
+        store = ChatHistoryStore(self.root, max_messages=4)
+        history: list[dict[str, str]] = []
+        for idx in range(6):
+            history.append(_msg("user" if idx % 2 == 0 else "assistant", f"m{idx}"))
+            store.sync_messages("chat-1", history[-4:])
+        self.assertEqual(ChatHistoryStore(self.root, max_messages=4).load_messages("chat-1"), history[-4:])
+        edited = [_msg("user", "edited")]
+        store.sync_messages("chat-1", edited)
+        self.assertEqual(ChatHistoryStore(self.root, max_messages=4).load_messages("chat-1"), edited)
+
+    def test_index_holds_metadata_only_and_prunes_deleted_sessions(self) -> None:
+        store = ChatHistoryStore(self.root)
+        sessions = [
+            {"id": "chat-1", "title": "One", "messages": [_msg("user", "a")]},
+            {"id": "chat-2", "title": "Two", "messages": [_msg("user", "b")]},
+        ]
+        for session in sessions:
+            store.sync_messages(session["id"], session["messages"])
+        store.save_index(sessions, "chat-2")
+        loaded, active = ChatHistoryStore(self.root).load_index()
+        self.assertEqual(active, "chat-2")
+        self.assertEqual([s["title"] for s in loaded], ["One", "Two"])
+        self.assertTrue(all("messages" not in s and s["message_count"] == 1 for s in loaded))
+        store.save_index(sessions[1:], "chat-2")
+        self.assertFalse(store.session_path("chat-1").exists())
+        self.assertEqual(store.load_messages("chat-2"), [_msg("user", "b")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import shutil
+import threading
+import sys
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.services.definition_index import DefinitionIndex, extract_definitions, find_definition_in_files
+
+
+class _FakeTabs:
+    def __init__(self, tabs: list) -> None:
+        self.tabs = tabs
+
+    def count(self) -> int:
+        return len(self.tabs)
+
+
+class _FakeTab:
+    def __init__(self, path: str, text: str) -> None:
+        self.current_file = path
+        self.session_load_pending = False
+        self.text_edit = type("Editor", (), {"get_text": lambda _self: text})()
+
+
+class _FakeWindow:
+    def __init__(self, root: Path, files: list[str], tabs: list[_FakeTab]) -> None:
+        self.root = root
+        self.files = files
+        self.tab_widget = _FakeTabs(tabs)
+
+    def _workspace_root(self) -> str:
+        return str(self.root)
+
+    def _tab_at_index(self, index: int):
+        return self.tab_widget.tabs[index]
+
+
+class DefinitionIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = ROOT / "tests_tmp" / f"definition_index_{time.time_ns()}"
+        (self.tmp / "pkg" / "sub").mkdir(parents=True, exist_ok=True)
+        (self.tmp / "other").mkdir(parents=True, exist_ok=True)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_extract_definitions_by_language(self) -> None:
+        py = extract_definitions("python", "class Foo:\n    def bar(self):\n        pass\nVALUE = 1\n")
+        self.assertEqual(py, [("Foo", 0, "class"), ("bar", 1, "function"), ("VALUE", 3, "variable")])
+        js = extract_definitions("javascript", "export function go() {}\nconst x = 1;\n")
+        self.assertEqual(js, [("go", 0, "function"), ("x", 1, "variable")])
+
+    def test_lookup_ranks_by_proximity_and_persists(self) -> None:
+        near = self.tmp / "pkg" / "sub" / "near.py"
+        far = self.tmp / "other" / "far.py"
+        current = self.tmp / "pkg" / "sub" / "current.py"
+        near.write_text("def target():\n    pass\n", encoding="utf-8")
+        far.write_text("\n\ndef target():\n    pass\n", encoding="utf-8")
+        current.write_text("target()\n", encoding="utf-8")
+        files = [str(far), str(near), str(current)]
+        cache = self.tmp / "cache"
+
+        index = DefinitionIndex.for_workspace(cache, str(self.tmp))
+        self.assertEqual(index.refresh(files), 3)
+        hits = index.lookup("target", current_file=str(current), language="python")
+        self.assertEqual([Path(h.path).name for h in hits], ["near.py", "far.py"])
+        index.save()
+
+        reloaded = DefinitionIndex.for_workspace(cache, str(self.tmp))
+        reloaded.load()
+        self.assertEqual(reloaded.refresh(files), 0)
+        self.assertEqual(reloaded.lookup("target", current_file=str(current))[0].path, str(near))
+
+    def test_refresh_reparses_only_changed_files_and_drops_missing(self) -> None:
+        a = self.tmp / "a.py"
+        b = self.tmp / "b.py"
+        a.write_text("def one():\n    pass\n", encoding="utf-8")
+        b.write_text("def two():\n    pass\n", encoding="utf-8")
+        index = DefinitionIndex(self.tmp / "defs.json", root=str(self.tmp))
+        index.refresh([str(a), str(b)])
+        a.write_text("def renamed():\n    pass\n", encoding="utf-8")
+        stat = a.stat()
+        os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(index.refresh([str(a)]), 1)
+        self.assertEqual(index.lookup("one"), [])
+        self.assertEqual(index.lookup("two"), [])
+        self.assertEqual(index.lookup("renamed")[0].line, 0)
+
+    def test_cold_index_searches_open_documents_and_leaves_disk_to_the_worker_scan(self) -> None:
+        from pypad.ui.features.advanced_features import AdvancedFeaturesController
+
+        on_disk = self.tmp / "pkg" / "helpers.py"
+        on_disk.write_text("\n\ndef helper():\n    pass\n", encoding="utf-8")
+        opened = self.tmp / "other" / "open.py"
+        current = self.tmp / "pkg" / "current.py"
+        files = [str(on_disk), str(opened), str(current)]
+        # The fake window has no _workspace_files: resolving must never list the workspace.
+        window = _FakeWindow(
+            self.tmp,
+            files,
+            [_FakeTab(str(opened), "class Opened:\n    pass\n"), _FakeTab(str(current), "helper()\n")],
+        )
+        controller = AdvancedFeaturesController.__new__(AdvancedFeaturesController)
+        controller.window = window
+        index = DefinitionIndex(self.tmp / "defs.json", root=str(self.tmp))
+        controller._definition_index = index
+        controller._definition_index_lock = threading.Lock()
+
+        def resolve(symbol: str):
+            return controller._resolve_definition_fallback(
+                symbol=symbol, language="python", source_text="helper()\n", current_file=str(current)
+            )
+
+        # Cold: open documents answer in place; files on disk are left to the background scan.
+        self.assertTrue(controller.definition_index_cold())
+        self.assertEqual(resolve("Opened"), (str(opened), 0))
+        self.assertIsNone(resolve("helper"))
+        searched = {str(current.resolve()), str(opened.resolve())}
+        self.assertEqual(find_definition_in_files("helper", files, skip=searched), (str(on_disk), 2))
+        self.assertIsNone(find_definition_in_files("helper", files, skip=searched | {str(on_disk.resolve())}))
+
+        # A save before the first build does not make a reloaded index look built.
+        index.update_text(str(on_disk), on_disk.read_text(encoding="utf-8"))
+        index.save()
+        partial = DefinitionIndex(self.tmp / "defs.json", root=str(self.tmp))
+        partial.load()
+        self.assertFalse(partial.built)
+
+        # Once built, only the index is consulted, and the flag survives a reload.
+        index.refresh(files)
+        index.save()
+        self.assertFalse(controller.definition_index_cold())
+        self.assertEqual(resolve("helper"), (str(on_disk), 2))
+        self.assertIsNone(resolve("Opened"))
+        self.assertIsNone(resolve("missing"))
+        reloaded = DefinitionIndex(self.tmp / "defs.json", root=str(self.tmp))
+        reloaded.load()
+        self.assertTrue(reloaded.built)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.main_window.lazy_services import LazyService, lazy_service_names, loaded_service
+
+
+class _Window:
+    controller = LazyService("_create_controller")
+    loop = LazyService("_create_loop")
+
+    def __init__(self) -> None:
+        self.built = 0
+        self.logs: list[str] = []
+
+    def log_event(self, level: str, message: str) -> None:
+        self.logs.append(message)
+
+    def _create_controller(self) -> object:
+        self.built += 1
+        return object()
+
+    def _create_loop(self) -> object:
+        return self.loop
+
+
+class LazyServiceTests(unittest.TestCase):
+    def test_built_once_on_first_access(self) -> None:
+        window = _Window()
+        self.assertIsNone(loaded_service(window, "controller"))
+        self.assertEqual(window.built, 0)
+        first = window.controller
+        self.assertIs(window.controller, first)
+        self.assertIs(loaded_service(window, "controller"), first)
+        self.assertEqual(window.built, 1)
+        self.assertIn("Service created: controller", window.logs[0])
+        self.assertEqual(lazy_service_names(_Window), ["controller", "loop"])
+
+    def test_reentrant_creation_raises(self) -> None:
+        window = _Window()
+        with self.assertRaises(RuntimeError):
+            window.loop
+        self.assertIsNone(loaded_service(window, "loop"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import io
+import logging
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad import logging_utils
+from pypad.logging_utils import (
+    LogFileWriter,
+    _ConsoleCaptureTee,
+    clear_console_log_lines,
+    configure_app_logging,
+    flush_app_logging,
+    format_log_timestamp,
+    get_console_log_lines,
+    shutdown_app_logging,
+)
+
+
+class LoggingPipelineTests(unittest.TestCase):
+    def test_cached_timestamp_matches_strftime(self) -> None:
+        base = time.time()
+        for created in (base, base + 0.5, base + 1.25, base + 3600.999):
+            stamp = datetime.fromtimestamp(created)
+            expected = f"{stamp.strftime('%H:%M:%S')}.{int((created - int(created)) * 1000):03d} "
+            expected += f"{stamp.month}/{stamp.day}/{stamp.year}"
+            self.assertEqual(format_log_timestamp(created), expected)
+
+    def test_writer_batches_lines_and_rotates_by_size(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "logs" / "debug.log"
+            writer = LogFileWriter(max_bytes=200, backup_count=2, batch_sec=0.05)
+            try:
+                for index in range(5):
+                    writer.write(path, f"line {index}\n")
+                self.assertTrue(writer.flush())
+                self.assertEqual(path.read_text(encoding="utf-8"), "".join(f"line {i}\n" for i in range(5)))
+
+                for batch in range(4):
+                    writer.write_lines(path, [f"{batch}:" + "x" * 60] * 2)
+                    self.assertTrue(writer.flush())
+                self.assertTrue(path.with_name("debug.log.1").exists())
+                self.assertTrue(path.with_name("debug.log.2").exists())
+                self.assertFalse(path.with_name("debug.log.3").exists())
+                self.assertTrue(path.read_text(encoding="utf-8").startswith("3:"))
+                self.assertLessEqual(path.stat().st_size, 200)
+            finally:
+                writer.close()
+            writer.write(path, "after close")
+            self.assertTrue(writer.flush())
+            self.assertTrue(path.read_text(encoding="utf-8").endswith("after close\n"))
+            writer.close()
+
+    def test_console_tee_joins_partial_writes(self) -> None:
+        clear_console_log_lines()
+        sink = io.StringIO()
+        tee = _ConsoleCaptureTee(sink, label="stdout")
+        self.assertEqual(tee.write("hel"), 3)
+        tee.write("lo")
+        self.assertEqual(tee.write(" world\nsecond\n\nthi"), 18)
+        tee.write("rd")
+        self.assertEqual(get_console_log_lines(), ["[stdout] hello world", "[stdout] second"])
+        tee.flush()
+        self.assertEqual(get_console_log_lines()[-1], "[stdout] third")
+        self.assertEqual(sink.getvalue(), "hello world\nsecond\n\nthird")
+        clear_console_log_lines()
+
+    def test_flush_drains_queued_records_and_shutdown_logs_synchronously(self) -> None:
+        configure_app_logging("INFO")
+        logger = logging.getLogger("pypad.test.pipeline")
+        listener = logging_utils._console_listener
+        if listener is not None:
+            # With the listener parked, only flush_app_logging can write the record.
+            listener.stop()
+            try:
+                logger.info("queued while parked")
+                self.assertFalse(any("queued while parked" in line for line in get_console_log_lines()))
+                flush_app_logging()
+                self.assertTrue(any("queued while parked" in line for line in get_console_log_lines()))
+            finally:
+                listener.start()
+        shutdown_app_logging()
+        self.assertIsNone(logging_utils._console_listener)
+        logger.info("after shutdown")
+        self.assertTrue(any("after shutdown" in line for line in get_console_log_lines()))
+        self.assertEqual(configure_app_logging("INFO"), "INFO")
+        self.assertIsNone(logging_utils._console_listener)
+
+
+if __name__ == "__main__":
+    unittest.main()
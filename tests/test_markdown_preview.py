@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QApplication, QTextEdit
+
+from pypad.ui.editor import markdown_preview
+from pypad.ui.editor.markdown_preview import MarkdownPreviewRenderer, split_markdown_sections
+
+
+class _FakeEditor(QObject):
+    textChanged = Signal()
+
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self.text = text
+        self.revision = 0
+
+    def get_text(self) -> str:
+        return self.text
+
+    def edit(self, text: str) -> None:
+        self.text = text
+        self.revision += 1
+
+
+def _visible_blocks(edit: QTextEdit) -> list[str]:
+    rows = []
+    block = edit.document().begin()
+    while block.isValid():
+        if block.text().strip():
+            rows.append(block.text())
+        block = block.next()
+    return rows
+
+
+def _block_shapes(edit: QTextEdit) -> list[tuple[str, int, int]]:
+    """Visible blocks with the list they belong to (numbered in order, 0 for none) and indent."""
+    lists: dict[int, int] = {}
+    rows = []
+    block = edit.document().begin()
+    while block.isValid():
+        if block.text().strip():
+            text_list = block.textList()
+            list_no = lists.setdefault(text_list.objectIndex(), len(lists) + 1) if text_list is not None else 0
+            rows.append((block.text(), list_no, block.blockFormat().indent()))
+        block = block.next()
+    return rows
+
+
+class MarkdownPreviewTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _render(self, renderer: MarkdownPreviewRenderer) -> None:
+        renderer.request(immediate=True)
+        deadline = time.time() + 3.0
+        while time.time() < deadline and not renderer.is_current():
+            self.app.processEvents()
+            time.sleep(0.005)
+        self.assertTrue(renderer.is_current())
+
+    def test_split_sections_keeps_fences_whole(self) -> None:
+        text = "# A\npara\n\n```py\nx = 1\n\n# not a heading\n```\n- item\n## B"
+        self.assertEqual(
+            split_markdown_sections(text),
+            ["# A\npara", "```py\nx = 1\n\n# not a heading\n```\n- item", "## B"],
+        )
+
+    def test_incremental_patches_match_full_render(self) -> None:
+        base = "# Title\n\nFirst para.\n\n## Part\n\n- one\n- two\n\nLast *para*."
+        editor = _FakeEditor(base)
+        preview = QTextEdit()
+        renderer = MarkdownPreviewRenderer(editor, preview, frame_ms=0)
+        self._render(renderer)
+        rendered_sources: list[str] = []
+        real = markdown_preview.render_section_html
+
+        def counting(source: str) -> str:
+            rendered_sources.append(source)
+            return real(source)
+
+        markdown_preview.render_section_html = counting
+        try:
+            edits = [
+                base.replace("First para.", "First para, edited."),
+                base.replace("## Part\n\n", ""),
+                "Intro.\n\n" + base,
+                base + "\n\nTail.",
+                "",
+                base,
+            ]
+            for text in edits:
+                editor.edit(text)
+                self._render(renderer)
+                reference = QTextEdit()
+                reference.setMarkdown(text)
+                self.assertEqual(_visible_blocks(preview), _visible_blocks(reference), text)
+        finally:
+            markdown_preview.render_section_html = real
+        self.assertEqual(rendered_sources[0], "First para, edited.")
+
+    def test_sections_render_like_the_whole_document(self) -> None:
+        cases = [
+            "See [the docs][d] and [home].\n\nMore text.\n\n[d]: https://example.com/docs\n[home]: https://example.com/",
+            "- one\n\n  continued para\n\n  second continuation\n- two\n\nAfter.",
+            "1. first\n\n2. second\n\n3. third\n\nClosing para.",
+            "# Head\n\n- a\n- b\n\n    indented code\n\n```\n[d]: not-a-definition\n```",
+        ]
+        for text in cases:
+            editor = _FakeEditor(text)
+            preview = QTextEdit()
+            renderer = MarkdownPreviewRenderer(editor, preview, frame_ms=0)
+            self._render(renderer)
+            reference = QTextEdit()
+            reference.setMarkdown(text)
+            self.assertEqual(_block_shapes(preview), _block_shapes(reference), text)
+            self.assertEqual(preview.toHtml().count("href="), reference.toHtml().count("href="), text)
+        self.assertEqual(
+            split_markdown_sections("- one\n\n  more\n- two\n\nAfter.\n\n    code"),
+            ["- one\n\n  more\n- two", "After.", "    code"],
+        )
+
+    def test_external_reset_forces_rebuild(self) -> None:
+        editor = _FakeEditor("# Heading\n\nBody")
+        preview = QTextEdit()
+        renderer = MarkdownPreviewRenderer(editor, preview, frame_ms=0)
+        self._render(renderer)
+        preview.clear()
+        self.assertFalse(renderer.is_current())
+        self._render(renderer)
+        self.assertEqual(_visible_blocks(preview), ["Heading", "Body"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QApplication
+
+from pypad.ui.editor.editor_widget import EditorWidget
+from pypad.ui.editor.minimap_widget import (
+    LINE_BLANK,
+    LINE_CODE,
+    LINE_COMMENT,
+    LINE_DEFINITION,
+    MinimapWidget,
+    classify_line,
+)
+from pypad.ui.editor.text_delta import TextDelta
+from pypad.ui.features.advanced_features import MinimapDock
+
+
+class MinimapWidgetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_classify_line(self) -> None:
+        self.assertEqual(classify_line(""), (0, 0, LINE_BLANK))
+        self.assertEqual(classify_line("\tdef run(self):"), (4, 18, LINE_DEFINITION))
+        self.assertEqual(classify_line("  # note  "), (2, 8, LINE_COMMENT))
+        self.assertEqual(classify_line("x = 1\r"), (0, 5, LINE_CODE))
+
+    def test_incremental_update_matches_full_rebuild(self) -> None:
+        owner = object()
+        widget = MinimapWidget()
+        widget.resize(80, 200)
+        lines = [f"line_{i} = {i}" for i in range(50)]
+        widget.set_document(owner, 1, "\n".join(lines))
+        widget._ensure_image()
+        edits = [
+            (10, 1, ["def ten():", "    return 10"]),
+            (3, 2, ["line_3 = 3"]),
+            (49, 1, ["line_48 = 48", "# tail"]),
+            (0, 0, []),
+        ]
+        for revision, (start, count, fresh) in enumerate(edits, start=2):
+            self.assertTrue(widget.apply_edit(owner, revision, start, count, fresh))
+            lines[start : start + count] = fresh
+            self.assertEqual(widget._meta, [classify_line(line) for line in lines])
+            self.assertTrue(widget.has_document(owner, revision))
+            widget._ensure_image()
+        self.assertFalse(widget.apply_edit(object(), 9, 0, 1, ["x"]))
+        self.assertFalse(widget.apply_edit(owner, 9, 60, 1, ["x"]))
+
+    def test_dock_follows_edits_without_reading_the_text(self) -> None:
+        editor = EditorWidget()
+        editor.set_text("\n".join(f"value_{i} = {i}" for i in range(300)))
+        dock = MinimapDock(None, lambda _line: None)
+        dock.refresh(editor)
+        full_reads: list[int] = []
+        get_text = editor.get_text
+        editor.get_text = lambda: full_reads.append(1) or get_text()
+
+        def edit(line: int, column: int, removed: int, inserted: str) -> None:
+            cursor = editor.widget.textCursor()
+            block = editor.widget.document().findBlockByNumber(line)
+            cursor.setPosition(block.position() + column)
+            cursor.setPosition(block.position() + column + removed, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(inserted)
+            dock.refresh(editor)
+
+        edit(5, 0, 0, "def five():\n    ")
+        edit(120, 3, 30, "# gone")
+        edit(299, 5, 0, "\n\n'tail'")
+        edit(0, 0, 12, "")
+        self.assertEqual(full_reads, [])
+        expected = [classify_line(line) for line in get_text().split("\n")]
+        self.assertEqual(dock.map._meta, expected)
+        self.assertTrue(dock.map.has_document(editor, editor.revision))
+
+        # An edit block arrives as one delta spanning both changes.
+        cursor = editor.widget.textCursor()
+        cursor.beginEditBlock()
+        cursor.setPosition(0)
+        cursor.insertText("class A:\n")
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText("\n# end")
+        cursor.endEditBlock()
+        dock.refresh(editor)
+        self.assertEqual(dock.map._meta, [classify_line(line) for line in get_text().split("\n")])
+        self.assertEqual(full_reads, [])
+
+        # A reset delta makes the next refresh rebuild from the full text once.
+        dock._on_text_delta(TextDelta(editor.revision, 0, 0, get_text(), reset=True))
+        dock.refresh(editor)
+        self.assertEqual(full_reads, [1])
+        self.assertEqual(dock.map._meta, [classify_line(line) for line in get_text().split("\n")])
+        dock.refresh(None)
+
+    def test_large_document_paints_bounded_rows(self) -> None:
+        owner = object()
+        widget = MinimapWidget()
+        widget.resize(80, 120)
+        text = "\n".join("    value = call(x)" for _ in range(200_000))
+        widget.set_document(owner, 1, text)
+        widget._ensure_image()
+        self.assertEqual(widget.line_count(), 200_000)
+        self.assertEqual(widget._image.height(), 120)
+        self.assertTrue(widget.apply_edit(owner, 2, 2, 1, ["#   value = call(x)"]))
+        self.assertEqual(widget._dirty_lines, (2, 3))
+        widget._ensure_image()
+        self.assertIsNone(widget._dirty_lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
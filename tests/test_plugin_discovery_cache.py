@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.features import plugin_discovery_cache
+from pypad.ui.features.plugin_discovery_cache import PluginDiscoveryCache, compute_plugin_digest
+
+
+class PluginDiscoveryCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.plugin = self.root / "plugins" / "demo"
+        self.plugin.mkdir(parents=True)
+        (self.plugin / "plugin.json").write_text('{"id": "demo"}', encoding="utf-8")
+        (self.plugin / "plugin.py").write_text("class Plugin:\n    pass\n", encoding="utf-8")
+        self.cache_path = self.root / "cache.json"
+        self.assessed: list[tuple[str, frozenset[str]]] = []
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _assess(self, plugin_dir: Path, plugin_id: str, permissions: set[str]) -> list[str]:
+        self.assessed.append((plugin_id, frozenset(permissions)))
+        source = (plugin_dir / "plugin.py").read_text(encoding="utf-8")
+        return ["Blocked module import: subprocess"] if "subprocess" in source else []
+
+    def test_unchanged_plugins_skip_hashing_and_assessment(self) -> None:
+        cache = PluginDiscoveryCache(self.cache_path)
+        digest, issues = cache.lookup(self.plugin, "demo", {"hooks"}, self._assess)
+        self.assertEqual((digest, issues), (compute_plugin_digest(self.plugin), []))
+        cache.save()
+
+        reloaded = PluginDiscoveryCache(self.cache_path)
+        reloaded.load()
+        with mock.patch.object(plugin_discovery_cache, "compute_plugin_digest", side_effect=AssertionError):
+            self.assertEqual(reloaded.lookup(self.plugin, "demo", {"hooks"}, self._assess), (digest, []))
+            # New permissions need a new assessment, but the files were not touched.
+            reloaded.lookup(self.plugin, "demo", {"hooks", "file"}, self._assess)
+            # An extra file is reassessed (it could be a blocked payload) but not rehashed.
+            (self.plugin / "notes.txt").write_text("hi", encoding="utf-8")
+            reloaded.lookup(self.plugin, "demo", {"hooks"}, self._assess)
+        self.assertEqual(len(self.assessed), 3)
+        self.assertEqual((reloaded.hits, reloaded.misses), (1, 2))
+
+        (self.plugin / "plugin.py").write_text("import subprocess\n", encoding="utf-8")
+        digest2, issues2 = reloaded.lookup(self.plugin, "demo", {"hooks"}, self._assess)
+        self.assertNotEqual(digest2, digest)
+        self.assertEqual(issues2, ["Blocked module import: subprocess"])
+
+    def test_verify_catches_rewrites_that_keep_size_and_mtime(self) -> None:
+        cache = PluginDiscoveryCache(self.cache_path)
+        digest, _ = cache.lookup(self.plugin, "demo", {"hooks"}, self._assess)
+        self.assertEqual(cache.verify(self._assess), [])
+
+        script = self.plugin / "plugin.py"
+        st = script.stat()
+        script.write_text("import subprocess\n####\n", encoding="utf-8")
+        self.assertEqual(script.stat().st_size, st.st_size)
+        os.utime(script, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(cache.lookup(self.plugin, "demo", {"hooks"}, self._assess), (digest, []))
+
+        self.assertEqual(cache.verify(self._assess), [str(self.plugin)])
+        digest2, issues = cache.lookup(self.plugin, "demo", {"hooks"}, self._assess)
+        self.assertNotEqual(digest2, digest)
+        self.assertEqual(issues, ["Blocked module import: subprocess"])
+
+        cache.prune(set())
+        cache.lookup(self.plugin, "demo", {"hooks"}, self._assess)
+        self.assertEqual(cache.misses, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
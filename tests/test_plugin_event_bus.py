@@ -0,0 +1,114 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.features.plugin_event_bus import (
+    STATE_SUSPENDED,
+    STATE_THROTTLED,
+    EventSubscriber,
+    PluginEventBus,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Recorder:
+    def __init__(self, clock: _Clock | None = None, cost_ms: float = 0.0) -> None:
+        self.events: list[tuple[str, dict]] = []
+        self.clock = clock
+        self.cost_ms = cost_ms
+
+    def on_change(self, event) -> None:
+        self.events.append(("change", event))
+        if self.clock is not None:
+            self.clock.now += self.cost_ms / 1000.0
+
+
+class _SaveOnly:
+    def __init__(self) -> None:
+        self.saved: list[dict] = []
+
+    def on_save(self, event) -> None:
+        self.saved.append(event)
+
+
+class PluginEventBusTests(unittest.TestCase):
+    def test_dispatches_only_to_implemented_hooks(self) -> None:
+        bus = PluginEventBus()
+        recorder, saver = _Recorder(), _SaveOnly()
+        bus.set_subscribers([EventSubscriber("rec", "Rec", recorder), EventSubscriber("save", "Save", saver, allow_tab=True)])
+        self.assertTrue(bus.has_subscribers("change"))
+        self.assertFalse(bus.has_subscribers("tab_changed"))
+        bus.dispatch("save", {"tab": object(), "path": "a.txt"})
+        self.assertEqual(len(saver.saved), 1)
+        self.assertIn("tab", saver.saved[0])
+        self.assertEqual(recorder.events, [])
+
+    def test_coalesces_per_key_and_strips_tab_without_ui(self) -> None:
+        bus = PluginEventBus()
+        recorder = _Recorder()
+        bus.set_subscribers([EventSubscriber("rec", "Rec", recorder)])
+        for i in range(50):
+            bus.post("change", {"tab": "t1", "n": i}, key=1)
+        bus.post("change", {"tab": "t2", "n": 99}, key=2)
+        self.assertEqual(recorder.events, [])
+        self.assertIsNone(bus.flush())
+        self.assertEqual([e["n"] for _name, e in recorder.events], [49, 99])
+        self.assertNotIn("tab", recorder.events[0][1])
+        self.assertEqual(bus.stats("rec").calls, 2)
+
+    def test_slow_plugin_is_throttled_then_suspended(self) -> None:
+        clock = _Clock()
+        slowed: list[tuple[str, str]] = []
+        errors: list[str] = []
+        bus = PluginEventBus(
+            budget_ms=10,
+            slow_strikes=2,
+            throttle_interval_ms=1000,
+            clock=clock,
+            on_slow=lambda sub, stats, _ms: slowed.append((sub.plugin_id, stats.state)),
+            on_error=lambda sub, _event, exc: errors.append(str(exc)),
+        )
+        slow, fast = _Recorder(clock, cost_ms=50), _Recorder()
+        bus.set_subscribers([EventSubscriber("slow", "Slow", slow), EventSubscriber("fast", "Fast", fast)])
+        for i in range(2):
+            bus.post("change", {"n": i})
+            bus.flush()
+        self.assertEqual(slowed, [("slow", STATE_THROTTLED)])
+
+        # Throttled: further typing is held back and collapsed to the latest payload.
+        bus.post("change", {"n": 2})
+        self.assertIsNotNone(bus.flush())
+        bus.post("change", {"n": 3})
+        retry_ms = bus.flush()
+        self.assertEqual([e["n"] for _name, e in slow.events], [0, 1])
+        self.assertEqual([e["n"] for _name, e in fast.events], [0, 1, 2, 3])
+
+        clock.now += retry_ms / 1000.0
+        self.assertIsNone(bus.flush())
+        self.assertEqual([e["n"] for _name, e in slow.events], [0, 1, 3])
+        clock.now += 1.0
+        bus.post("change", {"n": 4})
+        bus.flush()
+        self.assertEqual(slowed[-1], ("slow", STATE_SUSPENDED))
+        self.assertEqual(bus.stats("slow").state, STATE_SUSPENDED)
+        bus.post("change", {"n": 5})
+        bus.flush()
+        self.assertEqual([e["n"] for _name, e in slow.events], [0, 1, 3, 4])
+        self.assertEqual([e["n"] for _name, e in fast.events], [0, 1, 2, 3, 4, 5])
+        self.assertEqual(errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
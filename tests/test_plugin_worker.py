@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.ui.editor.text_delta import TextDelta
+from pypad.ui.features.plugin_worker import WORKER_MODULE, decode_message, delta_message, encode_message
+
+_PLUGIN = '''
+class Plugin:
+    def __init__(self, api):
+        self.api = api
+
+    def on_change(self, event):
+        print("plugin output goes to stderr")
+        self.api.notify(f"{len(self.api.current_text())}:{self.api.current_text()[-3:]}")
+        if self.api.current_text().endswith("spin"):
+            while True:
+                pass
+
+    def on_save(self, event):
+        self.api.save_active()
+
+    def on_open(self, event):
+        changes = self.api.changes_since(1)
+        self.api.notify(f"{self.api.revision()} {len(changes)} {self.api.text_lines(0, 1)}")
+'''
+
+
+class PluginWorkerProtocolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        plugin_dir = Path(self._tmp.name)
+        (plugin_dir / "plugin.py").write_text(_PLUGIN, encoding="utf-8")
+        env = dict(os.environ, PYTHONPATH=str(SRC))
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", WORKER_MODULE, str(plugin_dir)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+
+    def tearDown(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait(5)
+        for stream in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            stream.close()
+        self._tmp.cleanup()
+
+    def _send(self, message: dict) -> None:
+        self.proc.stdin.write(encode_message(message))
+        self.proc.stdin.flush()
+
+    def _receive(self) -> dict:
+        message = decode_message(self.proc.stdout.readline())
+        self.assertIsNotNone(message)
+        return message
+
+    def test_mirror_bridged_calls_and_cpu_limit(self) -> None:
+        self._send(
+            {
+                "t": "init",
+                "plugin_id": "demo",
+                "permissions": ["hooks"],
+                "cpu_limit_ms": 300,
+                "text": {"doc": 1, "rev": 1, "text": "hello"},
+            }
+        )
+        ready = self._receive()
+        self.assertEqual((ready["t"], ready["hooks"]), ("ready", ["change", "open", "save"]))
+
+        self._send(delta_message(1, TextDelta(2, 5, 0, " world")))
+        self._send({"t": "event", "name": "change", "payload": {"path": ""}})
+        self.assertEqual(self._receive(), {"t": "call", "method": "notify", "args": ["11:rld"]})
+        done = self._receive()
+        self.assertEqual((done["t"], done["error"], done["limited"]), ("done", "", False))
+        self._send({"t": "event", "name": "open", "payload": {}})
+        self.assertEqual(self._receive()["args"], ["2 1 ['hello world']"])
+        self._receive()
+
+        self._send({"t": "event", "name": "save", "payload": {}})
+        call = self._receive()
+        self.assertEqual((call["method"], call["args"]), ("save_active", []))
+        self._send({"t": "reply", "id": call["id"], "ok": False, "error": "missing permission: file"})
+        done = self._receive()
+        self.assertIn("missing permission: file", done["error"])
+
+        self._send(delta_message(1, TextDelta(3, 0, 11, "spin")))
+        self._send({"t": "event", "name": "change", "payload": {}})
+        self.assertEqual(self._receive()["args"], ["4:pin"])
+        done = self._receive()
+        self.assertTrue(done["limited"])
+        self.assertGreaterEqual(done["cpu_ms"], 250)
+
+        self._send({"t": "shutdown"})
+        self.assertEqual(self.proc.wait(5), 0)
+        self.assertIn(b"plugin output goes to stderr", self.proc.stderr.read())
+
+    def test_load_failure_is_reported(self) -> None:
+        (Path(self._tmp.name) / "plugin.py").write_text("raise ValueError('broken')\n", encoding="utf-8")
+        self._send({"t": "init", "plugin_id": "demo", "permissions": []})
+        fatal = self._receive()
+        self.assertEqual(fatal["t"], "fatal")
+        self.assertIn("broken", fatal["error"])
+        self.assertEqual(self.proc.wait(5), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.services.retrieval_index import RetrievalIndex, line_windows, tokenize
+from pypad.ui.ai.ai_collaboration import build_indexed_citation_snippets
+
+
+class RetrievalIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, name: str, text: str) -> str:
+        path = self.root / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def test_tokenize_splits_identifiers(self) -> None:
+        self.assertEqual(tokenize("loadSessionIndex"), ["loadsessionindex", "load", "session", "index"])
+        self.assertEqual(tokenize("chat_history_store"), ["chat_history_store", "chat", "history", "store"])
+        self.assertEqual(tokenize("what is the cache"), ["is", "cache"])
+
+    def test_windows_overlap_and_cover_every_line(self) -> None:
+        self.assertEqual(line_windows(0), [])
+        self.assertEqual(line_windows(5), [(0, 5)])
+        self.assertEqual(line_windows(20, size=12, stride=6), [(0, 12), (6, 18), (12, 20)])
+
+    def test_rare_terms_outrank_common_ones(self) -> None:
+        filler = "\n".join(f"value = compute(item_{i})" for i in range(40))
+        common = self._write("common.py", filler)
+        rare = self._write("rare.py", "def rotate_api_token():\n    return vault.rotate()\n")
+        index = RetrievalIndex(str(self.root))
+        self.assertEqual(index.refresh([common, rare]), 2)
+        hits = index.search("how does token rotation compute values")
+        self.assertEqual(hits[0].path, rare)
+
+    def test_refresh_reparses_only_changed_files(self) -> None:
+        a = self._write("a.md", "alpha notes\n")
+        b = self._write("b.md", "beta notes\n")
+        index = RetrievalIndex(str(self.root))
+        self.assertEqual(index.refresh([a, b]), 2)
+        self.assertEqual(index.refresh([a, b]), 0)
+        Path(b).write_text("gamma notes with more words\n", encoding="utf-8")
+        self.assertEqual(index.refresh([a, b]), 1)
+        self.assertEqual([hit.path for hit in index.search("gamma")], [b])
+        self.assertEqual(index.search("beta"), [])
+        index.refresh([a])
+        self.assertEqual(index.file_count, 1)
+        self.assertEqual(index.search("gamma"), [])
+
+    def test_update_text_replaces_postings(self) -> None:
+        path = self._write("notes.txt", "old heading\n")
+        index = RetrievalIndex(str(self.root))
+        index.refresh([path])
+        index.update_text(path, "fresh heading\n")
+        self.assertEqual(index.search("old"), [])
+        self.assertEqual([hit.path for hit in index.search("fresh")], [path])
+
+    def test_indexed_snippets_cite_matching_lines(self) -> None:
+        body = ["# filler"] * 30 + ["def parse_config(path):", "    return load_toml(path)"] + ["# filler"] * 30
+        path = self._write("config.py", "\n".join(body) + "\n")
+        other = self._write("other.py", "print('hello')\n")
+        index = RetrievalIndex(str(self.root))
+        index.refresh([path, other])
+        snippets = build_indexed_citation_snippets(index, "where is parse_config", max_files=3, max_lines_per_file=20)
+        self.assertEqual([s.path for s in snippets], [path])
+        self.assertIn("0031: def parse_config(path):", snippets[0].excerpt)
+        self.assertLessEqual(len(snippets[0].excerpt.splitlines()), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
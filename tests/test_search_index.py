@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+import time
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QApplication, QPlainTextEdit
+
+from pypad.ui.editor.search_index import DocumentSearchHighlighter, SearchMatchIndex, find_match_offsets
+
+
+class SearchMatchIndexTests(unittest.TestCase):
+    def test_find_offsets_case_and_utf16(self) -> None:
+        self.assertEqual(find_match_offsets("Foo foo FOO", "foo", case_sensitive=True), [4])
+        self.assertEqual(find_match_offsets("Foo foo FOO", "foo", case_sensitive=False), [0, 4, 8])
+        # The emoji takes two UTF-16 code units, shifting later document positions by one.
+        self.assertEqual(find_match_offsets("a\U0001F600ab", "ab", case_sensitive=True), [3])
+
+    def test_incremental_edits_match_full_scan(self) -> None:
+        rng = random.Random(7)
+        text = "".join(rng.choice("ab \n") for _ in range(400))
+        index = SearchMatchIndex("ab", case_sensitive=True, starts=find_match_offsets(text, "ab", case_sensitive=True))
+        for _ in range(300):
+            pos = rng.randint(0, len(text))
+            removed = rng.randint(0, min(4, len(text) - pos))
+            inserted = "".join(rng.choice("ab\n") for _ in range(rng.randint(0, 4)))
+            text = text[:pos] + inserted + text[pos + removed :]
+            lo, hi = index.apply_edit(pos, removed, len(inserted))
+            index.rescan(lo, hi, text[lo : hi + index.length - 1])
+            self.assertEqual(index.starts, find_match_offsets(text, "ab", case_sensitive=True))
+
+    def test_ordinal_navigation_and_ranges(self) -> None:
+        index = SearchMatchIndex("x", case_sensitive=True, starts=[2, 5, 9])
+        self.assertEqual(index.ordinal_at(5), 2)
+        self.assertEqual(index.ordinal_at(6), 0)
+        self.assertEqual(index.next_start(6), 9)
+        self.assertEqual(index.next_start(10), 2)
+        self.assertEqual(index.next_start(2, backward=True), 9)
+        self.assertEqual(index.ranges_between(4, 9), [(5, 6)])
+
+
+class DocumentSearchHighlighterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_follows_edits_made_during_and_after_the_scan(self) -> None:
+        edit = QPlainTextEdit()
+        edit.setPlainText("needle hay\n" * 50)
+        highlighter = DocumentSearchHighlighter(edit)
+        highlighter.set_query("needle", case_sensitive=False)
+        cursor = QTextCursor(edit.document())
+        cursor.insertText("NEEDLE ")  # lands while the worker scan is in flight
+        deadline = time.time() + 3.0
+        while time.time() < deadline and not highlighter.is_ready():
+            self.app.processEvents()
+            time.sleep(0.005)
+        self.assertEqual(highlighter.index().count, 51)
+        cursor.setPosition(7)
+        cursor.setPosition(13, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        expected = find_match_offsets(edit.toPlainText(), "needle", case_sensitive=False)
+        self.assertEqual(highlighter.index().starts, expected)
+        self.assertEqual(highlighter.ranges_between(0, 10), [(0, 6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtWidgets import QApplication
+
+from pypad.ui.editor.editor_widget import EditorWidget
+
+
+class SessionLazyRestoreTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_view_state_round_trip_is_clamped(self) -> None:
+        source = EditorWidget()
+        source.set_text("def a():\n    x = 1\n    y = 2\n\ndef b():\n    pass\n")
+        source.set_cursor_position(4, 3)
+        source.widget.setContractedFolds([0])
+        state = source.view_state()
+        self.assertEqual(state["cursor"], [4, 3])
+        self.assertEqual(state["folds"], [0])
+
+        target = EditorWidget()
+        target.set_text(source.get_text())
+        target.apply_view_state(state)
+        self.assertEqual(target.cursor_position(), (4, 3))
+        self.assertEqual(target.widget.contractedFolds(), [0])
+
+        short = EditorWidget()
+        short.set_text("one\ntwo")
+        short.apply_view_state({"cursor": [40, 9], "first_line": 99, "folds": [30]})
+        self.assertEqual(short.cursor_position(), (1, 3))
+
+    def test_restore_reads_only_the_active_tab(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            files = []
+            for index in range(4):
+                path = root / f"note{index}.txt"
+                path.write_text("\n".join(f"line {n}" for n in range(50)) + f"\n{index}", encoding="utf-8")
+                files.append(str(path))
+            settings_dir = root / "appdata" / "notepadclone"
+            settings_dir.mkdir(parents=True)
+            settings = {
+                "welcome_tutorial_seen": True,
+                "auto_check_updates": False,
+                "defer_plugin_load_on_startup": True,
+                "session_background_load_ms": 0,
+                "last_session_files": files + [str(root / "missing.txt")],
+                "last_session_active_file": files[1],
+                "last_session_view_states": {files[2]: {"cursor": [7, 2]}},
+            }
+            (settings_dir / "settings.json").write_text(json.dumps(settings), encoding="utf-8")
+            with mock.patch.dict(os.environ, {"APPDATA": str(root / "appdata")}):
+                from pypad.ui.main_window.window import Notepad
+
+                window = Notepad()
+                try:
+                    tabs = [window.tab_widget.widget(i) for i in range(window.tab_widget.count())]
+                    self.assertEqual([tab.current_file for tab in tabs], files)
+                    self.assertEqual([tab.session_load_pending for tab in tabs], [True, False, True, True])
+                    self.assertIs(window.active_tab(), tabs[1])
+                    self.assertTrue(tabs[1].text_edit.get_text().endswith("\n1"))
+                    self.assertEqual(window._collect_session_state()["views"][files[2]], {"cursor": [7, 2]})
+
+                    window.tab_widget.setCurrentIndex(2)
+                    self.app.processEvents()
+                    active = window.active_tab()
+                    self.assertEqual(window.tab_widget.currentIndex(), 2)
+                    self.assertFalse(active.session_load_pending)
+                    self.assertTrue(active.text_edit.get_text().endswith("\n2"))
+                    self.assertEqual(active.text_edit.cursor_position(), (7, 2))
+                    self.assertFalse(active.text_edit.is_modified())
+
+                    window._materialize_session_tabs()
+                    self.assertEqual(window._pending_session_tabs(), [])
+                    self.assertEqual(window.tab_widget.currentIndex(), 2)
+                    self.assertEqual(
+                        [window.tab_widget.widget(i).current_file for i in range(window.tab_widget.count())], files
+                    )
+                finally:
+                    for index in range(window.tab_widget.count()):
+                        window.tab_widget.widget(index).text_edit.set_modified(False)
+                    if window.file_watcher.files():
+                        window.file_watcher.removePaths(window.file_watcher.files())
+                    window.close()
+                    window.deleteLater()
+                    self.app.processEvents()
+
+    def test_background_load_skips_prompting_files_and_keeps_failed_tabs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            files = [str(root / name) for name in ("active.txt", "secret.encnote", "broken.txt", "plain.txt")]
+            for path in files:
+                Path(path).write_text(f"{Path(path).stem} text", encoding="utf-8")
+            settings_dir = root / "appdata" / "notepadclone"
+            settings_dir.mkdir(parents=True)
+            settings = {
+                "welcome_tutorial_seen": True,
+                "auto_check_updates": False,
+                "defer_plugin_load_on_startup": True,
+                "session_background_load_ms": 1,
+                "last_session_files": files,
+                "last_session_active_file": files[0],
+            }
+            (settings_dir / "settings.json").write_text(json.dumps(settings), encoding="utf-8")
+            with mock.patch.dict(os.environ, {"APPDATA": str(root / "appdata")}):
+                from pypad.ui.main_window import file_ops
+                from pypad.ui.main_window.window import Notepad
+
+                window = Notepad()
+                try:
+                    real_open = window._open_file_path
+                    quiet_flags: list[bool] = []
+
+                    def failing_open(path: str, *, make_current: bool = True, quiet: bool = False) -> bool:
+                        if path == files[2]:
+                            quiet_flags.append(quiet)
+                            return False
+                        return real_open(path, make_current=make_current, quiet=quiet)
+
+                    with mock.patch.object(window, "_open_file_path", side_effect=failing_open), mock.patch.object(
+                        window.security_controller, "prompt_password", return_value=None
+                    ) as prompt, mock.patch.object(file_ops.QMessageBox, "critical") as critical:
+                        deadline = time.monotonic() + 5
+                        while time.monotonic() < deadline and window._session_background_load_scheduled:
+                            self.app.processEvents()
+                            time.sleep(0.005)
+                        tabs = [window.tab_widget.widget(i) for i in range(window.tab_widget.count())]
+                        self.assertEqual([tab.current_file for tab in tabs], files)
+                        self.assertEqual([tab.session_load_pending for tab in tabs], [False, True, True, False])
+                        self.assertEqual(quiet_flags, [True])
+                        self.assertIs(window.active_tab(), tabs[0])
+                        prompt.assert_not_called()
+                        critical.assert_not_called()
+                        self.assertIn("plain", window._build_open_docs_word_list())
+                        self.assertNotIn("secret", window._build_open_docs_word_list())
+
+                        window.tab_widget.setCurrentIndex(1)
+                        self.app.processEvents()
+                        prompt.assert_called_once()
+                        self.assertIs(window.tab_widget.widget(1), tabs[1])
+                        self.assertTrue(tabs[1].session_load_pending)
+                finally:
+                    for index in range(window.tab_widget.count()):
+                        window.tab_widget.widget(index).text_edit.set_modified(False)
+                    if window.file_watcher.files():
+                        window.file_watcher.removePaths(window.file_watcher.files())
+                    window.close()
+                    window.deleteLater()
+                    self.app.processEvents()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtWidgets import QApplication
+
+from pypad.services.open_targets import OpenTarget, collect_open_targets, parse_open_target
+from pypad.ui.system.single_instance import SingleInstanceServer, decode_request, forward_to_running_instance
+
+
+class SingleInstanceTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_arguments_resolve_to_targets_with_positions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / "a.py").write_text("x\n", encoding="utf-8")
+            (root / "odd:7").write_text("", encoding="utf-8")
+            (root / "pkg").mkdir()
+            cwd = str(root)
+            self.assertEqual(parse_open_target("a.py:12:5", cwd), OpenTarget(str(root / "a.py"), 12, 5))
+            self.assertEqual(parse_open_target("a.py:3", cwd), OpenTarget(str(root / "a.py"), 3, 0))
+            self.assertEqual(parse_open_target("odd:7", cwd), OpenTarget(str(root / "odd:7")))
+            self.assertIsNone(parse_open_target("missing.py:3", cwd))
+            self.assertIsNone(parse_open_target("-style", cwd))
+            files, folders = collect_open_targets(["a.py", "pkg", "a.py:9", "nope"], cwd)
+            self.assertEqual(files, [OpenTarget(str(root / "a.py"))])
+            self.assertEqual(folders, [str(root / "pkg")])
+            self.assertIsNone(decode_request(b'{"version": 99, "files": []}'))
+            self.assertIsNone(decode_request(b"not json"))
+
+    def test_later_launch_hands_targets_to_the_server(self) -> None:
+        name = f"pypad-test-{uuid.uuid4().hex[:12]}"
+        self.assertFalse(forward_to_running_instance([], [], "", server_name=name, connect_timeout_ms=50))
+        server = SingleInstanceServer(server_name=name)
+        self.assertTrue(server.listen())
+        received: list[tuple] = []
+        server.open_requested.connect(lambda files, folders: received.append((files, folders)))
+        target = OpenTarget(str(Path(__file__).resolve()), 4, 2)
+        # The client blocks, so it runs in its own process, like a real second launch.
+        script = (
+            "import os, sys; sys.path.insert(0, sys.argv[1]);"
+            "from pypad.services.open_targets import OpenTarget;"
+            "from pypad.ui.system.single_instance import forward_to_running_instance;"
+            "sys.exit(0 if forward_to_running_instance([OpenTarget(sys.argv[3], 4, 2)], [], os.getcwd(),"
+            " server_name=sys.argv[2]) else 1)"
+        )
+        client = subprocess.Popen([sys.executable, "-c", script, str(SRC), name, target.path])
+        deadline = time.monotonic() + 20
+        while client.poll() is None and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        server.close()
+        self.assertEqual(client.wait(5), 0)
+        self.assertEqual(received, [([target], [])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import builtins
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.services.startup_profile import (
+    ImportTimer,
+    StartupHistory,
+    build_startup_report,
+    find_regressions,
+    stage_durations,
+)
+
+
+def _run(**stages: float) -> dict:
+    offset = 0.0
+    rows = []
+    for name, ms in stages.items():
+        offset += ms
+        rows.append([name, offset])
+    return {"version": 1, "started_at": 0, "stages": rows}
+
+
+class StartupProfileTests(unittest.TestCase):
+    def test_stage_durations_and_regressions(self) -> None:
+        self.assertEqual(
+            stage_durations(_run(ui_built=100, first_paint=50)),
+            {"ui_built": 100, "first_paint": 50, "total": 150},
+        )
+        baseline = [_run(ui_built=100, first_paint=50), _run(ui_built=110, first_paint=52), _run(ui_built=90, first_paint=48)]
+        # first_paint is exactly REGRESSION_MIN_MS (20ms) over its median of 50ms.
+        current = _run(ui_built=200, first_paint=70)
+        self.assertEqual(find_regressions(current, baseline[:2]), [])
+        self.assertEqual(
+            [(name, median) for name, _ms, median in find_regressions(current, baseline)],
+            [("ui_built", 100), ("first_paint", 50), ("total", 150)],
+        )
+        self.assertEqual(find_regressions(current, baseline, min_ms=25), [("ui_built", 200, 100), ("total", 270, 150)])
+
+        report = build_startup_report(baseline + [current])
+        self.assertIn("median of 3 earlier launch(es)", report)
+        ui_line = next(line for line in report.splitlines() if line.startswith("ui_built"))
+        self.assertTrue(ui_line.endswith("REGRESSED"))
+        self.assertIn("+100", ui_line)
+        self.assertEqual(build_startup_report([]), "No startup profiles recorded yet.")
+
+    def test_history_keeps_newest_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "startup_history.json"
+            history = StartupHistory(path, max_entries=2)
+            self.assertEqual(history.load(), [])
+            for ms in (10, 20, 30):
+                runs = history.append(_run(ui_built=ms))
+            self.assertEqual([run["stages"][0][1] for run in runs], [20, 30])
+            self.assertEqual(StartupHistory(path).load(), runs)
+            path.write_text("{not json", encoding="utf-8")
+            self.assertEqual(history.load(), [])
+
+    def test_import_timer_records_first_imports_and_uninstalls(self) -> None:
+        original = builtins.__import__
+        sys.modules.pop("colorsys", None)
+        timer = ImportTimer()
+        timer.install()
+        try:
+            import colorsys  # noqa: F401
+            import json  # noqa: F401
+        finally:
+            timer.uninstall()
+        self.assertIs(builtins.__import__, original)
+        self.assertIn("colorsys", timer.slowest())
+        self.assertNotIn("json", timer.modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QApplication
+
+from pypad.ui.editor import symbol_model
+from pypad.ui.editor.symbol_model import DocumentSymbolModel, SymbolSnapshot
+
+
+class _FakeEditor(QObject):
+    textChanged = Signal()
+
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self.text = text
+        self.revision = 0
+
+    def get_text(self) -> str:
+        return self.text
+
+    def edit(self, text: str) -> None:
+        self.text = text
+        self.revision += 1
+        self.textChanged.emit()
+
+
+class DocumentSymbolModelTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _pump_until(self, predicate, timeout: float = 2.0) -> None:
+        deadline = time.time() + timeout
+        while time.time() < deadline and not predicate():
+            self.app.processEvents()
+            time.sleep(0.01)
+
+    def test_snapshot_enclosing_symbol(self) -> None:
+        snap = SymbolSnapshot(revision=1, language="python", rows=((1, "class A"), (4, "def b")))
+        self.assertIsNone(SymbolSnapshot(revision=0, language="python").enclosing(3))
+        self.assertEqual(snap.enclosing(3), "class A")
+        self.assertEqual(snap.enclosing(9), "def b")
+
+    def test_many_requests_parse_once_per_revision(self) -> None:
+        editor = _FakeEditor("def a():\n    pass\n")
+        model = DocumentSymbolModel(editor, lambda: "python", idle_ms=20)
+        calls: list[str] = []
+        real = symbol_model.extract_symbol_rows
+
+        def counting(language: str, text: str):
+            calls.append(text)
+            return real(language, text)
+
+        with patch.object(symbol_model, "extract_symbol_rows", counting):
+            for _ in range(10):
+                model.request()
+            self._pump_until(model.is_current)
+            self.assertEqual(model.snapshot().rows, ((1, "def a"),))
+            for _ in range(5):
+                model.request()
+            editor.edit("def a():\n    pass\n\ndef b():\n    pass\n")
+            model.request()
+            self._pump_until(model.is_current)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(model.snapshot().revision, 1)
+        self.assertEqual([title for _line, title in model.snapshot().rows], ["def a", "def b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import random
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QApplication
+
+from pypad.ui.editor.editor_widget import EditorWidget
+from pypad.ui.editor.text_delta import TextChangeLog, TextDelta, apply_text_delta, diff_text, line_range
+
+
+class TextDeltaTests(unittest.TestCase):
+    def test_diff_round_trips(self) -> None:
+        rng = random.Random(7)
+        for _ in range(200):
+            old = "".join(rng.choice("ab\n") for _ in range(rng.randint(0, 40)))
+            new = old[: rng.randint(0, len(old))] + "xy"[: rng.randint(0, 2)] + old[rng.randint(0, len(old)) :]
+            position, removed, inserted = diff_text(old, new)
+            self.assertEqual(apply_text_delta(old, TextDelta(1, position, removed, inserted)), new)
+        big = "a" * 10000
+        self.assertEqual(diff_text(big, big[:5000] + "b" + big[5000:]), (5000, 0, "b"))
+
+    def test_reset_and_out_of_range(self) -> None:
+        self.assertEqual(apply_text_delta("old", TextDelta(2, 0, 0, "new", reset=True)), "new")
+        with self.assertRaises(ValueError):
+            apply_text_delta("abc", TextDelta(2, 2, 5, ""))
+
+    def test_line_range(self) -> None:
+        text = "a\nb\n\nd"
+        self.assertEqual(line_range(text, 0, 10), text.split("\n"))
+        self.assertEqual(line_range(text, 1, 3), ["b", ""])
+        self.assertEqual(line_range(text, 5, 9), [])
+
+    def test_change_log_replays_only_known_revisions(self) -> None:
+        log = TextChangeLog(10, max_deltas=3)
+        for revision in (11, 12, 12, 13):
+            log.record(TextDelta(revision, 0, 0, str(revision)))
+        self.assertEqual(log.revision, 13)
+        self.assertEqual(log.since(13), [])
+        self.assertEqual([d.inserted for d in log.since(11)], ["12", "12", "13"])
+        self.assertIsNone(log.since(10))  # trimmed away
+        self.assertIsNone(log.since(7))  # another document's revision
+        log.reset(20)
+        self.assertEqual(log.since(20), [])
+        self.assertIsNone(log.since(13))
+
+
+class EditorWidgetDeltaTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QApplication.instance() or QApplication([])
+
+    def test_deltas_reproduce_the_document(self) -> None:
+        editor = EditorWidget()
+        editor.set_text("line one\nline two\n")
+        mirror = [editor.get_text()]
+        revisions: list[int] = []
+
+        def _apply(delta: TextDelta) -> None:
+            mirror[0] = apply_text_delta(mirror[0], delta)
+            revisions.append(delta.revision)
+
+        editor.set_delta_tracking(True)
+        editor.textDelta.connect(_apply)
+        rng = random.Random(3)
+        doc = editor.widget.document()
+        for _ in range(150):
+            length = doc.characterCount() - 1
+            cursor = QTextCursor(doc)
+            cursor.setPosition(rng.randint(0, length))
+            cursor.setPosition(rng.randint(0, length), QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(rng.choice(["", "x", "yz", "\n", "tab\t"]))
+            if rng.random() < 0.1:
+                editor.undo()
+            self.assertEqual(mirror[0], editor.get_text())
+        editor.set_text("all new 😀 text")
+        self.assertEqual(mirror[0], editor.get_text())
+        editor.insert_text("more")
+        self.assertEqual(mirror[0], editor.get_text())
+        self.assertEqual(revisions[-1], editor.revision)
+        self.assertEqual(revisions, sorted(revisions))
+
+        editor.set_delta_tracking(False)
+        count = len(revisions)
+        editor.insert_text("untracked")
+        self.assertEqual(len(revisions), count)
+
+    def test_batched_edits_are_one_undo_step(self) -> None:
+        editor = EditorWidget()
+        editor.set_text("one 😀 two\nthree\nfour")
+        log = editor.change_log()
+        before = editor.revision
+        editor.apply_edits([(10, 15, "THREE"), (0, 3, "ONE"), (5, 5, "!")])
+        self.assertEqual(editor.get_text(), "ONE 😀! two\nTHREE\nfour")
+        self.assertEqual(editor.get_line_range(1, 5), ["THREE", "four"])
+        self.assertEqual(editor.line_count(), 3)
+        replayed = "one 😀 two\nthree\nfour"
+        for delta in log.since(before):
+            replayed = apply_text_delta(replayed, delta)
+        self.assertEqual(replayed, editor.get_text())
+        editor.undo()
+        self.assertEqual(editor.get_text(), "one 😀 two\nthree\nfour")
+        with self.assertRaises(ValueError):
+            editor.apply_edits([(0, 5, "x"), (3, 6, "y")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import gettext
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.i18n.translator import (
+    AppTranslator,
+    GoogleTranslateBackend,
+    PseudoTranslationBackend,
+    TranslationCatalog,
+    compile_catalog,
+)
+
+
+class _RecordingBackend(PseudoTranslationBackend):
+    def __init__(self) -> None:
+        self.batches: list[tuple[str, list[str]]] = []
+        self.release = threading.Event()
+
+    def translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
+        self.release.wait(5)
+        self.batches.append((target_lang, list(texts)))
+        return super().translate_batch(texts, target_lang)
+
+
+class _FakeGoogleClient:
+    """Stands in for googletrans: upper-cases each line, or drops one when asked to."""
+
+    def __init__(self, *, drop_line: bool = False) -> None:
+        self.calls: list[str] = []
+        self.drop_line = drop_line
+
+    def translate(self, text: str, dest: str):
+        self.calls.append(text)
+        lines = text.upper().split("\n")
+        if self.drop_line and len(lines) > 1:
+            lines = lines[:-1]
+        return type("Translated", (), {"text": "\n".join(lines)})()
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TranslationQueueTests(unittest.TestCase):
+    def test_catalog_lookup_matches_gettext(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "de.mo"
+            strings = {"Open": "Öffnen", "Save As...": "Speichern unter...", "Zoom": "Zoom", "日本": "Japan"}
+            self.assertEqual(compile_catalog(strings, path), 3)
+            with open(path, "rb") as handle:
+                reference = gettext.GNUTranslations(handle)
+            catalog = TranslationCatalog(path)
+            try:
+                for text in ("Open", "Save As...", "日本"):
+                    self.assertEqual(catalog.get(text), reference.gettext(text))
+                self.assertIsNone(catalog.get("Zoom"))
+                self.assertIsNone(catalog.get("Close"))
+            finally:
+                catalog.close()
+
+    def test_google_backend_sends_one_request_per_batch(self) -> None:
+        client = _FakeGoogleClient()
+        backend = GoogleTranslateBackend(client)
+        texts = ["Open", "Save As...", "two\nlines", "Close", " "]
+        self.assertEqual(backend.translate_batch(texts, "de"), ["OPEN", "SAVE AS...", "TWO\nLINES", "CLOSE", " "])
+        self.assertEqual(client.calls, ["Open\nSave As...\nClose", "two\nlines"])
+
+        fallback = _FakeGoogleClient(drop_line=True)
+        results = GoogleTranslateBackend(fallback).translate_batch(["Open", "Close"], "de")
+        self.assertEqual(results, ["OPEN", "CLOSE"])
+        self.assertEqual(fallback.calls, ["Open\nClose", "Open", "Close"])
+
+    def test_misses_are_batched_deduplicated_and_saved_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            compile_catalog({"File": "Datei"}, root / "i18n" / "de.mo")
+            backend = _RecordingBackend()
+            cache_path = root / "translation_cache.json"
+            translator = AppTranslator(cache_path, catalog_dir=root / "i18n", backend=backend, save_delay_sec=0.1)
+
+            words = ["File", "Edit", "View", "Edit", "", "Help"]
+            self.assertEqual(translator.translate_many(words, "de"), ["Datei", "Edit", "View", "Edit", "", "Help"])
+            self.assertEqual(translator.translate("View", "de"), "View")
+            self.assertEqual(translator.pending_count(), 3)
+            backend.release.set()
+
+            self.assertTrue(_wait_until(lambda: translator.pending_count() == 0))
+            self.assertEqual(backend.batches, [("de", ["Edit", "View", "Help"])])
+            self.assertEqual(translator.translate_many(["Edit", "File"], "de"), ["[de] Edit", "Datei"])
+            self.assertTrue(_wait_until(cache_path.exists))
+            saved = json.loads(cache_path.read_text(encoding="utf-8"))
+            self.assertEqual(saved, {"de": {"Edit": "[de] Edit", "View": "[de] View", "Help": "[de] Help"}})
+
+            reloaded = AppTranslator(cache_path, backend=backend)
+            self.assertEqual(reloaded.translate("Help", "de"), "[de] Help")
+            self.assertEqual(len(backend.batches), 1)
+
+    def test_flush_writes_pending_translations_immediately(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "translation_cache.json"
+            translator = AppTranslator(cache_path, backend=PseudoTranslationBackend(), save_delay_sec=60)
+            translator.translate("Find", "fr")
+            self.assertTrue(_wait_until(lambda: translator.pending_count() == 0))
+            self.assertFalse(cache_path.exists())
+            translator.flush()
+            self.assertEqual(json.loads(cache_path.read_text(encoding="utf-8")), {"fr": {"Find": "[fr] Find"}})
+            translator.clear_cache()
+            self.assertFalse(cache_path.exists())
+            self.assertEqual(translator.translate("Find", "fr"), "Find")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+OUT_DIR = ROOT / "assets" / "i18n"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from pypad.i18n.translator import compile_catalog  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compile reviewed translations ({lang: {source: text}} JSON, e.g. a translation cache) "
+        "into the .mo catalogs bundled under assets/i18n."
+    )
+    parser.add_argument("source", type=Path, help="JSON file with translations per language code")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help=f"output directory (default: {OUT_DIR})")
+    args = parser.parse_args()
+
+    data = json.loads(args.source.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise SystemExit(f"{args.source}: expected an object keyed by language code")
+    for lang, mapping in sorted(data.items()):
+        if not isinstance(mapping, dict) or not mapping:
+            continue
+        strings = {str(src): str(dst) for src, dst in mapping.items()}
+        path = args.out / f"{str(lang).strip().lower()}.mo"
+        count = compile_catalog(strings, path)
+        print(f"Wrote {path} ({count} messages)")
+
+
+if __name__ == "__main__":
+    main()